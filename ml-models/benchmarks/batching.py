@@ -0,0 +1,149 @@
+"""
+MentorAid - Micro-Batching Benchmark
+Closed-loop load test of the prediction service: N client threads each send
+single-student requests back to back (the StudentDetails.tsx pattern) for a
+fixed time. Reports throughput, latency percentiles and the mean batch size,
+with batching off and for several max-wait settings.
+
+Clients call PredictionService.predict in-process by default. --http goes
+through the HTTP server on a free local port, which adds the JSON and socket
+cost of every request.
+
+Usage:
+    python benchmarks/batching.py
+    python benchmarks/batching.py --clients 1 16 64 --waits 0 2 10 --http
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mentoraid.artifacts import ModelRegistry
+from mentoraid.batching import BATCH_REQUESTS
+from mentoraid.config import PRODUCTION_MODEL, TRAINED_MODELS_DIR
+from mentoraid.preprocessing import load_dataset
+from mentoraid.server import PredictionServer, PredictionService
+
+CLIENTS = (1, 8, 32)
+WAITS_MS = (0, 2, 5)
+DURATION_S = 3.0
+
+
+def student_records(features, n=1000):
+    """The first n dataset.csv students as request bodies"""
+    return load_dataset()[list(features)].head(n).to_dict("records")
+
+
+def http_client(port):
+    url = f"http://127.0.0.1:{port}/predict"
+
+    def send(record):
+        request = urllib.request.Request(
+            url, data=json.dumps(record).encode(), headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+
+    return send
+
+
+def load_test(send, records, clients, duration):
+    """
+    Run `clients` threads calling send(record) until `duration` has passed
+
+    Returns:
+        (requests per second, sorted latencies in seconds)
+    """
+    latencies = [[] for _ in range(clients)]
+    stop = time.perf_counter() + duration
+
+    def client(i):
+        k = i
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            send(records[k % len(records)])
+            latencies[i].append(time.perf_counter() - start)
+            k += clients
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    merged = sorted(t for per_client in latencies for t in per_client)
+    return len(merged) / elapsed, merged
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark request micro-batching")
+    parser.add_argument("--clients", nargs="+", type=int, default=list(CLIENTS))
+    parser.add_argument("--waits", nargs="+", type=float, default=list(WAITS_MS), metavar="MS")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=DURATION_S, help="seconds per run")
+    parser.add_argument("--http", action="store_true", help="go through the HTTP server")
+    parser.add_argument("--model", default=PRODUCTION_MODEL)
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(TRAINED_MODELS_DIR)
+    features = registry.predictor(args.model).schema.feature_names
+    records = student_records(features)
+    configs = [("off", 0, 0)] + [(f"wait {w:g}ms", args.max_batch, w) for w in args.waits]
+
+    print(
+        f"📊 Micro-batching: single-student requests, {args.duration:g}s per run, "
+        f"{'HTTP' if args.http else 'in-process'}, max batch {args.max_batch}"
+    )
+    print(
+        f"{'clients':>7} {'batching':>12} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'batch':>6}"
+    )
+    for clients in args.clients:
+        for label, max_batch, wait in configs:
+            service = PredictionService(
+                registry,
+                args.model,
+                max_batch=max_batch,
+                max_wait_ms=wait,
+                batch_workers=args.workers,
+            )
+            server = None
+            if args.http:
+                server = PredictionServer(("127.0.0.1", 0), service)
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                send = http_client(server.server_port)
+            else:
+                send = lambda record: service.predict([record])  # noqa: E731
+
+            batches_before = BATCH_REQUESTS.count()
+            requests_before = BATCH_REQUESTS.sum()
+            try:
+                throughput, latencies = load_test(send, records, clients, args.duration)
+            finally:
+                if server is not None:
+                    server.shutdown()
+                    server.server_close()
+                service.close()
+
+            batches = BATCH_REQUESTS.count() - batches_before
+            mean_batch = (BATCH_REQUESTS.sum() - requests_before) / batches if batches else 1.0
+            print(
+                f"{clients:>7} {label:>12} {throughput:9,.0f} "
+                f"{percentile(latencies, 0.5) * 1000:8.2f} "
+                f"{percentile(latencies, 0.99) * 1000:8.2f} {mean_batch:6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
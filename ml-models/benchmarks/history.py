@@ -0,0 +1,138 @@
+"""
+MentorAid - Prediction History Benchmark
+Simulates years of weekly re-scores of a roster into the prediction history
+(mentoraid.history), compacting after every week as batch-predict does,
+and reports:
+
+- the append throughput and the storage at the end of every year, which
+  levels off once the oldest months expire
+- the latency of one student's history (InterventionHistory) and of a
+  downsampled series (ProgressChart)
+- that every score of the last raw_days is returned unchanged
+
+The first week is scored by the production model on a synthetic roster;
+later weeks drift every probability by a random step, so the run does not
+depend on model speed. Attributions are random values over the model's
+features.
+
+Usage:
+    python benchmarks/history.py
+    python benchmarks/history.py --students 100000 --years 7
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mentoraid.artifacts import ModelRegistry  # noqa: E402
+from mentoraid.history import (  # noqa: E402
+    DAY_S,
+    KEEP_DAYS,
+    RAW_DAYS,
+    SCORE_SCALE,
+    HistoryStore,
+    epoch_seconds,
+)
+from mentoraid.synthetic import RosterGenerator  # noqa: E402
+
+STUDENTS = 20_000
+YEARS = 6
+START = "2020-01-06"
+QUERIES = 1000
+
+
+def latencies(query, keys):
+    times = []
+    for key in keys:
+        start = time.perf_counter()
+        query(key)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000, times[int(len(times) * 0.99)] * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the prediction history")
+    parser.add_argument("--students", type=int, default=STUDENTS)
+    parser.add_argument("--years", type=int, default=YEARS)
+    parser.add_argument("--raw-days", type=int, default=RAW_DAYS)
+    parser.add_argument("--keep-days", type=int, default=KEEP_DAYS)
+    args = parser.parse_args(argv)
+
+    predictor = ModelRegistry().predictor()
+    features = list(predictor.schema.feature_names)
+    roster = next(RosterGenerator.from_dataset().iter_chunks(args.students, args.students, 42))
+    probabilities = predictor.dropout_probability(roster[features].to_numpy(np.float64))
+    ids = [f"STU{i:07d}" for i in range(args.students)]
+    rng = np.random.default_rng(7)
+    weeks = args.years * 52
+    first = epoch_seconds(START)
+
+    print(
+        f"📊 Prediction history: {args.students:,} students scored weekly for "
+        f"{args.years} years (raw {args.raw_days} days, kept {args.keep_days} days)"
+    )
+    print(f"{'year':>5} {'appends/s':>11} {'compact s':>10} {'scores':>12} {'MB':>8}")
+    # The scores of one student, to check what the history returns
+    watched, expected = ids[args.students // 2], []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(Path(tmp) / "history")
+        append_s = compact_s = 0.0
+        for week in range(weeks):
+            now = first + week * 7 * DAY_S
+            probabilities = np.clip(probabilities + rng.normal(0, 0.03, len(ids)), 0, 1)
+            attributions = rng.normal(size=(len(ids), len(features)))
+            start = time.perf_counter()
+            store.append(ids, probabilities, now, "svm@3f9c2a1b7d4e", attributions, features)
+            append_s += time.perf_counter() - start
+            expected.append((now, round(float(probabilities[args.students // 2]), 4)))
+
+            start = time.perf_counter()
+            store.compact(now, args.raw_days, args.keep_days)
+            compact_s += time.perf_counter() - start
+            if (week + 1) % 52 == 0:
+                stats = store.stats()
+                print(
+                    f"{(week + 1) // 52:5} {args.students * 52 / append_s:11,.0f} "
+                    f"{compact_s:10.2f} {stats['rows']:12,} {stats['bytes'] / 1e6:8.1f}"
+                )
+                append_s = compact_s = 0.0
+
+        keys = [ids[i] for i in rng.integers(0, len(ids), QUERIES)]
+        p50, p99 = latencies(store.history, keys)
+        print(f"\n   history() all years     p50 {p50:6.3f}ms  p99 {p99:6.3f}ms")
+        p50, p99 = latencies(lambda key: store.history(key, now - 90 * DAY_S), keys)
+        print(f"   history() last 90 days  p50 {p50:6.3f}ms  p99 {p99:6.3f}ms")
+        p50, p99 = latencies(lambda key: store.series(key, points=52), keys)
+        print(f"   series() 52 points      p50 {p50:6.3f}ms  p99 {p99:6.3f}ms")
+
+        # Months that ended within raw_days still hold every score
+        month_start = np.datetime64(int(now - args.raw_days * DAY_S), "s").astype("datetime64[M]")
+        raw_from = int((month_start + 1).astype("datetime64[s]").astype(np.int64))
+        got = [
+            (epoch_seconds(row["scoredAt"]), row["dropoutProbability"])
+            for row in store.history(watched, raw_from)
+        ]
+        want = [(ts, round(round(p * SCORE_SCALE) / SCORE_SCALE, 4)) for ts, p in expected]
+        ok = got == [(ts, p) for ts, p in want if ts >= raw_from]
+        rows = store.history(watched)
+        print(
+            f"   {stats['bytes'] / stats['rows']:.1f} bytes per stored score "
+            f"({len(json.dumps(rows)) / len(rows):.0f} as history() JSON)"
+        )
+        if ok:
+            print(f"✓ {len(got)} recent scores of {watched} returned unchanged")
+        else:
+            print(f"❌ Recent scores of {watched} differ from what was appended")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
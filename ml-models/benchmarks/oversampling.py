@@ -0,0 +1,123 @@
+"""
+MentorAid - Oversampling Benchmark
+Compares the tuning script's RandomOverSampler approach (balanced copy, then
+5-fold CV on it) with mentoraid.balancing (oversampled fold indices, or
+sample weights) for the tuned RF, SVM and KNN. Reports wall time, peak
+traced memory and CV accuracy.
+
+The "copy" accuracy is optimistic: duplicates of a minority row land in
+both the training and the scoring part of a fold. --tile grows the data with
+jittered near-duplicates, so compare only time and memory there.
+
+Usage:
+    python benchmarks/oversampling.py
+    python benchmarks/oversampling.py --tile 20 --models svm knn
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from mentoraid.artifacts import load_model
+from mentoraid.balancing import OversampledCV, balanced_sample_weight, supports_sample_weight
+from mentoraid.preprocessing import prepare_training_data
+from mentoraid.report import load_tuning_results
+from mentoraid.schema import FeatureSchema
+
+MODELS = ("rf", "svm", "knn")
+
+
+def tuned_estimator(name):
+    """Unfitted estimator with the best parameters from tuning_results.csv"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.svm import SVC
+
+    params = load_tuning_results()[name].best_params
+    if name == "rf":
+        return RandomForestClassifier(random_state=42, n_jobs=1, **params)
+    if name == "svm":
+        return SVC(random_state=42, **params)
+    return KNeighborsClassifier(**params)
+
+
+def training_data(tile, seed=42):
+    """Scaled dataset.csv rows, optionally tiled with small noise to grow them"""
+    schema = FeatureSchema.from_model(load_model("svm"), "svm")
+    _, X, y, _ = prepare_training_data(schema.feature_names)
+    if tile > 1:
+        rng = np.random.default_rng(seed)
+        X = np.vstack([X] + [X + rng.normal(0, 0.01, X.shape) for _ in range(tile - 1)])
+        y = np.tile(y, tile)
+    return X, y
+
+
+def measure(run):
+    """(result, seconds, peak MB) of one call under tracemalloc"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def strategies(estimator, X, y, cv):
+    """name -> zero-argument callable returning the mean CV accuracy"""
+    from sklearn.model_selection import cross_val_score
+
+    def copy():
+        from imblearn.over_sampling import RandomOverSampler
+
+        X_res, y_res = RandomOverSampler(random_state=42).fit_resample(X, y)
+        return cross_val_score(estimator, X_res, y_res, cv=cv).mean()
+
+    def index():
+        return cross_val_score(estimator, X, y, cv=OversampledCV(cv)).mean()
+
+    def weight():
+        params = {"sample_weight": balanced_sample_weight(y)}
+        return cross_val_score(estimator, X, y, cv=cv, params=params).mean()
+
+    runs = {"copy": copy, "index": index}
+    if supports_sample_weight(estimator):
+        runs["weight"] = weight
+    return runs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark copy vs index oversampling")
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=MODELS)
+    parser.add_argument("--tile", type=int, default=1, help="grow the data N times")
+    args = parser.parse_args(argv)
+
+    from sklearn.model_selection import StratifiedKFold
+
+    X, y = training_data(args.tile)
+    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    counts = np.bincount(y)
+    print(
+        f"📊 Oversampling benchmark: {len(y):,} rows "
+        f"(Dropout {counts[0]:,} / Graduate {counts[1]:,}), 5-fold CV"
+    )
+    print(f"{'model':>6} {'strategy':>9} {'time':>8} {'peak MB':>8} {'CV acc':>7}")
+
+    for name in args.models:
+        estimator = tuned_estimator(name)
+        for strategy, run in strategies(estimator, X, y, cv).items():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                accuracy, seconds, peak = measure(run)
+            print(f"{name:>6} {strategy:>9} {seconds:7.2f}s {peak:8.1f} {accuracy:7.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+MentorAid - Pre-Fork Server Benchmark
+Starts the pre-fork prediction server with 1, 2, 4 and 8 workers. Each
+count is run twice: with the models preloaded in the master (copy-on-write
+sharing) and with every worker loading its own copy. Reports startup
+latency, per-worker unique memory (USS, pages only that worker uses) and
+the total footprint (PSS summed over the master and the workers). Memory is
+measured right after startup and again after every worker has served
+traffic.
+
+Each configuration runs in a fresh interpreter, so modules imported by one
+run do not leak into the next. Linux only (reads /proc/<pid>/smaps_rollup).
+
+Usage:
+    python benchmarks/prefork.py
+    python benchmarks/prefork.py --workers 1 4 --requests 2000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+ML_MODELS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ML_MODELS_DIR))
+
+WORKERS = (1, 2, 4, 8)
+REQUESTS = 1000
+MB = 1024 * 1024
+
+
+def send_traffic(port, records, n, clients=8):
+    """n single-student /predict requests from `clients` threads"""
+    url = f"http://127.0.0.1:{port}/predict"
+
+    def client(i):
+        for k in range(i, n, clients):
+            body = json.dumps(records[k % len(records)]).encode()
+            with urllib.request.urlopen(urllib.request.Request(url, data=body)) as response:
+                response.read()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def footprint(stats):
+    workers = [w["memory"] for w in stats["workers"]]
+    return {
+        "uss": sum(w["uss"] for w in workers) / len(workers),
+        "pss": stats["master"]["pss"] + sum(w["pss"] for w in workers),
+    }
+
+
+def run_one(workers, preload, requests):
+    """Measure one configuration in this process; returns a JSON-able dict"""
+    from mentoraid.artifacts import ModelRegistry
+    from mentoraid.config import TRAINED_MODELS_DIR
+    from mentoraid.prefork import PreforkServer
+
+    registry = ModelRegistry(TRAINED_MODELS_DIR)
+    server = PreforkServer(registry, workers, port=0, preload=preload)
+    start = time.perf_counter()
+    server.start()
+    startup = time.perf_counter() - start
+    try:
+        after_start = server.stats()
+        ready = [w["startup"] for w in after_start["workers"]]
+
+        from mentoraid.preprocessing import load_dataset
+
+        features = registry.predictor().schema.feature_names
+        records = load_dataset()[list(features)].head(1000).to_dict("records")
+        send_traffic(server.port, records, requests)
+        after_traffic = server.stats()
+    finally:
+        server.stop()
+    return {
+        "workers": workers,
+        "preload": preload,
+        "startup": startup,
+        "ready_max": max(ready),
+        "start": footprint(after_start),
+        "traffic": footprint(after_traffic),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pre-fork server")
+    parser.add_argument("--workers", nargs="+", type=int, default=list(WORKERS))
+    parser.add_argument("--requests", type=int, default=REQUESTS, help="requests after startup")
+    parser.add_argument("--run", nargs=2, metavar=("WORKERS", "PRELOAD"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run:
+        result = run_one(int(args.run[0]), args.run[1] == "1", args.requests)
+        print(json.dumps(result))
+        return 0
+
+    print(f"📊 Pre-fork server: startup and memory, {args.requests:,} requests per run")
+    print(
+        f"{'workers':>7} {'models':>8} {'startup':>8} {'slowest':>8} "
+        f"{'USS/worker':>11} {'total PSS':>10} {'USS/worker':>11} {'total PSS':>10}"
+    )
+    print(f"{'':>34}{'after startup':^23}{'after traffic':^23}")
+    for workers in args.workers:
+        for preload in (False, True):
+            output = subprocess.run(
+                [sys.executable, __file__, "--run", str(workers), str(int(preload))]
+                + ["--requests", str(args.requests)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            r = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{workers:>7} {'master' if preload else 'worker':>8} "
+                f"{r['startup']:7.2f}s {r['ready_max']:7.3f}s "
+                f"{r['start']['uss'] / MB:8.1f} MB {r['start']['pss'] / MB:7.1f} MB "
+                f"{r['traffic']['uss'] / MB:8.1f} MB {r['traffic']['pss'] / MB:7.1f} MB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+MentorAid - Risk Store Benchmark
+Loads a synthetic scored roster into the risk store (mentoraid.riskstore)
+and reports:
+
+- the initial load, in 50,000-row upserts
+- an incremental refresh: 1% of the students re-scored with changed fields
+- GET /dashboard latency from the rollups, against the same numbers
+  aggregated from the students table on every request
+- that the incrementally maintained rollups equal a full rebuild
+
+Usage:
+    python benchmarks/risk_store.py
+    python benchmarks/risk_store.py --rows 1000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mentoraid.artifacts import ModelRegistry  # noqa: E402
+from mentoraid.calibration import risk_level, risk_score  # noqa: E402
+from mentoraid.riskstore import RiskStore  # noqa: E402
+from mentoraid.synthetic import RosterGenerator, add_student_fields  # noqa: E402
+
+ROWS = 100_000
+CHUNK_ROWS = 50_000
+QUERIES = 1000
+
+# What /dashboard would run without the rollups
+NAIVE_QUERIES = [
+    "SELECT riskLevel, COUNT(*), SUM(riskScore), TOTAL(attendance), COUNT(attendance) "
+    "FROM students GROUP BY riskLevel",
+    "SELECT COUNT(*) FROM students WHERE feeStatus IN ('pending', 'overdue')",
+    "SELECT department, riskLevel, COUNT(*) FROM students GROUP BY department, riskLevel",
+    "SELECT MIN(riskScore / 10, 9) AS bucket, COUNT(*) FROM students GROUP BY bucket",
+]
+
+
+def scored_chunks(n, chunk_size, seed=42):
+    """Synthetic students with Student fields, scored by the production model"""
+    predictor = ModelRegistry().predictor()
+    columns = list(predictor.schema.feature_names)
+    generator = RosterGenerator.from_dataset()
+    for start, chunk in zip(range(0, n, chunk_size), generator.iter_chunks(n, chunk_size, seed)):
+        add_student_fields(chunk, start=start, seed=seed)
+        probabilities = predictor.dropout_probability(chunk[columns].to_numpy(np.float64))
+        yield chunk.assign(
+            dropoutProbability=probabilities.round(4),
+            riskScore=risk_score(probabilities),
+            riskLevel=risk_level(probabilities),
+            outOfRange=False,
+        )
+
+
+def latencies(query, n=QUERIES):
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        query()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000, times[int(len(times) * 0.99)] * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard risk store")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--refresh", type=float, default=0.01, help="share of students re-scored")
+    args = parser.parse_args(argv)
+
+    print(f"📊 Risk store: {args.rows:,} students")
+    chunks = list(scored_chunks(args.rows, CHUNK_ROWS))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RiskStore(Path(tmp) / "risk.sqlite")
+
+        start = time.perf_counter()
+        for chunk in chunks:
+            store.upsert(chunk, "svm")
+        elapsed = time.perf_counter() - start
+        print(f"   initial load      {elapsed:8.2f}s  ({args.rows / elapsed:,.0f} rows/s)")
+
+        # Re-score a random share of the students, some moving fee status
+        rng = np.random.default_rng(7)
+        n = max(1, int(args.rows * args.refresh))
+        roster = pd.concat(chunks, ignore_index=True)
+        changed = roster.iloc[rng.choice(args.rows, n, replace=False)]
+        probabilities = rng.random(len(changed))
+        changed = changed.assign(
+            feeStatus=rng.choice(["paid", "pending", "overdue"], len(changed)),
+            dropoutProbability=probabilities,
+            riskScore=risk_score(probabilities),
+            riskLevel=risk_level(probabilities),
+        )
+        start = time.perf_counter()
+        store.upsert(changed, "svm")
+        elapsed = time.perf_counter() - start
+        print(f"   refresh {n:>9,}  {elapsed * 1000:8.1f}ms ({n / elapsed:,.0f} rows/s)")
+
+        p50, p99 = latencies(store.dashboard)
+        print(f"   /dashboard rollups   p50 {p50:7.3f}ms  p99 {p99:7.3f}ms")
+
+        def naive():
+            for sql in NAIVE_QUERIES:
+                store._query(sql)
+
+        p50, p99 = latencies(naive, n=max(3, min(QUERIES, 2_000_000 // args.rows)))
+        print(f"   /dashboard naive     p50 {p50:7.3f}ms  p99 {p99:7.3f}ms")
+
+        before = store.dashboard()
+        store.rebuild()
+        ok = store.dashboard() == before
+        if ok:
+            print("✓ Incremental rollups match a rebuild")
+        else:
+            print("❌ Incremental rollups differ from a rebuild")
+        store.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
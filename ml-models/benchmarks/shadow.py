@@ -0,0 +1,138 @@
+"""
+MentorAid - Shadow Scoring Benchmark
+Closed-loop load test of the prediction service with and without shadow
+candidates (see mentoraid.shadow). Reports the primary request latency
+seen by the clients, plus how many batches the shadow thread scored and
+how many it dropped because its queue was full.
+
+--rate limits every client to that many requests per second, so the
+service runs below saturation as in production. Without it, clients send
+back to back. On a machine with fewer cores than clients, the shadow
+thread then competes with the primary scoring for the CPU.
+
+Usage:
+    python benchmarks/shadow.py
+    python benchmarks/shadow.py --candidates knn lr dt --clients 8 --rate 50
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from batching import load_test, percentile, student_records  # noqa: E402
+
+from mentoraid.artifacts import ModelRegistry  # noqa: E402
+from mentoraid.config import PRODUCTION_MODEL, TRAINED_MODELS_DIR  # noqa: E402
+from mentoraid.shadow import SHADOW_DROPPED, SHADOW_SECONDS  # noqa: E402
+from mentoraid.server import PredictionService  # noqa: E402
+
+CANDIDATES = ("knn", "lr", "dt")
+CLIENTS = 8
+RATE = 100.0
+DURATION_S = 5.0
+
+
+def paced_load_test(send, records, clients, duration, rate):
+    """
+    load_test() with every client sending `rate` requests per second
+
+    Returns:
+        (requests per second, sorted latencies in seconds); the pause
+        between two requests is not part of their latency
+    """
+    if not rate:
+        return load_test(send, records, clients, duration)
+    interval = 1.0 / rate
+    latencies = [[] for _ in range(clients)]
+    stop = time.perf_counter() + duration
+
+    def client(i):
+        k = i
+        # Spread the clients over the first interval
+        due = time.perf_counter() + interval * i / clients
+        while due < stop:
+            time.sleep(max(0.0, due - time.perf_counter()))
+            start = time.perf_counter()
+            send(records[k % len(records)])
+            latencies[i].append(time.perf_counter() - start)
+            due += interval
+            k += clients
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    merged = sorted(t for per_client in latencies for t in per_client)
+    return len(merged) / elapsed, merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark shadow scoring")
+    parser.add_argument("--candidates", nargs="+", default=list(CANDIDATES))
+    parser.add_argument("--clients", type=int, default=CLIENTS)
+    parser.add_argument(
+        "--rate", type=float, default=RATE, help="requests/s per client (0: back to back)"
+    )
+    parser.add_argument("--duration", type=float, default=DURATION_S, help="seconds per run")
+    parser.add_argument("--shadow-rate", type=float, default=1.0)
+    parser.add_argument("--model", default=PRODUCTION_MODEL)
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(TRAINED_MODELS_DIR)
+    records = student_records(registry.predictor(args.model).schema.feature_names)
+    for name in args.candidates:
+        registry[name.rpartition(":")[2]]
+
+    print(
+        f"📊 Shadow scoring: {args.clients} clients, "
+        f"{f'{args.rate:g} req/s each' if args.rate else 'back to back'}, "
+        f"{args.duration:g}s per run, candidates {' '.join(args.candidates)}"
+    )
+    print(
+        f"{'shadow':>8} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'shadowed':>9} {'dropped':>8} {'drain s':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for shadow in ((), tuple(args.candidates)):
+            service = PredictionService(
+                registry,
+                args.model,
+                shadow=shadow,
+                shadow_rate=args.shadow_rate,
+                shadow_db=Path(tmp) / "shadow.sqlite",
+            )
+            scored_before = SHADOW_SECONDS.count(args.candidates[0])
+            dropped_before = SHADOW_DROPPED.value()
+            try:
+                throughput, latencies = paced_load_test(
+                    lambda record: service.predict([record]),
+                    records,
+                    args.clients,
+                    args.duration,
+                    args.rate,
+                )
+            finally:
+                # Time to score what is still queued once the load stops
+                start = time.perf_counter()
+                service.close()
+                drain = time.perf_counter() - start
+            print(
+                f"{'on' if shadow else 'off':>8} {throughput:9,.0f} "
+                f"{percentile(latencies, 0.5) * 1000:8.2f} "
+                f"{percentile(latencies, 0.99) * 1000:8.2f} "
+                f"{SHADOW_SECONDS.count(args.candidates[0]) - scored_before:9,} "
+                f"{SHADOW_DROPPED.value() - dropped_before:8,.0f} {drain:8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+MentorAid - Start-up Benchmark
+Times cold starts of the Python entry points in fresh interpreters and reads
+`python -X importtime` to show which heavy modules each one loads. A single
+SVM prediction (`mentoraid predict` or python -m mentoraid.predict) must
+stay under PREDICT_TARGET_S and must not import any of HEAVY_MODULES.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 10 --json startup.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ML_MODELS_DIR = Path(__file__).resolve().parent.parent
+DATASET_PATH = ML_MODELS_DIR / "datasets" / "dataset.csv"
+
+# Cold-start budget for scoring one student with the production SVM
+PREDICT_TARGET_S = 0.5
+
+HEAVY_MODULES = ("tensorflow", "sklearn", "scipy", "pandas", "imblearn", "docx")
+
+
+def scenarios(student_file):
+    """(name, interpreter arguments, target seconds or None) per entry point"""
+    return [
+        ("predict (runtime arrays)", ["-m", "mentoraid.predict", student_file], PREDICT_TARGET_S),
+        ("mentoraid predict", ["-m", "mentoraid", "predict", student_file], PREDICT_TARGET_S),
+        (
+            "predict (pickle + scaler)",
+            [
+                "-c",
+                "from mentoraid.cohorts import load_roster, score_roster;"
+                f"score_roster(load_roster({student_file!r}))",
+            ],
+            None,
+        ),
+        ("import mentoraid", ["-c", "import mentoraid"], None),
+        ("import mentoraid.validation", ["-c", "import mentoraid.validation"], None),
+        ("generate_documentation --help", ["generate_documentation.py", "--help"], None),
+    ]
+
+
+def write_student(path):
+    """First dataset.csv row as a one-student JSON roster"""
+    with open(DATASET_PATH, newline="", encoding="utf-8-sig") as f:
+        row = next(csv.DictReader(f))
+    record = {k: v if k == "Target" else float(v) for k, v in row.items()}
+    with open(path, "w") as f:
+        json.dump([record], f)
+
+
+def run(args, importtime=False):
+    """Run one fresh interpreter; returns (seconds, stderr)"""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    start = time.perf_counter()
+    result = subprocess.run(
+        command,
+        cwd=ML_MODELS_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+    return elapsed, result.stderr
+
+
+def parse_importtime(stderr):
+    """
+    Read -X importtime output
+
+    Returns:
+        (dictionary top-level import -> cumulative seconds, set of every
+        package loaded at any depth)
+    """
+    packages = {}
+    loaded = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        package = name.strip().split(".")[0]
+        loaded.add(package)
+        # Nesting is shown by indentation; time only the modules imported directly
+        if len(name) - len(name.lstrip()) == 1:
+            packages[package] = packages.get(package, 0.0) + int(cumulative) / 1e6
+    return packages, loaded
+
+
+def benchmark(repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        student_file = str(Path(tmp) / "student.json")
+        write_student(student_file)
+
+        for name, args, target in scenarios(student_file):
+            run(args)  # warm the OS file cache
+            times = [run(args)[0] for _ in range(repeat)]
+            _, stderr = run(args, importtime=True)
+            packages, loaded = parse_importtime(stderr)
+            heavy = sorted(m for m in HEAVY_MODULES if m in loaded)
+            median = statistics.median(times)
+            results.append(
+                {
+                    "name": name,
+                    "median_s": round(median, 3),
+                    "min_s": round(min(times), 3),
+                    "target_s": target,
+                    "heavy_modules": heavy,
+                    "top_imports": {
+                        package: round(seconds, 3)
+                        for package, seconds in sorted(packages.items(), key=lambda p: -p[1])[:5]
+                    },
+                    "passed": target is None or (median <= target and not heavy),
+                }
+            )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start time of the ML entry points")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per entry point")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    print(f"🔄 Timing {args.repeat} cold starts per entry point ({sys.executable})...\n")
+    results = benchmark(args.repeat)
+
+    print(f"{'entry point':>32}  {'median':>7}  {'min':>7}  heavy modules")
+    for r in results:
+        mark = "" if r["target_s"] is None else ("✓" if r["passed"] else "✗")
+        heavy = ", ".join(r["heavy_modules"]) or "-"
+        print(f"{r['name']:>32}  {r['median_s']:6.2f}s  {r['min_s']:6.2f}s  {heavy} {mark}")
+        slowest = ", ".join(f"{p} {s:.2f}s" for p, s in r["top_imports"].items())
+        print(f"{'':>32}  imports: {slowest}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    failed = [r for r in results if not r["passed"]]
+    if failed:
+        print(f"\n❌ {failed[0]['name']} misses its {failed[0]['target_s']}s target "
+              f"or imports {failed[0]['heavy_modules']}")
+        return 1
+    print(f"\n✅ Single SVM prediction starts in under {PREDICT_TARGET_S}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
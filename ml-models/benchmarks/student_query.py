@@ -0,0 +1,135 @@
+"""
+MentorAid - Student Query Benchmark
+Times RiskStore.query() (GET /students) on a store of synthetic scored
+students: the first page and a deep page of typical StudentTable queries,
+keyset cursors against LIMIT/OFFSET at the same depth, and what shipping the
+whole roster to the browser costs (every row, as JSON).
+
+The store is built with benchmarks/risk_store.py's scored roster, or
+reused with --db.
+
+Usage:
+    python benchmarks/student_query.py                  # 1,000,000 students
+    python benchmarks/student_query.py --rows 100000 --db /tmp/risk.sqlite
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from risk_store import CHUNK_ROWS, scored_chunks  # noqa: E402
+
+from mentoraid.riskstore import SORT_KEYS, RiskStore  # noqa: E402
+
+ROWS = 1_000_000
+LIMIT = 50
+DEPTH = 200
+REPEATS = 200
+FIELDS = ["studentId", "name", "class", "attendance", "riskLevel", "riskScore", "feeStatus"]
+COLUMNS = ", ".join(f'"{field}"' for field in FIELDS)
+
+# (label, where, sort, search)
+QUERIES = [
+    ("all by risk", {}, "-riskScore", None),
+    ("high risk", {"riskLevel": "high"}, "-riskScore", None),
+    ("department", {"department": "Arts"}, "-riskScore", None),
+    ("class + level", {"class": "10A", "riskLevel": "medium"}, "-riskScore", None),
+    ("by name", {}, "name", None),
+    ("attendance", {"feeStatus": "overdue"}, "attendance", None),
+    ("search", {}, "-riskScore", "Lopez"),
+]
+
+
+def timed(call, repeats=REPEATS):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = call()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return result, times[len(times) // 2] * 1000, times[int(len(times) * 0.99)] * 1000
+
+
+def offset_page(store, where, sort, search, offset):
+    """The same page through LIMIT/OFFSET (what the cursor replaces)"""
+    key = SORT_KEYS[sort.lstrip("-")]
+    order = "DESC" if sort.startswith("-") else "ASC"
+    conditions, params = [], []
+    for column, value in where.items():
+        conditions.append(f'"{column}" = ?')
+        params.append(value)
+    if search:
+        conditions.append("(name LIKE ? OR studentId LIKE ?)")
+        params += [f"%{search}%"] * 2
+    sql = (
+        f"SELECT {COLUMNS} FROM students"
+        f"{' WHERE ' + ' AND '.join(conditions) if conditions else ''}"
+        f" ORDER BY {key} {order}, studentId {order} LIMIT ? OFFSET ?"
+    )
+    return store._query(sql, params + [LIMIT, offset])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the paginated student query API")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--db", type=Path, help="reuse (or create) this store")
+    parser.add_argument("--depth", type=int, default=DEPTH, help="page number of the deep page")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or Path(tmp) / "risk.sqlite"
+        store = RiskStore(path)
+        if store.stats()["totalStudents"] < args.rows:
+            start = time.perf_counter()
+            for chunk in scored_chunks(args.rows, CHUNK_ROWS):
+                store.upsert(chunk, "svm")
+            print(f"✓ Loaded {args.rows:,} students in {time.perf_counter() - start:.1f}s")
+        students = store.stats()["totalStudents"]
+
+        print(
+            f"📊 Student queries: {students:,} students, {LIMIT} per page, {len(FIELDS)} fields"
+        )
+        print(
+            f"{'query':>14} {'page 1 p50':>11} {'p99':>8} "
+            f"{f'page {args.depth} p50':>13} {'OFFSET p50':>11}"
+        )
+        for label, where, sort, search in QUERIES:
+
+            def page(cursor=None):
+                return store.query(where, sort, LIMIT, cursor, FIELDS, search)
+
+            first, p50, p99 = timed(page)
+            # Walk to the deep page; its cursor is what a client would hold
+            cursor, pages = first["nextCursor"], 1
+            while cursor and pages < args.depth - 1:
+                cursor, pages = page(cursor)["nextCursor"], pages + 1
+            if cursor:
+                deep = timed(lambda: page(cursor))[1]
+                offset = timed(lambda: offset_page(store, where, sort, search, pages * LIMIT), 5)[1]
+                deep_text = f"{deep:11.3f}ms {offset:9.2f}ms"
+            else:
+                deep_text = f"{f'only {pages} pages':>25}"
+            print(f"{label:>14} {p50:9.3f}ms {p99:6.3f}ms {deep_text}")
+
+        def whole_roster():
+            rows = store._query(f"SELECT {COLUMNS} FROM students")
+            return json.dumps([dict(zip(FIELDS, row)) for row in rows])
+
+        body, p50, _ = timed(whole_roster, 3)
+        one_page = json.dumps(store.query(fields=FIELDS, limit=LIMIT))
+        print(
+            f"\n   whole roster as JSON: {p50:,.0f}ms, {len(body) / 1e6:,.1f} MB "
+            f"(one page: {len(one_page) / 1e3:.1f} kB)"
+        )
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
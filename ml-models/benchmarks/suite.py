@@ -0,0 +1,331 @@
+"""
+MentorAid - Benchmark Suite
+Times every stage of the pipeline on synthetic rosters of fixed size and
+seed: CSV load, the IQR outlier filter, scaling, oversampling, single-row
+and batch inference for each artifact in trained-models/ (plus the NumPy
+runtime path), and report generation.
+
+Each run is appended to benchmarks/results/history.jsonl together with the
+commit, library versions and machine, and compared with
+benchmarks/results/baseline.json: a case whose median is more than 20%
+(and 1 ms) slower than the baseline is flagged, and the exit status is 1.
+Save a baseline on the machine the comparison runs on; timings from other
+machines are not comparable.
+
+The rosters come from mentoraid.synthetic (fixed seed) and are cached in
+benchmarks/results/rosters/.
+
+Usage:
+    python benchmarks/suite.py                          # 1k / 100k / 1M rows
+    python benchmarks/suite.py --sizes 1000 --filter inference
+    python benchmarks/suite.py --save-baseline
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+ML_MODELS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ML_MODELS_DIR))
+
+import numpy as np
+
+from mentoraid.config import DATASET_PATH, MODEL_FILES, TARGET_COLUMN, TRAINED_MODELS_DIR
+
+SIZES = (1_000, 100_000, 1_000_000)
+SEED = 42
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+HISTORY_FILE = RESULTS_DIR / "history.jsonl"
+BASELINE_FILE = RESULTS_DIR / "baseline.json"
+ROSTER_DIR = RESULTS_DIR / "rosters"
+
+# A case is a regression when it is this much slower than the baseline...
+REGRESSION_RATIO = 1.2
+# ...and by more than this (sub-millisecond cases are mostly noise)
+NOISE_FLOOR_S = 0.001
+# Seconds spent repeating each case (at least MIN_REPEAT runs)
+TIME_BUDGET_S = 1.0
+MIN_REPEAT = 3
+MAX_REPEAT = 200
+
+
+def synthetic_roster(n, seed=SEED):
+    """
+    Path of an n-row synthetic roster, written on first use
+
+    Returns:
+        Path to the cached CSV (same header as dataset.csv)
+    """
+    from mentoraid.synthetic import RosterGenerator, write_roster
+
+    path = ROSTER_DIR / f"synthetic-{n}-{seed}.csv"
+    if not path.exists():
+        ROSTER_DIR.mkdir(parents=True, exist_ok=True)
+        write_roster(RosterGenerator.from_dataset(DATASET_PATH), path, n, seed=seed)
+    return path
+
+
+def time_case(run):
+    """
+    Time a zero-argument callable
+
+    The first call is timed (and warms caches); the case is then repeated
+    within TIME_BUDGET_S. Garbage collection is off while timing, as in
+    timeit.
+
+    Returns:
+        {"median", "min", "repeat"} in seconds
+    """
+    times = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+        repeat = int(min(MAX_REPEAT, max(MIN_REPEAT, TIME_BUDGET_S / max(times[0], 1e-9))))
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {"median": statistics.median(times), "min": min(times), "repeat": len(times)}
+
+
+def preprocessing_cases(n):
+    """(name, callable) for the training preprocessing stages on an n-row roster"""
+    from mentoraid.balancing import balanced_sample_weight
+    from mentoraid.preprocessing import (
+        encode_target,
+        fit_scaler,
+        load_dataset,
+        random_oversample_indices,
+        remove_outliers_iqr,
+    )
+
+    path = synthetic_roster(n)
+    students_df = load_dataset(path)
+    features = [c for c in students_df.columns if c != TARGET_COLUMN]
+    _, y = encode_target(students_df)
+
+    yield f"load_csv[{n}]", lambda: load_dataset(path)
+    yield f"iqr_filter[{n}]", lambda: remove_outliers_iqr(students_df)
+    yield f"scaling[{n}]", lambda: fit_scaler(students_df, features).transform(
+        students_df[features].to_numpy(dtype=np.float64)
+    )
+    yield f"oversample_index[{n}]", lambda: random_oversample_indices(y)
+    yield f"oversample_weight[{n}]", lambda: balanced_sample_weight(y)
+
+    try:
+        from imblearn.over_sampling import RandomOverSampler
+    except ImportError:
+        return
+    X = students_df.loc[students_df[TARGET_COLUMN] != "Enrolled", features]
+    yield f"oversample_copy[{n}]", lambda: RandomOverSampler(random_state=SEED).fit_resample(X, y)
+
+
+def load_models():
+    """
+    Every artifact of MODEL_FILES, or the reason it cannot be benchmarked
+
+    Returns:
+        (dict name -> model, dict name -> skip reason)
+    """
+    from mentoraid.artifacts import load_model
+
+    models, skipped = {}, {}
+    for name, filename in MODEL_FILES.items():
+        if not (TRAINED_MODELS_DIR / filename).exists():
+            skipped[name] = f"{filename} not in trained-models/"
+            continue
+        try:
+            models[name] = load_model(name)
+        except ImportError as e:
+            skipped[name] = f"{e.name or e} not installed"
+    return models, skipped
+
+
+def _predict(model):
+    if hasattr(model, "predict_proba") or hasattr(model, "decision_function"):
+        return model.predict
+    # Keras
+    return lambda X: model.predict(X, batch_size=4096, verbose=0)
+
+
+def inference_cases(models, sizes):
+    """Single-row and batch inference for every model and the runtime SVM"""
+    from mentoraid.predict import Predictor
+    from mentoraid.preprocessing import load_dataset
+
+    predictor = Predictor()
+    features = list(predictor.schema.feature_names)
+
+    batches = {}
+    for n in sizes:
+        X_raw = load_dataset(synthetic_roster(n))[features].to_numpy(dtype=np.float64)
+        batches[n] = (X_raw, predictor.runtime.scale_rows(X_raw))
+
+    single_raw, single = batches[min(sizes)][0][:1], batches[min(sizes)][1][:1]
+    yield "predict_single[svm-runtime]", lambda: predictor.dropout_probability(single_raw)
+    for name, model in models.items():
+        yield f"predict_single[{name}]", lambda predict=_predict(model): predict(single)
+
+    for n, (X_raw, X) in batches.items():
+        yield f"predict_batch[svm-runtime,{n}]", lambda X_raw=X_raw: predictor.dropout_probability(
+            X_raw
+        )
+        for name, model in models.items():
+            yield f"predict_batch[{name},{n}]", lambda predict=_predict(model), X=X: predict(X)
+
+
+def report_cases():
+    """Documentation generation, from cached sections and from scratch"""
+    sys.path.insert(0, str(ML_MODELS_DIR))
+    import generate_documentation
+
+    output = Path(tempfile.mkdtemp()) / "documentation.docx"
+    yield "report[cached]", lambda: generate_documentation.create_documentation(
+        str(output), use_cache=True
+    )
+    yield "report[cold]", lambda: generate_documentation.create_documentation(
+        str(output), use_cache=False
+    )
+
+
+def run_suite(sizes, selected=None, quiet_reports=True):
+    """
+    Run every case whose name contains one of the `selected` substrings
+
+    Returns:
+        (dict name -> timing, dict name -> skip reason)
+    """
+    results = {}
+    models, skipped = load_models()
+
+    def groups():
+        for n in sizes:
+            yield from preprocessing_cases(n)
+        yield from inference_cases(models, sizes)
+        yield from report_cases()
+
+    for name, run in groups():
+        if selected and not any(s in name for s in selected):
+            continue
+        with warnings.catch_warnings(), open(os.devnull, "w") as devnull:
+            warnings.simplefilter("ignore")
+            stdout = sys.stdout
+            if quiet_reports and name.startswith("report"):
+                sys.stdout = devnull
+            try:
+                results[name] = time_case(run)
+            finally:
+                sys.stdout = stdout
+        timing = results[name]
+        print(f"   {name:42} {timing['median'] * 1000:11.3f} ms  (x{timing['repeat']})")
+    return results, {f"predict[{name}]": reason for name, reason in skipped.items()}
+
+
+def environment():
+    """Where and on what a run was measured"""
+    import sklearn
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ML_MODELS_DIR,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results, baseline):
+    """
+    Cases slower than the baseline
+
+    Returns:
+        List of (name, baseline median, median) for every regression
+    """
+    regressions = []
+    for name, timing in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        if (
+            timing["median"] > before["median"] * REGRESSION_RATIO
+            and timing["median"] - before["median"] > NOISE_FLOOR_S
+        ):
+            regressions.append((name, before["median"], timing["median"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MentorAid benchmark suite")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument(
+        "--filter", nargs="+", metavar="TEXT", help="only cases whose name contains TEXT"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store this run as the baseline"
+    )
+    parser.add_argument("--no-history", action="store_true", help="do not append to the history")
+    args = parser.parse_args(argv)
+
+    print(f"📊 Benchmark suite: rosters of {', '.join(f'{n:,}' for n in args.sizes)} rows")
+    results, skipped = run_suite(args.sizes, args.filter)
+    for name, reason in skipped.items():
+        print(f"   {name:42} skipped: {reason}")
+
+    run = dict(environment(), sizes=args.sizes, seed=SEED, results=results, skipped=skipped)
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    if not args.no_history:
+        with open(HISTORY_FILE, "a") as f:
+            f.write(json.dumps(run) + "\n")
+        print(f"\n✓ Appended to {HISTORY_FILE}")
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"✓ Saved baseline {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("⚠️  No baseline to compare with (run with --save-baseline)")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline)
+    print(f"\nCompared with baseline {baseline.get('commit')} ({baseline.get('timestamp')})")
+    for name, before, after in regressions:
+        print(f"   ❌ {name:42} {before * 1000:10.3f} ms -> {after * 1000:10.3f} ms")
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) over {REGRESSION_RATIO - 1:.0%}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
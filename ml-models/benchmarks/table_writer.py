@@ -0,0 +1,117 @@
+"""
+MentorAid - Table Writer Benchmark
+Times the bulk <w:tbl> writer (mentoraid.tables.add_table) against the
+row-by-row python-docx approach it replaced, on per-student prediction
+tables of 1k-50k rows.
+
+Usage:
+    python benchmarks/table_writer.py
+    python benchmarks/table_writer.py --rows 1000 50000 --legacy-max 5000
+"""
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document
+from docx.shared import Pt
+
+from mentoraid.tables import add_table
+
+HEADERS = ["Student ID", "Name", "Department", "Class", "Risk Score", "Risk Level"]
+STYLE = "Light Grid Accent 1"
+
+
+def student_rows(n):
+    """Synthetic rows shaped like a per-student prediction appendix"""
+    departments = ["Computer Science", "Mechanical", "Electrical", "Civil", "Management"]
+    levels = ["low", "medium", "high"]
+    return [
+        (
+            f"STU{i:06d}",
+            f"Student {i}",
+            departments[i % len(departments)],
+            f"Year {i % 4 + 1}",
+            f"{(i * 37) % 101}",
+            levels[(i * 37) % 101 * 3 // 101],
+        )
+        for i in range(n)
+    ]
+
+
+def legacy_table(doc, data, headers):
+    """The previous add_table_data: add_row() plus cell.text per cell"""
+    table = doc.add_table(rows=1, cols=len(headers))
+    table.style = STYLE
+    hdr_cells = table.rows[0].cells
+    for i, header in enumerate(headers):
+        hdr_cells[i].text = header
+        for paragraph in hdr_cells[i].paragraphs:
+            for run in paragraph.runs:
+                run.font.bold = True
+                run.font.size = Pt(11)
+    for row_data in data:
+        row_cells = table.add_row().cells
+        for i, cell_data in enumerate(row_data):
+            row_cells[i].text = str(cell_data)
+    return table
+
+
+def bulk_table(doc, data, headers):
+    return add_table(doc, data, headers, style=STYLE, header_size=Pt(11))
+
+
+def time_writer(writer, rows):
+    """(build seconds, save seconds, document.xml bytes) for one table"""
+    doc = Document()
+    start = time.perf_counter()
+    writer(doc, rows, HEADERS)
+    built = time.perf_counter() - start
+
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    doc.save(buffer)
+    saved = time.perf_counter() - start
+    return built, saved, doc.element.xml
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the bulk DOCX table writer")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 10000, 50000])
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=10000,
+        help="largest table to build row by row (it grows quadratically)",
+    )
+    args = parser.parse_args(argv)
+
+    print("📊 Table writer benchmark")
+    compared = False
+    print(f"{'rows':>8} {'legacy build':>13} {'bulk build':>11} {'speedup':>8} {'save':>8}")
+    for n in args.rows:
+        rows = student_rows(n)
+        bulk_build, bulk_save, bulk_xml = time_writer(bulk_table, rows)
+
+        legacy = "skipped"
+        speedup = "-"
+        if n <= args.legacy_max:
+            legacy_build, _, legacy_xml = time_writer(legacy_table, rows)
+            if legacy_xml != bulk_xml:
+                raise SystemExit(f"❌ XML differs from the legacy writer at {n} rows")
+            compared = True
+            legacy = f"{legacy_build:.2f}s"
+            speedup = f"{legacy_build / bulk_build:.0f}x"
+
+        print(f"{n:>8} {legacy:>13} {bulk_build:>10.2f}s {speedup:>8} {bulk_save:>7.2f}s")
+
+    if compared:
+        print("✓ Bulk output is identical to the row-by-row writer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+MentorAid - Early-Warning Trigger Benchmark
+Pushes a stream of feature-change events through TriggerEngine
+(mentoraid.triggers) on its in-process queue and reports, for several
+batch sizes:
+
+- events per second from the first submit() until the queue is drained
+- how many students were re-scored and how many interventions were queued
+- the mean time from submit() until an event's rules were evaluated, with
+  the events submitted at a steady --rate (below saturation)
+
+The roster is synthetic (mentoraid.synthetic). The event mix has grades,
+fee status changes, debtor flags and scholarship changes, plus attendance
+records the model does not use and grades sent again with the roster's
+value. Attendance records are never re-scored, repeated grades only when
+an earlier event changed the grade. The last line is what re-scoring the
+whole roster on every batch would allow instead.
+
+Usage:
+    python benchmarks/triggers.py
+    python benchmarks/triggers.py --students 1000000 --events 500000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mentoraid.artifacts import ModelRegistry  # noqa: E402
+from mentoraid.synthetic import RosterGenerator, add_student_fields  # noqa: E402
+from mentoraid.triggers import (  # noqa: E402
+    DEFAULT_RULES,
+    EVENT_SECONDS,
+    INTERVENTIONS,
+    MAX_BATCH,
+    RESCORED,
+    TriggerEngine,
+)
+
+STUDENTS = 100_000
+EVENTS = 200_000
+BATCH_SIZES = (1, 64, MAX_BATCH, 1024)
+RATE = 5000
+TICK_S = 0.01
+GRADE = "Curricular units 2nd sem (grade)"
+EVALUATIONS = "Curricular units 2nd sem (evaluations)"
+# (event type, share of the stream)
+MIX = (
+    ("grade_posted", 0.40),
+    ("fee_status_changed", 0.15),
+    ("debtor_flag_set", 0.10),
+    ("scholarship_changed", 0.05),
+    ("attendance_recorded", 0.20),
+    ("repeat", 0.10),
+)
+
+
+def event_stream(roster, n, seed=7):
+    """n events against random students of the roster"""
+    rng = np.random.default_rng(seed)
+    kinds = rng.choice([kind for kind, _ in MIX], n, p=[share for _, share in MIX])
+    students = rng.integers(0, len(roster), n)
+    ids = roster["studentId"].to_numpy()
+    grades = roster[GRADE].to_numpy()
+    evaluations = roster[EVALUATIONS].to_numpy()
+    events = []
+    for kind, i in zip(kinds, students):
+        event = {"studentId": ids[i], "type": str(kind)}
+        if kind == "grade_posted":
+            # Grades mostly slip: the stream should raise some alerts
+            event["values"] = {
+                GRADE: round(float(np.clip(grades[i] + rng.normal(-2, 3), 0, 20)), 2),
+                EVALUATIONS: int(evaluations[i] + 1),
+            }
+        elif kind == "fee_status_changed":
+            event["values"] = {"feeStatus": str(rng.choice(["paid", "pending", "overdue"]))}
+        elif kind == "scholarship_changed":
+            event["values"] = {"Scholarship holder": int(rng.integers(0, 2))}
+        elif kind == "attendance_recorded":
+            event["values"] = {"attendance": int(rng.integers(50, 100))}
+        else:
+            # The roster's grade, sent again
+            event = {"studentId": ids[i], "type": "grade_posted", "values": {GRADE: grades[i]}}
+        events.append(event)
+    return events
+
+
+def interventions():
+    return sum(INTERVENTIONS.value(rule.name) for rule in DEFAULT_RULES)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the early-warning trigger engine")
+    parser.add_argument("--students", type=int, default=STUDENTS)
+    parser.add_argument("--events", type=int, default=EVENTS)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=list(BATCH_SIZES))
+    parser.add_argument("--rate", type=float, default=RATE, help="events/s of the paced run")
+    args = parser.parse_args(argv)
+
+    predictor = ModelRegistry().predictor()
+    columns = list(predictor.schema.feature_names)
+    roster = next(RosterGenerator.from_dataset().iter_chunks(args.students, args.students, 42))
+    add_student_fields(roster)
+    X = roster[columns].to_numpy(np.float64)
+    start = time.perf_counter()
+    probabilities = predictor.dropout_probability(X)
+    full_rescore = time.perf_counter() - start
+    events = event_stream(roster, args.events)
+
+    print(
+        f"📊 Early-warning triggers: {args.events:,} events over {args.students:,} students "
+        f"(initial scoring {full_rescore:.2f}s)"
+    )
+    print(f"{'batch':>6} {'events/s':>10} {'re-scored':>10} {'interventions':>14}")
+    for max_batch in args.batch_sizes:
+        engine = TriggerEngine(
+            predictor, roster["studentId"], X, probabilities, max_batch=max_batch
+        )
+        rescored, raised = RESCORED.value(), interventions()
+        start = time.perf_counter()
+        engine.start()
+        for event in events:
+            engine.submit(event)
+        engine.close()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{max_batch:6} {len(events) / elapsed:10,.0f} {RESCORED.value() - rescored:10,.0f} "
+            f"{interventions() - raised:14,.0f}"
+        )
+
+    # Steady stream: every tick submits rate * TICK_S events
+    engine = TriggerEngine(predictor, roster["studentId"], X, probabilities).start()
+    waited, waits = EVENT_SECONDS.sum(), EVENT_SECONDS.count()
+    per_tick = max(1, int(args.rate * TICK_S))
+    due = time.perf_counter()
+    for first in range(0, min(len(events), int(args.rate * 5)), per_tick):
+        time.sleep(max(0.0, due - time.perf_counter()))
+        for event in events[first : first + per_tick]:
+            engine.submit(event)
+        due += TICK_S
+    engine.close()
+    latency = (EVENT_SECONDS.sum() - waited) / (EVENT_SECONDS.count() - waits) * 1000
+    print(
+        f"\n   {args.rate:,.0f} events/s, batch {MAX_BATCH}: "
+        f"submit -> rules {latency:.2f}ms mean"
+    )
+
+    print(
+        f"   re-scoring all {args.students:,} students per {MAX_BATCH}-event batch: "
+        f"{MAX_BATCH / full_rescore:,.0f} events/s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
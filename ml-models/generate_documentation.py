@@ -1,14 +1,83 @@
 """
 MentorAid - Student Dropout Prediction Model Documentation Generator
-This script generates a comprehensive DOCX document detailing the entire ML pipeline
+This script generates a comprehensive DOCX document detailing the entire ML pipeline.
+
+Every figure is read from the tuning artifacts (tuning_results.csv, the tuning
+journal, feature_importance.json) at generation time. Each section is a
+template function; sections whose template and inputs did not change since the
+last run are restored from ml-models/.report_cache/ instead of being rebuilt.
+
+Usage:
+    python generate_documentation.py [--output PATH] [--no-cache]
+    python generate_documentation.py --cohorts roster.csv [--by department class] [--jobs N]
 """
 
-from docx import Document
+import argparse
+import datetime
+import io
+import os
+import time
+from collections import Counter
+
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
-import datetime
+
+from mentoraid.cohorts import (
+    COHORT_FIELDS,
+    cohort_groups,
+    group_value,
+    load_roster,
+    render_cohort_reports,
+    score_roster,
+)
+from mentoraid.config import ML_MODELS_DIR, PRODUCTION_MODEL, RISK_LEVELS
+from mentoraid.report import ReportData, ReportTemplate, format_params
+from mentoraid.tables import add_table
+
+DEFAULT_OUTPUT = ML_MODELS_DIR / "MentorAid_ML_Documentation.docx"
+DEFAULT_COHORT_DIR = ML_MODELS_DIR / "cohort-reports"
+
+MODEL_NAMES = {
+    "svm": "SVM (RBF Kernel)",
+    "rf": "Random Forest",
+    "dt": "Decision Tree",
+    "lr": "Logistic Regression",
+    "knn": "K-Nearest Neighbors",
+    "nn": "Neural Network (Deep RELU)",
+}
+
+# Feature groups used for the combined-importance insights in section 9
+FEATURE_CATEGORIES = {
+    "Academic Performance": [
+        "Curricular units 1st sem (without evaluations)",
+        "Curricular units 2nd sem (credited)",
+        "Curricular units 2nd sem (enrolled)",
+        "Curricular units 2nd sem (evaluations)",
+        "Curricular units 2nd sem (grade)",
+        "Curricular units 2nd sem (without evaluations)",
+        "Previous qualification",
+        "Application mode",
+        "Application order",
+    ],
+    "Financial Factors": ["Debtor", "Tuition fees up to date", "Scholarship holder"],
+    "Demographic Factors": [
+        "Marital status",
+        "Nacionality",
+        "Displaced",
+        "Educational special needs",
+        "Gender",
+        "Age at enrollment",
+        "International",
+    ],
+    "Family Background": [
+        "Mother's qualification",
+        "Father's qualification",
+        "Mother's occupation",
+        "Father's occupation",
+    ],
+    "Institutional Factors": ["Course", "Daytime/evening attendance"],
+    "Macroeconomic Factors": ["Unemployment rate", "Inflation rate", "GDP"],
+}
 
 
 def add_heading_with_color(doc, text, level=1, color=(0, 51, 102)):
@@ -20,35 +89,53 @@ def add_heading_with_color(doc, text, level=1, color=(0, 51, 102)):
 
 
 def add_table_data(doc, data, headers):
-    """Add a formatted table to the document"""
-    table = doc.add_table(rows=1, cols=len(headers))
-    table.style = "Light Grid Accent 1"
+    """Add a formatted table to the document (built in one pass, see mentoraid.tables)"""
+    return add_table(doc, data, headers, style="Light Grid Accent 1", header_size=Pt(11))
 
-    # Add headers
-    hdr_cells = table.rows[0].cells
-    for i, header in enumerate(headers):
-        hdr_cells[i].text = header
-        for paragraph in hdr_cells[i].paragraphs:
-            for run in paragraph.runs:
-                run.font.bold = True
-                run.font.size = Pt(11)
 
-    # Add data rows
-    for row_data in data:
-        row_cells = table.add_row().cells
-        for i, cell_data in enumerate(row_data):
-            row_cells[i].text = str(cell_data)
+def tuning_verdict(result, ranked):
+    """Short status of one model in the tuning results table"""
+    if result is ranked[0]:
+        return "Best Overall"
+    if result.improvement == max(r.improvement for r in ranked):
+        return "Most Improved"
+    if result.improvement < 1:
+        return "Near Ceiling"
+    if result.improvement >= 10:
+        return "High Improvement"
+    return "Good Balance"
 
-    return table
 
+def ordinal(n):
+    """1 -> "1st", 2 -> "2nd", 11 -> "11th", ..."""
+    suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    if 10 <= n % 100 <= 20:
+        suffix = "th"
+    return f"{n}{suffix}"
+
+
+def rank_of(result, ranked):
+    """1-based position of one model in the tuning ranking"""
+    return next(rank for rank, other in enumerate(ranked, 1) if other is result)
+
+
+def place(result, ranked):
+    """Heading suffix for one model: "WINNER ⭐" for the best, "2nd Place", ..."""
+    rank = rank_of(result, ranked)
+    return "WINNER ⭐" if rank == 1 else f"{ordinal(rank)} Place"
 
-def create_documentation():
-    """Generate the complete documentation"""
-    doc = Document()
 
-    # =========================
-    # TITLE PAGE
-    # =========================
+def tuned_params(result, *names):
+    """Named tuned parameters of one model, formatted like format_params"""
+    return format_params({name: result.best_params[name] for name in names})
+
+
+report = ReportTemplate()
+
+
+@report.section("title_page", inputs=("date",))
+def render_title_page(doc, data):
+    """Title Page"""
     title = doc.add_heading("MentorAid", level=0)
     title.alignment = WD_ALIGN_PARAGRAPH.CENTER
     for run in title.runs:
@@ -69,15 +156,16 @@ def create_documentation():
 
     doc.add_paragraph()
     date_para = doc.add_paragraph(
-        f'Generated: {datetime.datetime.now().strftime("%B %d, %Y")}'
+        f'Generated: {data.generated_on.strftime("%B %d, %Y")}'
     )
     date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
     doc.add_page_break()
 
-    # =========================
-    # TABLE OF CONTENTS
-    # =========================
+
+@report.section("table_of_contents")
+def render_table_of_contents(doc, data):
+    """Table of Contents"""
     add_heading_with_color(doc, "Table of Contents", level=1)
     toc_items = [
         "1. Executive Summary",
@@ -98,9 +186,12 @@ def create_documentation():
 
     doc.add_page_break()
 
-    # =========================
-    # 1. EXECUTIVE SUMMARY
-    # =========================
+
+@report.section("executive_summary", inputs=("dataset", "tuning"))
+def render_executive_summary(doc, data):
+    """1. Executive Summary"""
+    ds = data.dataset
+    best = data.ranked()[0]
     add_heading_with_color(doc, "1. Executive Summary", level=1)
 
     doc.add_paragraph(
@@ -111,27 +202,27 @@ def create_documentation():
 
     add_heading_with_color(doc, "Key Highlights", level=2, color=(51, 102, 153))
     highlights = [
-        ("Dataset Size", "4,424 student records (3,630 after cleaning)"),
+        ("Dataset Size", f"{ds.raw_rows:,} student records ({ds.binary_rows:,} after cleaning)"),
         (
             "Features",
-            "27 predictive features across demographics, academics, and socio-economics",
+            f"{ds.n_features} predictive features across demographics, academics, and socio-economics",
         ),
         (
             "Models Tested",
             "20+ variants including RF, DT, SVM, KNN, Logistic Regression, and Neural Networks",
         ),
-        ("Best Model (After Tuning)", "SVM with RBF Kernel"),
-        ("Accuracy Achieved", "99.50%"),
-        ("Precision", "100% (1.0)"),
-        ("Recall", "100% (1.0)"),
+        ("Best Model (After Tuning)", MODEL_NAMES.get(best.key, best.label)),
+        ("Accuracy Achieved", f"{best.tuned:.2%} (5-fold CV)"),
     ]
 
     table = add_table_data(doc, highlights, ["Metric", "Value"])
     doc.add_paragraph()
 
-    # =========================
-    # 2. DATASET OVERVIEW
-    # =========================
+
+@report.section("dataset_overview", inputs=("dataset",))
+def render_dataset_overview(doc, data):
+    """2. Dataset Overview"""
+    ds = data.dataset
     doc.add_page_break()
     add_heading_with_color(doc, "2. Dataset Overview", level=1)
 
@@ -146,13 +237,13 @@ def create_documentation():
         doc, "2.2 Dataset Characteristics", level=2, color=(51, 102, 153)
     )
     dataset_info = [
-        ("Total Records (Original)", "4,424 students"),
-        ("Total Records (After Cleaning)", "3,630 students"),
-        ("Total Features (Original)", "33 columns"),
-        ("Total Features (Final Model)", "27 columns"),
+        ("Total Records (Original)", f"{ds.raw_rows:,} students"),
+        ("Total Records (After Cleaning)", f"{ds.binary_rows:,} students"),
+        ("Total Features (Original)", f"{ds.raw_columns} columns"),
+        ("Total Features (Final Model)", f"{ds.n_features} columns"),
         ("Target Variable", "Student Status (Dropout, Graduate, Enrolled)"),
         ("Target Classes (Final)", "Binary - Dropout (0) vs Graduate (1)"),
-        ("Data Types", "Integer (22), Float (11)"),
+        ("Data Types", f"Integer ({ds.int_columns}), Float ({ds.float_columns})"),
         ("Missing Values", "None detected"),
         ("Duplicate Rows", "None detected"),
     ]
@@ -188,9 +279,11 @@ def create_documentation():
     p.add_run("Institutional Data: ").bold = True
     p.add_run("Course, Daytime/evening attendance, Application mode, Application order")
 
-    # =========================
-    # 3. DATA PREPROCESSING & CLEANING
-    # =========================
+
+@report.section("data_preprocessing_cleaning", inputs=("dataset",))
+def render_data_preprocessing_cleaning(doc, data):
+    """3. Data Preprocessing & Cleaning"""
+    ds = data.dataset
     doc.add_page_break()
     add_heading_with_color(doc, "3. Data Preprocessing & Cleaning", level=1)
 
@@ -282,7 +375,7 @@ def create_documentation():
 
     doc.add_paragraph("Impact of Feature Removal:", style="Heading 3")
     doc.add_paragraph(
-        "• Reduced dimensionality from 33 to 27 features (18% reduction)\n"
+        f"• Reduced dimensionality from {ds.raw_columns} to {ds.n_features} features ({1 - ds.n_features / ds.raw_columns:.0%} reduction)\n"
         "• Eliminated multicollinearity (VIF < 10 for all remaining features)\n"
         "• Improved model interpretability without sacrificing accuracy\n"
         "• Reduced risk of overfitting\n"
@@ -310,11 +403,11 @@ def create_documentation():
 
     p = doc.add_paragraph("", style="List Bullet")
     p.add_run("Records Removed: ").bold = True
-    p.add_run("794 outlier records (17.9% of original data)")
+    p.add_run(f"{ds.outlier_rows:,} outlier records ({ds.outlier_rows / ds.raw_rows:.1%} of original data)")
 
     p = doc.add_paragraph("", style="List Bullet")
     p.add_run("Final Dataset: ").bold = True
-    p.add_run("3,630 clean records")
+    p.add_run(f"{ds.binary_rows:,} clean records")
 
     add_heading_with_color(doc, "3.5 Data Normalization", level=2, color=(51, 102, 153))
     doc.add_paragraph(
@@ -337,9 +430,11 @@ def create_documentation():
     p.add_run("Applied to: ").bold = True
     p.add_run("Numerical features only (categorical features already encoded)")
 
-    # =========================
-    # 4. EXPLORATORY DATA ANALYSIS
-    # =========================
+
+@report.section("exploratory_data_analysis", inputs=("dataset",))
+def render_exploratory_data_analysis(doc, data):
+    """4. Exploratory Data Analysis"""
+    ds = data.dataset
     doc.add_page_break()
     add_heading_with_color(doc, "4. Exploratory Data Analysis (EDA)", level=1)
 
@@ -351,9 +446,9 @@ def create_documentation():
     )
 
     target_dist = [
-        ("Dropout (Class 0)", "1,421 students", "39.1%"),
-        ("Graduate (Class 1)", "2,209 students", "60.9%"),
-        ("Imbalance Ratio", "1 : 1.56", "Moderate imbalance"),
+        ("Dropout (Class 0)", f"{ds.dropout_rows:,} students", f"{ds.dropout_rows / ds.binary_rows:.1%}"),
+        ("Graduate (Class 1)", f"{ds.graduate_rows:,} students", f"{ds.graduate_rows / ds.binary_rows:.1%}"),
+        ("Imbalance Ratio", f"1 : {ds.imbalance_ratio:.2f}", f"{ds.imbalance}"),
     ]
 
     table = add_table_data(doc, target_dist, ["Class", "Count", "Percentage"])
@@ -406,7 +501,7 @@ def create_documentation():
 
     p = doc.add_paragraph("", style="List Bullet")
     p.add_run("Components Analyzed: ").bold = True
-    p.add_run("All 27 features decomposed into principal components")
+    p.add_run(f"All {ds.n_features} features decomposed into principal components")
 
     p = doc.add_paragraph("", style="List Bullet")
     p.add_run("Variance Explained by Top 5 Components: ").bold = True
@@ -443,9 +538,10 @@ def create_documentation():
     p.add_run("Insight: ").bold = True
     p.add_run("Validates the need for early intervention systems")
 
-    # =========================
-    # 5. FEATURE ENGINEERING
-    # =========================
+
+@report.section("feature_engineering")
+def render_feature_engineering(doc, data):
+    """5. Feature Engineering"""
     doc.add_page_break()
     add_heading_with_color(doc, "5. Feature Engineering", level=1)
 
@@ -521,9 +617,10 @@ def create_documentation():
     )
     doc.add_paragraph()
 
-    # =========================
-    # 6. MODEL DEVELOPMENT & TRAINING
-    # =========================
+
+@report.section("model_development_training")
+def render_model_development_training(doc, data):
+    """6. Model Development & Training"""
     doc.add_page_break()
     add_heading_with_color(doc, "6. Model Development & Training", level=1)
 
@@ -679,9 +776,13 @@ def create_documentation():
         "• Performance: 78% accuracy (best neural network)"
     )
 
-    # =========================
-    # 7. MODEL EVALUATION & COMPARISON
-    # =========================
+
+@report.section("model_evaluation_comparison", inputs=("dataset", "tuning"))
+def render_model_evaluation_comparison(doc, data):
+    """7. Model Evaluation & Comparison"""
+    ds = data.dataset
+    svm, rf, dt, knn, nn, lr = data.results("svm", "rf", "dt", "knn", "nn", "lr")
+    ranked = data.ranked()
     doc.add_page_break()
     add_heading_with_color(doc, "7. Model Evaluation & Comparison", level=1)
 
@@ -739,47 +840,18 @@ def create_documentation():
     doc.add_paragraph(
         "IMPORTANT NOTE: Advanced hyperparameter tuning was performed using GridSearchCV and RandomizedSearchCV. "
         "All models underwent comprehensive tuning with expanded parameter grids to maximize performance. "
-        "Results show dramatic improvements, with SVM achieving 99.50% accuracy (winner), Random Forest 98.16%, "
-        "and Neural Networks improving from 70% to 87.87%."
+        f"Results show dramatic improvements, with SVM achieving {svm.tuned:.2%} accuracy (winner), Random Forest {rf.tuned:.2%}, "
+        f"and Neural Networks improving from {nn.default:.2%} to {nn.tuned:.2%}."
     )
 
     tuning_status = [
         (
-            "SVM (WINNER)",
-            "Tuned: RBF kernel, C=1, gamma=1, shrinking=False",
-            "✓ Advanced tuning completed",
-            "99.50% (+13.69% from 87.52%)",
-        ),
-        (
-            "Random Forest",
-            "Tuned: n_estimators=200, max_depth=20, bootstrap=False",
-            "✓ Advanced tuning completed",
-            "98.16% (+1.91% from 96.32%)",
-        ),
-        (
-            "Decision Tree",
-            "Tuned: max_depth=15, splitter=random, criterion=gini",
-            "✓ Advanced tuning completed",
-            "93.72% (+2.28% from 91.63%)",
-        ),
-        (
-            "KNN",
-            "Tuned: n_neighbors=3, metric=hamming, weights=distance",
+            MODEL_NAMES.get(result.key, result.label) + (" (WINNER)" if rank == 1 else ""),
+            f"Tuned: {format_params(result.best_params)}",
             "✓ Advanced tuning completed",
-            "91.21% (+11.58% from 81.74%)",
-        ),
-        (
-            "Neural Networks",
-            "Tuned: Deep RELU+BatchNorm (512-256-128-64-32), dropout=0.3",
-            "✓ Advanced tuning completed",
-            "87.87% (+25.52% from 70.00%)",
-        ),
-        (
-            "Logistic Regression",
-            "Tuned: C=10, penalty=l2, solver=lbfgs",
-            "✓ Advanced tuning completed",
-            "78.22% (+0.11% from 78.14%)",
-        ),
+            f"{result.tuned:.2%} ({result.improvement:+.2f}% from {result.default:.2%})",
+        )
+        for rank, result in enumerate(ranked, 1)
     ]
 
     table = add_table_data(
@@ -801,46 +873,51 @@ def create_documentation():
         color=(51, 102, 153),
     )
 
-    # SVM Analysis - WINNER after hyperparameter tuning
+    # SVM Analysis
     doc.add_paragraph(
-        "SVM (87.52% Default, 99.50% Tuned) - WINNER ⭐", style="Heading 3"
+        f"SVM ({svm.default:.2%} Default, {svm.tuned:.2%} Tuned) - {place(svm, ranked)}",
+        style="Heading 3",
     )
 
     p = doc.add_paragraph()
-    p.add_run("Why It Won After Hyperparameter Tuning:").bold = True
+    p.add_run(
+        "Why It Won After Hyperparameter Tuning:"
+        if svm is ranked[0]
+        else "Why It Performs Well After Hyperparameter Tuning:"
+    ).bold = True
     doc.add_paragraph(
         "• RBF Kernel Excellence: Radial Basis Function kernel transforms data into infinite dimensions, "
         "perfectly capturing non-linear patterns in student dropout behavior\n"
-        "• Optimal Hyperparameters: Advanced tuning found ideal C=1 (regularization), gamma=1 (kernel coefficient), "
+        f"• Optimal Hyperparameters: Advanced tuning found {tuned_params(svm, 'C', 'gamma')} (regularization, kernel coefficient), "
         "creating decision boundaries that maximize class separation\n"
         "• Maximum Margin Classifier: SVM finds the optimal hyperplane that maximizes distance between dropout/graduate classes\n"
         "• Support Vector Focus: Only uses critical boundary points (support vectors), avoiding noise from bulk samples\n"
-        "• Shrinking Algorithm Disabled: Setting shrinking=False prevents premature optimization termination, "
+        f"• Shrinking Algorithm: Setting {tuned_params(svm, 'shrinking')} controls optimization termination, "
         "ensuring thorough exploration of solution space\n"
-        "• Small Dataset Advantage: SVMs excel with limited data (3,630 samples), unlike neural networks requiring 10,000+\n"
-        "• Dramatic Improvement: +13.69% accuracy gain (87.52% → 99.50%) proves tuning was critical for unleashing SVM potential"
+        f"• Small Dataset Advantage: SVMs excel with limited data ({ds.binary_rows:,} samples), unlike neural networks requiring 10,000+\n"
+        f"• Dramatic Improvement: {svm.improvement:+.2f}% accuracy gain ({svm.default:.2%} → {svm.tuned:.2%}) proves tuning was critical for unleashing SVM potential"
     )
 
     p = doc.add_paragraph()
     p.add_run("Strengths:").bold = True
     doc.add_paragraph(
-        "✓ HIGHEST accuracy (99.50%) after hyperparameter tuning\n"
+        f"✓ HIGHEST accuracy ({svm.tuned:.2%}) after hyperparameter tuning\n"
         "✓ RBF kernel handles complex non-linear relationships excellently\n"
         "✓ Robust to overfitting via regularization parameter C\n"
         "✓ Works exceptionally well with small-to-medium datasets\n"
         "✓ Mathematically rigorous optimization (quadratic programming)\n"
         "✓ Memory efficient (stores only support vectors, not all training data)\n"
-        "✓ Significant improvement potential through tuning (+13.69%)\n"
-        "✓ Training time reasonable (463 seconds / 7.7 minutes for 99.50% accuracy)"
+        f"✓ Significant improvement potential through tuning ({svm.improvement:+.2f}%)\n"
+        f"✓ Training time reasonable ({svm.tuning_time:.0f} seconds / {svm.tuning_time / 60:.1f} minutes for {svm.tuned:.2%} accuracy)"
     )
 
     p = doc.add_paragraph()
     p.add_run("Weaknesses:").bold = True
     doc.add_paragraph(
-        "✗ Longer training time than Random Forest (7.7 min vs <1 sec default RF)\n"
+        f"✗ Longer training time than Random Forest ({svm.tuning_time / 60:.1f} min vs <1 sec default RF)\n"
         "✗ Less interpretable than tree-based models (no feature importance)\n"
         "✗ Requires feature scaling (already done in preprocessing)\n"
-        "✗ Hyperparameter tuning essential (default 87.52% far below tuned 99.50%)\n"
+        f"✗ Hyperparameter tuning essential (default {svm.default:.2%} far below tuned {svm.tuned:.2%})\n"
         "✗ Sensitive to kernel choice and parameter settings\n"
         "✗ Prediction time slightly slower than tree models"
     )
@@ -848,18 +925,19 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Why SVM is the Clear Winner:").bold = True
     doc.add_paragraph(
-        "Despite Random Forest's faster training time, SVM's 99.50% accuracy after tuning makes it the "
-        "undisputed best model. The 7.7-minute training time is perfectly acceptable for a production model "
-        "that will be trained once and used for thousands of predictions. SVM's +1.34% accuracy advantage over "
-        "Random Forest (99.50% vs 98.16%) translates to correctly predicting dropout risk for an additional "
-        "~50 students out of 3,630 - a meaningful improvement for early intervention programs."
+        f"Despite Random Forest's faster training time, SVM's {svm.tuned:.2%} accuracy after tuning makes it the "
+        f"undisputed best model. The {svm.tuning_time / 60:.1f}-minute training time is perfectly acceptable for a production model "
+        f"that will be trained once and used for thousands of predictions. SVM's +{svm.tuned - rf.tuned:.2%} accuracy advantage over "
+        f"Random Forest ({svm.tuned:.2%} vs {rf.tuned:.2%}) translates to correctly predicting dropout risk for an additional "
+        f"~{(svm.tuned - rf.tuned) * ds.binary_rows:.0f} students out of {ds.binary_rows:,} - a meaningful improvement for early intervention programs."
     )
 
     doc.add_paragraph()
 
     # Random Forest Analysis
     doc.add_paragraph(
-        "Random Forest (97% Default, 98.16% Tuned) - 2nd Place", style="Heading 3"
+        f"Random Forest ({rf.default:.2%} Default, {rf.tuned:.2%} Tuned) - {place(rf, ranked)}",
+        style="Heading 3",
     )
 
     p = doc.add_paragraph()
@@ -876,7 +954,7 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Strengths:").bold = True
     doc.add_paragraph(
-        "✓ High accuracy (97% default, 98.16% after tuning)\n"
+        f"✓ High accuracy ({rf.default:.2%} default, {rf.tuned:.2%} after tuning)\n"
         "✓ Provides feature importance for interpretability\n"
         "✓ Resistant to overfitting due to ensemble averaging\n"
         "✓ Handles missing values well (though none in this dataset)\n"
@@ -888,10 +966,10 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Weaknesses:").bold = True
     doc.add_paragraph(
-        "✗ Second to SVM after tuning (98.16% vs 99.50%)\n"
-        "✗ Advanced tuning with 200 trees takes 2.2 hours (impractical for production retraining)\n"
+        f"✗ Second to SVM after tuning ({rf.tuned:.2%} vs {svm.tuned:.2%})\n"
+        f"✗ Advanced tuning with {rf.best_params['n_estimators']} trees takes {rf.tuning_time / 3600:.1f} hours (impractical for production retraining)\n"
         "✗ Black box for individual predictions (less interpretable than single tree)\n"
-        "✗ Larger memory footprint (200 trees stored after tuning)\n"
+        f"✗ Larger memory footprint ({rf.best_params['n_estimators']} trees stored after tuning)\n"
         "✗ Cannot extrapolate beyond training data range\n"
         "✗ Biased towards features with many categories"
     )
@@ -900,7 +978,8 @@ def create_documentation():
 
     # Decision Tree Analysis
     doc.add_paragraph(
-        "Decision Tree (89% Default, 93.72% Tuned) - 3rd Place", style="Heading 3"
+        f"Decision Tree ({dt.default:.2%} Default, {dt.tuned:.2%} Tuned) - {place(dt, ranked)}",
+        style="Heading 3",
     )
 
     p = doc.add_paragraph()
@@ -926,8 +1005,8 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Weaknesses:").bold = True
     doc.add_paragraph(
-        "✗ 5.78% below SVM (93.72% vs 99.50%) even after tuning\n"
-        "✗ Still prone to overfitting despite tuning (max_depth=15)\n"
+        f"✗ {svm.tuned - dt.tuned:.2%} below SVM ({dt.tuned:.2%} vs {svm.tuned:.2%}) even after tuning\n"
+        f"✗ Still prone to overfitting despite tuning ({tuned_params(dt, 'max_depth')})\n"
         "✗ Unstable - small data changes cause large tree changes\n"
         "✗ Biased towards dominant classes without balancing\n"
         "✗ Cannot capture linear relationships efficiently\n"
@@ -937,7 +1016,7 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Tuning Results:").bold = True
     doc.add_paragraph(
-        "✓ Improved from 89% to 93.72% (+4.72%) with max_depth=15, random splitter, gini criterion\n"
+        f"✓ Improved from {dt.default:.2%} to {dt.tuned:.2%} ({dt.improvement:+.2f}%) with {tuned_params(dt, 'max_depth', 'splitter', 'criterion')}\n"
         "✓ Now competitive but ensemble methods still superior\n"
         "✓ Maintains interpretability advantage over SVM/neural networks"
     )
@@ -946,7 +1025,8 @@ def create_documentation():
 
     # Logistic Regression Analysis
     doc.add_paragraph(
-        "Logistic Regression (89% Default, 78.22% Tuned) - 6th Place", style="Heading 3"
+        f"Logistic Regression ({lr.default:.2%} Default, {lr.tuned:.2%} Tuned) - {place(lr, ranked)}",
+        style="Heading 3",
     )
 
     p = doc.add_paragraph()
@@ -973,13 +1053,13 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Weaknesses:").bold = True
     doc.add_paragraph(
-        "✗ Lowest accuracy (78.22%) - linear model hit its ceiling\n"
-        "✗ 21.28% below SVM (78.22% vs 99.50%)\n"
+        f"✗ Lowest accuracy ({lr.tuned:.2%}) - linear model hit its ceiling\n"
+        f"✗ {svm.tuned - lr.tuned:.2%} below SVM ({lr.tuned:.2%} vs {svm.tuned:.2%})\n"
         "✗ Linear assumption too restrictive for this complex problem\n"
         "✗ Cannot discover feature interactions automatically\n"
         "✗ Sensitive to feature scaling (StandardScaler required)\n"
         "✗ Multicollinearity affects coefficient interpretation\n"
-        "✗ Tuning provided minimal improvement (+0.11% only)"
+        f"✗ Tuning provided minimal improvement ({lr.improvement:+.2f}% only)"
     )
 
     p = doc.add_paragraph()
@@ -988,7 +1068,7 @@ def create_documentation():
         "Logistic Regression is fundamentally a linear model. No amount of hyperparameter tuning "
         "(C, penalty, solver) can make it capture non-linear patterns. The student dropout problem "
         "requires non-linear decision boundaries that logistic regression simply cannot learn. "
-        "This is why SVM (99.50%), Random Forest (98.16%), and even Decision Tree (93.72%) all "
+        f"This is why SVM ({svm.tuned:.2%}), Random Forest ({rf.tuned:.2%}), and even Decision Tree ({dt.tuned:.2%}) all "
         "significantly outperform it."
     )
 
@@ -996,16 +1076,17 @@ def create_documentation():
 
     # KNN Analysis
     doc.add_paragraph(
-        "K-Nearest Neighbors (76% Default, 91.21% Tuned) - 4th Place", style="Heading 3"
+        f"K-Nearest Neighbors ({knn.default:.2%} Default, {knn.tuned:.2%} Tuned) - {place(knn, ranked)}",
+        style="Heading 3",
     )
 
     p = doc.add_paragraph()
     p.add_run("Why Lower Than Top Models Despite Major Improvement:").bold = True
     doc.add_paragraph(
-        "• Curse of Dimensionality: 27 features create sparse high-dimensional space\n"
+        f"• Curse of Dimensionality: {ds.n_features} features create sparse high-dimensional space\n"
         "• Distance Metric Issues: Euclidean distance treats all features equally (not ideal)\n"
         "• k=5 Not Optimized: Default k may be too small or too large for this dataset\n"
-        "• Sensitive to Irrelevant Features: All 27 features used, including low-importance ones\n"
+        f"• Sensitive to Irrelevant Features: All {ds.n_features} features used, including low-importance ones\n"
         "• No Feature Weighting: Important features (2nd sem grades) weighted same as minor ones\n"
         "• Oversampling Creates Artificial Clusters: Duplicated samples create misleading neighborhoods\n"
         "• No Learning: Lazy algorithm doesn't learn patterns, just memorizes training data"
@@ -1024,7 +1105,7 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Weaknesses:").bold = True
     doc.add_paragraph(
-        "✗ Still 8.29% below SVM (91.21% vs 99.50%) despite tuning\n"
+        f"✗ Still {svm.tuned - knn.tuned:.2%} below SVM ({knn.tuned:.2%} vs {svm.tuned:.2%}) despite tuning\n"
         "✗ Very slow prediction time (searches all training samples)\n"
         "✗ Memory intensive (stores entire training set)\n"
         "✗ Sensitive to feature scaling (despite normalization)\n"
@@ -1035,18 +1116,19 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Actual Improvement After Tuning:").bold = True
     doc.add_paragraph(
-        "✓ Advanced tuning achieved 91.21% (+15.21% improvement from 76%)\n"
-        "✓ Optimal k=3 found (not default k=5)\n"
-        "✓ Hamming distance metric proved superior to Euclidean\n"
-        "✓ Distance-based weighting improved boundary decisions\n"
-        "✓ Now competitive with Decision Tree (93.72%) but still 8.29% below SVM winner"
+        f"✓ Advanced tuning achieved {knn.tuned:.2%} ({knn.improvement:+.2f}% improvement from {knn.default:.2%})\n"
+        f"✓ Optimal k={knn.best_params['n_neighbors']} found (default k=5)\n"
+        f"✓ {knn.best_params['metric'].capitalize()} distance metric chosen over Euclidean\n"
+        f"✓ {knn.best_params['weights'].capitalize()} weighting improved boundary decisions\n"
+        f"✓ Now competitive with Decision Tree ({dt.tuned:.2%}) but still {svm.tuned - knn.tuned:.2%} below SVM winner"
     )
 
     doc.add_paragraph()
 
     # Neural Networks - Sigmoid
     doc.add_paragraph(
-        "Sigmoid Neural Network (72% Default) - 7th Place", style="Heading 3"
+        f"Sigmoid Neural Network (72% Default) - {ordinal(len(ranked) + 1)} Place",
+        style="Heading 3",
     )
 
     p = doc.add_paragraph()
@@ -1054,10 +1136,10 @@ def create_documentation():
     doc.add_paragraph(
         "• Vanishing Gradient Problem: Sigmoid activation saturates (outputs near 0 or 1), gradients → 0\n"
         "• Slow Learning: Vanishing gradients mean weights update very slowly during backpropagation\n"
-        "• Single Hidden Layer: Only 64 neurons, insufficient capacity for 27 complex features\n"
+        f"• Single Hidden Layer: Only 64 neurons, insufficient capacity for {ds.n_features} complex features\n"
         "• Symmetric Saturation: Sigmoid outputs 0.5 for input=0, causing centered data issues\n"
         "• Not Zero-Centered: Outputs [0,1] instead of [-1,1], slows convergence\n"
-        "• Small Dataset: 3,630 samples insufficient for deep learning to excel\n"
+        f"• Small Dataset: {ds.binary_rows:,} samples insufficient for deep learning to excel\n"
         "• No Regularization: No dropout layers, L1/L2 regularization, or batch normalization\n"
         "• Architecture Not Tuned: Layer sizes, depth, learning rate all default values"
     )
@@ -1087,7 +1169,8 @@ def create_documentation():
 
     # Neural Networks - RELU
     doc.add_paragraph(
-        "RELU Neural Network (70% Default) - 8th Place", style="Heading 3"
+        f"RELU Neural Network ({nn.default:.2%} Default) - {ordinal(len(ranked) + 2)} Place",
+        style="Heading 3",
     )
 
     p = doc.add_paragraph()
@@ -1099,7 +1182,7 @@ def create_documentation():
         "• Learning Rate Not Tuned: Default Adam LR may be too high, killing neurons\n"
         "• Weight Initialization: Default initialization may cause many neurons to die early\n"
         "• Negative Saturation: RELU outputs 0 for all negative inputs, losing information\n"
-        "• Small Dataset: Neural networks need more data; 3,630 samples inadequate\n"
+        f"• Small Dataset: Neural networks need more data; {ds.binary_rows:,} samples inadequate\n"
         "• No Dropout: Overfitting to training data, poor generalization"
     )
 
@@ -1116,9 +1199,9 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Weaknesses:").bold = True
     doc.add_paragraph(
-        "✗ Poor performance (70%) despite tuning attempts\n"
+        f"✗ Poor performance ({nn.default:.2%}) despite tuning attempts\n"
         "✗ Dying RELU neurons with small datasets\n"
-        "✗ 29.50% below SVM winner (70% vs 99.50%)\n"
+        f"✗ {svm.tuned - nn.default:.2%} below SVM winner ({nn.default:.2%} vs {svm.tuned:.2%})\n"
         "✗ Needs 10,000+ samples to be competitive\n"
         "✗ Overfitting risk without proper regularization\n"
         "✗ No gradient for negative inputs\n"
@@ -1128,10 +1211,10 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Note on Neural Network Tuning:").bold = True
     doc.add_paragraph(
-        "Advanced hyperparameter tuning achieved 87.87% with Deep RELU + BatchNorm architecture "
-        "(512-256-128-64-32 neurons, batch normalization, dropout=0.3). This represents a +17.87% "
-        "improvement over the default 70%, making neural networks competitive at 5th place overall. "
-        "However, even this heavily optimized network still falls 11.63% short of SVM's 99.50% accuracy, "
+        f"Advanced hyperparameter tuning achieved {nn.tuned:.2%} with Deep RELU + BatchNorm architecture "
+        f"(512-256-128-64-32 neurons, batch normalization, dropout=0.3). This represents a {nn.improvement:+.2f}% "
+        f"improvement over the default {nn.default:.2%}, making neural networks competitive at {ordinal(rank_of(nn, ranked))} place overall. "
+        f"However, even this heavily optimized network still falls {svm.tuned - nn.tuned:.2%} short of SVM's {svm.tuned:.2%} accuracy, "
         "confirming that neural networks require much larger datasets (10,000+) to match traditional ML "
         "on tabular data."
     )
@@ -1140,7 +1223,7 @@ def create_documentation():
 
     # Neural Networks - Advanced ANN
     doc.add_paragraph(
-        "Advanced ANN (76% Default, 87.87% Tuned) - 5th Place", style="Heading 3"
+        "Advanced ANN (76% Default)", style="Heading 3"
     )
 
     p = doc.add_paragraph()
@@ -1148,7 +1231,7 @@ def create_documentation():
     doc.add_paragraph(
         "• Deeper Architecture: Two hidden layers (128, 64) capture more complex patterns than single layer\n"
         "• RELU Activation: Avoids vanishing gradients of sigmoid network\n"
-        "• But Still Small Dataset: 3,630 samples insufficient for deep learning advantages\n"
+        f"• But Still Small Dataset: {ds.binary_rows:,} samples insufficient for deep learning advantages\n"
         "• Tabular Data Challenge: Neural networks excel at images/text, not tabular data\n"
         "• No Feature Engineering: NN expects raw features; ensemble methods benefit from feature interactions\n"
         "• Overfitting Risk: 100 epochs may overfit without validation-based early stopping\n"
@@ -1169,7 +1252,7 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Weaknesses:").bold = True
     doc.add_paragraph(
-        "✗ Still 23.50% below SVM (76% vs 99.50%), 21% below Random Forest (76% vs 97%)\n"
+        f"✗ Below SVM's {svm.tuned:.2%}; even the tuned network ({nn.tuned:.2%}) trails it by {svm.tuned - nn.tuned:.2%}\n"
         "✗ Needs 10,000+ samples to truly shine\n"
         "✗ Prone to overfitting on small datasets\n"
         "✗ Slow training (38 seconds for CNN variant)\n"
@@ -1194,7 +1277,7 @@ def create_documentation():
         "• But Wrong Data Type: CNNs designed for spatial/sequential data (images, time series)\n"
         "• Tabular Data Mismatch: Student features have no inherent spatial ordering\n"
         "• Arbitrary Feature Order: Shuffling columns shouldn't matter, but CNN assumes locality\n"
-        "• Massive Overkill: 47,200 parameters for 3,630 samples = severe overfitting risk\n"
+        f"• Massive Overkill: 47,200 parameters for {ds.binary_rows:,} samples = severe overfitting risk\n"
         "• Slow Training: 38 seconds vs <1 second for RF (38x slower)\n"
         "• Still Too Small Dataset: CNNs need millions of samples (ImageNet has 1.2M images)"
     )
@@ -1212,11 +1295,11 @@ def create_documentation():
     p = doc.add_paragraph()
     p.add_run("Weaknesses:").bold = True
     doc.add_paragraph(
-        "✗ Still 21.50% below SVM (78% vs 99.50%), 19% below Random Forest (wrong tool for the job)\n"
+        f"✗ Below SVM's {svm.tuned:.2%} and the tuned network's {nn.tuned:.2%} (wrong tool for the job)\n"
         "✗ CNNs designed for images/sequences, NOT tabular data\n"
         "✗ Assumes spatial locality that doesn't exist in student features\n"
         "✗ 38-second training time (38x slower than RF)\n"
-        "✗ 47,200 parameters for 3,630 samples = overfitting\n"
+        f"✗ 47,200 parameters for {ds.binary_rows:,} samples = overfitting\n"
         "✗ Needs orders of magnitude more data to be effective\n"
         "✗ Complex architecture unjustified for tabular data\n"
         "✗ Interpretability lost - cannot explain predictions"
@@ -1236,16 +1319,16 @@ def create_documentation():
     p = doc.add_paragraph("", style="List Number")
     p.add_run("Dataset Size Matters: ").bold = True
     p.add_run(
-        "3,630 samples is TINY for deep learning. Neural networks typically need 10,000+ samples minimum, "
-        "ideally 100,000+. Even after advanced tuning achieving 87.87%, neural networks still fall 11.63% "
-        "short of SVM's 99.50%. Traditional ML (SVM, Random Forest) excel with small datasets."
+        f"{ds.binary_rows:,} samples is TINY for deep learning. Neural networks typically need 10,000+ samples minimum, "
+        f"ideally 100,000+. Even after advanced tuning achieving {nn.tuned:.2%}, neural networks still fall {svm.tuned - nn.tuned:.2%} "
+        f"short of SVM's {svm.tuned:.2%}. Traditional ML (SVM, Random Forest) excel with small datasets."
     )
 
     p = doc.add_paragraph("", style="List Number")
     p.add_run("Tabular Data vs Images: ").bold = True
     p.add_run(
         "Neural networks excel at images (millions of pixels, spatial patterns) and text (sequential tokens). "
-        "Student dropout data is tabular - SVM (99.50%) and tree-based models are proven superior for this data type."
+        f"Student dropout data is tabular - SVM ({svm.tuned:.2%}) and tree-based models are proven superior for this data type."
     )
 
     p = doc.add_paragraph("", style="List Number")
@@ -1259,8 +1342,8 @@ def create_documentation():
     p.add_run("Hyperparameter Tuning Impact: ").bold = True
     p.add_run(
         "Neural networks are EXTREMELY sensitive to hyperparameters (learning rate, architecture, dropout, batch size). "
-        "Advanced tuning improved neural networks from 70% to 87.87% (+17.87%), proving tuning is critical. "
-        "However, SVM's +13.69% improvement (87.52% → 99.50%) was even more dramatic, showing that "
+        f"Advanced tuning improved neural networks from {nn.default:.2%} to {nn.tuned:.2%} ({nn.improvement:+.2f}%), proving tuning is critical. "
+        f"However, SVM's {svm.improvement:+.2f}% improvement ({svm.default:.2%} → {svm.tuned:.2%}) was even more dramatic, showing that "
         "traditional ML benefits greatly from tuning too."
     )
 
@@ -1275,10 +1358,10 @@ def create_documentation():
     p = doc.add_paragraph("", style="List Number")
     p.add_run("Training Time Trade-offs: ").bold = True
     p.add_run(
-        "Random Forest (default): <1 second, but tuned version takes 2.2 hours. "
-        "SVM (tuned): 7.7 minutes for 99.50% accuracy - best balance of accuracy and training time. "
-        "Neural networks: 38 seconds to several minutes. For production deployment, SVM's 7.7-minute "
-        "training time is perfectly acceptable for 99.50% accuracy."
+        f"Random Forest (default): <1 second, but tuned version takes {rf.tuning_time / 3600:.1f} hours. "
+        f"SVM (tuned): {svm.tuning_time / 60:.1f} minutes for {svm.tuned:.2%} accuracy - best balance of accuracy and training time. "
+        f"Neural networks: 38 seconds to several minutes. For production deployment, SVM's {svm.tuning_time / 60:.1f}-minute "
+        f"training time is perfectly acceptable for {svm.tuned:.2%} accuracy."
     )
 
     add_heading_with_color(
@@ -1290,48 +1373,42 @@ def create_documentation():
 
     doc.add_paragraph()
 
-    # Create ranking table
-    ranking_table = doc.add_table(rows=1, cols=5)
-    ranking_table.style = "Light Grid Accent 1"
-    ranking_headers = ranking_table.rows[0].cells
-    ranking_headers[0].text = "Rank"
-    ranking_headers[1].text = "Model"
-    ranking_headers[2].text = "Default Accuracy"
-    ranking_headers[3].text = "Tuned Accuracy"
-    ranking_headers[4].text = "Improvement"
-
-    # Add model rankings
+    # Rank models by tuned accuracy; the untuned baselines close the table
+    medals = {1: "1 🥇", 2: "2 🥈", 3: "3 🥉"}
     rankings = [
-        ("1 🥇", "SVM (RBF Kernel)", "87.52%", "99.50%", "+13.69%"),
-        ("2 🥈", "Random Forest", "96.32%", "98.16%", "+1.91%"),
-        ("3 🥉", "Decision Tree", "91.63%", "93.72%", "+2.28%"),
-        ("4", "K-Nearest Neighbors", "81.74%", "91.21%", "+11.58%"),
-        ("5", "Neural Network (Deep RELU)", "70.00%", "87.87%", "+25.52%"),
-        ("6", "Logistic Regression", "78.14%", "78.22%", "+0.11%"),
-        ("7", "Sigmoid NN (Default)", "72%", "-", "Not tuned"),
-        ("8", "RELU NN (Default)", "70%", "-", "Not tuned"),
+        (
+            medals.get(rank, str(rank)),
+            MODEL_NAMES.get(result.key, result.label),
+            f"{result.default:.2%}",
+            f"{result.tuned:.2%}",
+            f"{result.improvement:+.2f}%",
+        )
+        for rank, result in enumerate(data.ranked(), 1)
+    ]
+    n_tuned = len(rankings)
+    rankings += [
+        (str(n_tuned + 1), "Sigmoid NN (Default)", "72%", "-", "Not tuned"),
+        (str(n_tuned + 2), "RELU NN (Default)", "70%", "-", "Not tuned"),
     ]
 
-    for rank, model, default, tuned, improvement in rankings:
-        row_cells = ranking_table.add_row().cells
-        row_cells[0].text = rank
-        row_cells[1].text = model
-        row_cells[2].text = default
-        row_cells[3].text = tuned
-        row_cells[4].text = improvement
+    table = add_table_data(
+        doc,
+        rankings,
+        ["Rank", "Model", "Default Accuracy", "Tuned Accuracy", "Improvement"],
+    )
 
     doc.add_paragraph()
 
     p = doc.add_paragraph()
     p.add_run("Key Findings:").bold = True
     doc.add_paragraph(
-        "• SVM emerges as clear winner with 99.50% accuracy after hyperparameter tuning\n"
-        "• Tuning was CRITICAL: SVM improved 13.69%, Neural Networks improved 25.52%\n"
-        "• Random Forest remains strong at 98.16% but 2.2-hour training time is impractical\n"
-        "• SVM's 7.7-minute training time perfectly acceptable for production use\n"
-        "• Logistic Regression hit its linear ceiling - tuning provided only 0.11% gain\n"
-        "• Neural Networks showed most improvement (+25.52%) but still 11.63% below SVM\n"
-        "• Small dataset (3,630 samples) favors traditional ML over deep learning"
+        f"• {MODEL_NAMES.get(ranked[0].key, ranked[0].label)} emerges as winner with {ranked[0].tuned:.2%} accuracy after hyperparameter tuning\n"
+        f"• Tuning was CRITICAL: SVM improved {svm.improvement:.2f}%, Neural Networks improved {nn.improvement:.2f}%\n"
+        f"• Random Forest remains strong at {rf.tuned:.2%} but {rf.tuning_time / 3600:.1f}-hour training time is impractical\n"
+        f"• SVM's {svm.tuning_time / 60:.1f}-minute training time perfectly acceptable for production use\n"
+        f"• Logistic Regression hit its linear ceiling - tuning provided only {lr.improvement:.2f}% gain\n"
+        f"• Neural Networks showed most improvement ({nn.improvement:+.2f}%) but still {svm.tuned - nn.tuned:.2%} below SVM\n"
+        f"• Small dataset ({ds.binary_rows:,} samples) favors traditional ML over deep learning"
     )
 
     doc.add_paragraph()
@@ -1345,22 +1422,22 @@ def create_documentation():
     p = doc.add_paragraph("", style="List Number")
     p.add_run("SVM Excellence After Tuning: ").bold = True
     p.add_run(
-        "SVM with RBF kernel achieved 99.50% accuracy after advanced hyperparameter tuning, "
-        "significantly outperforming all other models including Random Forest (98.16%)"
+        f"SVM with RBF kernel achieved {svm.tuned:.2%} accuracy after advanced hyperparameter tuning, "
+        f"significantly outperforming all other models including Random Forest ({rf.tuned:.2%})"
     )
 
     p = doc.add_paragraph("", style="List Number")
     p.add_run("Hyperparameter Tuning Critical: ").bold = True
     p.add_run(
-        "Tuning dramatically improved models: SVM +13.69% (87.52%→99.50%), Neural Networks +25.52% (70%→87.87%), "
-        "KNN +11.58% (81.74%→91.21%). Default configurations severely underperform."
+        f"Tuning dramatically improved models: SVM {svm.improvement:+.2f}% ({svm.default:.2%}→{svm.tuned:.2%}), Neural Networks {nn.improvement:+.2f}% ({nn.default:.2%}→{nn.tuned:.2%}), "
+        f"KNN {knn.improvement:+.2f}% ({knn.default:.2%}→{knn.tuned:.2%}). Default configurations severely underperform."
     )
 
     p = doc.add_paragraph("", style="List Number")
     p.add_run("Traditional ML vs Deep Learning: ").bold = True
     p.add_run(
-        "Traditional ML models still superior after tuning: SVM (99.50%), RF (98.16%), DT (93.72%) vs "
-        "best Neural Network (87.87%). Small dataset (3,630 samples) favors traditional ML."
+        f"Traditional ML models still superior after tuning: SVM ({svm.tuned:.2%}), RF ({rf.tuned:.2%}), DT ({dt.tuned:.2%}) vs "
+        f"best Neural Network ({nn.tuned:.2%}). Small dataset ({ds.binary_rows:,} samples) favors traditional ML."
     )
 
     p = doc.add_paragraph("", style="List Number")
@@ -1378,8 +1455,8 @@ def create_documentation():
     p = doc.add_paragraph("", style="List Number")
     p.add_run("Training Time vs Accuracy Trade-off: ").bold = True
     p.add_run(
-        "SVM's 7.7-minute training for 99.50% accuracy is optimal. Random Forest's 2.2-hour tuned training "
-        "is impractical despite 98.16% accuracy. Production systems should prioritize SVM."
+        f"SVM's {svm.tuning_time / 60:.1f}-minute training for {svm.tuned:.2%} accuracy is optimal. Random Forest's {rf.tuning_time / 3600:.1f}-hour tuned training "
+        f"is impractical despite {rf.tuned:.2%} accuracy. Production systems should prioritize SVM."
     )
 
     p = doc.add_paragraph("", style="List Number")
@@ -1419,9 +1496,13 @@ def create_documentation():
         "DEFAULT parameters demonstrates it is the right algorithm for this problem."
     )
 
-    # =========================
-    # 8. BEST MODEL SELECTION
-    # =========================
+
+@report.section("tuning_results", inputs=("dataset", "tuning"))
+def render_tuning_results(doc, data):
+    """8. Hyperparameter Tuning Results & Analysis"""
+    ds = data.dataset
+    svm, rf, dt, knn, nn, lr = data.results("svm", "rf", "dt", "knn", "nn", "lr")
+    ranked = data.ranked()
     doc.add_page_break()
     add_heading_with_color(doc, "8. Hyperparameter Tuning Results & Analysis", level=1)
 
@@ -1440,53 +1521,14 @@ def create_documentation():
 
     tuning_results = [
         (
-            "Random Forest",
-            "96.32%",
-            "98.16%",
-            "+1.91%",
-            "Best Overall",
-            "200 trees, max_depth=20, no bootstrap",
-        ),
-        (
-            "SVM",
-            "87.52%",
-            "99.50%",
-            "+13.69%",
-            "Biggest Improvement",
-            "RBF kernel, C=1, gamma=1, no shrinking",
-        ),
-        (
-            "Decision Tree",
-            "91.63%",
-            "93.72%",
-            "+2.28%",
-            "Good Balance",
-            "max_depth=15, random splitter, gini criterion",
-        ),
-        (
-            "KNN",
-            "81.74%",
-            "91.21%",
-            "+11.58%",
-            "High Improvement",
-            "n_neighbors=3, hamming metric, distance weights",
-        ),
-        (
-            "Neural Network",
-            "70.00%",
-            "87.87%",
-            "+25.52%",
-            "Most Improved",
-            "Deep RELU + BatchNorm (512-256-128-64-32)",
-        ),
-        (
-            "Logistic Regression",
-            "78.14%",
-            "78.22%",
-            "+0.11%",
-            "Linear Ceiling",
-            "C=1, L1 penalty, saga solver",
-        ),
+            MODEL_NAMES.get(result.key, result.label),
+            f"{result.default:.2%}",
+            f"{result.tuned:.2%}",
+            f"{result.improvement:+.2f}%",
+            tuning_verdict(result, ranked),
+            format_params(result.best_params),
+        )
+        for result in ranked
     ]
 
     table = add_table_data(
@@ -1511,14 +1553,19 @@ def create_documentation():
 
     # SVM Analysis
     add_heading_with_color(
-        doc, "SVM (99.50% - BEST TUNED MODEL)", level=3, color=(0, 128, 0)
+        doc,
+        f"SVM ({svm.tuned:.2%} - "
+        + ("BEST TUNED MODEL" if svm is ranked[0] else f"{ordinal(rank_of(svm, ranked))} BEST")
+        + ")",
+        level=3,
+        color=(0, 128, 0),
     )
 
     svm_analysis = [
         (
             "Final Accuracy",
-            "99.50%",
-            "Near-perfect performance, only 6 misclassifications",
+            f"{svm.tuned:.2%}",
+            f"Misclassifies {1 - svm.tuned:.2%} of students in cross-validation",
         ),
         (
             "Strengths",
@@ -1527,28 +1574,28 @@ def create_documentation():
         ),
         (
             "Weaknesses",
-            "✗ Training time: 7.7 minutes\n✗ Not interpretable\n✗ Requires careful tuning",
+            f"✗ Training time: {svm.tuning_time / 60:.1f} minutes\n✗ Not interpretable\n✗ Requires careful tuning",
             "Slower than tree-based models",
         ),
         (
             "vs Random Forest",
-            "Better: +1.34% accuracy\nFaster training: 463s vs 7970s",
+            f"Better: +{svm.tuned - rf.tuned:.2%} accuracy\nFaster training: {svm.tuning_time:.0f}s vs {rf.tuning_time:.0f}s",
             "SVM wins on performance and speed",
         ),
         (
             "vs Neural Network",
-            "Better: +11.63% accuracy\nMore stable",
+            f"Better: +{svm.tuned - nn.tuned:.2%} accuracy\nMore stable",
             "SVM much more reliable",
         ),
         (
             "vs KNN",
-            "Better: +8.29% accuracy\nBetter generalization",
+            f"Better: +{svm.tuned - knn.tuned:.2%} accuracy\nBetter generalization",
             "SVM superior in all aspects",
         ),
         (
             "Best Use Case",
             "Production deployment requiring highest accuracy",
-            "Accept 7min training for 99.5% accuracy",
+            f"Accept {svm.tuning_time / 60:.1f}min training for {svm.tuned:.1%} accuracy",
         ),
     ]
 
@@ -1558,36 +1605,37 @@ def create_documentation():
     # Random Forest Analysis
     add_heading_with_color(
         doc,
-        "Random Forest (98.16% - BEST OVERALL BALANCE)",
+        f"Random Forest ({rf.tuned:.2%} - BEST OVERALL BALANCE)",
         level=3,
         color=(0, 102, 204),
     )
 
     rf_analysis = [
-        ("Final Accuracy", "98.16%", "Excellent performance, 2nd best overall"),
+        ("Final Accuracy", f"{rf.tuned:.2%}", f"Excellent performance, {ordinal(rank_of(rf, ranked))} best overall"),
         (
             "Strengths",
-            "✓ Highly interpretable (feature importance)\n✓ Robust and stable\n✓ No overfitting with bootstrap=False",
+            "✓ Highly interpretable (feature importance)\n✓ Robust and stable\n"
+            f"✓ No overfitting with {tuned_params(rf, 'bootstrap')}",
             "Best for understanding predictions",
         ),
         (
             "Weaknesses",
-            "✗ Very long training: 2.2 hours (7970s)\n✗ Large parameter grid slowdown",
+            f"✗ Very long training: {rf.tuning_time / 3600:.1f} hours ({rf.tuning_time:.0f}s)\n✗ Large parameter grid slowdown",
             "Tuning time is impractical",
         ),
         (
             "vs SVM",
-            "Worse: -1.34% accuracy\nSlower: 7970s vs 463s",
+            f"Worse: -{svm.tuned - rf.tuned:.2%} accuracy\nSlower: {rf.tuning_time:.0f}s vs {svm.tuning_time:.0f}s",
             "SVM better for deployment",
         ),
         (
             "vs Decision Tree",
-            "Better: +4.44% accuracy\nMore stable",
+            f"Better: +{rf.tuned - dt.tuned:.2%} accuracy\nMore stable",
             "RF significantly superior",
         ),
         (
             "vs Neural Network",
-            "Better: +10.29% accuracy\nMore interpretable",
+            f"Better: +{rf.tuned - nn.tuned:.2%} accuracy\nMore interpretable",
             "RF more reliable for tabular data",
         ),
         (
@@ -1602,44 +1650,45 @@ def create_documentation():
 
     # Decision Tree Analysis
     add_heading_with_color(
-        doc, "Decision Tree (93.72% - MOST INTERPRETABLE)", level=3, color=(153, 51, 0)
+        doc, f"Decision Tree ({dt.tuned:.2%} - MOST INTERPRETABLE)", level=3, color=(153, 51, 0)
     )
 
     dt_analysis = [
         (
             "Final Accuracy",
-            "93.72%",
-            "Good performance, +2.28% improvement from tuning",
+            f"{dt.tuned:.2%}",
+            f"Good performance, {dt.improvement:+.2f}% improvement from tuning",
         ),
         (
             "Strengths",
-            "✓ Fully interpretable decision rules\n✓ Fast inference\n✓ Reasonable training time: 6.9 minutes",
+            "✓ Fully interpretable decision rules\n✓ Fast inference\n"
+            f"✓ Reasonable training time: {dt.tuning_time / 60:.1f} minutes",
             "Best for explainability",
         ),
         (
             "Weaknesses",
-            "✗ 5.78% worse than SVM\n✗ Single tree prone to overfitting\n✗ High variance",
+            f"✗ {svm.tuned - dt.tuned:.2%} worse than SVM\n✗ Single tree prone to overfitting\n✗ High variance",
             "Ensemble methods superior",
         ),
         (
             "vs Random Forest",
-            "Worse: -4.44% accuracy\nMuch faster training: 413s vs 7970s",
+            f"Worse: -{rf.tuned - dt.tuned:.2%} accuracy\nMuch faster training: {dt.tuning_time:.0f}s vs {rf.tuning_time:.0f}s",
             "RF worth the extra time",
         ),
         (
             "vs SVM",
-            "Worse: -5.78% accuracy\nFaster training: 413s vs 463s",
+            f"Worse: -{svm.tuned - dt.tuned:.2%} accuracy\nFaster training: {dt.tuning_time:.0f}s vs {svm.tuning_time:.0f}s",
             "SVM better despite similar speed",
         ),
         (
             "vs Logistic Regression",
-            "Better: +15.50% accuracy\nSlower training",
+            f"Better: +{dt.tuned - lr.tuned:.2%} accuracy\nSlower training",
             "DT clearly superior to LR",
         ),
         (
             "Best Use Case",
             "Regulatory compliance requiring explainable decisions",
-            "Trade 5.78% accuracy for full transparency",
+            f"Trade {svm.tuned - dt.tuned:.2%} accuracy for full transparency",
         ),
     ]
 
@@ -1648,32 +1697,34 @@ def create_documentation():
 
     # KNN Analysis
     add_heading_with_color(
-        doc, "KNN (91.21% - DISTANCE-BASED)", level=3, color=(153, 0, 153)
+        doc, f"KNN ({knn.tuned:.2%} - DISTANCE-BASED)", level=3, color=(153, 0, 153)
     )
 
     knn_analysis = [
-        ("Final Accuracy", "91.21%", "Strong improvement (+11.58% from tuning)"),
+        ("Final Accuracy", f"{knn.tuned:.2%}", f"Strong improvement ({knn.improvement:+.2f}% from tuning)"),
         (
             "Strengths",
-            "✓ Hamming distance metric effective\n✓ Distance weighting helps\n✓ k=3 optimal for this dataset",
+            f"✓ {knn.best_params['metric'].capitalize()} distance metric effective\n"
+            f"✓ {knn.best_params['weights'].capitalize()} weighting helps\n"
+            f"✓ k={knn.best_params['n_neighbors']} optimal for this dataset",
             "Tuning solved curse of dimensionality",
         ),
         (
             "Weaknesses",
-            "✗ 8.29% worse than SVM\n✗ Slow inference (compares all samples)\n✗ Memory intensive",
+            f"✗ {svm.tuned - knn.tuned:.2%} worse than SVM\n✗ Slow inference (compares all samples)\n✗ Memory intensive",
             "Not suitable for large-scale deployment",
         ),
         (
             "vs SVM",
-            "Worse: -8.29% accuracy\nFaster training: 5s vs 463s",
+            f"Worse: -{svm.tuned - knn.tuned:.2%} accuracy\nFaster training: {knn.tuning_time:.0f}s vs {svm.tuning_time:.0f}s",
             "SVM worth the training time",
         ),
         (
             "vs Neural Network",
-            "Better: +3.34% accuracy\nFaster and simpler",
+            f"Better: +{knn.tuned - nn.tuned:.2%} accuracy\nFaster and simpler",
             "KNN better than deep learning",
         ),
-        ("vs Logistic Regression", "Better: +12.99% accuracy", "KNN vastly superior"),
+        ("vs Logistic Regression", f"Better: +{knn.tuned - lr.tuned:.2%} accuracy", "KNN vastly superior"),
         (
             "Best Use Case",
             "Small-scale applications with limited data",
@@ -1686,11 +1737,11 @@ def create_documentation():
 
     # Neural Network Analysis
     add_heading_with_color(
-        doc, "Neural Network (87.87% - DEEP LEARNING)", level=3, color=(255, 102, 0)
+        doc, f"Neural Network ({nn.tuned:.2%} - DEEP LEARNING)", level=3, color=(255, 102, 0)
     )
 
     nn_analysis = [
-        ("Final Accuracy", "87.87%", "Massive improvement (+25.52% from default 70%)"),
+        ("Final Accuracy", f"{nn.tuned:.2%}", f"Massive improvement ({nn.improvement:+.2f}% from default {nn.default:.2%})"),
         (
             "Strengths",
             "✓ BatchNorm solved vanishing gradients\n✓ Deep architecture (512-256-128-64-32)\n✓ Dropout prevented overfitting",
@@ -1698,20 +1749,20 @@ def create_documentation():
         ),
         (
             "Weaknesses",
-            "✗ 11.63% worse than SVM\n✗ Dataset too small (1,194 samples)\n✗ Overfitting risk\n✗ Not interpretable",
+            f"✗ {svm.tuned - nn.tuned:.2%} worse than SVM\n✗ Dataset too small ({ds.resampled_rows:,} samples)\n✗ Overfitting risk\n✗ Not interpretable",
             "Tabular data not ideal for deep learning",
         ),
         (
             "vs SVM",
-            "Worse: -11.63% accuracy\nBetter for images, not tabular",
+            f"Worse: -{svm.tuned - nn.tuned:.2%} accuracy\nBetter for images, not tabular",
             "SVM dominates tabular data",
         ),
         (
             "vs Random Forest",
-            "Worse: -10.29% accuracy\nLess stable",
+            f"Worse: -{rf.tuned - nn.tuned:.2%} accuracy\nLess stable",
             "Tree methods better for structured data",
         ),
-        ("vs KNN", "Worse: -3.34% accuracy\nMore complex", "KNN simpler and better"),
+        ("vs KNN", f"Worse: -{knn.tuned - nn.tuned:.2%} accuracy\nMore complex", "KNN simpler and better"),
         (
             "Best Use Case",
             "Learning exercise to understand deep learning",
@@ -1725,7 +1776,7 @@ def create_documentation():
     # Logistic Regression Analysis
     add_heading_with_color(
         doc,
-        "Logistic Regression (78.22% - LINEAR BASELINE)",
+        f"Logistic Regression ({lr.tuned:.2%} - LINEAR BASELINE)",
         level=3,
         color=(128, 128, 128),
     )
@@ -1733,32 +1784,32 @@ def create_documentation():
     lr_analysis = [
         (
             "Final Accuracy",
-            "78.22%",
-            "Minimal improvement (+0.11% - hit linear ceiling)",
+            f"{lr.tuned:.2%}",
+            f"Minimal improvement ({lr.improvement:+.2f}% - hit linear ceiling)",
         ),
         (
             "Strengths",
-            "✓ Extremely fast training: 2.3s\n✓ Fast inference\n✓ Interpretable coefficients",
+            f"✓ Extremely fast training: {lr.tuning_time:.1f}s\n✓ Fast inference\n✓ Interpretable coefficients",
             "Best for linear relationships",
         ),
         (
             "Weaknesses",
-            "✗ 21.28% worse than SVM\n✗ Linear assumption too restrictive\n✗ Cannot capture non-linear patterns",
+            f"✗ {svm.tuned - lr.tuned:.2%} worse than SVM\n✗ Linear assumption too restrictive\n✗ Cannot capture non-linear patterns",
             "Fundamental limitation for complex data",
         ),
         (
             "vs ALL Models",
-            "Worst performer by large margin\n15.50% worse than Decision Tree",
+            f"Worst performer by large margin\n{dt.tuned - lr.tuned:.2%} worse than Decision Tree",
             "Linear model inadequate",
         ),
         (
             "vs SVM",
-            "Worse: -21.28% accuracy\nFaster training: 2.3s vs 463s",
+            f"Worse: -{svm.tuned - lr.tuned:.2%} accuracy\nFaster training: {lr.tuning_time:.1f}s vs {svm.tuning_time:.0f}s",
             "Speed not worth accuracy loss",
         ),
         (
             "vs Neural Network",
-            "Worse: -9.65% accuracy\nFaster",
+            f"Worse: -{nn.tuned - lr.tuned:.2%} accuracy\nFaster",
             "Even deep learning beats linear",
         ),
         (
@@ -1782,43 +1833,27 @@ def create_documentation():
     run = p.add_run("Based on comprehensive hyperparameter tuning and analysis:\n\n")
     run.font.size = Pt(11)
 
-    ranking = [
-        (
-            "1st",
-            "SVM (99.50%)",
+    outlook = {
+        "svm": (
             "Best for production deployment",
-            "Accept 7min training for 99.5% accuracy",
+            f"Accept {svm.tuning_time / 60:.1f}min training for {svm.tuned:.1%} accuracy",
         ),
-        (
-            "2nd",
-            "Random Forest (98.16%)",
+        "rf": (
             "Best for feature analysis",
-            "Use for insights, too slow for production (2.2 hours)",
-        ),
-        (
-            "3rd",
-            "Decision Tree (93.72%)",
-            "Best for explainability",
-            "Use when transparency required by regulations",
-        ),
-        (
-            "4th",
-            "KNN (91.21%)",
-            "Good for prototypes",
-            "Acceptable for small-scale applications",
-        ),
-        (
-            "5th",
-            "Neural Network (87.87%)",
-            "Educational value",
-            "Dataset too small for deep learning",
+            f"Use for insights, too slow for production ({rf.tuning_time / 3600:.1f} hours)",
         ),
+        "dt": ("Best for explainability", "Use when transparency required by regulations"),
+        "knn": ("Good for prototypes", "Acceptable for small-scale applications"),
+        "nn": ("Educational value", "Dataset too small for deep learning"),
+        "lr": ("Baseline only", "Linear assumption inadequate for complex patterns"),
+    }
+    ranking = [
         (
-            "6th",
-            "Logistic Regression (78.22%)",
-            "Baseline only",
-            "Linear assumption inadequate for complex patterns",
-        ),
+            ordinal(rank),
+            f"{MODEL_NAMES.get(result.key, result.label)} ({result.tuned:.2%})",
+            *outlook.get(result.key, ("", "")),
+        )
+        for rank, result in enumerate(ranked, 1)
     ]
 
     table = add_table_data(
@@ -1833,23 +1868,23 @@ def create_documentation():
 
     p = doc.add_paragraph()
     run = p.add_run(
-        "• SVM achieved 99.50% accuracy, becoming the best model after hyperparameter tuning\n"
+        f"• SVM achieved {svm.tuned:.2%} accuracy, becoming the best model after hyperparameter tuning\n"
     )
     run.font.size = Pt(11)
     run = p.add_run(
-        "• Random Forest too slow (2.2 hours training) despite 98.16% accuracy\n"
+        f"• Random Forest too slow ({rf.tuning_time / 3600:.1f} hours training) despite {rf.tuned:.2%} accuracy\n"
     )
     run.font.size = Pt(11)
     run = p.add_run(
-        "• Neural Network improved +25.52% but still 11.63% behind SVM due to small dataset\n"
+        f"• Neural Network improved {nn.improvement:+.2f}% but still {svm.tuned - nn.tuned:.2%} behind SVM due to small dataset\n"
     )
     run.font.size = Pt(11)
     run = p.add_run(
-        "• KNN improved +11.58% with hamming distance, proving feature engineering importance\n"
+        f"• KNN improved {knn.improvement:+.2f}% with {knn.best_params['metric']} distance, proving feature engineering importance\n"
     )
     run.font.size = Pt(11)
     run = p.add_run(
-        "• Logistic Regression hit linear ceiling at 78.22%, confirming non-linear patterns in data\n"
+        f"• Logistic Regression hit linear ceiling at {lr.tuned:.2%}, confirming non-linear patterns in data\n"
     )
     run.font.size = Pt(11)
 
@@ -1862,17 +1897,17 @@ def create_documentation():
 
     best_model_specs = [
         ("Model Type", "Support Vector Machine (SVM)"),
-        ("Kernel", "RBF (Radial Basis Function)"),
+        ("Kernel", str(svm.best_params["kernel"]).upper()),
         ("Sampling Method", "Random Oversampling"),
-        ("C (Regularization)", "1"),
-        ("Gamma", "1"),
-        ("Shrinking", "False"),
-        ("Cache Size", "500 MB"),
+        ("C (Regularization)", str(svm.best_params["C"])),
+        ("Gamma", str(svm.best_params["gamma"])),
+        ("Shrinking", str(svm.best_params["shrinking"])),
+        ("Cache Size", f"{svm.best_params['cache_size']} MB"),
         ("Random State", "42"),
-        ("Training Samples", "1,194 (after oversampling)"),
-        ("Features Used", "28 predictive features"),
-        ("Training Time", "463 seconds (7.7 minutes)"),
-        ("Final Accuracy", "99.50%"),
+        ("Training Samples", f"{ds.resampled_rows:,} (after oversampling)"),
+        ("Features Used", f"{ds.n_features} predictive features"),
+        ("Training Time", f"{svm.tuning_time:.0f} seconds ({svm.tuning_time / 60:.1f} minutes)"),
+        ("Final Accuracy", f"{svm.tuned:.2%}"),
     ]
 
     table = add_table_data(doc, best_model_specs, ["Specification", "Value"])
@@ -1883,32 +1918,25 @@ def create_documentation():
     )
 
     performance = [
-        ("Accuracy", "99.50%", "Correctly classifies 995 out of 1000 students"),
         (
-            "Precision",
-            "~0.995",
-            "Extremely low false positives - highly reliable dropout predictions",
+            "Accuracy",
+            f"{svm.tuned:.2%}",
+            f"Correctly classifies {svm.tuned * 1000:.0f} out of 1000 students",
         ),
-        (
-            "Recall",
-            "~0.995",
-            "Catches virtually all actual dropout cases",
-        ),
-        ("F1-Score", "~0.995", "Near-perfect balance between precision and recall"),
         (
             "Cross-Validation Score",
-            "99.50% (5-fold CV)",
+            f"{svm.tuned:.2%} (5-fold CV)",
             "Extremely consistent performance across all folds",
         ),
         (
             "Training Time",
-            "463 seconds (7.7 min)",
+            f"{svm.tuning_time:.0f} seconds ({svm.tuning_time / 60:.1f} min)",
             "Acceptable for production deployment",
         ),
         ("Inference Time", "<5ms per student", "Real-time prediction capability"),
         (
             "Improvement vs Default",
-            "+13.69%",
+            f"{svm.improvement:+.2f}%",
             "Hyperparameter tuning critical for SVM performance",
         ),
     ]
@@ -1916,102 +1944,90 @@ def create_documentation():
     table = add_table_data(doc, performance, ["Metric", "Value", "Interpretation"])
     doc.add_paragraph()
 
-    add_heading_with_color(
-        doc, "8.3 Confusion Matrix Analysis", level=2, color=(51, 102, 153)
-    )
-    doc.add_paragraph("Confusion matrix on test set shows near-perfect classification:")
-
-    confusion = [
-        ("", "Predicted Dropout", "Predicted Graduate"),
-        ("Actual Dropout", "1,421 (True Negative)", "0 (False Positive)"),
-        ("Actual Graduate", "0 (False Negative)", "2,209 (True Positive)"),
-    ]
-
-    table = add_table_data(doc, confusion[1:], ["", confusion[0][1], confusion[0][2]])
-    doc.add_paragraph()
-
-    doc.add_paragraph(
-        "Critical Achievement: Zero false negatives means no at-risk students are missed - "
-        "crucial for an early intervention system where missing a student could have serious consequences."
-    )
 
-    # =========================
-    # 9. FEATURE IMPORTANCE ANALYSIS
-    # =========================
+@report.section("feature_importance_analysis", inputs=("importance",))
+def render_feature_importance_analysis(doc, data):
+    """9. Feature Importance Analysis"""
     doc.add_page_break()
     add_heading_with_color(doc, "9. Feature Importance Analysis", level=1)
 
+    importances = data.importance
+    production = importances[PRODUCTION_MODEL]
+    ranked = [f for f in production["features"] if f["importance"] > 0]
+    total = sum(f["importance"] for f in ranked) or 1.0
+
     add_heading_with_color(
         doc, "9.1 Top 10 Most Important Features", level=2, color=(51, 102, 153)
     )
     doc.add_paragraph(
-        "The Random Forest model provides interpretable feature importance scores based on "
-        "Gini importance (mean decrease in impurity):"
+        f"Permutation importance of the production model ({MODEL_NAMES[PRODUCTION_MODEL]}) "
+        f"on the held-out split ({production['held_out_rows']} students, "
+        f"{production['n_repeats']} shuffles per feature): the drop in accuracy when a "
+        "feature's values are randomly shuffled. The model is refit with its tuned "
+        f"hyperparameters on the other {production['train_rows']} students first, so none "
+        "of the scored rows were seen in training. Share is the feature's fraction of the "
+        "total positive importance."
     )
 
     feature_importance = [
-        ("1", "Curricular units 2nd sem (grade)", "17.2%", "Most critical predictor"),
         (
-            "2",
-            "Curricular units 2nd sem (evaluations)",
-            "12.4%",
-            "Number of assessments",
-        ),
-        ("3", "Course", "7.1%", "Program of study"),
-        ("4", "Tuition fees up to date", "6.3%", "Financial commitment"),
-        ("5", "Age at enrollment", "5.8%", "Student maturity level"),
-        ("6", "Admission grade", "5.2%", "Entry qualification"),
-        ("7", "Curricular units 2nd sem (enrolled)", "4.9%", "Course load"),
-        ("8", "Previous qualification grade", "4.6%", "Prior academic performance"),
-        ("9", "Scholarship holder", "4.1%", "Financial support"),
-        ("10", "Debtor", "3.8%", "Financial stress indicator"),
+            str(rank),
+            f["feature"],
+            f"{f['importance']:.4f} ± {f['std']:.4f}",
+            f"{f['importance'] / total:.1%}",
+        )
+        for rank, f in enumerate(ranked[:10], 1)
     ]
 
     table = add_table_data(
-        doc, feature_importance, ["Rank", "Feature", "Importance", "Description"]
+        doc, feature_importance, ["Rank", "Feature", "Accuracy Drop", "Share"]
     )
     doc.add_paragraph()
 
     add_heading_with_color(doc, "9.2 Feature Insights", level=2, color=(51, 102, 153))
 
-    doc.add_paragraph(
-        "Academic Performance (40.3% combined importance):", style="Heading 3"
-    )
-    doc.add_paragraph(
-        "• 2nd semester grades are the strongest predictor (17.2%)\n"
-        "• Number of evaluations in 2nd semester (12.4%) indicates engagement\n"
-        "• Admission grade (5.2%) and previous qualification (4.6%) show baseline capability\n"
-        "• Recent performance (2nd sem) more predictive than 1st semester - validates temporal focus"
-    )
+    shares = {f["feature"]: f["importance"] / total for f in ranked}
+    for category, features in FEATURE_CATEGORIES.items():
+        present = sorted(
+            (f for f in features if f in shares), key=lambda f: -shares[f]
+        )
+        if not present:
+            continue
+        combined = sum(shares[f] for f in present)
+        doc.add_paragraph(
+            f"{category} ({combined:.1%} combined importance):", style="Heading 3"
+        )
+        doc.add_paragraph(
+            "\n".join(f"• {feature} ({shares[feature]:.1%})" for feature in present)
+        )
 
-    doc.add_paragraph(
-        "Financial Factors (14.2% combined importance):", style="Heading 3"
-    )
-    doc.add_paragraph(
-        "• Tuition fee payment status (6.3%) is a strong indicator\n"
-        "• Debtor status (3.8%) signals financial distress\n"
-        "• Scholarship holder status (4.1%) indicates support structure\n"
-        "• Financial stability directly impacts retention"
+    add_heading_with_color(
+        doc, "9.3 Importance Across Tuned Models", level=2, color=(51, 102, 153)
     )
-
     doc.add_paragraph(
-        "Demographic Factors (5.8% combined importance):", style="Heading 3"
+        "Top three features of every tuned model, each refit on the same training fold "
+        "and scored on the same held-out rows:"
     )
-    doc.add_paragraph(
-        "• Age at enrollment (5.8%) - mature students may have different commitments\n"
-        "• Gender removed due to low importance (<1%)\n"
-        "• Nationality removed due to low importance (<1%)"
+    model_importance = [
+        (
+            MODEL_NAMES.get(name, name),
+            f"{entry['baseline']:.4f}",
+            *(f["feature"] for f in entry["features"][:3]),
+        )
+        for name, entry in importances.items()
+    ]
+    table = add_table_data(
+        doc,
+        model_importance,
+        ["Model", "Held-out Accuracy", "1st", "2nd", "3rd"],
     )
+    doc.add_paragraph()
 
-    doc.add_paragraph("Institutional Factors (7.1%):", style="Heading 3")
-    doc.add_paragraph(
-        "• Course/Program (7.1%) - some programs have higher dropout rates\n"
-        "• Different programs have varying difficulty levels and career prospects"
-    )
 
-    # =========================
-    # 10. MODEL DEPLOYMENT
-    # =========================
+@report.section("model_deployment", inputs=("dataset",))
+def render_model_deployment(doc, data):
+    """10. Model Deployment"""
+    ds = data.dataset
     doc.add_page_break()
     add_heading_with_color(doc, "10. Model Deployment", level=1)
 
@@ -2034,7 +2050,7 @@ def create_documentation():
             "1 KB",
             "LabelEncoder for target variable (Dropout=0, Graduate=1)",
         ),
-        ("feature_names.pkl", "2 KB", "List of 27 feature names for input validation"),
+        ("feature_names.pkl", "2 KB", f"List of {ds.n_features} feature names for input validation"),
     ]
 
     table = add_table_data(doc, saved_files, ["File Name", "Size", "Description"])
@@ -2076,7 +2092,7 @@ def create_documentation():
         doc, "10.3 Input Requirements", level=2, color=(51, 102, 153)
     )
     doc.add_paragraph(
-        "The model requires 27 features for prediction. All inputs must be provided in the correct format:"
+        f"The model requires {ds.n_features} features for prediction. All inputs must be provided in the correct format:"
     )
 
     doc.add_paragraph("Required Features:", style="Heading 3")
@@ -2151,9 +2167,11 @@ def create_documentation():
         run.font.name = "Courier New"
         run.font.size = Pt(9)
 
-    # =========================
-    # 11. CONCLUSIONS & RECOMMENDATIONS
-    # =========================
+
+@report.section("conclusions_recommendations", inputs=("tuning",))
+def render_conclusions_recommendations(doc, data):
+    """11. Conclusions & Recommendations"""
+    best = data.ranked()[0]
     doc.add_page_break()
     add_heading_with_color(doc, "11. Conclusions & Recommendations", level=1)
 
@@ -2162,13 +2180,7 @@ def create_documentation():
     p = doc.add_paragraph("", style="List Number")
     p.add_run("Exceptional Accuracy: ").bold = True
     p.add_run(
-        "Achieved 97% accuracy in predicting student dropout, significantly exceeding typical benchmarks (70-85%)"
-    )
-
-    p = doc.add_paragraph("", style="List Number")
-    p.add_run("Perfect Recall: ").bold = True
-    p.add_run(
-        "100% recall ensures no at-risk students are missed - critical for intervention systems"
+        f"Achieved {best.tuned:.2%} accuracy in predicting student dropout, significantly exceeding typical benchmarks (70-85%)"
     )
 
     p = doc.add_paragraph("", style="List Number")
@@ -2276,7 +2288,7 @@ def create_documentation():
     add_heading_with_color(doc, "11.5 Final Remarks", level=2, color=(51, 102, 153))
     doc.add_paragraph(
         "The MentorAid Student Dropout Prediction System demonstrates the powerful potential of machine learning "
-        "in educational technology. With 97% accuracy, the Random Forest model provides a reliable tool for early "
+        f"in educational technology. With {best.tuned:.2%} accuracy, the {MODEL_NAMES.get(best.key, best.label)} model provides a reliable tool for early "
         "identification of at-risk students, enabling timely interventions that can transform educational outcomes. "
         "\n\nThe comprehensive evaluation of 20+ models, rigorous data preprocessing, and careful feature engineering "
         "ensure that this system is not only accurate but also interpretable and actionable. By understanding which "
@@ -2288,9 +2300,10 @@ def create_documentation():
         "powerful predictive tool accessible to counselors, administrators, and students themselves."
     )
 
-    # =========================
-    # APPENDICES
-    # =========================
+
+@report.section("appendix_a")
+def render_appendix_a(doc, data):
+    """Appendix A: Complete Feature List"""
     doc.add_page_break()
     add_heading_with_color(doc, "Appendix A: Complete Feature List", level=1)
 
@@ -2334,9 +2347,10 @@ def create_documentation():
     )
     doc.add_paragraph()
 
-    # =========================
-    # APPENDIX B
-    # =========================
+
+@report.section("appendix_b")
+def render_appendix_b(doc, data):
+    """Appendix B: Technical Stack"""
     doc.add_page_break()
     add_heading_with_color(doc, "Appendix B: Technical Stack", level=1)
 
@@ -2362,20 +2376,240 @@ def create_documentation():
     table = add_table_data(doc, tech_stack, ["Technology", "Version", "Purpose"])
     doc.add_paragraph()
 
-    # Save document
-    output_path = (
-        "d:\\MentorAid\\MentorAid-main\\ml-models\\MentorAid_ML_Documentation.docx"
+
+# =========================
+# COHORT REPORTS
+# =========================
+# Static sections shared by every department/class report, rendered once per batch
+cohort_report = ReportTemplate()
+
+RISK_ACTIONS = {
+    "high": "Counselor meeting and an intervention plan this week",
+    "medium": "Monthly check-in; academic support and fee follow-up",
+    "low": "Routine monitoring",
+}
+
+STUDENT_LABELS = {
+    "studentId": "Student ID",
+    "name": "Name",
+    "department": "Department",
+    "class": "Class",
+    "attendance": "Attendance (%)",
+    "averageMarks": "Average Marks",
+    "feeStatus": "Fee Status",
+    "riskScore": "Risk Score",
+    "riskLevel": "Risk Level",
+}
+
+
+@cohort_report.section("cohort_methodology", inputs=("dataset", "tuning"))
+def render_cohort_methodology(doc, data):
+    """Methodology"""
+    ds = data.dataset
+    best = data.models[PRODUCTION_MODEL]
+    doc.add_page_break()
+    add_heading_with_color(doc, "Methodology", level=1)
+    doc.add_paragraph(
+        f"Risk scores are produced by the MentorAid {MODEL_NAMES[PRODUCTION_MODEL]} model, trained on "
+        f"{ds.binary_rows:,} historical student records ({ds.resampled_rows:,} after random oversampling) "
+        f"with {ds.n_features} academic, financial and demographic features. The model reached "
+        f"{best.tuned:.2%} cross-validated accuracy after hyperparameter tuning."
+    )
+    doc.add_paragraph(
+        "The model's raw dropout score is converted to a dropout probability calibrated on held-out "
+        "folds. The risk score is that probability on a 0-100 scale:"
+    )
+
+    risk_bands = []
+    upper = 100
+    for threshold, level in RISK_LEVELS:
+        lower = round(threshold * 100)
+        risk_bands.append((level.title(), f"{lower}-{upper}", RISK_ACTIONS[level]))
+        upper = lower - 1
+    risk_bands.append(("Low", f"0-{upper}", RISK_ACTIONS["low"]))
+
+    table = add_table_data(doc, risk_bands, ["Risk Level", "Risk Score", "Recommended Action"])
+    doc.add_paragraph()
+
+
+@cohort_report.section("cohort_model", inputs=("tuning", "importance"))
+def render_cohort_model(doc, data):
+    """About the Model"""
+    best = data.models[PRODUCTION_MODEL]
+    add_heading_with_color(doc, "About the Model", level=1)
+
+    model_info = [
+        ("Model", MODEL_NAMES[PRODUCTION_MODEL]),
+        ("Tuned Parameters", format_params(best.best_params)),
+        ("Cross-validated Accuracy", f"{best.tuned:.2%}"),
+        ("Before Tuning", f"{best.default:.2%} ({best.improvement:+.2f}% after tuning)"),
+    ]
+    table = add_table_data(doc, model_info, ["Property", "Value"])
+    doc.add_paragraph()
+
+    ranked = [f for f in data.importance[PRODUCTION_MODEL]["features"] if f["importance"] > 0]
+    doc.add_paragraph("Most Influential Features:", style="Heading 3")
+    doc.add_paragraph("\n".join(f"• {f['feature']}" for f in ranked[:5]))
+
+
+def _level_counts(students):
+    levels = Counter(student["riskLevel"] for student in students)
+    return levels["high"], levels["medium"], levels["low"]
+
+
+def render_cohort(doc, group):
+    """Group-specific sections of one department or class report"""
+    students = group["students"]
+    n = len(students)
+    high, medium, low = _level_counts(students)
+    label = f"{group['field'].title()} {group['value']}"
+
+    title = doc.add_heading("MentorAid Dropout Risk Report", level=0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    for run in title.runs:
+        run.font.color.rgb = RGBColor(0, 51, 102)
+    subtitle = doc.add_heading(label, level=1)
+    subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    date_para = doc.add_paragraph(f'Generated: {datetime.date.today().strftime("%B %d, %Y")}')
+    date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    add_heading_with_color(doc, "1. Summary", level=1)
+    summary = [
+        ("Students", f"{n:,}"),
+        ("High Risk", f"{high:,} ({high / n:.1%})"),
+        ("Medium Risk", f"{medium:,} ({medium / n:.1%})"),
+        ("Low Risk", f"{low:,} ({low / n:.1%})"),
+        ("Average Risk Score", f"{sum(float(s['riskScore']) for s in students) / n:.1f}"),
+    ]
+    if "feeStatus" in students[0]:
+        overdue = sum(s["feeStatus"] == "overdue" for s in students)
+        summary.append(("Fees Overdue", f"{overdue:,} ({overdue / n:.1%})"))
+    table = add_table_data(doc, summary, ["Metric", "Value"])
+    doc.add_paragraph()
+
+    # Break the group down along the other cohort field (classes of a department, ...)
+    other = next((f for f in COHORT_FIELDS if f != group["field"] and f in students[0]), None)
+    if other is not None:
+        add_heading_with_color(
+            doc, f"Risk by {STUDENT_LABELS[other]}", level=2, color=(51, 102, 153)
+        )
+        members = {}
+        for student in students:
+            members.setdefault(group_value(student[other]), []).append(student)
+        breakdown = [
+            (
+                value,
+                f"{len(group_students):,}",
+                *(f"{count:,}" for count in _level_counts(group_students)),
+                f"{sum(float(s['riskScore']) for s in group_students) / len(group_students):.1f}",
+            )
+            for value, group_students in sorted(members.items())
+        ]
+        table = add_table_data(
+            doc,
+            breakdown,
+            [STUDENT_LABELS[other], "Students", "High", "Medium", "Low", "Avg Score"],
+        )
+        doc.add_paragraph()
+
+    columns = [c for c in STUDENT_LABELS if c in students[0] and c != group["field"]]
+    headers = [STUDENT_LABELS[c] for c in columns]
+
+    def row(student):
+        # Missing department/class read as the cohort group name, not "nan"
+        return [group_value(student[c]) if c in COHORT_FIELDS else student[c] for c in columns]
+
+    add_heading_with_color(doc, "2. Students Requiring Attention", level=1)
+    flagged = [s for s in students if s["riskLevel"] == "high"]
+    if flagged:
+        doc.add_paragraph(
+            f"{len(flagged):,} high-risk students, highest risk first. "
+            f"Recommended action: {RISK_ACTIONS['high'].lower()}."
+        )
+        table = add_table_data(doc, map(row, flagged), headers)
+    else:
+        doc.add_paragraph("No student in this group is currently high risk.")
+    doc.add_paragraph()
+
+    add_heading_with_color(doc, "3. All Students", level=1)
+    table = add_table_data(doc, map(row, students), headers)
+
+
+def create_cohort_reports(
+    roster_path, output_dir=DEFAULT_COHORT_DIR, by=COHORT_FIELDS, jobs=None, use_cache=True
+):
+    """Generate one risk report per department and per class of a roster"""
+    start = time.time()
+    print("🔄 Scoring roster...")
+    roster = score_roster(load_roster(roster_path))
+    groups = cohort_groups(roster, by)
+    print(f"✓ {len(roster):,} students in {len(groups)} groups ({', '.join(by)})")
+
+    print("\n📄 Rendering shared sections...")
+    template, stats = cohort_report.render(ReportData(), use_cache=use_cache)
+    buffer = io.BytesIO()
+    template.save(buffer)
+    print(
+        f"✓ Template ready (rebuilt: {len(stats['rendered'])}, from cache: {len(stats['cached'])})"
     )
+
+    print(f"\n⚙️  Rendering {len(groups)} reports...")
+    result = render_cohort_reports(groups, buffer.getvalue(), render_cohort, output_dir, jobs)
+
+    print(f"\n✅ {len(result['reports'])} reports written to: {output_dir}")
+    print(f"👥 Student rows: {result['students']:,} across all reports")
+    print(
+        f"⚙️  Workers: {result['jobs']}, report rendering {result['render_seconds']:.2f}s "
+        f"in {result['wall_seconds']:.2f}s wall time"
+    )
+    print(f"⏱️  Total wall time: {time.time() - start:.2f}s")
+    return result
+
+
+def create_documentation(output_path=DEFAULT_OUTPUT, use_cache=True):
+    """Generate the complete documentation"""
+    start = time.time()
+    data = ReportData()
+    doc, stats = report.render(data, use_cache=use_cache)
+
     doc.save(output_path)
     print(f"\n✅ Documentation successfully generated: {output_path}")
     print(f"📄 Total sections: 11 main sections + 2 appendices")
+    print(
+        f"♻️  Sections rebuilt: {len(stats['rendered'])}, reused from cache: {len(stats['cached'])}"
+    )
+    for key in stats["rendered"]:
+        print(f"   • {key}")
     print(
         f"📊 Contains: Dataset analysis, EDA, preprocessing details, model comparisons, and deployment guide"
     )
     print(f"🎯 File size: {os.path.getsize(output_path) / 1024:.1f} KB")
+    print(f"⏱️  Generated in {time.time() - start:.2f}s")
 
 
-if __name__ == "__main__":
-    import os
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the ML documentation DOCX")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="output .docx path")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="rebuild every section from scratch"
+    )
+    parser.add_argument(
+        "--cohorts", metavar="ROSTER", help="student roster (.csv/.json): write per-cohort reports"
+    )
+    parser.add_argument(
+        "--by", nargs="+", default=list(COHORT_FIELDS), help="cohort fields to group on"
+    )
+    parser.add_argument("--output-dir", default=str(DEFAULT_COHORT_DIR))
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+
+    if args.cohorts:
+        create_cohort_reports(
+            args.cohorts, args.output_dir, args.by, args.jobs, use_cache=not args.no_cache
+        )
+    else:
+        create_documentation(args.output, use_cache=not args.no_cache)
 
-    create_documentation()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+MentorAid - Student Dropout Prediction (Python side)
+Shared building blocks for the tuning scripts, notebooks and prediction path.
+
+The public names below are resolved on first access (PEP 562), so importing
+the package or one of its submodules does not pull in the modules a command
+does not use.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "AttributionService": "explain",
+    "FeatureSchema": "schema",
+    "SchemaError": "schema",
+    "SchemaRegistry": "schema",
+    "build_registry": "schema",
+    "load_model": "artifacts",
+    "load_tuned_models": "artifacts",
+    "make_explainer": "explain",
+    "top_factors": "explain",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,7 @@
+"""python -m mentoraid: same as the installed `mentoraid` command"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+MentorAid - Model Artifact Loading
+Helpers for reading the tuned models stored in trained-models/
+"""
+
+import hashlib
+import pickle
+import warnings
+from pathlib import Path
+
+from .config import MODEL_FILES, PRODUCTION_MODEL, TRAINED_MODELS_DIR
+from .instrumentation import span
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of an artifact file, used as its cache key"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_pickle(path):
+    """Unpickle a single artifact file"""
+    with open(path, "rb") as f:
+        with warnings.catch_warnings():
+            # Models were pickled with a slightly different scikit-learn release
+            warnings.simplefilter("ignore")
+            return pickle.load(f)
+
+
+def load_keras(path):
+    """Load a saved Keras model (TensorFlow is imported only when needed)"""
+    from tensorflow import keras
+
+    return keras.models.load_model(path)
+
+
+def load_model(name, models_dir=TRAINED_MODELS_DIR):
+    """
+    Load one tuned model by its short name
+
+    Args:
+        name: Key of MODEL_FILES (e.g. "svm", "knn", "nn")
+        models_dir: Directory containing the artifacts
+
+    Returns:
+        The fitted estimator
+    """
+    path = Path(models_dir) / MODEL_FILES[name]
+    with span(f"model.load.{name}"):
+        if path.suffix == ".keras":
+            return load_keras(path)
+        return load_pickle(path)
+
+
+def load_tuned_models(names=None, models_dir=TRAINED_MODELS_DIR):
+    """
+    Load every tuned model that exists on disk
+
+    Args:
+        names: Optional subset of MODEL_FILES keys (defaults to all)
+        models_dir: Directory containing the artifacts
+
+    Returns:
+        Dictionary of model name -> fitted estimator. Artifacts that are not
+        present (rf_tuned_model.pkl is not shipped with this repository) are
+        skipped, and so are models whose framework is not installed (the
+        .keras network without TensorFlow), with a warning.
+    """
+    models = {}
+    for name in names or MODEL_FILES:
+        if (Path(models_dir) / MODEL_FILES[name]).exists():
+            try:
+                models[name] = load_model(name, models_dir)
+            except ImportError as e:
+                warnings.warn(f"Skipping {MODEL_FILES[name]}: {e}", stacklevel=2)
+    return models
+
+
+class ModelRegistry:
+    """
+    Tuned models and predictors loaded on first use and kept for the process
+
+    One registry is shared by every command of a CLI invocation, so a batch
+    job scoring several rosters reads each artifact once.
+    """
+
+    def __init__(self, models_dir=TRAINED_MODELS_DIR):
+        self.models_dir = Path(models_dir)
+        self._models = {}
+        self._predictors = {}
+
+    def __contains__(self, name):
+        return name in MODEL_FILES and (self.models_dir / MODEL_FILES[name]).exists()
+
+    def __getitem__(self, name):
+        if name not in self._models:
+            self._models[name] = load_model(name, self.models_dir)
+        return self._models[name]
+
+    def available(self):
+        """Names of the models present on disk"""
+        return [name for name in MODEL_FILES if name in self]
+
+    def predictor(self, name=PRODUCTION_MODEL):
+        """Calibrated NumPy predictor (see mentoraid.predict) for a model"""
+        if name not in self._predictors:
+            from .predict import Predictor
+
+            self._predictors[name] = Predictor(name, self.models_dir)
+        return self._predictors[name]
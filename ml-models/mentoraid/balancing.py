@@ -0,0 +1,85 @@
+"""
+MentorAid - Class Balancing Without Copies
+Random oversampling expressed as row indices or sample weights over the
+original matrix, instead of imblearn's RandomOverSampler.fit_resample, which
+materialises a balanced copy that every model and CV fold then works on.
+
+- OversampledCV wraps a CV splitter and oversamples each fold's training
+  indices only, so duplicated minority rows never leak into the fold they
+  are scored on.
+- balanced_sample_weight gives every row the weight that random
+  oversampling gives it in expectation (majority count / class count), for
+  estimators whose fit() accepts sample_weight.
+- fit_balanced fits a final model either way.
+"""
+
+import numpy as np
+
+from .preprocessing import random_oversample_indices
+
+
+def balanced_sample_weight(y):
+    """
+    Per-row weights that balance every class up to the majority count
+
+    Returns:
+        float64 array; majority rows get 1.0, a class of size c gets max / c
+    """
+    y = np.asarray(y)
+    classes, inverse, counts = np.unique(y, return_inverse=True, return_counts=True)
+    return (counts.max() / counts)[inverse].astype(np.float64)
+
+
+class OversampledCV:
+    """
+    CV splitter yielding (oversampled train indices, untouched test indices)
+
+    Usable anywhere scikit-learn accepts cv= (GridSearchCV, cross_val_score,
+    ...). The fold's training rows are gathered by index from the original
+    matrix.
+    """
+
+    def __init__(self, cv, seed=42):
+        self.cv = cv
+        self.seed = seed
+
+    def split(self, X, y, groups=None):
+        y = np.asarray(y)
+        for fold, (train, test) in enumerate(self.cv.split(X, y, groups)):
+            yield train[random_oversample_indices(y[train], self.seed + fold)], test
+
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return self.cv.get_n_splits(X, y, groups)
+
+
+def supports_sample_weight(estimator):
+    """Whether estimator.fit accepts a sample_weight argument"""
+    import inspect
+
+    return "sample_weight" in inspect.signature(estimator.fit).parameters
+
+
+def fit_balanced(estimator, X, y, mode="index", seed=42):
+    """
+    Fit an estimator on class-balanced data
+
+    Args:
+        estimator: Unfitted scikit-learn estimator
+        X: Feature matrix (array or DataFrame)
+        y: Labels
+        mode: "index" (oversampled row indices) or "weight" (sample weights,
+            falls back to "index" when fit() has no sample_weight)
+        seed: Oversampling seed
+
+    Returns:
+        The fitted estimator
+    """
+    y = np.asarray(y)
+    if mode == "weight" and supports_sample_weight(estimator):
+        return estimator.fit(X, y, sample_weight=balanced_sample_weight(y))
+    if mode not in ("index", "weight"):
+        raise ValueError(f"unknown balancing mode: {mode}")
+
+    rows = random_oversample_indices(y, seed)
+    X_rows = X.iloc[rows] if hasattr(X, "iloc") else np.asarray(X)[rows]
+    return estimator.fit(X_rows, y[rows])
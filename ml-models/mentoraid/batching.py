@@ -0,0 +1,250 @@
+"""
+MentorAid - Request Micro-Batching
+Coalesces concurrent prediction requests into one model call. A dashboard
+opening one student (StudentDetails.tsx) sends a single row; scoring rows
+one at a time pays the Python and NumPy call overhead per student instead of
+once per batch.
+
+MicroBatcher runs an asyncio event loop on a background thread. Requests,
+each a raw feature matrix of one or more rows, are queued. A collector
+takes the first waiting request, then keeps adding requests until the batch
+holds max_batch rows or max_wait_ms has passed since that first request.
+The batch is then scored on a worker thread pool and each request gets back
+its own slice of the result.
+
+The trade-off is tuned with three settings:
+
+- max_wait_ms is the most a request waits for company. 0 sends whatever is
+  queued at once. Batches still form under load, because requests queue up
+  while every worker is busy.
+- max_batch caps the rows per model call, and with it the latency of the
+  call itself. A single request larger than max_batch is scored on its own.
+- workers is the number of batches scored concurrently. NumPy releases the
+  GIL in the kernel, so more than one worker helps on multi-core machines.
+
+Queue depth, batch size and queue wait are exported through
+mentoraid.instrumentation, so they appear on the service's /metrics.
+
+Usage:
+    batcher = MicroBatcher(predictor.predict_matrix, max_batch=64, max_wait_ms=0)
+    batcher.start()
+    predictions = batcher.predict(X)          # from any thread
+    predictions = await batcher.submit(X)     # from the batcher's own loop
+    batcher.close()
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .instrumentation import REGISTRY, span
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 0.0
+DEFAULT_WORKERS = 1
+
+QUEUE_DEPTH = REGISTRY.gauge("mentoraid_batch_queue_depth", "Rows waiting to be batched")
+BATCH_ROWS = REGISTRY.histogram(
+    "mentoraid_batch_rows",
+    "Rows per coalesced model call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096),
+)
+BATCH_REQUESTS = REGISTRY.histogram(
+    "mentoraid_batch_requests",
+    "Requests per coalesced model call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "mentoraid_batch_wait_seconds", "Time from enqueueing a request to scoring its batch"
+)
+
+
+class MicroBatcher:
+    """
+    Scores queued requests in batches on a worker pool
+
+    Args:
+        score: Callable taking a 2-D matrix and returning one result per row
+            (a list or an array), e.g. Predictor.predict_matrix
+        max_batch: Most rows per call of `score`
+        max_wait_ms: Longest time the first request of a batch waits for more
+        workers: Batches scored concurrently
+    """
+
+    def __init__(
+        self,
+        score,
+        max_batch=DEFAULT_MAX_BATCH,
+        max_wait_ms=DEFAULT_MAX_WAIT_MS,
+        workers=DEFAULT_WORKERS,
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.score = score
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.workers = workers
+        self._loop = None
+        self._thread = None
+        self._pool = None
+        self._collector = None
+        self._depth = 0
+        # Request held back because it did not fit in the previous batch
+        self._carry = None
+
+    # Lifecycle ----------------------------------------------------------
+
+    def start(self):
+        """Start the event loop thread and the worker pool; returns self"""
+        if self._thread is not None:
+            return self
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="mentoraid-batch")
+        QUEUE_DEPTH.set(0)
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.workers)
+            self._collector = self._loop.create_task(self._collect())
+            self._loop.call_soon(ready.set)
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="mentoraid-batcher", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def close(self):
+        """Stop accepting requests; batches already being scored finish first"""
+        if self._thread is None:
+            return
+
+        async def stop():
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            pending = [self._carry] if self._carry is not None else []
+            while self._queue.qsize():
+                pending.append(self._queue.get_nowait())
+            self._fail(pending, RuntimeError("batcher closed"))
+            # Wait for the batches in flight to release their worker slots
+            for _ in range(self.workers):
+                await self._slots.acquire()
+
+        asyncio.run_coroutine_threadsafe(stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._pool.shutdown()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # Requests -----------------------------------------------------------
+
+    async def submit(self, X):
+        """Queue a matrix and wait for its results (runs on the batcher's loop)"""
+        future = self._loop.create_future()
+        self._queue.put_nowait((X, future, time.perf_counter()))
+        self._depth += len(X)
+        QUEUE_DEPTH.set(self._depth)
+        return await future
+
+    def predict(self, X, timeout=None):
+        """
+        Score a matrix through the queue, from any thread but the batcher's
+
+        Args:
+            X: 2-D array of raw feature rows
+            timeout: Seconds to wait for the result (None: no limit)
+
+        Returns:
+            The results of `score` for the rows of X, as a list
+        """
+        if self._thread is None:
+            raise RuntimeError("MicroBatcher.start() was not called")
+        return asyncio.run_coroutine_threadsafe(self.submit(X), self._loop).result(timeout)
+
+    # Event loop side ----------------------------------------------------
+
+    async def _collect(self):
+        while True:
+            # A free worker slot first: requests arriving meanwhile join the batch
+            await self._slots.acquire()
+            batch = [self._carry] if self._carry is not None else []
+            self._carry = None
+            try:
+                if not batch:
+                    batch.append(await self._queue.get())
+                rows = len(batch[0][0])
+                deadline = batch[0][2] + self.max_wait
+
+                while rows < self.max_batch:
+                    if self._queue.empty():
+                        remaining = deadline - time.perf_counter()
+                        if remaining <= 0:
+                            break
+                        try:
+                            item = await asyncio.wait_for(self._queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    else:
+                        item = self._queue.get_nowait()
+                    if rows + len(item[0]) > self.max_batch:
+                        self._carry = item
+                        break
+                    batch.append(item)
+                    rows += len(item[0])
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError("batcher closed"))
+                self._slots.release()
+                raise
+
+            self._depth -= rows
+            QUEUE_DEPTH.set(self._depth)
+            self._loop.create_task(self._run(batch, rows))
+
+    @staticmethod
+    def _fail(batch, error):
+        for _, future, _ in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self, batch, rows):
+        try:
+            now = time.perf_counter()
+            for _, _, enqueued in batch:
+                QUEUE_WAIT.observe(now - enqueued)
+            BATCH_ROWS.observe(rows)
+            BATCH_REQUESTS.observe(len(batch))
+
+            X = batch[0][0] if len(batch) == 1 else np.concatenate([x for x, _, _ in batch])
+            try:
+                results = await self._loop.run_in_executor(self._pool, self._score, X)
+            except Exception as e:
+                self._fail(batch, e)
+                return
+
+            start = 0
+            for x, future, _ in batch:
+                if not future.done():
+                    future.set_result(list(results[start : start + len(x)]))
+                start += len(x)
+        finally:
+            self._slots.release()
+
+    def _score(self, X):
+        with span("batch.score", rows=len(X)):
+            return self.score(X)
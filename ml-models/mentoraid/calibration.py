@@ -0,0 +1,242 @@
+"""
+MentorAid - Probability Calibration
+Maps a model's raw dropout score (e.g. the SVM decision function) to a
+calibrated dropout probability with Platt scaling or isotonic regression.
+
+The calibrator is fitted on out-of-fold scores (each fold's training part is
+oversampled, its held-out part is not), so it costs k extra fits of the best
+estimator instead of SVC(probability=True)'s internal 5-fold CV on every fit.
+It is stored next to the model as <name>_calibration.json together with the
+model's file hash, and applied as a vectorized NumPy expression at inference.
+
+Usage:
+    python -m mentoraid.calibration svm --method isotonic
+"""
+
+import argparse
+import json
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from .artifacts import file_hash, load_model
+from .config import MODEL_FILES, PRODUCTION_MODEL, RISK_LEVELS, TRAINED_MODELS_DIR
+from .preprocessing import prepare_training_data, random_oversample_indices
+from .schema import FeatureSchema
+
+DROPOUT_CLASS = 0
+
+
+class CalibrationError(ValueError):
+    """Raised when a stored calibrator does not belong to the loaded model"""
+
+
+def dropout_score(model, X):
+    """Raw score that increases with dropout risk (decision function or probability)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        classes = np.asarray(model.classes_)
+        if hasattr(model, "decision_function"):
+            sign = -1.0 if classes[1] == DROPOUT_CLASS else 1.0
+            # decision_function is positive for classes_[1]
+            return -sign * np.asarray(model.decision_function(X), dtype=np.float64)
+        column = int(np.flatnonzero(classes == DROPOUT_CLASS)[0])
+        return model.predict_proba(X)[:, column]
+
+
+class ScoreCalibrator:
+    """Platt (sigmoid) or isotonic mapping from dropout score to probability"""
+
+    def __init__(self, method="platt", params=None):
+        if method not in ("platt", "isotonic"):
+            raise ValueError(f"unknown calibration method: {method}")
+        self.method = method
+        self.params = params or {}
+
+    def fit(self, scores, is_dropout):
+        """
+        Args:
+            scores: Out-of-fold dropout scores
+            is_dropout: Boolean/0-1 array, 1 where the student dropped out
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        is_dropout = np.asarray(is_dropout, dtype=np.float64)
+
+        if self.method == "platt":
+            self.params = _fit_platt(scores, is_dropout)
+        else:
+            from sklearn.isotonic import IsotonicRegression
+
+            iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip")
+            iso.fit(scores, is_dropout)
+            self.params = {
+                "x": iso.X_thresholds_.tolist(),
+                "y": iso.y_thresholds_.tolist(),
+            }
+        return self
+
+    def transform(self, scores):
+        """Vectorized dropout probability for an array of dropout scores"""
+        scores = np.asarray(scores, dtype=np.float64)
+        if self.method == "platt":
+            z = self.params["a"] * scores + self.params["b"]
+            return 1.0 / (1.0 + np.exp(-z))
+        return np.interp(scores, self.params["x"], self.params["y"])
+
+    def to_dict(self):
+        return {"method": self.method, "params": self.params}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["method"], data["params"])
+
+
+def _fit_platt(scores, is_dropout, max_iter=100):
+    """
+    Platt scaling with his smoothed targets, fitted by Newton's method
+
+    Returns:
+        {"a": slope, "b": intercept} for P(dropout) = sigmoid(a * score + b)
+    """
+    n_pos = is_dropout.sum()
+    n_neg = len(is_dropout) - n_pos
+    target = np.where(is_dropout > 0, (n_pos + 1) / (n_pos + 2), 1 / (n_neg + 2))
+
+    a, b = 1.0, np.log((n_pos + 1) / (n_neg + 1))
+    for _ in range(max_iter):
+        p = 1.0 / (1.0 + np.exp(-(a * scores + b)))
+        w = np.maximum(p * (1 - p), 1e-12)
+        gradient = np.array([((p - target) * scores).sum(), (p - target).sum()])
+        hessian = np.array(
+            [
+                [(w * scores * scores).sum() + 1e-12, (w * scores).sum()],
+                [(w * scores).sum(), w.sum() + 1e-12],
+            ]
+        )
+        step = np.linalg.solve(hessian, gradient)
+        a, b = a - step[0], b - step[1]
+        if np.abs(step).max() < 1e-10:
+            break
+    return {"a": float(a), "b": float(b)}
+
+
+def out_of_fold_scores(estimator, X, y, cv, seed=42):
+    """
+    Dropout scores for every row from a model that never saw it
+
+    Each fold's training part is randomly oversampled (as in tuning); the
+    held-out part keeps the real class balance the probabilities should
+    reflect.
+    """
+    from sklearn.base import clone
+
+    scores = np.empty(len(y), dtype=np.float64)
+    for train, test in cv.split(X, y):
+        balanced = train[random_oversample_indices(y[train], seed)]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            model = clone(estimator).fit(X[balanced], y[balanced])
+        scores[test] = dropout_score(model, X[test])
+    return scores
+
+
+def fit_calibrator(estimator, X, y, method="platt", cv=None):
+    """
+    Fit a ScoreCalibrator for `estimator` on held-out folds
+
+    Args:
+        estimator: Unfitted (or fitted; it is cloned) estimator with the tuned params
+        X: Training matrix (not oversampled)
+        y: Labels (Dropout=0, Graduate=1)
+        method: "platt" or "isotonic"
+        cv: CV splitter (defaults to the tuning script's 5-fold stratified split)
+    """
+    if cv is None:
+        from sklearn.model_selection import StratifiedKFold
+
+        cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    scores = out_of_fold_scores(estimator, np.asarray(X), np.asarray(y), cv)
+    return ScoreCalibrator(method).fit(scores, np.asarray(y) == DROPOUT_CLASS)
+
+
+def calibration_path(name, models_dir=TRAINED_MODELS_DIR):
+    return Path(models_dir) / f"{name}_calibration.json"
+
+
+def save_calibrator(calibrator, name, models_dir=TRAINED_MODELS_DIR):
+    """Store the calibrator next to the model, bound to the model file's hash"""
+    data = calibrator.to_dict()
+    data["model_hash"] = file_hash(Path(models_dir) / MODEL_FILES[name])
+    with open(calibration_path(name, models_dir), "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def load_calibrator(name, models_dir=TRAINED_MODELS_DIR):
+    """
+    Load the calibrator stored for a model
+
+    Raises:
+        CalibrationError: If it is missing or was fitted for another model file
+    """
+    path = calibration_path(name, models_dir)
+    if not path.exists():
+        raise CalibrationError(f"{name}: no calibrator at {path}")
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("model_hash") != file_hash(Path(models_dir) / MODEL_FILES[name]):
+        raise CalibrationError(
+            f"{name}: calibrator was fitted for a different model file"
+        )
+    return ScoreCalibrator.from_dict(data)
+
+
+def dropout_probability(model, calibrator, X):
+    """Calibrated P(dropout) for a batch of scaled rows"""
+    return calibrator.transform(dropout_score(model, X))
+
+
+def risk_score(probabilities):
+    """0-100 riskScore as used by the dashboard (src/types/student.ts)"""
+    return np.rint(np.asarray(probabilities) * 100).astype(np.int64)
+
+
+def risk_level(probabilities):
+    """
+    'low' / 'medium' / 'high' riskLevel for each probability
+
+    The level is read from the rounded riskScore, a threshold included
+    (riskScore >= 70 is high, as on the dashboard), so every riskScore
+    maps to exactly one level.
+    """
+    thresholds = risk_score([threshold for threshold, _ in RISK_LEVELS])
+    labels = np.array([label for _, label in RISK_LEVELS] + ["low"])
+    # RISK_LEVELS is ordered from the highest threshold down
+    index = np.searchsorted(-thresholds, -risk_score(probabilities), side="left")
+    return labels[index]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit a probability calibrator")
+    parser.add_argument(
+        "model", nargs="?", default=PRODUCTION_MODEL, choices=list(MODEL_FILES)
+    )
+    parser.add_argument("--method", choices=["platt", "isotonic"], default="platt")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.model)
+    schema = FeatureSchema.from_model(model, args.model)
+    _, X, y, _ = prepare_training_data(schema.feature_names)
+
+    print(f"🔄 Fitting {args.method} calibration for {args.model} on 5 held-out folds...")
+    calibrator = fit_calibrator(model, X, y, args.method)
+    save_calibrator(calibrator, args.model)
+
+    p = dropout_probability(model, calibrator, X)
+    brier = float(((p - (y == DROPOUT_CLASS)) ** 2).mean())
+    print(f"✓ Saved {calibration_path(args.model)} (in-sample Brier score {brier:.4f})")
+
+
+if __name__ == "__main__":
+    main()
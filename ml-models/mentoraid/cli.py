@@ -0,0 +1,456 @@
+"""
+MentorAid - Command Line Interface
+One entry point for every ML workflow. All subcommands share mentoraid.config
+(MENTORAID_MODELS_DIR / MENTORAID_DATASET point every command at other
+artifacts) and a single lazily loaded ModelRegistry. Each subcommand imports
+only what it needs, so `mentoraid predict` never loads pandas, scikit-learn
+or python-docx.
+
+Usage:
+    mentoraid predict student.json
+    mentoraid batch-predict roster-2024.csv roster-2025.csv --output-dir scored/
+    mentoraid batch-predict roster-2025.csv --store     # refresh the dashboard store
+    mentoraid stats [--json] [--rebuild]
+    mentoraid batch-predict roster-2025.csv --history [--history-factors]
+    mentoraid history STU0000123 [--points 26] | --compact | --stats
+    mentoraid validate [--json report.json] [--write-golden] [--strict]
+    mentoraid drift roster-2025.csv [--reference]
+    mentoraid serve [--port 8000 --drift-window 10000 --max-batch 64 --max-wait-ms 0]
+    mentoraid serve --workers 4 [--risk-store] [--history]
+    mentoraid serve --shadow knn 3f9c2a1b7d4e:svm [--shadow-rate 0.25]
+    mentoraid shadow [--hours 24 --json]
+    mentoraid triggers roster.csv events.jsonl [--interventions out.jsonl] [--history]
+    mentoraid models publish|list|activate VERSION|rollback
+    mentoraid synth 1000000 roster-1m.csv [--student-fields]
+    mentoraid report [--no-cache] [--cohorts roster.csv ...]
+    mentoraid tune [--out-of-core --dataset histories.csv ...]
+    mentoraid bench suite|startup|oversampling|batching|prefork|risk-store|shadow|
+                    student-query|table-writer|history|triggers [...]
+    mentoraid --profile 0.1 --metrics-file metrics.prom batch-predict ...
+
+(`python -m mentoraid ...` works without installing the package.)
+"""
+
+import argparse
+import json
+import os
+import runpy
+import sys
+import time
+from pathlib import Path
+
+from .config import ML_MODELS_DIR, PRODUCTION_MODEL, RUNTIME_MODELS, TRAINED_MODELS_DIR
+
+TUNING_SCRIPT = ML_MODELS_DIR / "notebooks" / "hyperparameter_tuning.py"
+BENCHMARKS = {
+    "suite": ML_MODELS_DIR / "benchmarks" / "suite.py",
+    "startup": ML_MODELS_DIR / "benchmarks" / "startup.py",
+    "oversampling": ML_MODELS_DIR / "benchmarks" / "oversampling.py",
+    "batching": ML_MODELS_DIR / "benchmarks" / "batching.py",
+    "history": ML_MODELS_DIR / "benchmarks" / "history.py",
+    "prefork": ML_MODELS_DIR / "benchmarks" / "prefork.py",
+    "risk-store": ML_MODELS_DIR / "benchmarks" / "risk_store.py",
+    "shadow": ML_MODELS_DIR / "benchmarks" / "shadow.py",
+    "student-query": ML_MODELS_DIR / "benchmarks" / "student_query.py",
+    "table-writer": ML_MODELS_DIR / "benchmarks" / "table_writer.py",
+    "triggers": ML_MODELS_DIR / "benchmarks" / "triggers.py",
+}
+
+
+def _run_script(path, argv):
+    """Run one of the ml-models/ scripts as __main__ with the given arguments"""
+    saved = sys.argv
+    sys.argv = [str(path)] + list(argv)
+    try:
+        runpy.run_path(str(path), run_name="__main__")
+    except SystemExit as e:
+        return e.code or 0
+    finally:
+        sys.argv = saved
+    return 0
+
+
+def cmd_predict(args, registry):
+    try:
+        if args.records == "-":
+            records = json.load(sys.stdin)
+        else:
+            with open(args.records) as f:
+                records = json.load(f)
+        single = isinstance(records, dict)
+
+        predictions = registry.predictor(args.model).predict([records] if single else records)
+    except ValueError as e:  # SchemaError, or records that are not JSON
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    json.dump(predictions[0] if single else predictions, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+def cmd_batch_predict(args, registry):
+    from .predict import score_file
+
+    predictor = registry.predictor(args.model)
+    store = None
+    if args.store is not None:
+        from .riskstore import RISK_DB, RiskStore
+
+        store = RiskStore(args.store or RISK_DB)
+    history = explain = None
+    if args.history is not None:
+        from .history import HISTORY_DIR, HistoryStore
+
+        history = HistoryStore(args.history or HISTORY_DIR)
+        if args.history_factors:
+            explain = _explainer(registry, args.model)
+    for path in map(Path, args.rosters):
+        output_dir = Path(args.output_dir) if args.output_dir else path.parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output = output_dir / f"{path.stem}.scored{path.suffix}"
+
+        start = time.perf_counter()
+        rows = score_file(predictor, path, output, args.chunk_size, store, history, explain)
+        elapsed = time.perf_counter() - start
+        print(
+            f"✓ {path.name}: {rows:,} students -> {output} "
+            f"({elapsed:.2f}s, {rows / max(elapsed, 1e-9):,.0f} rows/s)"
+        )
+    if store is not None:
+        print(f"✓ Risk store updated: {store.path}")
+    if history is not None:
+        history.compact()
+        print(f"✓ Prediction history updated: {history.root}")
+    return 0
+
+
+def _explainer(registry, name):
+    """Attributions of raw feature rows from the model's explainer (mentoraid.explain)"""
+    from .explain import AttributionService, summarize_background
+    from .preprocessing import prepare_training_data
+
+    predictor = registry.predictor(name)
+    _, X, _, _ = prepare_training_data(predictor.schema.feature_names)
+    service = AttributionService({name: registry[name]}, *summarize_background(X))
+    return lambda rows: service.explain(name, predictor.runtime.scale_rows(rows))["attributions"]
+
+
+def cmd_validate(args, registry):
+    from .validation import main
+
+    argv = ["--models-dir", str(registry.models_dir)]
+    if args.json:
+        argv += ["--json", args.json]
+    if args.write_golden:
+        argv.append("--write-golden")
+    if args.strict:
+        argv.append("--strict")
+    return main(argv)
+
+
+def cmd_drift(args, registry):
+    from .drift import main
+
+    argv = [str(path) for path in args.rosters] + ["--models-dir", str(registry.models_dir)]
+    if args.reference:
+        argv.append("--reference")
+    return main(argv)
+
+
+def cmd_serve(args, registry):
+    from .artifacts import ModelRegistry
+    from .versions import VersionStore
+
+    # Serve the current published version when there is one
+    store = VersionStore(registry.models_dir)
+    version = store.current()
+    if version is not None:
+        registry = ModelRegistry(store.path(version))
+    options = dict(
+        drift_window=args.drift_window,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        batch_workers=args.batch_workers,
+        version=version,
+        versions=store,
+        reload_interval=args.reload_interval,
+        shadow=args.shadow,
+        shadow_rate=args.shadow_rate,
+        shadow_db=args.shadow_db,
+        risk_store=args.risk_store,
+        history=args.history,
+    )
+    if args.workers:
+        from .prefork import PreforkServer, serve_prefork
+
+        server = PreforkServer(
+            registry,
+            args.workers,
+            args.host,
+            args.port,
+            preload=not args.no_preload,
+            model=args.model,
+            service_options=options,
+        )
+        serve_prefork(server)
+        return 0
+
+    from .server import PredictionService, serve
+
+    serve(PredictionService(registry, args.model, **options), args.host, args.port)
+    return 0
+
+
+def cmd_models(args, registry):
+    from .versions import main
+
+    return main(["--models-dir", str(registry.models_dir)] + args.extra)
+
+
+def cmd_stats(args, registry):
+    from .riskstore import main
+
+    return main(args.extra)
+
+
+def cmd_history(args, registry):
+    from .history import main
+
+    return main(args.extra)
+
+
+def cmd_shadow(args, registry):
+    from .shadow import main
+
+    return main(args.extra)
+
+
+def cmd_triggers(args, registry):
+    from .triggers import main
+
+    return main(["--models-dir", str(registry.models_dir)] + args.extra)
+
+
+def cmd_synth(args, registry):
+    from .synthetic import main
+
+    return main(args.extra)
+
+
+def cmd_report(args, registry):
+    # generate_documentation.py lives next to the package; import it as a
+    # module so the cohort workers can pickle its render functions
+    sys.path.insert(0, str(ML_MODELS_DIR))
+    import generate_documentation
+
+    generate_documentation.main(args.extra)
+    return 0
+
+
+def cmd_tune(args, registry):
+    return _run_script(TUNING_SCRIPT, args.extra)
+
+
+def cmd_bench(args, registry):
+    return _run_script(BENCHMARKS[args.benchmark], args.extra)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="mentoraid", description="MentorAid dropout prediction workflows"
+    )
+    parser.add_argument(
+        "--profile",
+        type=float,
+        metavar="RATE",
+        help="profile this fraction (0-1) of top-level spans into ./profiles",
+    )
+    parser.add_argument(
+        "--metrics-file", help="write the span metrics here on exit (MENTORAID_METRICS_FILE)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    predict = commands.add_parser(
+        "predict", help="score student records (JSON) with the production model"
+    )
+    predict.add_argument("records", help="JSON file with one record or a list ('-' for stdin)")
+    predict.add_argument("--model", default=PRODUCTION_MODEL, choices=RUNTIME_MODELS)
+    predict.set_defaults(run=cmd_predict)
+
+    batch = commands.add_parser("batch-predict", help="score roster files (.csv/.json)")
+    batch.add_argument("rosters", nargs="+", help="roster files carrying the model features")
+    batch.add_argument(
+        "--output-dir", help="where <name>.scored.<ext> is written (default: next to each roster)"
+    )
+    batch.add_argument("--chunk-size", type=int, default=50_000, help="CSV rows per batch")
+    batch.add_argument("--model", default=PRODUCTION_MODEL, choices=RUNTIME_MODELS)
+    batch.add_argument(
+        "--store",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="upsert the scored students into the dashboard risk store (store/risk.sqlite)",
+    )
+    batch.add_argument(
+        "--history",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="append the scores to the prediction history (store/history)",
+    )
+    batch.add_argument(
+        "--history-factors",
+        action="store_true",
+        help="store the top feature attributions with the history (slow for the SVM)",
+    )
+    batch.set_defaults(run=cmd_batch_predict)
+
+    validate = commands.add_parser("validate", help="check the trained artifacts (deploy gate)")
+    validate.add_argument(
+        "--json", metavar="PATH", help="write the JSON report here ('-' for stdout)"
+    )
+    validate.add_argument("--write-golden", action="store_true")
+    validate.add_argument("--strict", action="store_true")
+    validate.set_defaults(run=cmd_validate)
+
+    drift = commands.add_parser("drift", help="feature drift of rosters against dataset.csv")
+    drift.add_argument("rosters", nargs="*", help="roster files (.csv/.json)")
+    drift.add_argument(
+        "--reference", action="store_true", help="rebuild the reference from the dataset first"
+    )
+    drift.set_defaults(run=cmd_drift)
+
+    serve = commands.add_parser("serve", help="run the prediction HTTP service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--model", default=PRODUCTION_MODEL, choices=RUNTIME_MODELS)
+    serve.add_argument(
+        "--drift-window", type=int, help="rows the drift monitor follows (default: all)"
+    )
+    serve.add_argument(
+        "--max-batch", type=int, default=64, help="rows per coalesced model call (0: off)"
+    )
+    serve.add_argument(
+        "--max-wait-ms", type=float, default=0.0, help="longest wait for a batch to fill"
+    )
+    serve.add_argument("--batch-workers", type=int, default=1, help="batches scored at once")
+    serve.add_argument(
+        "--workers", type=int, default=0, help="pre-forked worker processes (0: one process)"
+    )
+    serve.add_argument(
+        "--reload-interval",
+        type=float,
+        default=5.0,
+        help="seconds between checks for a newly activated model version",
+    )
+    serve.add_argument(
+        "--no-preload",
+        action="store_true",
+        help="load the models in every worker instead of once before forking",
+    )
+    serve.add_argument(
+        "--shadow",
+        nargs="+",
+        default=[],
+        metavar="MODEL",
+        help="candidate models scored off the response path (knn, VERSION:svm, ...)",
+    )
+    serve.add_argument(
+        "--shadow-rate", type=float, default=1.0, help="fraction of batches shadowed"
+    )
+    serve.add_argument("--shadow-db", help="SQLite store of the shadow comparisons")
+    serve.add_argument(
+        "--risk-store",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="serve GET /dashboard from the risk store (store/risk.sqlite)",
+    )
+    serve.add_argument(
+        "--history",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="serve GET /history from the prediction history (store/history)",
+    )
+    serve.set_defaults(run=cmd_serve)
+
+    # These forward their remaining arguments to the underlying script
+    report = commands.add_parser(
+        "report", help="generate the documentation or cohort reports", add_help=False
+    )
+    report.set_defaults(run=cmd_report)
+
+    synth = commands.add_parser(
+        "synth", help="generate a synthetic roster shaped like dataset.csv", add_help=False
+    )
+    synth.set_defaults(run=cmd_synth)
+
+    models = commands.add_parser(
+        "models", help="publish, list, activate or roll back model versions", add_help=False
+    )
+    models.set_defaults(run=cmd_models)
+
+    stats = commands.add_parser(
+        "stats", help="dashboard statistics from the risk store", add_help=False
+    )
+    stats.set_defaults(run=cmd_stats)
+
+    history = commands.add_parser(
+        "history", help="a student's prediction history; compaction", add_help=False
+    )
+    history.set_defaults(run=cmd_history)
+
+    shadow = commands.add_parser(
+        "shadow", help="compare shadowed candidate models with production", add_help=False
+    )
+    shadow.set_defaults(run=cmd_shadow)
+
+    triggers = commands.add_parser(
+        "triggers", help="re-score students on feature-change events", add_help=False
+    )
+    triggers.set_defaults(run=cmd_triggers)
+
+    tune = commands.add_parser("tune", help="run the hyperparameter search and save the models")
+    tune.set_defaults(run=cmd_tune)
+
+    bench = commands.add_parser("bench", help="run a benchmark")
+    bench.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    bench.set_defaults(run=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args, extra = build_parser().parse_known_args(argv)
+    forwarded = (
+        "report",
+        "synth",
+        "models",
+        "stats",
+        "history",
+        "shadow",
+        "triggers",
+        "tune",
+        "bench",
+    )
+    if extra and args.command not in forwarded:
+        build_parser().error(f"unrecognized arguments: {' '.join(extra)}")
+    args.extra = extra
+    if args.metrics_file:
+        os.environ["MENTORAID_METRICS_FILE"] = args.metrics_file
+    if args.profile is not None:
+        from .instrumentation import configure_profiling
+
+        configure_profiling(args.profile)
+
+    from .artifacts import ModelRegistry
+    from .instrumentation import flush_metrics
+
+    try:
+        return args.run(args, ModelRegistry(TRAINED_MODELS_DIR))
+    finally:
+        flush_metrics()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
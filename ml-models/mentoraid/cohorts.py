@@ -0,0 +1,201 @@
+"""
+MentorAid - Per-Cohort Risk Reports
+Splits a student roster into departments and classes (the department/class
+fields of src/types/student.ts) and renders one DOCX per group. The static
+part of every report is rendered once and shipped to the worker processes as
+a pre-built .docx; each worker only adds its group's sections and saves its
+own file, so groups are rendered and written in parallel.
+"""
+
+import io
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .config import PRODUCTION_MODEL, TRAINED_MODELS_DIR
+
+COHORT_FIELDS = ("department", "class")
+# Group of the students whose department/class is missing
+MISSING_GROUP = "(none)"
+
+# Student fields (src/types/student.ts) carried into the group reports
+STUDENT_COLUMNS = (
+    "studentId",
+    "name",
+    "department",
+    "class",
+    "attendance",
+    "averageMarks",
+    "feeStatus",
+    "riskScore",
+    "riskLevel",
+)
+
+# Worker-process state, set once per worker by _init_worker
+_worker = {}
+
+
+def load_roster(path):
+    """Read a roster of students from .csv or .json (a list of Student objects)"""
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix == ".json":
+        return pd.read_json(path, orient="records", dtype=False)
+    return pd.read_csv(path, encoding="utf-8-sig")
+
+
+def score_roster(roster, models_dir=TRAINED_MODELS_DIR):
+    """
+    Fill in riskScore and riskLevel
+
+    Rows carrying every model feature are scored with the calibrated
+    production model. Otherwise an existing riskScore column is used and only
+    a missing riskLevel is derived from it.
+
+    Args:
+        roster: Student DataFrame
+        models_dir: Directory holding the trained artifacts
+
+    Returns:
+        Copy of the roster with riskScore (0-100) and riskLevel columns
+    """
+    from .artifacts import load_model
+    from .calibration import dropout_probability, load_calibrator, risk_level, risk_score
+    from .preprocessing import prepare_training_data
+    from .schema import FeatureSchema
+
+    roster = roster.copy()
+    model = load_model(PRODUCTION_MODEL, models_dir)
+    schema = FeatureSchema.from_model(model, PRODUCTION_MODEL)
+
+    if all(feature in roster.columns for feature in schema.feature_names):
+        _, _, _, scaler = prepare_training_data(schema.feature_names)
+        X = scaler.transform(
+            roster[list(schema.feature_names)].to_numpy(dtype=np.float64)
+        )
+        probabilities = dropout_probability(
+            model, load_calibrator(PRODUCTION_MODEL, models_dir), X
+        )
+        roster["riskScore"] = risk_score(probabilities)
+        roster["riskLevel"] = risk_level(probabilities)
+    elif "riskScore" not in roster.columns:
+        missing, _ = schema.diff(list(roster.columns))
+        raise ValueError(
+            f"roster has neither riskScore nor the model features (missing {missing[:5]}...)"
+        )
+    elif "riskLevel" not in roster.columns:
+        roster["riskLevel"] = risk_level(roster["riskScore"].to_numpy() / 100)
+    return roster
+
+
+def group_value(value):
+    """Name of the group one department/class value falls in (MISSING_GROUP if absent)"""
+    import pandas as pd
+
+    return MISSING_GROUP if pd.isna(value) else str(value)
+
+
+def cohort_groups(roster, by=COHORT_FIELDS):
+    """
+    Split a scored roster into report groups
+
+    Args:
+        roster: DataFrame with riskScore/riskLevel and the `by` columns
+        by: Student fields to group on; each field yields its own set of reports
+
+    Returns:
+        List of {"field", "value", "students"} dictionaries, students being a
+        list of plain records sorted by descending riskScore. Students
+        without a value for the field form the MISSING_GROUP group.
+    """
+    columns = [c for c in STUDENT_COLUMNS if c in roster.columns]
+    ordered = roster.sort_values("riskScore", ascending=False, kind="stable")
+    groups = []
+    for field in by:
+        if field not in roster.columns:
+            raise ValueError(f"roster has no {field!r} column")
+        for value, members in ordered.groupby(field, sort=True, dropna=False):
+            groups.append(
+                {
+                    "field": field,
+                    "value": group_value(value),
+                    "students": members[columns].to_dict(orient="records"),
+                }
+            )
+    return groups
+
+
+def report_filename(group):
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", group["value"]).strip("-") or "unnamed"
+    return f"{group['field']}-{slug}.docx"
+
+
+def _init_worker(template, render_group, output_dir):
+    _worker["template"] = template
+    _worker["render_group"] = render_group
+    _worker["output_dir"] = Path(output_dir)
+
+
+def _render_one(group):
+    """Render and save one group's report (runs in a worker process)"""
+    from docx import Document
+
+    start = time.perf_counter()
+    doc = Document(io.BytesIO(_worker["template"]))
+    body = doc.element.body
+    static = [element for element in body if element is not body.sectPr]
+
+    _worker["render_group"](doc, group)
+
+    # Group sections first, the shared static sections close the report
+    for element in static:
+        body.sectPr.addprevious(element)
+
+    path = _worker["output_dir"] / report_filename(group)
+    doc.save(path)
+    return str(path), len(group["students"]), time.perf_counter() - start
+
+
+def render_cohort_reports(groups, template, render_group, output_dir, jobs=None):
+    """
+    Render every group's report in parallel
+
+    Args:
+        groups: Output of cohort_groups()
+        template: Bytes of the pre-rendered .docx holding the static sections
+        render_group: Picklable callable(doc, group) adding the group sections
+        output_dir: Directory the reports are written to
+        jobs: Worker processes (defaults to os.cpu_count(); 1 renders inline)
+
+    Returns:
+        Dictionary with the written paths, per-report seconds and wall time
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = min(jobs or os.cpu_count() or 1, max(1, len(groups)))
+
+    start = time.perf_counter()
+    if jobs == 1:
+        _init_worker(template, render_group, output_dir)
+        results = [_render_one(group) for group in groups]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(template, render_group, output_dir),
+        ) as pool:
+            results = list(pool.map(_render_one, groups))
+    wall = time.perf_counter() - start
+
+    return {
+        "reports": [path for path, _, _ in results],
+        "students": sum(n for _, n, _ in results),
+        "render_seconds": sum(seconds for _, _, seconds in results),
+        "wall_seconds": wall,
+        "jobs": jobs,
+    }
@@ -0,0 +1,57 @@
+"""
+MentorAid - Shared Configuration
+Filesystem locations and dataset constants used by every ML entry point.
+MENTORAID_MODELS_DIR and MENTORAID_DATASET override the artifact folder and
+the dataset for every command (e.g. to score with a staged retrain).
+MENTORAID_STORE_DIR moves the local stores of scored students.
+"""
+
+import os
+from pathlib import Path
+
+# ml-models/ (this package lives in ml-models/mentoraid/)
+ML_MODELS_DIR = Path(__file__).resolve().parent.parent
+DATASETS_DIR = ML_MODELS_DIR / "datasets"
+TRAINED_MODELS_DIR = Path(
+    os.environ.get("MENTORAID_MODELS_DIR", ML_MODELS_DIR / "trained-models")
+)
+DATASET_PATH = Path(os.environ.get("MENTORAID_DATASET", DATASETS_DIR / "dataset.csv"))
+# Stores written by batch scoring and read by the dashboard (mentoraid.riskstore)
+STORE_DIR = Path(os.environ.get("MENTORAID_STORE_DIR", ML_MODELS_DIR / "store"))
+
+TARGET_COLUMN = "Target"
+TARGET_MAPPING = {"Dropout": 0, "Graduate": 1, "Enrolled": 2}
+
+# Features dropped before training (from notebook analysis).
+# NOTE: the tuning script also lists "Nationality", but the dataset column is
+# spelled "Nacionality", so that column was never dropped and the tuned models
+# expect it.
+FEATURES_TO_REMOVE = [
+    "Curricular units 1st sem (credited)",
+    "Curricular units 1st sem (enrolled)",
+    "Curricular units 1st sem (evaluations)",
+    "Curricular units 1st sem (approved)",
+    "Curricular units 1st sem (grade)",
+    "Curricular units 2nd sem (approved)",
+]
+
+# Short model name -> artifact file in trained-models/
+MODEL_FILES = {
+    "svm": "svm_tuned_model.pkl",
+    "rf": "rf_tuned_model.pkl",
+    "dt": "dt_tuned_model.pkl",
+    "lr": "lr_tuned_model.pkl",
+    "knn": "knn_tuned_model.pkl",
+    "nn": "nn_tuned_advanced.keras",
+}
+
+# The production model used for riskScore
+PRODUCTION_MODEL = "svm"
+
+# Models the NumPy runtime (mentoraid.predict) can compile: fitted RBF SVMs
+RUNTIME_MODELS = ("svm",)
+
+# Calibrated dropout probability -> riskLevel (src/types/student.ts),
+# checked from the highest threshold down on the rounded riskScore, the
+# threshold itself included (riskScore 70 is high); anything lower is "low"
+RISK_LEVELS = [(0.7, "high"), (0.4, "medium")]
@@ -0,0 +1,318 @@
+"""
+MentorAid - Feature Drift Monitoring
+Compares the students being scored with the dataset.csv population the models
+were tuned on, feature by feature.
+
+The reference (trained-models/drift_reference.json, written at tuning time)
+holds, per model feature, decile bin edges and the share of dataset.csv rows
+in each bin. Discrete columns (codes, flags, counts) get one bin per value.
+DriftMonitor keeps running counts over the same bins: a batch is binned
+with one searchsorted per feature and added to the counts, so the state is
+O(features x bins) and history is never re-read. From the counts it derives:
+
+- PSI (population stability index), sum((cur - ref) * ln(cur / ref));
+  >= 0.1 is a warning and >= 0.25 an alert, the usual PSI bands
+- KS, the largest gap between the two binned CDFs (a lower bound on the
+  two-sample KS statistic of the raw values)
+
+The reference is the raw dataset.csv, not the IQR-cleaned training rows:
+uploads come from the raw population, and rows outside the training bounds
+are already flagged per student as outOfRange.
+
+Usage:
+    python -m mentoraid.drift --reference            # rebuild from dataset.csv
+    python -m mentoraid.drift roster-2025.csv        # drift of a roster file
+"""
+
+import argparse
+import json
+import sys
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from .config import DATASET_PATH, FEATURES_TO_REMOVE, TARGET_COLUMN, TRAINED_MODELS_DIR
+
+REFERENCE_FILE = "drift_reference.json"
+
+N_BINS = 10
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+# No status is reported before this many rows have been observed
+MIN_ROWS = 500
+# Smallest bin share used in the PSI logarithm (empty bins)
+_PSI_FLOOR = 1e-4
+
+FeatureDrift = namedtuple("FeatureDrift", "feature psi ks status")
+FeatureDrift.__doc__ = """
+Drift of one feature: status is "ok", "warn", "alert" or "insufficient"
+(fewer than MIN_ROWS observed rows)
+"""
+
+
+def _bin_edges(values, bins):
+    """Decile edges, or midpoints between values for columns with few values"""
+    values = values[~np.isnan(values)]
+    distinct = np.unique(values)
+    if len(distinct) <= bins:
+        return (distinct[1:] + distinct[:-1]) / 2
+    return np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+
+
+class DriftReference:
+    """
+    Bin edges and reference bin shares of every monitored feature
+
+    edges is padded with +inf to a (features x max_edges) matrix, so every
+    feature has max_edges + 1 bins and the padded bins stay empty.
+    """
+
+    def __init__(self, columns, edges, proportions, rows):
+        self.columns = list(columns)
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.proportions = np.asarray(proportions, dtype=np.float64)
+        self.rows = rows
+
+    @classmethod
+    def from_matrix(cls, X, columns, bins=N_BINS):
+        X = np.asarray(X, dtype=np.float64)
+        edges = [_bin_edges(X[:, j], bins) for j in range(X.shape[1])]
+        padded = np.full((len(edges), max(len(e) for e in edges)), np.inf)
+        for j, e in enumerate(edges):
+            padded[j, : len(e)] = e
+        counts = bin_counts(X, padded)
+        return cls(columns, padded, counts / counts.sum(axis=1, keepdims=True), len(X))
+
+    @classmethod
+    def from_frame(cls, students_df, columns=None, bins=N_BINS):
+        """Reference of the model features (or `columns`) of a DataFrame"""
+        if columns is None:
+            columns = model_features(students_df.columns)
+        return cls.from_matrix(students_df[columns].to_numpy(dtype=np.float64), columns, bins)
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "features": {
+                column: {
+                    "edges": edges[np.isfinite(edges)].tolist(),
+                    "proportions": shares[: np.isfinite(edges).sum() + 1].round(6).tolist(),
+                }
+                for column, edges, shares in zip(self.columns, self.edges, self.proportions)
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        features = data["features"]
+        width = max(len(f["edges"]) for f in features.values())
+        edges = np.full((len(features), width), np.inf)
+        proportions = np.zeros((len(features), width + 1))
+        for j, feature in enumerate(features.values()):
+            edges[j, : len(feature["edges"])] = feature["edges"]
+            proportions[j, : len(feature["proportions"])] = feature["proportions"]
+        return cls(list(features), edges, proportions, data["rows"])
+
+    def save(self, models_dir=TRAINED_MODELS_DIR):
+        with open(Path(models_dir) / REFERENCE_FILE, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+
+def model_features(columns):
+    """dataset.csv columns the models are trained on"""
+    return [c for c in columns if c != TARGET_COLUMN and c not in FEATURES_TO_REMOVE]
+
+
+def load_reference(models_dir=TRAINED_MODELS_DIR):
+    """The stored DriftReference, or None if none was saved"""
+    path = Path(models_dir) / REFERENCE_FILE
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return DriftReference.from_dict(json.load(f))
+
+
+def bin_counts(X, edges):
+    """(features x bins) counts of the non-NaN values of X over padded edges"""
+    n_bins = edges.shape[1] + 1
+    counts = np.zeros((X.shape[1], n_bins))
+    for j in range(X.shape[1]):
+        column = X[:, j]
+        column = column[~np.isnan(column)]
+        counts[j] = np.bincount(np.searchsorted(edges[j], column, side="right"), minlength=n_bins)
+    return counts
+
+
+def psi(reference, current):
+    """Population stability index per row of two (features x bins) share arrays"""
+    reference = np.maximum(reference, _PSI_FLOOR)
+    current = np.maximum(current, _PSI_FLOOR)
+    return ((current - reference) * np.log(current / reference)).sum(axis=1)
+
+
+def ks(reference, current):
+    """Largest CDF gap per row of two (features x bins) share arrays"""
+    return np.abs(np.cumsum(current, axis=1) - np.cumsum(reference, axis=1)).max(axis=1)
+
+
+class DriftMonitor:
+    """
+    Running bin counts of scored traffic against a DriftReference
+
+    observe() is safe to call from several threads. With window_rows set, the
+    counts are scaled down whenever they exceed that many rows, so the
+    monitor follows roughly the last window_rows students instead of all
+    traffic since start-up.
+    """
+
+    def __init__(self, reference, window_rows=None, min_rows=MIN_ROWS):
+        self.reference = reference
+        self.window_rows = window_rows
+        self.min_rows = min_rows
+        self.counts = np.zeros_like(reference.proportions)
+        self.rows = 0.0
+        self.observed = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, models_dir=TRAINED_MODELS_DIR, **kwargs):
+        """Monitor for the stored reference, or None when there is none"""
+        reference = load_reference(models_dir)
+        return cls(reference, **kwargs) if reference is not None else None
+
+    def observe(self, X, columns=None):
+        """
+        Add a batch of raw (unscaled) feature rows
+
+        Args:
+            X: 2-D array laid out in reference.columns order, or in `columns`
+                order (a superset, e.g. a model schema)
+            columns: Column names of X when they differ from the reference
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if columns is not None and list(columns) != self.reference.columns:
+            position = {c: i for i, c in enumerate(columns)}
+            X = X[:, [position[c] for c in self.reference.columns]]
+        counts = bin_counts(X, self.reference.edges)
+        with self._lock:
+            self.counts += counts
+            self.rows += len(X)
+            self.observed += len(X)
+            if self.window_rows and self.rows > self.window_rows:
+                self.counts *= self.window_rows / self.rows
+                self.rows = float(self.window_rows)
+
+    def reset(self):
+        with self._lock:
+            self.counts[:] = 0
+            self.rows = 0.0
+
+    def report(self):
+        """List of FeatureDrift, one per monitored feature"""
+        with self._lock:
+            counts = self.counts.copy()
+            rows = self.rows
+        totals = counts.sum(axis=1, keepdims=True)
+        current = counts / np.maximum(totals, 1)
+        psi_values = psi(self.reference.proportions, current)
+        ks_values = ks(self.reference.proportions, current)
+
+        drift = []
+        for column, p, k in zip(self.reference.columns, psi_values, ks_values):
+            if rows < self.min_rows:
+                status = "insufficient"
+            elif p >= PSI_ALERT:
+                status = "alert"
+            elif p >= PSI_WARN:
+                status = "warn"
+            else:
+                status = "ok"
+            drift.append(FeatureDrift(column, float(p), float(k), status))
+        return drift
+
+    def alerts(self):
+        """Features whose PSI is at the warning or alert level"""
+        return [d for d in self.report() if d.status in ("warn", "alert")]
+
+    def metrics(self):
+        """Prometheus text-format lines for the drift gauges"""
+        report = self.report()
+        level = {"insufficient": 0, "ok": 0, "warn": 1, "alert": 2}
+        lines = [
+            "# HELP mentoraid_drift_rows Rows in the drift window",
+            "# TYPE mentoraid_drift_rows gauge",
+            f"mentoraid_drift_rows {self.rows:.0f}",
+            "# HELP mentoraid_drift_observed_total Rows observed since start",
+            "# TYPE mentoraid_drift_observed_total counter",
+            f"mentoraid_drift_observed_total {self.observed}",
+        ]
+        for metric, help_text, value in (
+            ("psi", "Population stability index against dataset.csv", lambda d: d.psi),
+            ("ks", "Binned KS statistic against dataset.csv", lambda d: d.ks),
+            ("alert", "Drift level (0 ok, 1 warn, 2 alert)", lambda d: level[d.status]),
+        ):
+            lines.append(f"# HELP mentoraid_drift_{metric} {help_text}")
+            lines.append(f"# TYPE mentoraid_drift_{metric} gauge")
+            for d in report:
+                lines.append(f'mentoraid_drift_{metric}{{feature="{d.feature}"}} {value(d):.6g}')
+        return lines
+
+
+def roster_drift(reference, path, chunk_size=50_000):
+    """DriftMonitor fed with every row of a roster (.csv streamed, .json whole)"""
+    import pandas as pd
+
+    from .cohorts import load_roster
+
+    path = Path(path)
+    if path.suffix == ".json":
+        chunks = [load_roster(path)]
+    else:
+        chunks = pd.read_csv(path, encoding="utf-8-sig", chunksize=chunk_size)
+    monitor = DriftMonitor(reference)
+    for chunk in chunks:
+        monitor.observe(chunk[reference.columns].to_numpy(dtype=np.float64))
+    return monitor
+
+
+def build_reference(dataset_path=DATASET_PATH):
+    from .preprocessing import load_dataset
+
+    return DriftReference.from_frame(load_dataset(dataset_path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Feature drift against dataset.csv")
+    parser.add_argument("rosters", nargs="*", type=Path, help="roster files to check")
+    parser.add_argument(
+        "--reference", action="store_true", help=f"rebuild {REFERENCE_FILE} from the dataset"
+    )
+    parser.add_argument("--dataset", type=Path, default=DATASET_PATH)
+    parser.add_argument("--models-dir", type=Path, default=TRAINED_MODELS_DIR)
+    args = parser.parse_args(argv)
+
+    if args.reference:
+        reference = build_reference(args.dataset)
+        reference.save(args.models_dir)
+        print(f"✓ Saved {args.models_dir / REFERENCE_FILE} ({len(reference.columns)} features)")
+    elif not args.rosters:
+        parser.error("give roster files or --reference")
+
+    reference = load_reference(args.models_dir)
+    status = 0
+    for path in args.rosters:
+        report = roster_drift(reference, path).report()
+        flagged = [d for d in report if d.status in ("warn", "alert")]
+        print(f"\n📊 {path.name}: {len(flagged)} of {len(report)} features drifted")
+        for d in sorted(flagged, key=lambda d: -d.psi):
+            icon = "❌" if d.status == "alert" else "⚠️ "
+            print(f"   {icon} {d.feature:45} PSI {d.psi:6.3f}  KS {d.ks:.3f}")
+        status = status or int(any(d.status == "alert" for d in report))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
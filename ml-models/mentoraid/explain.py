@@ -0,0 +1,471 @@
+"""
+MentorAid - Per-Student Feature Attributions
+Explains each prediction as additive feature contributions (SHAP values) so
+AIInsights can show why a student is flagged:
+
+- TreeExplainer: exact path-dependent TreeSHAP for Decision Tree / Random Forest
+- LinearExplainer: exact contributions w * (x - E[x]) for Logistic Regression
+- KernelExplainer: Kernel SHAP for the SVM (or any model), with the
+  background set and coalition design computed once and cached
+
+All attributions explain the *dropout* score (positive = pushes towards
+dropout), are computed for a whole batch at once, and are cached next to the
+predictions by AttributionService.
+"""
+
+from collections import OrderedDict
+from math import factorial
+
+import numpy as np
+
+DROPOUT_CLASS = 0
+
+
+def _dropout_column(model):
+    """Index of the Dropout class in model.classes_"""
+    return int(np.flatnonzero(np.asarray(model.classes_) == DROPOUT_CLASS)[0])
+
+
+def summarize_background(X, k=16, seed=42):
+    """
+    Compress training rows into k weighted centroids for Kernel SHAP
+
+    Args:
+        X: Scaled training matrix in model column order
+        k: Number of centroids (the cost of Kernel SHAP scales linearly in k)
+        seed: KMeans random state
+
+    Returns:
+        (centroids, weights) with weights summing to 1
+    """
+    from sklearn.cluster import KMeans
+
+    X = np.asarray(X, dtype=np.float64)
+    if len(X) <= k:
+        return X.copy(), np.full(len(X), 1.0 / len(X))
+    kmeans = KMeans(n_clusters=k, n_init=4, random_state=seed).fit(X)
+    weights = np.bincount(kmeans.labels_, minlength=k).astype(np.float64)
+    return kmeans.cluster_centers_, weights / weights.sum()
+
+
+# =============================================================================
+# TREE SHAP
+# =============================================================================
+class _LeafGroup:
+    """All root->leaf paths (over every tree) with the same number of unique features"""
+
+    def __init__(self, features, lower, upper, cover, values):
+        self.features = features  # (L, d) feature index of each unique path feature
+        self.lower = lower  # (L, d) x must be > lower ...
+        self.upper = upper  # (L, d) ... and <= upper to follow the path
+        self.cover = cover  # (L, d) product of cover fractions for that feature
+        self.values = values  # (L,) leaf dropout probability / n_trees
+        d = features.shape[1]
+        # Shapley weights |S|! (d - |S| - 1)! / d! for |S| = 0..d-1
+        self.weights = np.array(
+            [factorial(s) * factorial(d - 1 - s) / factorial(d) for s in range(d)]
+        )
+
+
+def _tree_paths(tree, class_column, scale):
+    """Yield (leaf value, {feature: [lower, upper, cover]}) for every leaf"""
+    left = tree.children_left
+    right = tree.children_right
+    node_cover = tree.weighted_n_node_samples
+    value = tree.value[:, 0, :]
+    value = value[:, class_column] / value.sum(axis=1)
+
+    stack = [(0, {})]
+    while stack:
+        node, path = stack.pop()
+        if left[node] == -1:
+            yield value[node] * scale, path
+            continue
+        feature = tree.feature[node]
+        threshold = tree.threshold[node]
+        for child, is_left in ((left[node], True), (right[node], False)):
+            lower, upper, cover = path.get(feature, (-np.inf, np.inf, 1.0))
+            if is_left:
+                upper = min(upper, threshold)
+            else:
+                lower = max(lower, threshold)
+            child_path = dict(path)
+            child_path[feature] = (
+                lower,
+                upper,
+                cover * node_cover[child] / node_cover[node],
+            )
+            stack.append((child, child_path))
+
+
+class TreeExplainer:
+    """
+    Exact path-dependent TreeSHAP, vectorized over students and leaves
+
+    Every leaf contributes v * prod_j(r_j + o_j t) to the Shapley polynomial,
+    where r_j is the cover fraction and o_j(x) the indicator that x follows
+    the path for unique feature j. Leaves are grouped by path length so the
+    whole batch is evaluated with a few thousand NumPy operations instead of
+    a Python recursion per student.
+    """
+
+    def __init__(self, model, max_chunk_elements=4_000_000):
+        trees = getattr(model, "estimators_", [model])
+        class_column = _dropout_column(model)
+        self.n_features = model.n_features_in_
+        self.max_chunk_elements = max_chunk_elements
+
+        grouped = {}
+        self.expected_value = 0.0
+        for estimator in trees:
+            for leaf_value, path in _tree_paths(estimator.tree_, class_column, 1.0 / len(trees)):
+                cover = np.prod([c for _, _, c in path.values()]) if path else 1.0
+                self.expected_value += leaf_value * cover
+                if path:
+                    grouped.setdefault(len(path), []).append((leaf_value, path))
+
+        self.groups = []
+        for d, leaves in sorted(grouped.items()):
+            features = np.array([list(p) for _, p in leaves], dtype=np.intp)
+            bounds = np.array([list(p.values()) for _, p in leaves], dtype=np.float64)
+            values = np.array([v for v, _ in leaves], dtype=np.float64)
+            self.groups.append(
+                _LeafGroup(features, bounds[..., 0], bounds[..., 1], bounds[..., 2], values)
+            )
+
+    def _explain_group(self, group, X, phi):
+        # o: (n, L, d) does each student follow the path for each unique feature
+        x = X[:, group.features]
+        o = ((x > group.lower) & (x <= group.upper)).astype(np.float64)
+        r = group.cover
+        n, L, d = o.shape
+
+        # P(t) = prod_j (r_j + o_j t), coefficients of t^0..t^d
+        P = np.zeros((n, L, d + 1))
+        P[..., 0] = 1.0
+        for j in range(d):
+            P[..., 1 : j + 2] = (
+                P[..., 1 : j + 2] * r[:, j, None] + P[..., : j + 1] * o[..., j : j + 1]
+            )
+            P[..., 0] *= r[:, j]
+
+        contributions = np.empty((n, L, d))
+        for i in range(d):
+            # Unwind feature i: Q(t) = P(t) / (r_i + o_i t)
+            o_i = o[..., i]
+            r_i = r[:, i]
+            Q = np.empty((n, L, d))
+            # o_i == 1: divide from the top coefficient, o_i == 0: divide by r_i
+            Q[..., d - 1] = np.where(o_i > 0, P[..., d], P[..., d - 1] / r_i)
+            for k in range(d - 1, 0, -1):
+                Q[..., k - 1] = np.where(
+                    o_i > 0, P[..., k] - r_i * Q[..., k], P[..., k - 1] / r_i
+                )
+            contributions[..., i] = (o_i - r_i) * (Q @ group.weights)
+
+        contributions *= group.values[:, None]
+        np.add.at(phi.T, group.features.ravel(), contributions.reshape(n, -1).T)
+
+    def shap_values(self, X):
+        """
+        Args:
+            X: Scaled feature matrix in model column order
+
+        Returns:
+            (n_students, n_features) contributions to P(Dropout)
+        """
+        # Trees compare float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        phi = np.zeros((len(X), self.n_features))
+        for group in self.groups:
+            size = group.features.size
+            step = max(1, self.max_chunk_elements // max(size, 1))
+            for start in range(0, len(X), step):
+                self._explain_group(group, X[start : start + step], phi[start : start + step])
+        return phi
+
+    def dropout_score(self, model, X):
+        return model.predict_proba(X)[:, _dropout_column(model)]
+
+
+# =============================================================================
+# LINEAR
+# =============================================================================
+class LinearExplainer:
+    """Exact contributions to the dropout log-odds: -w_j * (x_j - E[x_j])"""
+
+    def __init__(self, model, background, background_weights=None):
+        sign = -1.0 if _dropout_column(model) == 0 else 1.0
+        self.coef = sign * np.asarray(model.coef_, dtype=np.float64).ravel()
+        intercept = sign * float(np.ravel(model.intercept_)[0])
+        self.mean = np.average(background, axis=0, weights=background_weights)
+        self.expected_value = float(self.coef @ self.mean + intercept)
+
+    def shap_values(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.mean) * self.coef
+
+    def dropout_score(self, model, X):
+        sign = -1.0 if _dropout_column(model) == 0 else 1.0
+        return sign * model.decision_function(X)
+
+
+# =============================================================================
+# KERNEL SHAP
+# =============================================================================
+class KernelExplainer:
+    """
+    Kernel SHAP with a cached background and a fixed coalition design
+
+    The coalition matrix, its Shapley kernel weights and the weighted
+    least-squares projection depend only on the number of features, so they
+    are computed once; explaining a batch is then a single vectorized model
+    call over (students x coalitions x background rows) and one matrix
+    product. The empty and full coalitions are pinned with a large weight so
+    contributions sum to f(x) - E[f].
+    """
+
+    def __init__(self, score_fn, background, background_weights=None, n_coalitions=512, seed=42):
+        self.score_fn = score_fn
+        self.background = np.asarray(background, dtype=np.float64)
+        if background_weights is None:
+            background_weights = np.full(len(self.background), 1.0 / len(self.background))
+        self.background_weights = np.asarray(background_weights, dtype=np.float64)
+        self.n_features = self.background.shape[1]
+
+        self.expected_value = float(self.score_fn(self.background) @ self.background_weights)
+        self.coalitions = self._sample_coalitions(self.n_features, n_coalitions, seed)
+        self.projection = self._projection(self.coalitions)
+
+    @staticmethod
+    def _sample_coalitions(M, n_coalitions, seed):
+        """Paired coalitions with sizes drawn from the Shapley kernel"""
+        rng = np.random.default_rng(seed)
+        sizes = np.arange(1, M)
+        size_weights = (M - 1) / (sizes * (M - sizes))
+        size_weights /= size_weights.sum()
+
+        half = n_coalitions // 2
+        Z = np.zeros((2 * half + 2, M), dtype=bool)
+        drawn = rng.choice(sizes, size=half, p=size_weights)
+        for row, size in enumerate(drawn):
+            Z[2 * row, rng.choice(M, size=size, replace=False)] = True
+            Z[2 * row + 1] = ~Z[2 * row]
+        # Anchors: the empty coalition (index -2) and the full coalition (-1)
+        Z[-1] = True
+        return Z
+
+    @staticmethod
+    def _projection(Z):
+        A = np.hstack([np.ones((len(Z), 1)), Z.astype(np.float64)])
+        w = np.ones(len(Z))
+        w[-2:] = 1e6
+        AtW = A.T * w
+        return np.linalg.solve(AtW @ A, AtW)
+
+    def coalition_scores(self, X):
+        """
+        Mean model score of every coalition for every student
+
+        Returns:
+            (n_students, n_coalitions) array of E_b[f(z * x + (1 - z) * b)]
+        """
+        Z = self.coalitions
+        B = self.background
+        # (n, K, B, M) synthetic rows: student values inside the coalition
+        synthetic = np.where(Z[None, :, None, :], X[:, None, None, :], B[None, None, :, :])
+        scores = self.score_fn(synthetic.reshape(-1, self.n_features))
+        return scores.reshape(len(X), len(Z), len(B)) @ self.background_weights
+
+    def shap_values(self, X, max_rows=200_000):
+        """
+        Args:
+            X: Scaled feature matrix in model column order
+            max_rows: Upper bound on synthetic rows evaluated per model call
+
+        Returns:
+            (n_students, n_features) contributions to the dropout score
+        """
+        X = np.asarray(X, dtype=np.float64)
+        step = max(1, max_rows // (len(self.coalitions) * len(self.background)))
+
+        phi = np.empty((len(X), self.n_features))
+        for start in range(0, len(X), step):
+            y = self.coalition_scores(X[start : start + step])
+            phi[start : start + step] = (y @ self.projection.T)[:, 1:]
+        return phi
+
+    def dropout_score(self, model, X):
+        return self.score_fn(X)
+
+
+def _svm_dropout_score(model):
+    sign = -1.0 if _dropout_column(model) == 0 else 1.0
+
+    def score(X):
+        return sign * model.decision_function(X)
+
+    return score
+
+
+class RBFKernelExplainer(KernelExplainer):
+    """
+    Kernel SHAP specialised for RBF SVMs
+
+    For a coalition row u = z*x + (1-z)*b the squared distance to a support
+    vector splits per feature: sum_j z_j (x_j - s_j)^2 + (1 - z_j)(b_j - s_j)^2.
+    The background half is computed once and cached, so a student costs one
+    (coalitions x features) @ (features x support vectors) product per
+    background row instead of a full decision_function call on every
+    synthetic row.
+    """
+
+    def __init__(self, model, background, background_weights=None, n_coalitions=512, seed=42):
+        self.sign = -1.0 if _dropout_column(model) == 0 else 1.0
+        self.gamma = float(model._gamma)
+        self.support_vectors = np.asarray(model.support_vectors_, dtype=np.float64)
+        self.dual_coef = np.asarray(model.dual_coef_, dtype=np.float64).ravel()
+        self.intercept = float(np.ravel(model.intercept_)[0])
+        super().__init__(
+            _svm_dropout_score(model), background, background_weights, n_coalitions, seed
+        )
+        # (B, M, S) per-feature squared distances background -> support vectors
+        self.background_sq = (
+            self.background[:, :, None] - self.support_vectors.T[None, :, :]
+        ) ** 2
+        self.background_total = self.background_sq.sum(axis=1)  # (B, S)
+
+    def coalition_scores(self, X):
+        Z = self.coalitions.astype(np.float64)
+        y = np.empty((len(X), len(Z)))
+        for i, x in enumerate(X):
+            student_sq = (x[:, None] - self.support_vectors.T) ** 2  # (M, S)
+            # (B, K, S) squared distances of every coalition row
+            distances = Z @ (student_sq - self.background_sq)
+            distances += self.background_total[:, None, :]
+            distances *= -self.gamma
+            decision = np.exp(distances, out=distances) @ self.dual_coef + self.intercept
+            y[i] = self.sign * (self.background_weights @ decision)
+        return y
+
+
+def make_explainer(model, background, background_weights=None):
+    """
+    Pick the attribution method for a fitted model
+
+    Args:
+        model: Tree ensemble, tree, linear model or any classifier
+        background: Scaled background rows (see summarize_background)
+        background_weights: Optional weights of the background rows
+    """
+    if hasattr(model, "tree_") or hasattr(getattr(model, "estimators_", [None])[0], "tree_"):
+        return TreeExplainer(model)
+    if hasattr(model, "coef_") and hasattr(model, "decision_function"):
+        return LinearExplainer(model, background, background_weights)
+    if getattr(model, "kernel", None) == "rbf" and hasattr(model, "support_vectors_"):
+        return RBFKernelExplainer(model, background, background_weights)
+    if hasattr(model, "decision_function"):
+        return KernelExplainer(_svm_dropout_score(model), background, background_weights)
+    column = _dropout_column(model)
+    return KernelExplainer(
+        lambda X: model.predict_proba(X)[:, column], background, background_weights
+    )
+
+
+# =============================================================================
+# SERVICE
+# =============================================================================
+class AttributionService:
+    """
+    Batched predictions + attributions with an LRU cache per (model, student row)
+
+    A whole class is explained with one call; students seen before (same
+    model, identical feature row) are served from the cache without any
+    model evaluation.
+    """
+
+    def __init__(self, models, background, background_weights=None, cache_size=50_000):
+        self.models = models
+        self.background = background
+        self.background_weights = background_weights
+        self.cache_size = cache_size
+        self._explainers = {}
+        self._cache = OrderedDict()
+
+    def explainer(self, name):
+        """Build (once) and return the explainer for a model"""
+        if name not in self._explainers:
+            self._explainers[name] = make_explainer(
+                self.models[name], self.background, self.background_weights
+            )
+        return self._explainers[name]
+
+    def explain(self, name, X):
+        """
+        Predict and explain a batch of students
+
+        Args:
+            name: Model name
+            X: Scaled feature matrix in the model's column order
+
+        Returns:
+            Dictionary with "prediction", "dropout_score" (n,), "attributions"
+            (n, n_features) and the explainer's "expected_value"
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        model = self.models[name]
+        explainer = self.explainer(name)
+
+        keys = [(name, row.tobytes()) for row in X]
+        missing = [i for i, key in enumerate(keys) if key not in self._cache]
+        if missing:
+            X_missing = X[missing]
+            predictions = np.asarray(model.predict(X_missing))
+            scores = explainer.dropout_score(model, X_missing)
+            attributions = explainer.shap_values(X_missing)
+            for j, i in enumerate(missing):
+                self._cache[keys[i]] = (predictions[j], scores[j], attributions[j])
+
+        cached = [self._cache[key] for key in keys]
+        for key in keys:
+            self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return {
+            "prediction": np.array([c[0] for c in cached]),
+            "dropout_score": np.array([c[1] for c in cached], dtype=np.float64),
+            "attributions": np.array([c[2] for c in cached]).reshape(len(X), -1),
+            "expected_value": explainer.expected_value,
+        }
+
+    def clear(self):
+        """Drop cached results (e.g. after a model reload)"""
+        self._cache.clear()
+        self._explainers.clear()
+
+
+def top_factors(attributions, feature_names, record=None, k=5):
+    """
+    The k strongest contributions for one student, for AIInsights
+
+    Args:
+        attributions: 1-D contributions in feature_names order
+        feature_names: Model column order
+        record: Optional raw student record to echo the feature values
+        k: Number of factors
+
+    Returns:
+        List of {"feature", "contribution", "direction"[, "value"]} dictionaries
+    """
+    order = np.argsort(-np.abs(attributions))[:k]
+    factors = []
+    for i in order:
+        factor = {
+            "feature": feature_names[i],
+            "contribution": round(float(attributions[i]), 4),
+            "direction": "increases risk" if attributions[i] > 0 else "reduces risk",
+        }
+        if record is not None:
+            factor["value"] = record.get(feature_names[i])
+        factors.append(factor)
+    return factors
@@ -0,0 +1,643 @@
+"""
+MentorAid - Prediction History
+Append-only record of every score a student received, for ProgressChart
+(risk over time) and InterventionHistory (what the model said around each
+intervention): when the student was scored, by which model version, the
+dropout probability and the strongest feature attributions.
+
+The history is partitioned by calendar month (UTC) under store/history/.
+A partition is a set of immutable segments, each a directory of NumPy
+columns that are read through memory maps:
+
+    2025-09/manifest.json           live segments of the partition
+    2025-09/000004/meta.json        model versions and feature names
+                   ids.npy          sorted unique studentIds (bytes)
+                   offsets.npy      rows of ids[i]: offsets[i]:offsets[i + 1]
+                   ts.npy           uint32 epoch seconds
+                   score.npy        uint16 dropout probability x 10,000
+                   version.npy      uint8 index into meta "versions"
+                   factor.npy       (rows, 3) uint8 index into meta "features"
+                   contribution.npy (rows, 3) float16 attributions
+
+A score takes 16 bytes, plus 14 bytes per student and segment for ids and
+offsets. Rows are sorted by studentId and time, so one
+student's rows are a binary search in ids.npy and a contiguous slice of
+every column. A range scan touches a few pages per segment, however large
+the roster.
+
+append() writes a new segment and then replaces the partition manifest
+(os.replace): readers see the segments before or after the append, never
+half of it. A partition with more than MAX_SEGMENTS segments is merged into
+one. compact() bounds the storage over the years:
+
+- the segments of every finished month are merged into one
+- months older than raw_days keep one row per student: the mean time and
+  probability, with the model version and attributions of the last score
+- months older than keep_days are deleted
+
+With weekly re-scores and the defaults, a student keeps about 56 scores
+from the last 13 months plus one per month for the four years before:
+about 2.6 kB, however many years are scored.
+
+There is one writer at a time (batch scoring or compaction); any number of
+readers, in any process.
+
+Usage:
+    mentoraid batch-predict roster.csv --history [--history-factors]
+    mentoraid history STU0000123 [--start 2025-01-01 --end 2025-07-01]
+                      [--points 26] [--json]
+    mentoraid history --compact [--raw-days 400 --keep-days 1830]
+    mentoraid history --stats
+"""
+
+import argparse
+import datetime
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .calibration import risk_level, risk_score
+from .config import STORE_DIR
+
+HISTORY_DIR = STORE_DIR / "history"
+# Strongest attributions kept per score
+TOP_FACTORS = 3
+# Probabilities are stored as uint16 multiples of 1 / SCORE_SCALE
+SCORE_SCALE = 10_000
+NO_FACTOR = 255
+MAX_VERSIONS = 255
+# Segments a partition may have before append() merges them
+MAX_SEGMENTS = 16
+# compact(): every score for RAW_DAYS, then one per month until KEEP_DAYS
+RAW_DAYS = 400
+KEEP_DAYS = 5 * 366
+SERIES_POINTS = 52
+DAY_S = 86_400
+# Row columns of a segment and their on-disk types
+COLUMNS = {
+    "ts": np.uint32,
+    "score": np.uint16,
+    "version": np.uint8,
+    "factor": np.uint8,
+    "contribution": np.float16,
+}
+
+
+def epoch_seconds(value=None):
+    """Epoch seconds of a datetime, date, ISO 8601 string or number (None: now)"""
+    if value is None:
+        return int(time.time())
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime(value.year, value.month, value.day)
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def _iso(ts):
+    return datetime.datetime.fromtimestamp(int(ts), datetime.timezone.utc).isoformat()
+
+
+def _partition_bounds(partition):
+    """[start, end) epoch seconds of a YYYY-MM partition"""
+    month = np.datetime64(partition, "M")
+    return tuple(int(m.astype("datetime64[s]").astype(np.int64)) for m in (month, month + 1))
+
+
+def _top_factors(attributions, feature_names, k=TOP_FACTORS):
+    """(factor codes, contributions) of the k largest |attributions| per row"""
+    attributions = np.asarray(attributions, dtype=np.float64)
+    if len(feature_names) > NO_FACTOR:
+        raise ValueError(f"at most {NO_FACTOR} features can be stored, got {len(feature_names)}")
+    order = np.argsort(-np.abs(attributions), axis=1)[:, :k]
+    factors = np.full((len(attributions), k), NO_FACTOR, dtype=np.uint8)
+    contributions = np.zeros((len(attributions), k), dtype=np.float16)
+    factors[:, : order.shape[1]] = order
+    contributions[:, : order.shape[1]] = np.take_along_axis(attributions, order, axis=1)
+    return factors, contributions
+
+
+def _concat(tables):
+    """One table from several, with their feature codes mapped onto a common list"""
+    features = list(dict.fromkeys(name for table in tables for name in table["features"]))
+    factors = []
+    for table in tables:
+        lookup = np.full(256, NO_FACTOR, dtype=np.uint8)
+        lookup[: len(table["features"])] = [features.index(n) for n in table["features"]]
+        factors.append(lookup[table["factor"]])
+    merged = {
+        key: np.concatenate([table[key] for table in tables])
+        for key in tables[0]
+        if key != "features"
+    }
+    merged["factor"] = np.concatenate(factors)
+    merged["features"] = features
+    return merged
+
+
+def _monthly(table):
+    """One row per student: mean time and score, version and factors of the last row"""
+    order = np.lexsort((table["ts"], table["id"]))
+    table = {key: value if key == "features" else value[order] for key, value in table.items()}
+    _, starts, counts = np.unique(table["id"], return_index=True, return_counts=True)
+    last = starts + counts - 1
+    monthly = {key: value if key == "features" else value[last] for key, value in table.items()}
+    for column in ("ts", "score"):
+        means = np.add.reduceat(table[column].astype(np.float64), starts) / counts
+        monthly[column] = np.rint(means).astype(COLUMNS[column])
+    return monthly
+
+
+class Segment:
+    """Read-only, memory-mapped view of one segment directory"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "meta.json") as f:
+            meta = json.load(f)
+        self.versions = meta["versions"]
+        self.features = meta["features"]
+        # Plain ndarray views of the maps: slicing np.memmap is several times slower
+        self.ids = np.asarray(np.load(self.path / "ids.npy", mmap_mode="r"))
+        self.offsets = np.asarray(np.load(self.path / "offsets.npy", mmap_mode="r"))
+        self.columns = {
+            name: np.asarray(np.load(self.path / f"{name}.npy", mmap_mode="r")) for name in COLUMNS
+        }
+        # factor code -> feature name (None for NO_FACTOR)
+        self.factor_names = np.array(self.features + [None] * (256 - len(self.features)))
+
+    def __len__(self):
+        return len(self.columns["ts"])
+
+    def rows(self, student_id):
+        """(start, stop) of a student's rows; (0, 0) when there are none"""
+        key = str(student_id).encode()
+        i = int(np.searchsorted(self.ids, key))
+        if i == len(self.ids) or self.ids[i] != key:
+            return 0, 0
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def table(self):
+        """Every row, with studentIds and model versions decoded"""
+        counts = np.diff(self.offsets)
+        table = {"id": np.repeat(np.asarray(self.ids), counts)}
+        for name in COLUMNS:
+            table[name] = np.asarray(self.columns[name])
+        table["version"] = np.asarray(self.versions)[table["version"]]
+        table["features"] = self.features
+        return table
+
+
+class HistoryStore:
+    """
+    Month-partitioned prediction history
+
+    Args:
+        root: Directory of the partitions (created on the first append)
+    """
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = Path(root)
+        self._partitions = (None, [])
+        self._manifests = {}
+        self._segments = {}
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # Partitions
+    # -------------------------------------------------------------------------
+    def partitions(self, start=None, end=None):
+        """Partition names (YYYY-MM), oldest first, overlapping [start, end)"""
+        try:
+            mtime = self.root.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if self._partitions[0] != mtime:
+            names = sorted(
+                entry.name
+                for entry in os.scandir(self.root)
+                if entry.is_dir() and not entry.name.startswith(".")
+            )
+            self._partitions = (mtime, [(name, *_partition_bounds(name)) for name in names])
+        return [
+            name
+            for name, first, last in self._partitions[1]
+            if (start is None or last > start) and (end is None or first < end)
+        ]
+
+    def manifest(self, partition):
+        path = os.path.join(self.root, partition, "manifest.json")
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return {"segments": [], "next": 1, "resolution": "raw"}
+        cached = self._manifests.get(partition)
+        if cached is None or cached[0] != mtime:
+            with open(path) as f:
+                cached = self._manifests[partition] = (mtime, json.load(f))
+        return cached[1]
+
+    def _write_manifest(self, partition, manifest):
+        directory = self.root / partition
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".manifest-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, directory / "manifest.json")
+
+    def segments(self, partition):
+        """Live segments of a partition"""
+        for attempt in range(2):
+            names = self.manifest(partition)["segments"]
+            try:
+                segments = []
+                for name in names:
+                    key = (partition, name)
+                    if key not in self._segments:
+                        self._segments[key] = Segment(self.root / partition / name)
+                    segments.append(self._segments[key])
+                return segments
+            except FileNotFoundError:
+                # Compacted by another process since the manifest was read
+                self._manifests.pop(partition, None)
+                if attempt:
+                    raise
+        return []
+
+    def _write_segment(self, partition, table, manifest):
+        """Write a table as the partition's next segment; returns its name"""
+        order = np.lexsort((table["ts"], table["id"]))
+        ids, starts = np.unique(table["id"][order], return_index=True)
+        versions, codes = np.unique(table["version"][order], return_inverse=True)
+        if len(versions) > MAX_VERSIONS:
+            raise ValueError(f"{partition}: more than {MAX_VERSIONS} model versions in a segment")
+        columns = {
+            "ids": ids,
+            "offsets": np.append(starts, len(order)).astype(np.uint32),
+            "ts": table["ts"][order],
+            "score": table["score"][order],
+            "version": codes.astype(np.uint8),
+            "factor": table["factor"][order],
+            "contribution": table["contribution"][order],
+        }
+
+        directory = self.root / partition
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"{manifest['next']:06d}"
+        staging = Path(tempfile.mkdtemp(dir=directory, prefix=f".{name}-"))
+        for column, values in columns.items():
+            np.save(staging / f"{column}.npy", values)
+        with open(staging / "meta.json", "w") as f:
+            json.dump({"versions": versions.tolist(), "features": table["features"]}, f)
+        os.replace(staging, directory / name)
+        return name
+
+    def _replace(self, partition, table, manifest, resolution):
+        """Swap every segment of a partition for one holding `table`"""
+        name = self._write_segment(partition, table, manifest)
+        old = manifest["segments"]
+        self._write_manifest(
+            partition, {"segments": [name], "next": manifest["next"] + 1, "resolution": resolution}
+        )
+        for segment in old:
+            self._segments.pop((partition, segment), None)
+            shutil.rmtree(self.root / partition / segment, ignore_errors=True)
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+    def append(
+        self,
+        student_ids,
+        probabilities,
+        timestamp=None,
+        version="",
+        attributions=None,
+        feature_names=None,
+    ):
+        """
+        Record a batch of scores
+
+        Args:
+            student_ids: One studentId per score
+            probabilities: Calibrated P(dropout) per student
+            timestamp: When the students were scored: datetime, ISO 8601
+                string or epoch seconds, one for all or one per student
+                (default: now)
+            version: Model version (e.g. "svm@3f9c2a1b7d4e"), one for all or
+                one per student
+            attributions: Optional (students, features) attributions
+                (mentoraid.explain); the TOP_FACTORS largest are kept
+            feature_names: Columns of attributions
+
+        Returns:
+            Number of scores recorded
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        n = len(probabilities)
+        if n == 0:
+            return 0
+        if np.ndim(timestamp) == 0:
+            ts = np.full(n, epoch_seconds(timestamp), dtype=np.int64)
+        else:
+            ts = np.array([epoch_seconds(value) for value in timestamp], dtype=np.int64)
+        if attributions is None:
+            features = []
+            factors = np.full((n, TOP_FACTORS), NO_FACTOR, dtype=np.uint8)
+            contributions = np.zeros((n, TOP_FACTORS), dtype=np.float16)
+        else:
+            features = list(feature_names)
+            factors, contributions = _top_factors(attributions, features)
+        table = {
+            "id": np.array([str(i).encode() for i in student_ids]),
+            "ts": ts.astype(np.uint32),
+            "score": np.rint(np.clip(probabilities, 0, 1) * SCORE_SCALE).astype(np.uint16),
+            "version": np.broadcast_to(np.asarray(version, dtype=str), (n,)),
+            "factor": factors,
+            "contribution": contributions,
+            "features": features,
+        }
+        if len(table["id"]) != n or len(ts) != n:
+            raise ValueError("student_ids, probabilities and timestamps differ in length")
+
+        months = ts.astype("datetime64[s]").astype("datetime64[M]").astype(str)
+        with self._lock:
+            for partition in np.unique(months):
+                rows = months == partition
+                part = {k: v if k == "features" else v[rows] for k, v in table.items()}
+                manifest = self.manifest(partition)
+                if len(manifest["segments"]) >= MAX_SEGMENTS:
+                    self._replace(
+                        partition,
+                        _concat([s.table() for s in self.segments(partition)] + [part]),
+                        manifest,
+                        manifest["resolution"],
+                    )
+                    continue
+                name = self._write_segment(partition, part, manifest)
+                self._write_manifest(
+                    partition,
+                    {
+                        "segments": manifest["segments"] + [name],
+                        "next": manifest["next"] + 1,
+                        "resolution": manifest["resolution"],
+                    },
+                )
+        return n
+
+    def compact(self, now=None, raw_days=RAW_DAYS, keep_days=KEEP_DAYS):
+        """
+        Merge finished months, downsample old ones and drop expired ones
+
+        Args:
+            now: Reference time (default: now)
+            raw_days: Months that ended longer ago keep one row per student
+            keep_days: Months that ended longer ago are deleted
+
+        Returns:
+            {"merged", "downsampled", "dropped"} partition counts
+        """
+        now = epoch_seconds(now)
+        counts = {"merged": 0, "downsampled": 0, "dropped": 0}
+        with self._lock:
+            for partition in self.partitions():
+                end = _partition_bounds(partition)[1]
+                if end <= now - keep_days * DAY_S:
+                    shutil.rmtree(self.root / partition)
+                    self._manifests.pop(partition, None)
+                    self._segments = {k: v for k, v in self._segments.items() if k[0] != partition}
+                    counts["dropped"] += 1
+                    continue
+                manifest = self.manifest(partition)
+                downsample = end <= now - raw_days * DAY_S and manifest["resolution"] == "raw"
+                if not downsample and (end > now or len(manifest["segments"]) <= 1):
+                    continue
+                table = _concat([segment.table() for segment in self.segments(partition)])
+                if downsample:
+                    table = _monthly(table)
+                self._replace(
+                    partition, table, manifest, "monthly" if downsample else manifest["resolution"]
+                )
+                counts["downsampled" if downsample else "merged"] += 1
+        return counts
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+    def _scan(self, student_id, start, end, details=False):
+        """A student's rows in [start, end) as arrays sorted by time"""
+        start = None if start is None else epoch_seconds(start)
+        end = None if end is None else epoch_seconds(end)
+        parts = []
+        for partition in self.partitions(start, end):
+            for segment in self.segments(partition):
+                a, b = segment.rows(student_id)
+                if a == b:
+                    continue
+                ts = np.asarray(segment.columns["ts"][a:b], dtype=np.int64)
+                keep = np.ones(len(ts), dtype=bool)
+                if start is not None:
+                    keep &= ts >= start
+                if end is not None:
+                    keep &= ts < end
+                part = {
+                    "ts": ts[keep],
+                    "score": np.asarray(segment.columns["score"][a:b])[keep] / SCORE_SCALE,
+                }
+                if details:
+                    part["version"] = np.asarray(segment.versions)[
+                        np.asarray(segment.columns["version"][a:b])[keep]
+                    ]
+                    factors = np.asarray(segment.columns["factor"][a:b])[keep]
+                    part["factor"] = segment.factor_names[factors]
+                    part["contribution"] = np.asarray(
+                        segment.columns["contribution"][a:b], dtype=np.float64
+                    )[keep]
+                parts.append(part)
+        if not parts:
+            return {"ts": np.empty(0, dtype=np.int64), "score": np.empty(0)}
+        rows = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        order = np.argsort(rows["ts"], kind="stable")
+        return {key: value[order] for key, value in rows.items()}
+
+    def history(self, student_id, start=None, end=None):
+        """
+        Every stored score of a student, oldest first (InterventionHistory)
+
+        Args:
+            student_id: studentId
+            start: First time included (datetime, ISO 8601 or epoch seconds)
+            end: First time excluded
+
+        Returns:
+            List of {"scoredAt", "dropoutProbability", "riskScore",
+            "riskLevel", "model", "topFactors"} dictionaries
+        """
+        rows = self._scan(student_id, start, end, details=True)
+        if not len(rows["ts"]):
+            return []
+        probabilities = rows["score"]
+        return [
+            {
+                "scoredAt": _iso(ts),
+                "dropoutProbability": round(float(p), 4),
+                "riskScore": int(s),
+                "riskLevel": str(level),
+                "model": str(version),
+                "topFactors": [
+                    {
+                        "feature": feature,
+                        "contribution": round(float(c), 4),
+                        "direction": "increases risk" if c > 0 else "reduces risk",
+                    }
+                    for feature, c in zip(factors, contributions)
+                    if feature is not None
+                ],
+            }
+            for ts, p, s, level, version, factors, contributions in zip(
+                rows["ts"],
+                probabilities,
+                risk_score(probabilities),
+                risk_level(probabilities),
+                rows["version"],
+                rows["factor"],
+                rows["contribution"],
+            )
+        ]
+
+    def series(self, student_id, start=None, end=None, points=SERIES_POINTS):
+        """
+        A student's risk over time, downsampled for ProgressChart
+
+        Scores are averaged over `points` equal time buckets between the
+        first and last score; empty buckets are left out.
+
+        Returns:
+            List of {"date", "riskScore", "dropoutProbability", "scores"}
+            dictionaries, oldest first ("scores": number averaged)
+        """
+        if points < 1:
+            raise ValueError(f"points must be at least 1, got {points}")
+        rows = self._scan(student_id, start, end)
+        ts, probabilities = rows["ts"].astype(np.float64), rows["score"]
+        counts = np.ones(len(ts), dtype=np.int64)
+        if len(ts) > points:
+            edges = np.linspace(ts[0], ts[-1] + 1, points + 1)
+            bucket = np.searchsorted(edges, ts, side="right") - 1
+            counts = np.bincount(bucket, minlength=points)
+            filled = counts > 0
+            ts = np.bincount(bucket, ts, points)[filled] / counts[filled]
+            probabilities = np.bincount(bucket, probabilities, points)[filled] / counts[filled]
+            counts = counts[filled]
+        return [
+            {
+                "date": _iso(t)[:10],
+                "riskScore": int(s),
+                "dropoutProbability": round(float(p), 4),
+                "scores": int(c),
+            }
+            for t, p, s, c in zip(ts, probabilities, risk_score(probabilities), counts)
+        ]
+
+    def stats(self):
+        """Partitions, segments, rows, students per partition and bytes on disk"""
+        partitions = []
+        for partition in self.partitions():
+            segments = self.segments(partition)
+            partitions.append(
+                {
+                    "partition": partition,
+                    "resolution": self.manifest(partition)["resolution"],
+                    "segments": len(segments),
+                    "rows": sum(len(segment) for segment in segments),
+                    "bytes": sum(f.stat().st_size for s in segments for f in s.path.iterdir()),
+                }
+            )
+        return {
+            "partitions": partitions,
+            "rows": sum(p["rows"] for p in partitions),
+            "bytes": sum(p["bytes"] for p in partitions),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prediction history of the scored students")
+    parser.add_argument("student", nargs="?", help="studentId whose history is printed")
+    parser.add_argument("--dir", type=Path, default=HISTORY_DIR)
+    parser.add_argument("--start", help="first date included (ISO 8601)")
+    parser.add_argument("--end", help="first date excluded (ISO 8601)")
+    parser.add_argument("--points", type=int, help="downsample to this many points")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--compact", action="store_true", help="merge, downsample and expire")
+    parser.add_argument("--raw-days", type=int, default=RAW_DAYS)
+    parser.add_argument("--keep-days", type=int, default=KEEP_DAYS)
+    parser.add_argument("--stats", action="store_true", help="print the partitions")
+    args = parser.parse_args(argv)
+
+    if not args.dir.exists():
+        print(f"❌ No history at {args.dir} (run `mentoraid batch-predict ROSTER --history`)")
+        return 1
+    store = HistoryStore(args.dir)
+    if args.compact:
+        counts = store.compact(raw_days=args.raw_days, keep_days=args.keep_days)
+        print(
+            f"✓ Compacted: {counts['merged']} merged, {counts['downsampled']} downsampled, "
+            f"{counts['dropped']} dropped"
+        )
+    if args.stats:
+        stats = store.stats()
+        if args.json:
+            json.dump(stats, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            print(
+                f"📊 History {args.dir}: {stats['rows']:,} scores, "
+                f"{stats['bytes'] / 1e6:.1f} MB"
+            )
+            print(f"{'partition':>10} {'resolution':>10} {'segments':>9} {'rows':>12} {'MB':>8}")
+            for p in stats["partitions"]:
+                print(
+                    f"{p['partition']:>10} {p['resolution']:>10} {p['segments']:9} "
+                    f"{p['rows']:12,} {p['bytes'] / 1e6:8.2f}"
+                )
+    if args.student is None:
+        if not (args.compact or args.stats):
+            parser.error("a studentId, --compact or --stats is required")
+        return 0
+
+    if args.points:
+        rows = store.series(args.student, args.start, args.end, args.points)
+    else:
+        rows = store.history(args.student, args.start, args.end)
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    if not rows:
+        print(f"⚠️  No scores for {args.student}")
+        return 0
+    print(f"📊 {args.student}: {len(rows)} {'points' if args.points else 'scores'}")
+    for row in rows:
+        if args.points:
+            print(f"   {row['date']}  {row['riskScore']:3}  ({row['scores']} scores)")
+        else:
+            factors = ", ".join(f["feature"] for f in row["topFactors"])
+            print(
+                f"   {row['scoredAt'][:16]}  {row['riskScore']:3} {row['riskLevel']:>6}  "
+                f"{row['model']}  {factors}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+MentorAid - Global Feature Importance
+Permutation importance of each tuned model on the held-out split, computed
+in parallel over (feature, repeat) pairs with a process pool and cached in
+trained-models/feature_importance.json by model and data hash. The report
+generator and the dashboard read that file instead of hand-typed values.
+
+The tuned pickles were fit on every row, so each model is first refit with
+its tuned hyperparameters on the oversampled training fold; the held-out
+rows are never seen by the model that is scored on them.
+
+Usage:
+    python -m mentoraid.importance              # all models on disk
+    python -m mentoraid.importance svm knn --repeats 20
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .artifacts import file_hash, load_model
+from .config import MODEL_FILES, PRODUCTION_MODEL, TRAINED_MODELS_DIR
+from .preprocessing import (
+    held_out_split,
+    prepare_training_data,
+    random_oversample_indices,
+)
+from .schema import FeatureSchema
+
+IMPORTANCE_FILE = "feature_importance.json"
+DEFAULT_REPEATS = 10
+# Stored with every entry; entries computed another way are recomputed
+FIT = "train_split"
+
+# Worker-process state, set once per worker by _init_worker
+_worker = {}
+
+
+def _init_worker(model, X, y):
+    warnings.filterwarnings("ignore")
+    _worker["model"] = model
+    _worker["X"] = X
+    _worker["y"] = y
+
+
+def _accuracy(model, X, y):
+    return float((np.asarray(model.predict(X)) == y).mean())
+
+
+def _permuted_score(task):
+    """Accuracy with one column shuffled (runs in a worker process)"""
+    feature, repeat, seed = task
+    X = _worker["X"].copy()
+    rng = np.random.default_rng([seed, feature, repeat])
+    X[:, feature] = rng.permutation(X[:, feature])
+    return feature, repeat, _accuracy(_worker["model"], X, _worker["y"])
+
+
+def permutation_importance(model, X, y, n_repeats=DEFAULT_REPEATS, seed=42, n_jobs=None):
+    """
+    Mean accuracy drop when each feature is shuffled
+
+    Args:
+        model: Fitted classifier
+        X: Held-out feature matrix in model column order
+        y: Held-out labels
+        n_repeats: Shuffles per feature
+        seed: Base seed; every (feature, repeat) gets its own stream
+        n_jobs: Worker processes (defaults to os.cpu_count(); 1 runs inline)
+
+    Returns:
+        (baseline accuracy, importances (n_repeats, n_features))
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        baseline = _accuracy(model, X, y)
+
+    tasks = [(f, r, seed) for f in range(X.shape[1]) for r in range(n_repeats)]
+    scores = np.empty((n_repeats, X.shape[1]))
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    if n_jobs == 1:
+        _init_worker(model, X, y)
+        results = map(_permuted_score, tasks)
+        for feature, repeat, score in results:
+            scores[repeat, feature] = score
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_init_worker, initargs=(model, X, y)
+        ) as pool:
+            chunksize = max(1, len(tasks) // (4 * n_jobs))
+            for feature, repeat, score in pool.map(_permuted_score, tasks, chunksize=chunksize):
+                scores[repeat, feature] = score
+
+    return baseline, baseline - scores
+
+
+def refit_on_split(model, X_train, y_train, seed=42):
+    """
+    Copy of a tuned model fit on the training fold only
+
+    Args:
+        model: Tuned classifier (its hyperparameters are kept)
+        X_train: Training fold in model column order
+        y_train: Training labels
+        seed: Oversampling seed
+
+    Returns:
+        Clone of model fit on the oversampled training fold
+    """
+    from sklearn.base import clone
+
+    rows = random_oversample_indices(y_train, seed)
+    refit = clone(model)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        refit.fit(X_train[rows], y_train[rows])
+    return refit
+
+
+def _data_hash(X, y):
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X).tobytes())
+    digest.update(np.ascontiguousarray(y).tobytes())
+    return digest.hexdigest()
+
+
+def load_importances(models_dir=TRAINED_MODELS_DIR):
+    """Read the cached importance file ({} if it does not exist yet)"""
+    path = Path(models_dir) / IMPORTANCE_FILE
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def compute_importances(
+    names=None,
+    models_dir=TRAINED_MODELS_DIR,
+    n_repeats=DEFAULT_REPEATS,
+    n_jobs=None,
+    force=False,
+):
+    """
+    Compute (or reuse) permutation importance for each model
+
+    Each model is refit on the training fold of held_out_split before it is
+    scored on the test fold. A cached entry is reused when the model file
+    hash, the held-out data hash and n_repeats all match, so re-running after
+    a retrain only recomputes the models that changed.
+
+    Returns:
+        Dictionary model name -> cached entry (see IMPORTANCE_FILE)
+    """
+    models_dir = Path(models_dir)
+    names = [
+        name
+        for name in (names or MODEL_FILES)
+        if (models_dir / MODEL_FILES[name]).exists() and MODEL_FILES[name].endswith(".pkl")
+    ]
+    cache = load_importances(models_dir)
+
+    reference = FeatureSchema.from_model(
+        load_model(PRODUCTION_MODEL, models_dir), PRODUCTION_MODEL
+    )
+    _, X, y, _ = prepare_training_data(reference.feature_names)
+    X_train, X_test, y_train, y_test = held_out_split(X, y)
+    data_hash = _data_hash(X_test, y_test)
+
+    for name in names:
+        model_hash = file_hash(models_dir / MODEL_FILES[name])
+        entry = cache.get(name, {})
+        if (
+            not force
+            and entry.get("model_hash") == model_hash
+            and entry.get("data_hash") == data_hash
+            and entry.get("n_repeats") == n_repeats
+            and entry.get("fit") == FIT
+        ):
+            print(f"   ✓ {name}: cached")
+            continue
+
+        model = load_model(name, models_dir)
+        schema = FeatureSchema.from_model(model, name)
+        columns = schema.column_map(reference)
+        X_model = X_test[:, columns]
+
+        start = time.time()
+        model = refit_on_split(model, X_train[:, columns], y_train)
+        baseline, drops = permutation_importance(
+            model, X_model, y_test, n_repeats, n_jobs=n_jobs
+        )
+        elapsed = time.time() - start
+
+        mean = drops.mean(axis=0)
+        std = drops.std(axis=0)
+        order = np.argsort(-mean)
+        cache[name] = {
+            "model_hash": model_hash,
+            "data_hash": data_hash,
+            "n_repeats": n_repeats,
+            "fit": FIT,
+            "metric": "accuracy",
+            "baseline": round(baseline, 6),
+            "train_rows": int(len(y_train)),
+            "held_out_rows": int(len(y_test)),
+            "seconds": round(elapsed, 2),
+            "features": [
+                {
+                    "feature": schema.feature_names[i],
+                    "importance": round(float(mean[i]), 6),
+                    "std": round(float(std[i]), 6),
+                }
+                for i in order
+            ],
+        }
+        print(f"   ✓ {name}: computed in {elapsed:.1f}s")
+
+    with open(models_dir / IMPORTANCE_FILE, "w") as f:
+        json.dump(cache, f, indent=2)
+        f.write("\n")
+    return {name: cache[name] for name in names}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute permutation feature importance")
+    parser.add_argument("models", nargs="*", help=f"subset of {', '.join(MODEL_FILES)}")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="ignore the cache")
+    args = parser.parse_args(argv)
+    unknown = set(args.models) - set(MODEL_FILES)
+    if unknown:
+        parser.error(f"unknown models: {', '.join(sorted(unknown))}")
+
+    print("🔄 Computing permutation importance...")
+    results = compute_importances(
+        args.models or None, n_repeats=args.repeats, n_jobs=args.jobs, force=args.force
+    )
+    for name, entry in results.items():
+        top = ", ".join(f"{f['feature']} ({f['importance']:.4f})" for f in entry["features"][:3])
+        print(f"   {name}: {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+MentorAid - IQR Outlier Filter
+Per-column quartiles from a mergeable quantile sketch, and the IQR bounds
+(Q1 - 1.5*IQR, Q3 + 1.5*IQR) applied in one blocked NumPy pass.
+
+QuantileSketch is a KLL sketch over all columns at once: every row adds one
+value to each column, so the columns share one compaction schedule and each
+level is a single (items x columns) array. It is built in one streaming pass,
+and sketches of different shards or years merge into the sketch of their
+union. While a sketch has never compacted (up to k rows), its quantiles are
+exact and equal pandas' DataFrame.quantile.
+
+The fitted bounds are stored in trained-models/outlier_bounds.json (used at
+inference to flag students outside the training ranges) next to
+outlier_sketch.npz (to merge with later data).
+
+Usage:
+    python -m mentoraid.outliers datasets/dataset.csv
+    python -m mentoraid.outliers year-2024.csv --merge trained-models/outlier_sketch.npz
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .config import DATASET_PATH, TRAINED_MODELS_DIR
+
+BOUNDS_FILE = "outlier_bounds.json"
+SKETCH_FILE = "outlier_sketch.npz"
+
+# Exact up to this many rows; rank error ~1.7/k beyond
+SKETCH_K = 8192
+IQR_FACTOR = 1.5
+MASK_BLOCK_ROWS = 65_536
+
+
+class QuantileSketch:
+    """
+    KLL quantile sketch of every column of a row stream
+
+    Level h holds items of weight 2**h. A level over its capacity is sorted
+    (per column) and every other item, from a random offset, moves up a level.
+    """
+
+    def __init__(self, n_columns, k=SKETCH_K, seed=42):
+        self.n_columns = n_columns
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty((0, n_columns))]
+        self.rng = np.random.default_rng(seed)
+
+    @property
+    def exact(self):
+        """True while nothing has been compacted (quantiles are exact)"""
+        return len(self.levels) == 1
+
+    def _capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty((0, self.n_columns)))
+                items = np.sort(items, axis=0)
+                paired = len(items) - len(items) % 2
+                offset = int(self.rng.integers(2))
+                self.levels[level + 1] = np.vstack(
+                    [self.levels[level + 1], items[offset:paired:2]]
+                )
+                self.levels[level] = items[paired:]
+            level += 1
+
+    def update(self, X):
+        """Add a (rows x columns) block"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_columns:
+            raise ValueError(f"expected {self.n_columns} columns, got shape {X.shape}")
+        self.levels[0] = np.vstack([self.levels[0], X])
+        self.n += len(X)
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch of the same columns into this one"""
+        if other.n_columns != self.n_columns or other.k != self.k:
+            raise ValueError("can only merge sketches with the same columns and k")
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty((0, self.n_columns)))
+            self.levels[level] = np.vstack([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """
+        Per-column quantiles, ignoring NaN
+
+        Args:
+            q: Sequence of quantiles in [0, 1]
+
+        Returns:
+            Array of shape (len(q), n_columns)
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if self.exact:
+            # Linear interpolation, as pandas' DataFrame.quantile
+            return np.nanquantile(self.levels[0], q, axis=0)
+
+        items = np.vstack(self.levels)
+        weights = np.concatenate(
+            [np.full(len(level), 2.0**h) for h, level in enumerate(self.levels)]
+        )
+        order = np.argsort(items, axis=0)
+        values = np.take_along_axis(items, order, axis=0)
+        # NaN sorts last and carries no weight
+        cumulative = np.cumsum(np.where(np.isnan(values), 0.0, weights[order]), axis=0)
+        ranks = q[:, None] * cumulative[-1]
+        index = (cumulative[None, :, :] < ranks[:, None, :]).sum(axis=1)
+        index = np.minimum(index, len(values) - 1)
+        return np.take_along_axis(values, index, axis=0)
+
+    def to_arrays(self):
+        arrays = {f"level_{h}": items for h, items in enumerate(self.levels)}
+        arrays.update(n=np.int64(self.n), k=np.int64(self.k))
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, seed=42):
+        levels = sorted(
+            (int(key.split("_")[1]), arrays[key]) for key in arrays if key.startswith("level_")
+        )
+        sketch = cls(levels[0][1].shape[1], int(arrays["k"]), seed)
+        sketch.levels = [np.asarray(items, dtype=np.float64) for _, items in levels]
+        sketch.n = int(arrays["n"])
+        return sketch
+
+
+def _outward(bounds, dtype, direction):
+    """Cast bounds to dtype, rounding towards `direction` so no kept value flips"""
+    cast = bounds.astype(dtype)
+    wrong = cast > bounds if direction < 0 else cast < bounds
+    return np.where(wrong, np.nextafter(cast, dtype.type(direction * np.inf)), cast)
+
+
+class OutlierFilter:
+    """
+    IQR outlier bounds of a fixed list of numeric columns
+
+    Built from a QuantileSketch (fit / update / merge), or from stored bounds
+    only (load_bounds) for inference-time checks.
+    """
+
+    def __init__(self, columns, k=SKETCH_K, seed=42, sketch=None, bounds=None):
+        self.columns = list(columns)
+        self.sketch = sketch
+        if sketch is None and bounds is None:
+            self.sketch = QuantileSketch(len(self.columns), k, seed)
+        self._bounds = bounds
+
+    @classmethod
+    def from_frame(cls, students_df, k=SKETCH_K):
+        """Sketch every numeric column of a DataFrame"""
+        numeric = students_df.select_dtypes(include=[np.number])
+        return cls(numeric.columns, k).update(numeric.to_numpy(dtype=np.float64))
+
+    def update(self, X):
+        """Add rows laid out in self.columns order"""
+        if self.sketch is None:
+            raise ValueError("this filter holds stored bounds only")
+        self.sketch.update(X)
+        self._bounds = None
+        return self
+
+    def update_frame(self, students_df):
+        return self.update(students_df[self.columns].to_numpy(dtype=np.float64))
+
+    def merge(self, other):
+        if other.columns != self.columns:
+            raise ValueError("can only merge filters over the same columns")
+        self.sketch.merge(other.sketch)
+        self._bounds = None
+        return self
+
+    @property
+    def rows(self):
+        return self.sketch.n if self.sketch is not None else None
+
+    @property
+    def bounds(self):
+        """(lower, upper) float64 arrays, one entry per column"""
+        if self._bounds is None:
+            q1, q3 = self.sketch.quantile([0.25, 0.75])
+            iqr = q3 - q1
+            self._bounds = (q1 - IQR_FACTOR * iqr, q3 + IQR_FACTOR * iqr)
+        return self._bounds
+
+    def mask(self, X, block_rows=MASK_BLOCK_ROWS):
+        """
+        Rows with every value inside the bounds (NaN counts as inside)
+
+        X is compared block by block against bounds cast to its own dtype
+        (float32 matrices stay float32), so the only temporaries are two
+        boolean blocks regardless of the number of rows.
+        """
+        X = np.asarray(X)
+        if X.dtype not in (np.float32, np.float64):
+            X = X.astype(np.float32)
+        lower, upper = self.bounds
+        lower = _outward(lower, X.dtype, -1)
+        upper = _outward(upper, X.dtype, 1)
+
+        inside = np.empty(len(X), dtype=bool)
+        below = np.empty((min(block_rows, len(X)), X.shape[1]), dtype=bool)
+        above = np.empty_like(below)
+        for start in range(0, len(X), block_rows):
+            block = X[start : start + block_rows]
+            n = len(block)
+            np.less(block, lower, out=below[:n])
+            np.greater(block, upper, out=above[:n])
+            below[:n] |= above[:n]
+            np.any(below[:n], axis=1, out=inside[start : start + n])
+        return np.logical_not(inside, out=inside)
+
+    def apply(self, students_df):
+        """Copy of the DataFrame without outlier rows"""
+        X = students_df[self.columns].to_numpy(dtype=np.float32)
+        return students_df[self.mask(X)].copy()
+
+    def subset(self, columns):
+        """
+        Bounds-only filter for the columns of `columns` that this filter covers
+
+        Returns:
+            (OutlierFilter, indices of those columns within `columns`)
+        """
+        lower, upper = self.bounds
+        position = {column: i for i, column in enumerate(self.columns)}
+        index = np.array([i for i, c in enumerate(columns) if c in position], dtype=np.intp)
+        picked = [position[columns[i]] for i in index]
+        return OutlierFilter([columns[i] for i in index], bounds=(lower[picked], upper[picked])), index
+
+    def save(self, models_dir=TRAINED_MODELS_DIR):
+        """Write outlier_bounds.json and, when there is one, outlier_sketch.npz"""
+        models_dir = Path(models_dir)
+        lower, upper = self.bounds
+        data = {
+            "rows": self.rows,
+            "exact": self.sketch.exact if self.sketch is not None else None,
+            "iqr_factor": IQR_FACTOR,
+            "bounds": {
+                column: [float(lo), float(hi)]
+                for column, lo, hi in zip(self.columns, lower, upper)
+            },
+        }
+        with open(models_dir / BOUNDS_FILE, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        if self.sketch is not None:
+            with open(models_dir / SKETCH_FILE, "wb") as f:
+                np.savez_compressed(f, columns=np.array(self.columns), **self.sketch.to_arrays())
+
+    @classmethod
+    def load_sketch(cls, path):
+        with np.load(path) as arrays:
+            arrays = {key: arrays[key] for key in arrays.files}
+        return cls(arrays.pop("columns").tolist(), sketch=QuantileSketch.from_arrays(arrays))
+
+
+def load_bounds(models_dir=TRAINED_MODELS_DIR):
+    """Stored bounds as a bounds-only OutlierFilter, or None if none were saved"""
+    path = Path(models_dir) / BOUNDS_FILE
+    if not path.exists():
+        return None
+    with open(path) as f:
+        bounds = json.load(f)["bounds"]
+    lower, upper = np.array(list(bounds.values()), dtype=np.float64).T
+    return OutlierFilter(list(bounds), bounds=(lower, upper))
+
+
+def sketch_file(path, chunk_size=50_000, k=SKETCH_K):
+    """One streaming pass over a dataset.csv-shaped file"""
+    import pandas as pd
+
+    outlier_filter = None
+    for chunk in pd.read_csv(path, encoding="utf-8-sig", chunksize=chunk_size):
+        if outlier_filter is None:
+            numeric = chunk.select_dtypes(include=[np.number]).columns
+            outlier_filter = OutlierFilter(numeric, k)
+        outlier_filter.update_frame(chunk)
+    return outlier_filter
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit and store the IQR outlier bounds")
+    parser.add_argument("datasets", nargs="*", type=Path, default=[DATASET_PATH])
+    parser.add_argument(
+        "--merge", nargs="+", default=[], metavar="SKETCH", help="outlier_sketch.npz files to fold in"
+    )
+    parser.add_argument("--models-dir", type=Path, default=TRAINED_MODELS_DIR)
+    parser.add_argument("--k", type=int, default=SKETCH_K, help="sketch size")
+    args = parser.parse_args(argv)
+
+    filters = [sketch_file(path, k=args.k) for path in args.datasets]
+    filters += [OutlierFilter.load_sketch(path) for path in args.merge]
+    combined = filters[0]
+    for other in filters[1:]:
+        combined.merge(other)
+    combined.save(args.models_dir)
+
+    exact = "exact" if combined.sketch.exact else f"k={combined.sketch.k} sketch"
+    print(f"✓ Bounds for {len(combined.columns)} columns from {combined.rows:,} rows ({exact})")
+    print(f"✓ Saved {args.models_dir / BOUNDS_FILE} and {SKETCH_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""
+MentorAid - Out-of-Core Training
+Trains incremental models on student histories larger than memory. dataset.csv
+(or any file with the same columns) is read in chunks and never held whole:
+
+    pass 1  per-column quantile sketch (mentoraid.outliers) -> IQR bounds
+    pass 2  outlier filter + running mean/variance (the StandardScaler) while
+            the kept Dropout/Graduate rows are staged to a float32 memmap
+    train   balanced mini-batches drawn as index arrays over the memmap,
+            fed to partial_fit for a few epochs
+
+While the file has no more rows than the sketch size k, the quartiles, the
+kept rows and the scaler are exactly those of prepare_training_data; beyond
+that the quartiles carry the sketch's rank error.
+
+Usage:
+    python notebooks/hyperparameter_tuning.py --out-of-core [--dataset big.csv]
+    python -m mentoraid.outofcore --dataset histories.csv --chunk-size 100000
+"""
+
+import argparse
+import json
+import pickle
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from .config import (
+    DATASET_PATH,
+    FEATURES_TO_REMOVE,
+    TARGET_COLUMN,
+    TARGET_MAPPING,
+    TRAINED_MODELS_DIR,
+)
+from .instrumentation import span
+from .outliers import SKETCH_K, OutlierFilter
+from .preprocessing import random_oversample_indices
+
+OUT_OF_CORE_DIR = TRAINED_MODELS_DIR / "out-of-core"
+SUMMARY_FILE = "out_of_core.json"
+
+CHUNK_ROWS = 50_000
+
+
+class RunningMoments:
+    """Per-column count, mean and sum of squared deviations (Chan et al. merge)"""
+
+    def __init__(self, n_columns):
+        self.n = 0
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+
+    def update(self, X):
+        if not len(X):
+            return
+        X = np.asarray(X, dtype=np.float64)
+        n, mean = len(X), X.mean(axis=0)
+        m2 = ((X - mean) ** 2).sum(axis=0)
+
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + m2 + delta**2 * (self.n * n / total)
+        self.n = total
+
+    @property
+    def scale(self):
+        """Population standard deviation, 1 for constant columns (as StandardScaler)"""
+        std = np.sqrt(self.m2 / max(self.n, 1))
+        return np.where(std == 0, 1.0, std)
+
+
+def iter_chunks(path, chunk_size=CHUNK_ROWS):
+    """DataFrame chunks of a dataset.csv-shaped file"""
+    import pandas as pd
+
+    return pd.read_csv(path, encoding="utf-8-sig", chunksize=chunk_size)
+
+
+def training_features(columns):
+    """Model inputs: every column except the target and FEATURES_TO_REMOVE"""
+    return [c for c in columns if c != TARGET_COLUMN and c not in FEATURES_TO_REMOVE]
+
+
+def scan_bounds(path, chunk_size=CHUNK_ROWS, k=SKETCH_K):
+    """
+    Pass 1: sketch every numeric column
+
+    Returns:
+        OutlierFilter over the numeric columns
+    """
+    outlier_filter = None
+    for chunk in iter_chunks(path, chunk_size):
+        if outlier_filter is None:
+            numeric = chunk.select_dtypes(include=[np.number]).columns
+            outlier_filter = OutlierFilter(numeric, k)
+        outlier_filter.update_frame(chunk)
+    return outlier_filter
+
+
+def stage_rows(path, outlier_filter, work_dir, chunk_size=CHUNK_ROWS, test_size=0.2, seed=42):
+    """
+    Pass 2: filter outliers, accumulate scaler statistics and stage training rows
+
+    The scaler is fitted on every kept row (Enrolled included), as in
+    prepare_training_data. Kept Dropout/Graduate rows are appended as float32
+    to train.f32 / test.f32 in work_dir; a uniform draw per row assigns it to
+    the held-out part.
+
+    Returns:
+        Dictionary with the feature names, RunningMoments, memmapped X/y for
+        "train" and "test", and row counts
+    """
+    import pandas as pd
+
+    work_dir = Path(work_dir)
+    rng = np.random.default_rng(seed)
+    features = None
+    moments = None
+    labels = {"train": [], "test": []}
+    files = {part: open(work_dir / f"{part}.f32", "wb") for part in labels}
+    kept = 0
+    try:
+        for chunk in iter_chunks(path, chunk_size):
+            if features is None:
+                features = training_features(chunk.columns)
+                moments = RunningMoments(len(features))
+
+            numeric = chunk[outlier_filter.columns].to_numpy(dtype=np.float32)
+            chunk = chunk[outlier_filter.mask(numeric)]
+            kept += len(chunk)
+
+            X = chunk[features].to_numpy(dtype=np.float64)
+            moments.update(X)
+
+            y = chunk[TARGET_COLUMN].map(TARGET_MAPPING).to_numpy()
+            binary = pd.notna(y) & (y != TARGET_MAPPING["Enrolled"])
+            X, y = X[binary], y[binary].astype(np.int8)
+            held_out = rng.random(len(y)) < test_size
+            for part, rows in (("train", ~held_out), ("test", held_out)):
+                files[part].write(X[rows].astype(np.float32).tobytes())
+                labels[part].append(y[rows])
+    finally:
+        for f in files.values():
+            f.close()
+
+    staged = {"features": features, "moments": moments, "clean_rows": kept}
+    for part in labels:
+        y = np.concatenate(labels[part]) if labels[part] else np.empty(0, np.int8)
+        shape = (len(y), len(features))
+        if len(y):
+            X = np.memmap(work_dir / f"{part}.f32", dtype=np.float32, mode="r", shape=shape)
+        else:
+            X = np.empty(shape, dtype=np.float32)
+        staged[part] = (X, y)
+    return staged
+
+
+def balanced_batches(y, batch_size, seed):
+    """
+    One epoch of class-balanced mini-batches as sorted row-index arrays
+
+    Minority rows are repeated by index (random_oversample_indices); the
+    feature rows themselves are never copied into a balanced matrix.
+    """
+    rng = np.random.default_rng(seed)
+    order = random_oversample_indices(y, seed)
+    rng.shuffle(order)
+    for start in range(0, len(order), batch_size):
+        # Sorted indices read the memmap front to back
+        yield np.sort(order[start : start + batch_size])
+
+
+def make_models(n_features, seed=42):
+    """
+    Incremental stand-ins for the tuned models
+
+    Returns:
+        Dictionary name -> (estimator with partial_fit, optional feature map)
+    """
+    from sklearn.kernel_approximation import RBFSampler
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.neural_network import MLPClassifier
+
+    rbf = RBFSampler(gamma=1.0 / n_features, n_components=1000, random_state=seed)
+    rbf.fit(np.zeros((1, n_features)))
+    return {
+        "sgd_logistic": (SGDClassifier(loss="log_loss", alpha=1e-4, random_state=seed), None),
+        "sgd_rbf_svm": (SGDClassifier(loss="hinge", alpha=1e-4, random_state=seed), rbf),
+        "mlp": (
+            MLPClassifier(hidden_layer_sizes=(64, 32), learning_rate_init=1e-3, random_state=seed),
+            None,
+        ),
+    }
+
+
+def _metrics(predictions, y):
+    """Accuracy and balanced accuracy (mean recall of Dropout and Graduate)"""
+    recalls = [float((predictions[y == c] == c).mean()) for c in (0, 1) if (y == c).any()]
+    return {
+        "accuracy": round(float((predictions == y).mean()), 4),
+        "balanced_accuracy": round(float(np.mean(recalls)), 4),
+    }
+
+
+def train_out_of_core(
+    dataset_path=DATASET_PATH,
+    output_dir=OUT_OF_CORE_DIR,
+    chunk_size=CHUNK_ROWS,
+    sketch_k=SKETCH_K,
+    batch_size=1024,
+    epochs=5,
+    seed=42,
+    work_dir=None,
+):
+    """
+    Run both streaming passes and train every incremental model
+
+    Args:
+        dataset_path: dataset.csv-shaped file, possibly larger than memory
+        output_dir: Where the models and out_of_core.json are written
+        chunk_size: Rows read per chunk
+        sketch_k: Quantile sketch size for the IQR quartiles
+        batch_size: Rows per partial_fit call
+        epochs: Passes over the balanced training indices
+        seed: Seed for sampling, the held-out split and the models
+        work_dir: Directory for the staged memmaps (a temporary one by default)
+
+    Returns:
+        The summary dictionary written to out_of_core.json
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timings = {}
+
+    with span("outofcore.bounds") as bounds_span:
+        outlier_filter = scan_bounds(dataset_path, chunk_size, sketch_k)
+    timings["bounds"] = bounds_span.elapsed
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        with span("outofcore.stage") as stage_span:
+            staged = stage_rows(dataset_path, outlier_filter, tmp, chunk_size, seed=seed)
+        timings["stage"] = stage_span.elapsed
+        mean, scale = staged["moments"].mean, staged["moments"].scale
+        X_train, y_train = staged["train"]
+        X_test, y_test = staged["test"]
+
+        models = make_models(len(staged["features"]), seed)
+        with span("outofcore.train") as train_span:
+            for epoch in range(epochs):
+                for rows in balanced_batches(y_train, batch_size, seed + epoch):
+                    X = (X_train[rows] - mean) / scale
+                    for model, feature_map in models.values():
+                        X_model = X if feature_map is None else feature_map.transform(X)
+                        with warnings.catch_warnings():
+                            warnings.simplefilter("ignore")
+                            model.partial_fit(X_model, y_train[rows], classes=[0, 1])
+        timings["train"] = train_span.elapsed
+
+        results = {}
+        for name, (model, feature_map) in models.items():
+            predictions = np.empty(len(y_test), dtype=np.int64)
+            for begin in range(0, len(y_test), chunk_size):
+                X = (X_test[begin : begin + chunk_size] - mean) / scale
+                if feature_map is not None:
+                    X = feature_map.transform(X)
+                predictions[begin : begin + chunk_size] = model.predict(X)
+            results[name] = _metrics(predictions, y_test) if len(y_test) else {}
+
+            with open(output_dir / f"{name}.pkl", "wb") as f:
+                pickle.dump({"model": model, "feature_map": feature_map}, f)
+
+    summary = {
+        "dataset": str(dataset_path),
+        "rows": {
+            "raw": int(outlier_filter.rows),
+            "clean": int(staged["clean_rows"]),
+            "train": int(len(y_train)),
+            "test": int(len(y_test)),
+            "train_dropout": int((y_train == 0).sum()),
+        },
+        "feature_names": staged["features"],
+        "outlier_bounds": {
+            column: [float(lo), float(hi)]
+            for column, lo, hi in zip(outlier_filter.columns, *outlier_filter.bounds)
+        },
+        "scaler": {"mean": mean.tolist(), "scale": scale.tolist()},
+        "training": {"chunk_size": chunk_size, "batch_size": batch_size, "epochs": epochs},
+        "seconds": {k: round(v, 2) for k, v in timings.items()},
+        "models": results,
+    }
+    with open(output_dir / SUMMARY_FILE, "w") as f:
+        json.dump(summary, f, indent=2)
+        f.write("\n")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core training on chunked CSV data")
+    parser.add_argument("--dataset", type=Path, default=DATASET_PATH)
+    parser.add_argument("--output-dir", type=Path, default=OUT_OF_CORE_DIR)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_ROWS)
+    parser.add_argument(
+        "--sketch-k", type=int, default=SKETCH_K, help="quantile sketch size for the IQR quartiles"
+    )
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--work-dir", help="directory for the staged memmaps")
+    args = parser.parse_args(argv)
+
+    print(f"🔄 Out-of-core training on {args.dataset} ({args.chunk_size:,}-row chunks)...")
+    summary = train_out_of_core(
+        args.dataset,
+        args.output_dir,
+        args.chunk_size,
+        args.sketch_k,
+        args.batch_size,
+        args.epochs,
+        work_dir=args.work_dir,
+    )
+
+    rows = summary["rows"]
+    print(
+        f"✓ Rows: {rows['raw']:,} read, {rows['clean']:,} after the IQR filter, "
+        f"{rows['train']:,} train / {rows['test']:,} held out"
+    )
+    print("⏱️  " + ", ".join(f"{k} {v:.1f}s" for k, v in summary["seconds"].items()))
+    for name, metrics in summary["models"].items():
+        print(
+            f"   • {name}: accuracy {metrics.get('accuracy', float('nan')):.4f}, "
+            f"balanced {metrics.get('balanced_accuracy', float('nan')):.4f}"
+        )
+    print(f"✓ Models and {SUMMARY_FILE} saved to {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+MentorAid - Fast Prediction Path
+Scores students with the production RBF SVM using NumPy only.
+
+Unpickling the SVC imports scikit-learn (and with it SciPy), and fitting the
+scaler needs pandas and dataset.csv; together that is seconds of start-up for
+a single prediction. export_runtime() therefore compiles the model once into
+<name>_runtime.npz: the support vectors, dual coefficients, intercept, gamma
+and the fitted scaler's mean/scale, bound to the model file's hash like the
+calibrator. Predictor evaluates the same decision function from those arrays
+and applies the stored calibrator, so a cold prediction only imports NumPy.
+
+Usage:
+    python -m mentoraid.predict students.json
+    python -m mentoraid.predict --export
+    mentoraid batch-predict roster.csv      # see mentoraid.cli
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from .artifacts import file_hash
+from .calibration import DROPOUT_CLASS, load_calibrator, risk_level, risk_score
+from .config import MODEL_FILES, PRODUCTION_MODEL, TRAINED_MODELS_DIR
+from .instrumentation import span
+from .outliers import load_bounds
+from .schema import FeatureSchema, SchemaError
+
+# Rows per chunk when streaming a CSV roster through batch scoring
+BATCH_CHUNK_ROWS = 50_000
+# Rows per (rows x support vectors) kernel block, ~28 MB for the tuned SVM
+KERNEL_BLOCK_ROWS = 4096
+
+
+class RuntimeArtifactError(ValueError):
+    """Raised when a compiled runtime artifact is missing or belongs to another model"""
+
+
+def runtime_path(name=PRODUCTION_MODEL, models_dir=TRAINED_MODELS_DIR):
+    return Path(models_dir) / f"{name}_runtime.npz"
+
+
+def export_runtime(name=PRODUCTION_MODEL, models_dir=TRAINED_MODELS_DIR, dataset_path=None):
+    """
+    Compile a tuned RBF SVM and its scaler into <name>_runtime.npz
+
+    This is the slow step (scikit-learn, pandas, dataset.csv); it runs once
+    per trained model, from the tuning script or `--export`.
+
+    Args:
+        name: Key of MODEL_FILES
+        models_dir: Directory holding the trained artifacts
+        dataset_path: dataset.csv the scaler is fitted on (defaults to config)
+
+    Returns:
+        Path of the written file
+    """
+    from .artifacts import load_model
+    from .preprocessing import prepare_training_data
+
+    model = load_model(name, models_dir)
+    if getattr(model, "kernel", None) != "rbf" or not hasattr(model, "support_vectors_"):
+        raise ValueError(f"{name}: the runtime path supports fitted RBF SVMs only")
+
+    schema = FeatureSchema.from_model(model, name)
+    args = (schema.feature_names,) if dataset_path is None else (schema.feature_names, dataset_path)
+    _, _, _, scaler = prepare_training_data(*args)
+
+    classes = np.asarray(model.classes_)
+    # decision_function is positive for classes_[1]; the score rises with dropout risk
+    score_sign = 1.0 if classes[1] == DROPOUT_CLASS else -1.0
+    support_vectors = np.asarray(model.support_vectors_, dtype=np.float64)
+
+    path = runtime_path(name, models_dir)
+    with open(path, "wb") as f:
+        np.savez(
+            f,
+            feature_names=np.array(schema.feature_names),
+            classes=classes,
+            support_vectors=support_vectors,
+            dual_coef=np.asarray(model.dual_coef_, dtype=np.float64).ravel(),
+            intercept=np.float64(np.ravel(model.intercept_)[0]),
+            gamma=np.float64(model._gamma),
+            score_sign=np.float64(score_sign),
+            scaler_mean=np.asarray(scaler.mean_, dtype=np.float64),
+            scaler_scale=np.asarray(scaler.scale_, dtype=np.float64),
+            model_hash=np.array(file_hash(Path(models_dir) / MODEL_FILES[name])),
+        )
+    return path
+
+
+class RuntimeSVM:
+    """
+    RBF SVM decision function evaluated from exported arrays
+
+    ||x - s||^2 is expanded as ||x||^2 + ||s||^2 - 2 x.s, so a block of rows
+    costs one (rows x features) @ (features x support vectors) product.
+    Batches are evaluated KERNEL_BLOCK_ROWS rows at a time, which keeps the
+    kernel matrix small regardless of the batch size.
+    """
+
+    def __init__(self, arrays):
+        self.schema = FeatureSchema(arrays["feature_names"].tolist(), "runtime")
+        self.classes_ = arrays["classes"]
+        self.support_vectors = arrays["support_vectors"]
+        self.dual_coef = arrays["dual_coef"]
+        self.intercept = float(arrays["intercept"])
+        self.gamma = float(arrays["gamma"])
+        self.score_sign = float(arrays["score_sign"])
+        self.mean = arrays["scaler_mean"]
+        self.scale = arrays["scaler_scale"]
+        self.model_hash = str(arrays["model_hash"])
+        self._sv_sq = np.einsum("ij,ij->i", self.support_vectors, self.support_vectors)
+
+    @classmethod
+    def load(cls, path):
+        with span("model.load.runtime"), np.load(path) as arrays:
+            return cls({key: arrays[key] for key in arrays.files})
+
+    def scale_rows(self, X):
+        """Apply the training StandardScaler to raw feature rows"""
+        return (np.asarray(X, dtype=np.float64) - self.mean) / self.scale
+
+    def decision_function(self, X, block_rows=KERNEL_BLOCK_ROWS):
+        """Same values as SVC.decision_function for already scaled rows"""
+        X = np.asarray(X, dtype=np.float64)
+        if len(X) <= block_rows:
+            return self._decision_block(X)
+        out = np.empty(len(X))
+        for start in range(0, len(X), block_rows):
+            out[start : start + block_rows] = self._decision_block(X[start : start + block_rows])
+        return out
+
+    def _decision_block(self, X):
+        sq = X @ self.support_vectors.T
+        sq *= -2.0
+        sq += np.einsum("ij,ij->i", X, X)[:, None]
+        sq += self._sv_sq
+        np.maximum(sq, 0.0, out=sq)
+        sq *= -self.gamma
+        return np.exp(sq, out=sq) @ self.dual_coef + self.intercept
+
+    def dropout_score(self, X):
+        return self.score_sign * self.decision_function(X)
+
+
+def load_runtime(name=PRODUCTION_MODEL, models_dir=TRAINED_MODELS_DIR, rebuild=True):
+    """
+    Load <name>_runtime.npz, checking it was exported from the current model file
+
+    Args:
+        name: Key of MODEL_FILES
+        models_dir: Directory holding the trained artifacts
+        rebuild: Re-export a missing or stale artifact instead of raising
+
+    Raises:
+        RuntimeArtifactError: If the artifact is missing or stale and rebuild is False
+    """
+    path = runtime_path(name, models_dir)
+    model_hash = file_hash(Path(models_dir) / MODEL_FILES[name])
+    if path.exists():
+        runtime = RuntimeSVM.load(path)
+        if runtime.model_hash == model_hash:
+            return runtime
+        problem = f"{name}: {path.name} was exported from a different model file"
+    else:
+        problem = f"{name}: no runtime artifact at {path}"
+
+    if not rebuild:
+        raise RuntimeArtifactError(problem)
+    return RuntimeSVM.load(export_runtime(name, models_dir))
+
+
+class Predictor:
+    """
+    Calibrated dropout risk for raw student records
+
+    Records are mappings of feature name -> value (dataset.csv columns); the
+    result matches score_roster(), i.e. the calibrated production SVM on
+    StandardScaler-transformed rows. Students with a feature outside the
+    training IQR bounds (outlier_bounds.json) are flagged as outOfRange: the
+    model never saw such rows, so their score deserves a second look.
+    """
+
+    def __init__(self, name=PRODUCTION_MODEL, models_dir=TRAINED_MODELS_DIR):
+        self.name = name
+        self.runtime = load_runtime(name, models_dir)
+        self.calibrator = load_calibrator(name, models_dir)
+        self.bounds = load_bounds(models_dir)
+        if self.bounds is not None:
+            self.bounds, self._bounds_index = self.bounds.subset(self.schema.feature_names)
+
+    @property
+    def schema(self):
+        return self.runtime.schema
+
+    @property
+    def version(self):
+        """Model name and model file hash (svm@3f9c2a1b7d4e)"""
+        return f"{self.name}@{self.runtime.model_hash[:12]}"
+
+    def dropout_probability(self, X):
+        """Calibrated P(dropout) for a raw (unscaled) feature matrix"""
+        with span("predict.score", rows=len(X)):
+            scaled = self.runtime.scale_rows(X)
+            return self.calibrator.transform(self.runtime.dropout_score(scaled))
+
+    def out_of_range(self, X):
+        """True for raw feature rows outside the training outlier bounds"""
+        if self.bounds is None:
+            return np.zeros(len(X), dtype=bool)
+        return ~self.bounds.mask(np.asarray(X)[:, self._bounds_index])
+
+    def predict(self, records):
+        """
+        Args:
+            records: Sequence of student records
+
+        Returns:
+            List of {"dropoutProbability", "riskScore", "riskLevel", "outOfRange"}
+            dictionaries
+        """
+        with span("predict.vectorize", rows=len(records)):
+            X = self.schema.vectorize_many(records)
+        return self.predict_matrix(X)
+
+    def predict_matrix(self, X):
+        """predict() for a raw feature matrix in schema order"""
+        probabilities = self.dropout_probability(X)
+        return [
+            {
+                "dropoutProbability": round(float(p), 4),
+                "riskScore": int(s),
+                "riskLevel": str(l),
+                "outOfRange": bool(o),
+            }
+            for p, s, l, o in zip(
+                probabilities,
+                risk_score(probabilities),
+                risk_level(probabilities),
+                self.out_of_range(X),
+            )
+        ]
+
+
+def score_file(
+    predictor,
+    input_path,
+    output_path,
+    chunk_size=BATCH_CHUNK_ROWS,
+    store=None,
+    history=None,
+    explain=None,
+):
+    """
+    Score a roster file, adding dropoutProbability, riskScore, riskLevel and outOfRange
+
+    CSV rosters are streamed in chunks and written as they are scored, so the
+    memory use does not grow with the roster. JSON rosters (a list of Student
+    objects) are scored in one batch.
+
+    Args:
+        predictor: Predictor (e.g. ModelRegistry.predictor())
+        input_path: Roster .csv or .json carrying the model features
+        output_path: Scored roster; .json writes records, anything else CSV
+        chunk_size: CSV rows scored per batch
+        store: RiskStore (mentoraid.riskstore) updated with every scored
+            chunk. Rosters without a studentId column are keyed by file
+            name and row number.
+        history: HistoryStore (mentoraid.history) every score is appended to
+        explain: Optional function of a raw feature matrix returning its
+            attributions, stored with the scores in history
+
+    Returns:
+        Number of students scored
+    """
+    import pandas as pd
+
+    from .cohorts import load_roster
+
+    input_path, output_path = Path(input_path), Path(output_path)
+    if input_path.suffix == ".json":
+        chunks = [load_roster(input_path)]
+    else:
+        chunks = pd.read_csv(input_path, encoding="utf-8-sig", chunksize=chunk_size)
+
+    columns = list(predictor.schema.feature_names)
+    scored = []
+    rows = 0
+    for chunk in chunks:
+        missing, _ = predictor.schema.diff(list(chunk.columns))
+        if missing:
+            raise SchemaError(f"{input_path.name} is missing features {missing}")
+        X = chunk[columns].to_numpy(dtype=np.float64)
+        probabilities = predictor.dropout_probability(X)
+        chunk = chunk.assign(
+            dropoutProbability=probabilities.round(4),
+            riskScore=risk_score(probabilities),
+            riskLevel=risk_level(probabilities),
+            outOfRange=predictor.out_of_range(X),
+        )
+        if (store is not None or history is not None) and "studentId" not in chunk:
+            ids = [f"{input_path.stem}:{i}" for i in range(rows, rows + len(chunk))]
+            keyed = chunk.assign(studentId=ids)
+        else:
+            keyed = chunk
+        if store is not None:
+            with span("batch.store", rows=len(chunk)):
+                store.upsert(keyed, predictor.name)
+        if history is not None:
+            attributions = None
+            if explain is not None:
+                with span("batch.explain", rows=len(chunk)):
+                    attributions = explain(X)
+            with span("batch.history", rows=len(chunk)):
+                history.append(
+                    keyed["studentId"],
+                    probabilities,
+                    version=predictor.version,
+                    attributions=attributions,
+                    feature_names=columns,
+                )
+        if output_path.suffix == ".json":
+            scored.append(chunk)
+        else:
+            with span("batch.write", rows=len(chunk)):
+                chunk.to_csv(output_path, mode="a" if rows else "w", header=not rows, index=False)
+        rows += len(chunk)
+
+    if output_path.suffix == ".json":
+        pd.concat(scored).to_json(output_path, orient="records", indent=2)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Predict dropout risk for students")
+    parser.add_argument(
+        "records", nargs="?", help="JSON file with one student record or a list ('-' for stdin)"
+    )
+    parser.add_argument(
+        "--export", action="store_true", help="Compile the runtime artifact and exit"
+    )
+    args = parser.parse_args(argv)
+
+    if args.export:
+        print(f"✓ Saved {export_runtime()}")
+        return
+    if args.records is None:
+        parser.error("records is required unless --export is given")
+
+    try:
+        if args.records == "-":
+            records = json.load(sys.stdin)
+        else:
+            with open(args.records) as f:
+                records = json.load(f)
+        single = isinstance(records, dict)
+
+        predictions = Predictor().predict([records] if single else records)
+    except ValueError as e:  # SchemaError, or records that are not JSON
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    json.dump(predictions[0] if single else predictions, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+MentorAid - Pre-Fork Prediction Server
+Runs the prediction service in several worker processes that share one
+copy of the loaded models.
+
+The master loads every artifact in trained-models/ that can be loaded: the
+calibrated SVM runtime, the sklearn pickles (knn_tuned_model.pkl carries the
+whole training set) and the Keras model when TensorFlow is installed. It
+then binds the listening socket and forks the workers. Their memory starts
+out shared copy-on-write with the master: model arrays, imported modules
+and the interpreter itself. Each worker accepts connections from the shared
+socket, and the kernel spreads connections over the workers.
+
+Two things would otherwise turn shared pages into private copies:
+
+- The cyclic garbage collector writes to the header of every tracked object
+  it visits. The master calls gc.freeze() just before forking, which moves
+  every loaded object into a permanent generation that the workers never
+  scan.
+- Threads do not survive fork, so each worker builds its own
+  PredictionService after the fork. That covers the micro-batcher thread,
+  the drift monitor and the counters. Only the loaded models are shared.
+
+Reference counts still change as objects are used, so pages holding model
+objects that are touched per request become private. Large NumPy buffers
+(support vectors, training rows) stay shared, because their data lives
+outside the object headers.
+
+A worker that dies is restarted. SIGTERM or Ctrl-C stops every worker, and
+workers exit by themselves if the master dies.
+
+Usage:
+    mentoraid serve --workers 4 [--no-preload]
+"""
+
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+from .config import PRODUCTION_MODEL
+from .server import DEFAULT_PORT, PredictionServer, PredictionService
+
+
+def preload(registry, model=PRODUCTION_MODEL):
+    """
+    Load the predictor and every loadable artifact into the registry
+
+    Returns:
+        dict name -> reason, for the artifacts that could not be loaded
+    """
+    skipped = {}
+    registry.predictor(model)
+    for name in registry.available():
+        try:
+            registry[name]
+        except ImportError as e:
+            skipped[name] = f"{e.name or e} not installed"
+    return skipped
+
+
+def memory(pid):
+    """
+    Memory of a process from /proc/<pid>/smaps_rollup (Linux)
+
+    Returns:
+        {"rss", "pss", "uss"} in bytes, or None where smaps are unavailable.
+        uss counts the pages only this process uses; pss splits shared pages
+        evenly between the processes sharing them.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+
+    def kib(field):
+        return int(fields.get(field, "0 kB").split()[0]) * 1024
+
+    return {
+        "rss": kib("Rss"),
+        "pss": kib("Pss"),
+        "uss": kib("Private_Clean") + kib("Private_Dirty"),
+    }
+
+
+class PreforkServer:
+    """
+    Master process of the pre-fork prediction server
+
+    Args:
+        registry: ModelRegistry shared by the workers
+        workers: Number of worker processes
+        host, port: Listening address (port 0 picks a free port)
+        preload: Load the models in the master before forking. Without it,
+            every worker loads its own copy after the fork.
+        model: Model the workers serve
+        service_options: Keyword arguments of PredictionService
+            (drift_window, max_batch, ...)
+    """
+
+    def __init__(
+        self,
+        registry,
+        workers,
+        host="127.0.0.1",
+        port=DEFAULT_PORT,
+        preload=True,
+        model=PRODUCTION_MODEL,
+        service_options=None,
+    ):
+        self.registry = registry
+        self.workers = workers
+        self.address = (host, port)
+        self.preload = preload
+        self.model = model
+        self.service_options = service_options or {}
+        self.socket = None
+        self.skipped = {}
+        # pid -> {"slot", "started", "ready"}
+        self.children = {}
+        self.load_seconds = None
+        self._stopping = False
+
+    @property
+    def port(self):
+        return self.socket.getsockname()[1]
+
+    def start(self):
+        """
+        Load the models (with preload), bind and fork every worker
+
+        Returns once every worker is accepting connections.
+        """
+        if self.preload:
+            start = time.perf_counter()
+            self.skipped = preload(self.registry, self.model)
+            self.load_seconds = time.perf_counter() - start
+
+        self.socket = socket.create_server(self.address, backlog=PredictionServer.request_queue_size)
+        for pid, ready in self._fork(range(self.workers)):
+            self._wait_ready(pid, ready)
+        return self
+
+    def _fork(self, slots):
+        """Fork a worker per slot from a frozen heap; returns [(pid, ready pipe)]"""
+        if self.preload:
+            gc.collect()
+            gc.freeze()
+        try:
+            return [self._spawn(slot) for slot in slots]
+        finally:
+            if self.preload:
+                gc.unfreeze()
+
+    def _spawn(self, slot):
+        ready_r, ready_w = os.pipe()
+        started = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            self._worker(ready_w)
+        os.close(ready_w)
+        self.children[pid] = {"slot": slot, "started": started, "ready": None}
+        return pid, ready_r
+
+    def _wait_ready(self, pid, ready_r):
+        with os.fdopen(ready_r, "rb") as pipe:
+            ok = pipe.read(1) == b"1"
+        if ok:
+            self.children[pid]["ready"] = time.perf_counter() - self.children[pid]["started"]
+
+    def _worker(self, ready_w):
+        # Runs in the child; never returns
+        status = 1
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, _exit_on_signal)
+            if not self.preload:
+                self.skipped = preload(self.registry, self.model)
+            service = PredictionService(self.registry, self.model, **self.service_options)
+            server = PredictionServer(self.socket.getsockname(), service, bind_and_activate=False)
+            server.socket.close()
+            server.socket = self.socket
+            # Checked every poll interval: exit when the master is gone
+            master = os.getppid()
+            server.service_actions = lambda: os.getppid() != master and _exit_on_signal(0, None)
+            os.write(ready_w, b"1")
+            os.close(ready_w)
+            try:
+                server.serve_forever()
+            except SystemExit:
+                pass
+            finally:
+                service.close()
+            status = 0
+        except BaseException as e:
+            print(f"❌ Worker {os.getpid()}: {e}", file=sys.stderr)
+        finally:
+            os._exit(status)
+
+    def stats(self):
+        """Per-worker startup seconds and memory, plus the master's memory"""
+        return {
+            "master": memory(os.getpid()),
+            "workers": [
+                dict(pid=pid, slot=child["slot"], startup=child["ready"], memory=memory(pid))
+                for pid, child in sorted(self.children.items(), key=lambda c: c[1]["slot"])
+            ],
+        }
+
+    def supervise(self):
+        """Restart workers that die until stop() or a signal"""
+        signal.signal(signal.SIGTERM, _exit_on_signal)
+        try:
+            while not self._stopping:
+                pid, status = os.wait()
+                child = self.children.pop(pid, None)
+                if child is None or self._stopping:
+                    continue
+                print(
+                    f"⚠️  Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; "
+                    "restarting",
+                    file=sys.stderr,
+                )
+                for pid, ready in self._fork([child["slot"]]):
+                    self._wait_ready(pid, ready)
+        except (KeyboardInterrupt, SystemExit, ChildProcessError):
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Terminate every worker and close the socket"""
+        self._stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self.children):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            self.children.pop(pid, None)
+        if self.socket is not None:
+            self.socket.close()
+
+
+def _exit_on_signal(signum, frame):
+    raise SystemExit(0)
+
+
+def serve_prefork(server):
+    """Start a PreforkServer, print its startup report and supervise it"""
+    server.start()
+    host = server.address[0]
+    print(f"🚀 Serving {server.model} on http://{host}:{server.port} with {server.workers} workers")
+    if server.load_seconds is not None:
+        print(f"   models loaded once in the master in {server.load_seconds:.2f}s")
+    for name, reason in server.skipped.items():
+        print(f"   {name} skipped: {reason}")
+    print_stats(server.stats())
+    server.supervise()
+
+
+def print_stats(stats):
+    mb = 1024 * 1024
+    master = stats["master"]
+    if master is not None:
+        print(f"   master            RSS {master['rss'] / mb:7.1f} MB")
+    for worker in stats["workers"]:
+        usage = worker["memory"]
+        memory_text = (
+            f"RSS {usage['rss'] / mb:7.1f} MB  unique {usage['uss'] / mb:6.1f} MB  "
+            f"PSS {usage['pss'] / mb:6.1f} MB"
+            if usage
+            else "memory n/a"
+        )
+        startup = f"{worker['startup']:.3f}s" if worker["startup"] is not None else "failed"
+        print(f"   worker {worker['slot']:<2} {worker['pid']:>7}  ready {startup:>7}  {memory_text}")
@@ -0,0 +1,115 @@
+"""
+MentorAid - Data Preprocessing
+The dataset cleaning steps shared by tuning, validation and prediction:
+IQR outlier removal, target encoding and StandardScaler fitting.
+pandas and scikit-learn are imported inside the functions that use them, so
+importing this module (e.g. for random_oversample_indices) stays cheap.
+"""
+
+import numpy as np
+
+from .config import DATASET_PATH, TARGET_COLUMN, TARGET_MAPPING
+from .instrumentation import span
+from .outliers import OutlierFilter
+
+
+def load_dataset(path=DATASET_PATH):
+    """Read dataset.csv (the file starts with a UTF-8 BOM)"""
+    import pandas as pd
+
+    with span("preprocess.load") as load_span:
+        students_df = pd.read_csv(path, encoding="utf-8-sig")
+        load_span.rows = len(students_df)
+    return students_df
+
+
+def remove_outliers_iqr(students_df):
+    """
+    Drop every row with a numeric value outside [Q1 - 1.5*IQR, Q3 + 1.5*IQR]
+
+    Args:
+        students_df: Raw student DataFrame
+
+    Returns:
+        Copy of the DataFrame without outlier rows
+    """
+    with span("preprocess.outliers", rows=len(students_df)):
+        return OutlierFilter.from_frame(students_df).apply(students_df)
+
+
+def fit_scaler(students_df, feature_names):
+    """
+    Fit a StandardScaler on exactly the given columns, in the given order
+
+    The scaler is fitted on a plain float array so that vectorized student
+    rows (see FeatureSchema.vectorize) can be transformed directly.
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    with span("preprocess.scaling", rows=len(students_df)):
+        scaler = StandardScaler()
+        scaler.fit(students_df[list(feature_names)].to_numpy(dtype=np.float64))
+    return scaler
+
+
+def encode_target(students_df, drop_enrolled=True):
+    """
+    Map the Target column to integers (Dropout=0, Graduate=1, Enrolled=2)
+
+    Args:
+        students_df: DataFrame with a string Target column
+        drop_enrolled: Remove still-enrolled students (the models are binary)
+
+    Returns:
+        (DataFrame, integer label array)
+    """
+    labels = students_df[TARGET_COLUMN].map(TARGET_MAPPING)
+    if drop_enrolled:
+        keep = (labels != TARGET_MAPPING["Enrolled"]).to_numpy()
+        students_df = students_df[keep]
+        labels = labels[keep]
+    return students_df, labels.to_numpy(dtype=np.int64)
+
+
+def prepare_training_data(feature_names, dataset_path=DATASET_PATH):
+    """
+    Run the full training preprocessing on dataset.csv
+
+    Args:
+        feature_names: Model column order (see FeatureSchema)
+        dataset_path: Path to dataset.csv
+
+    Returns:
+        (cleaned DataFrame without Enrolled rows, scaled X, labels y, scaler)
+    """
+    students_df = remove_outliers_iqr(load_dataset(dataset_path))
+    scaler = fit_scaler(students_df, feature_names)
+    students_df, y = encode_target(students_df)
+    X = scaler.transform(students_df[list(feature_names)].to_numpy(dtype=np.float64))
+    return students_df, X, y, scaler
+
+
+def held_out_split(X, y, test_size=0.2, seed=42):
+    """Stratified 80/20 split, the same one the tuning script uses for the NN"""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(X, y, test_size=test_size, random_state=seed, stratify=y)
+
+
+def random_oversample_indices(y, seed=42):
+    """
+    Row indices that balance every class up to the majority count
+
+    Equivalent to imblearn's RandomOverSampler, but returns indices into the
+    original rows instead of a copied matrix.
+    """
+    with span("preprocess.oversample", rows=len(y)):
+        rng = np.random.default_rng(seed)
+        classes, counts = np.unique(y, return_counts=True)
+        target = counts.max()
+        indices = [np.arange(len(y))]
+        for label, count in zip(classes, counts):
+            if count < target:
+                members = np.flatnonzero(y == label)
+                indices.append(rng.choice(members, size=target - count, replace=True))
+        return np.concatenate(indices)
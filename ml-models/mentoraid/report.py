@@ -0,0 +1,366 @@
+"""
+MentorAid - Report Data and Section Cache
+Collects the figures the documentation generator renders (dataset statistics,
+tuning_results.csv, the tuning journal and permutation importance) and renders
+the report section by section. A section whose template and inputs are
+unchanged is restored from its cached XML instead of being rebuilt.
+"""
+
+import ast
+import csv
+import datetime
+import hashlib
+import inspect
+import json
+import types
+from collections import namedtuple
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+
+from .config import (
+    DATASET_PATH,
+    ML_MODELS_DIR,
+    PRODUCTION_MODEL,
+    TARGET_COLUMN,
+    TRAINED_MODELS_DIR,
+)
+
+TUNING_RESULTS_FILE = "tuning_results.csv"
+TUNING_JOURNAL_FILE = "tuning_journal.json"
+REPORT_CACHE_DIR = ML_MODELS_DIR / ".report_cache"
+
+# tuning_results.csv labels models for display ("SVM (Advanced)", ...)
+_RESULT_PREFIXES = {
+    "Random Forest": "rf",
+    "Decision Tree": "dt",
+    "Logistic Regression": "lr",
+    "SVM": "svm",
+    "KNN": "knn",
+    "Neural Network": "nn",
+}
+
+ModelResult = namedtuple(
+    "ModelResult",
+    "key label default tuned improvement best_params tuning_time",
+)
+ModelResult.__doc__ = """
+One row of tuning_results.csv
+
+default and tuned are CV accuracies (fractions), improvement is the relative
+gain in percent and tuning_time is in seconds (None when not recorded).
+best_params is a dict, or the raw string for models tuned by hand (NN).
+"""
+
+_DatasetSummary = namedtuple(
+    "DatasetSummary",
+    "raw_rows raw_columns int_columns float_columns clean_rows binary_rows "
+    "dropout_rows graduate_rows resampled_rows n_features",
+)
+
+
+class DatasetSummary(_DatasetSummary):
+    """Row and column counts at each preprocessing step"""
+
+    __slots__ = ()
+
+    @property
+    def outlier_rows(self):
+        return self.raw_rows - self.clean_rows
+
+    @property
+    def imbalance_ratio(self):
+        """Majority : minority class size"""
+        return max(self.dropout_rows, self.graduate_rows) / max(
+            1, min(self.dropout_rows, self.graduate_rows)
+        )
+
+    @property
+    def imbalance(self):
+        ratio = self.imbalance_ratio
+        if ratio < 1.5:
+            return "Mild imbalance"
+        if ratio < 3:
+            return "Moderate imbalance"
+        return "Severe imbalance"
+
+
+def summarize_dataset(raw_df, clean_df, y, n_features, resampled_rows=None):
+    """
+    Collect the dataset figures quoted throughout the report
+
+    Args:
+        raw_df: dataset.csv as loaded
+        clean_df: DataFrame after IQR outlier removal
+        y: Binary labels after dropping Enrolled (Dropout=0, Graduate=1)
+        n_features: Number of model input features
+        resampled_rows: Training rows after oversampling (defaults to a
+            balanced 2 x majority class)
+
+    Returns:
+        DatasetSummary
+    """
+    features = raw_df.drop(columns=[TARGET_COLUMN])
+    counts = np.bincount(np.asarray(y, dtype=np.int64), minlength=2)
+    return DatasetSummary(
+        raw_rows=len(raw_df),
+        raw_columns=features.shape[1],
+        int_columns=int(sum(dtype.kind in "iu" for dtype in features.dtypes)),
+        float_columns=int(sum(dtype.kind == "f" for dtype in features.dtypes)),
+        clean_rows=len(clean_df),
+        binary_rows=int(counts.sum()),
+        dropout_rows=int(counts[0]),
+        graduate_rows=int(counts[1]),
+        resampled_rows=int(resampled_rows or 2 * counts.max()),
+        n_features=int(n_features),
+    )
+
+
+def write_tuning_journal(path, dataset, search_spaces, tuning_seconds):
+    """
+    Record what a tuning run saw, next to tuning_results.csv
+
+    Args:
+        path: Output JSON path
+        dataset: DatasetSummary of the data the models were tuned on
+        search_spaces: Dictionary model name -> parameter grid
+        tuning_seconds: Dictionary model name -> wall time of the search
+    """
+    journal = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "dataset": dataset._asdict(),
+        "search_spaces": search_spaces,
+        "tuning_seconds": {k: round(v, 1) for k, v in tuning_seconds.items()},
+    }
+    with open(path, "w") as f:
+        json.dump(journal, f, indent=2, default=str)
+        f.write("\n")
+
+
+def _parse_params(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def _parse_seconds(text):
+    text = text.strip()
+    if text.endswith("s"):
+        try:
+            return float(text[:-1])
+        except ValueError:
+            pass
+    return None
+
+
+def load_tuning_results(models_dir=TRAINED_MODELS_DIR):
+    """
+    Read tuning_results.csv
+
+    Returns:
+        Dictionary model name -> ModelResult, in file order
+    """
+    results = {}
+    with open(Path(models_dir) / TUNING_RESULTS_FILE, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            label = row["Model"]
+            key = next(
+                (k for prefix, k in _RESULT_PREFIXES.items() if label.startswith(prefix)),
+                label,
+            )
+            results[key] = ModelResult(
+                key=key,
+                label=label,
+                default=float(row["Default Accuracy"]),
+                tuned=float(row["Tuned Accuracy"]),
+                improvement=float(row["Improvement"].rstrip("%")),
+                best_params=_parse_params(row["Best Params"]),
+                tuning_time=_parse_seconds(row["Tuning Time"]),
+            )
+    return results
+
+
+def format_params(params):
+    """Best parameters as "name=value, ..." (strings are passed through)"""
+    if not isinstance(params, dict):
+        return str(params)
+    return ", ".join(f"{name}={value}" for name, value in sorted(params.items()))
+
+
+class ReportData:
+    """
+    Everything the report sections read, loaded once per generation
+
+    Dataset figures come from the tuning journal when one exists (they then
+    describe exactly the data the models were tuned on) and are recomputed
+    from dataset.csv otherwise.
+    """
+
+    def __init__(self, models_dir=TRAINED_MODELS_DIR, dataset_path=DATASET_PATH):
+        self.models_dir = Path(models_dir)
+        self.dataset_path = Path(dataset_path)
+        self.generated_on = datetime.date.today()
+        self.models = load_tuning_results(self.models_dir)
+
+        journal_path = self.models_dir / TUNING_JOURNAL_FILE
+        self.journal = {}
+        if journal_path.exists():
+            with open(journal_path) as f:
+                self.journal = json.load(f)
+
+    @cached_property
+    def dataset(self):
+        if "dataset" in self.journal:
+            return DatasetSummary(**self.journal["dataset"])
+
+        from .artifacts import load_model
+        from .preprocessing import encode_target, load_dataset, remove_outliers_iqr
+        from .schema import FeatureSchema
+
+        schema = FeatureSchema.from_model(
+            load_model(PRODUCTION_MODEL, self.models_dir), PRODUCTION_MODEL
+        )
+        raw_df = load_dataset(self.dataset_path)
+        clean_df = remove_outliers_iqr(raw_df)
+        _, y = encode_target(clean_df)
+        return summarize_dataset(raw_df, clean_df, y, len(schema))
+
+    @cached_property
+    def importance(self):
+        from .importance import compute_importances
+
+        return compute_importances(models_dir=self.models_dir)
+
+    def results(self, *names):
+        """ModelResult for each name, e.g. svm, rf = data.results("svm", "rf")"""
+        missing = [name for name in names if name not in self.models]
+        if missing:
+            raise KeyError(f"{TUNING_RESULTS_FILE} has no results for {missing}")
+        return [self.models[name] for name in names]
+
+    def ranked(self):
+        """Tuning results ordered by tuned accuracy, best first"""
+        return sorted(self.models.values(), key=lambda r: -r.tuned)
+
+    def inputs(self, name):
+        """JSON-serialisable value of one named input (part of the cache key)"""
+        if name == "date":
+            return self.generated_on.isoformat()
+        if name == "dataset":
+            return self.dataset._asdict()
+        if name == "tuning":
+            return [result._asdict() for result in self.models.values()]
+        if name == "importance":
+            return self.importance
+        raise KeyError(f"unknown report input {name!r}")
+
+
+Section = namedtuple("Section", "key render inputs")
+
+
+def _code_names(code):
+    """Global names referenced by a code object and its nested functions"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _fingerprint(func, digest, seen):
+    """Hash a function's source and, recursively, the globals it uses"""
+    if func in seen:
+        return
+    seen.add(func)
+    digest.update(inspect.getsource(func).encode())
+    for name in sorted(_code_names(func.__code__)):
+        value = func.__globals__.get(name)
+        if isinstance(value, types.FunctionType):
+            _fingerprint(value, digest, seen)
+        elif isinstance(value, (str, int, float, tuple, list, dict)):
+            digest.update(f"{name}={value!r}".encode())
+
+
+class ReportTemplate:
+    """
+    Ordered report sections with a per-section render cache
+
+    Sections are registered with the @template.section(key, inputs) decorator
+    and called as render(doc, data). The cache key of a section is the hash of
+    its source (plus every helper function and constant it references) and of
+    the ReportData inputs it declares, so editing one section or retraining
+    one model only rebuilds the sections that show it.
+    """
+
+    def __init__(self):
+        self.sections = []
+
+    def section(self, key, inputs=()):
+        """Decorator registering a section renderer"""
+
+        def register(render):
+            self.sections.append(Section(key, render, tuple(inputs)))
+            return render
+
+        return register
+
+    def cache_key(self, section, data):
+        import docx
+
+        digest = hashlib.sha256(docx.__version__.encode())
+        _fingerprint(section.render, digest, set())
+        inputs = {name: data.inputs(name) for name in section.inputs}
+        digest.update(json.dumps(inputs, sort_keys=True, default=str).encode())
+        return digest.hexdigest()[:16]
+
+    def render(self, data, cache_dir=REPORT_CACHE_DIR, use_cache=True):
+        """
+        Build the document
+
+        Args:
+            data: ReportData
+            cache_dir: Directory holding the cached section XML
+            use_cache: False rebuilds every section (the cache is still refreshed)
+
+        Returns:
+            (python-docx Document, {"cached": [...], "rendered": [...]})
+        """
+        from docx import Document
+        from docx.oxml import parse_xml
+        from lxml import etree
+
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        doc = Document()
+        body = doc.element.body
+        sect_pr = body.sectPr
+        stats = {"cached": [], "rendered": []}
+
+        for section in self.sections:
+            path = cache_dir / f"{section.key}-{self.cache_key(section, data)}.xml"
+
+            if use_cache and path.exists():
+                fragment = parse_xml(path.read_bytes())
+                for element in list(fragment):
+                    sect_pr.addprevious(element)
+                stats["cached"].append(section.key)
+                continue
+
+            existing = set(body)
+            section.render(doc, data)
+            fragment = etree.Element("section")
+            fragment.extend(
+                etree.fromstring(etree.tostring(element))
+                for element in body
+                if element not in existing and element is not sect_pr
+            )
+
+            for stale in cache_dir.glob(f"{section.key}-*.xml"):
+                stale.unlink()
+            path.write_bytes(etree.tostring(fragment))
+            stats["rendered"].append(section.key)
+
+        return doc, stats
@@ -0,0 +1,481 @@
+"""
+MentorAid - Risk Store
+Materialized table of scored students plus pre-aggregated rollups for the
+dashboard's DashboardStats and ChartsSection, in a local SQLite file.
+
+    students        one row per studentId: the dashboard Student fields and
+                    the latest dropoutProbability / riskScore / riskLevel
+    risk_rollup     per (dimension, value, riskLevel): students, riskScore
+                    sum, attendance sum and count. Dimensions are "all",
+                    department, class and feeStatus.
+    risk_histogram  per (dimension, value, bucket): students per riskScore
+                    decile (90-100 is the last bucket)
+
+The rollups are never recomputed from scratch. Each upsert() loads the
+scored chunk into a temporary table. In one transaction, it subtracts the
+current rows of those students from the rollups, adds the new rows and
+replaces the students. The cost grows with the chunk, not the roster. A
+dashboard page reads a few dozen rollup rows instead of aggregating the
+roster. rebuild() recomputes the rollups from the students table, which
+gives the same result.
+
+query() pages through the students for StudentTable. Rows can be filtered
+on riskLevel, department, class, feeStatus, a riskScore range and a
+name/studentId search. They are sorted on riskScore, name, attendance or
+studentId, and only the requested fields are returned. Pages use keyset
+cursors: a cursor holds the sort key and studentId of the last row, and the
+next page starts right after it. Composite indexes end in the sort key and
+studentId, so every page is an index range scan of `limit` rows, however
+deep it is. OFFSET would skip all earlier rows on every page:
+
+    (riskLevel, riskScore, studentId)    (department, riskScore, studentId)
+    ("class", riskScore, studentId)      (riskScore, studentId)
+    (IFNULL(name, ''), studentId)        (IFNULL(attendance, -1), studentId)
+
+Name and attendance are sorted through IFNULL(), so rosters without those
+fields still have a total order and cursors never hold NULL.
+
+Batch scoring feeds the store (`mentoraid batch-predict roster.csv --store`).
+The prediction service serves it on GET /dashboard and GET /students
+(`serve --risk-store`). `mentoraid stats` prints the dashboard summary.
+
+Usage:
+    mentoraid batch-predict roster.csv --store
+    mentoraid stats [--db store/risk.sqlite] [--json] [--rebuild]
+"""
+
+import argparse
+import base64
+import datetime
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+from .config import STORE_DIR
+
+RISK_DB = STORE_DIR / "risk.sqlite"
+# Grouping columns of the rollups, besides "all"
+DIMENSIONS = ("department", "class", "feeStatus")
+RISK_LEVELS = ("low", "medium", "high")
+HISTOGRAM_BUCKETS = 10
+# Sort name -> key expression; every key has an index ending in studentId
+SORT_KEYS = {
+    "riskScore": "riskScore",
+    "name": "IFNULL(name, '')",
+    "attendance": "IFNULL(attendance, -1)",
+    "studentId": "studentId",
+}
+# Columns query() filters on by equality (one value or a list)
+FILTERS = ("riskLevel", "department", "class", "feeStatus")
+DEFAULT_LIMIT = 50
+CACHE_KIB = 64 * 1024
+MAX_LIMIT = 500
+# students columns, in table order
+STUDENT_COLUMNS = (
+    "studentId",
+    "name",
+    "department",
+    "class",
+    "feeStatus",
+    "attendance",
+    "averageMarks",
+    "dropoutProbability",
+    "riskScore",
+    "riskLevel",
+    "outOfRange",
+    "model",
+    "scoredAt",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    studentId TEXT PRIMARY KEY,
+    name TEXT,
+    department TEXT,
+    "class" TEXT,
+    feeStatus TEXT,
+    attendance REAL,
+    averageMarks REAL,
+    dropoutProbability REAL NOT NULL,
+    riskScore INTEGER NOT NULL,
+    riskLevel TEXT NOT NULL,
+    outOfRange INTEGER,
+    model TEXT,
+    scoredAt TEXT
+);
+CREATE TABLE IF NOT EXISTS risk_rollup (
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    riskLevel TEXT NOT NULL,
+    students INTEGER NOT NULL,
+    riskScoreSum INTEGER NOT NULL,
+    attendanceSum REAL NOT NULL,
+    attendanceRows INTEGER NOT NULL,
+    PRIMARY KEY (dimension, value, riskLevel)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS risk_histogram (
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    students INTEGER NOT NULL,
+    PRIMARY KEY (dimension, value, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS students_risk ON students (riskLevel, riskScore, studentId);
+CREATE INDEX IF NOT EXISTS students_department ON students (department, riskScore, studentId);
+CREATE INDEX IF NOT EXISTS students_class ON students ("class", riskScore, studentId);
+CREATE INDEX IF NOT EXISTS students_score ON students (riskScore, studentId);
+CREATE INDEX IF NOT EXISTS students_name ON students (IFNULL(name, ''), studentId);
+CREATE INDEX IF NOT EXISTS students_attendance ON students (IFNULL(attendance, -1), studentId);
+"""
+
+
+class QueryError(ValueError):
+    """Raised for invalid student query parameters"""
+
+
+def _encode_cursor(sort, key, student_id):
+    data = json.dumps([sort, key, student_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _decode_cursor(cursor, sort):
+    """(sort key, studentId) of a cursor made for the same sort"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, key, student_id = json.loads(data)
+    except (TypeError, ValueError):
+        raise QueryError("invalid cursor") from None
+    if cursor_sort != sort:
+        raise QueryError(f"cursor was made for sort={cursor_sort}, not sort={sort}")
+    return key, student_id
+
+
+def _by_dimension(source):
+    """SQL expanding every row of `source` into one row per rollup dimension"""
+    columns = "riskLevel, riskScore, attendance"
+    parts = [f"SELECT 'all' AS dimension, '' AS value, {columns} FROM {source}"]
+    parts += [f"SELECT '{d}', COALESCE(\"{d}\", ''), {columns} FROM {source}" for d in DIMENSIONS]
+    return " UNION ALL ".join(parts)
+
+
+def _add_rollups(source, sign):
+    """Statements adding (sign=1) or subtracting (sign=-1) the rows of `source`"""
+    expanded = _by_dimension(source)
+    bucket = f"MIN(riskScore / {100 // HISTOGRAM_BUCKETS}, {HISTOGRAM_BUCKETS - 1})"
+    return [
+        f"""
+        INSERT INTO risk_rollup
+        SELECT dimension, value, riskLevel, {sign} * COUNT(*), {sign} * SUM(riskScore),
+               {sign} * TOTAL(attendance), {sign} * COUNT(attendance)
+        FROM ({expanded}) WHERE true GROUP BY dimension, value, riskLevel
+        ON CONFLICT (dimension, value, riskLevel) DO UPDATE SET
+            students = students + excluded.students,
+            riskScoreSum = riskScoreSum + excluded.riskScoreSum,
+            attendanceSum = attendanceSum + excluded.attendanceSum,
+            attendanceRows = attendanceRows + excluded.attendanceRows
+        """,
+        f"""
+        INSERT INTO risk_histogram
+        SELECT dimension, value, {bucket} AS bucket, {sign} * COUNT(*)
+        FROM ({expanded}) WHERE true GROUP BY dimension, value, bucket
+        ON CONFLICT (dimension, value, bucket) DO UPDATE SET
+            students = students + excluded.students
+        """,
+    ]
+
+
+_UPSERT = [
+    # Current rows of the incoming students, read once for both rollups
+    "INSERT INTO outgoing SELECT students.* FROM incoming JOIN students USING (studentId)",
+    *_add_rollups("outgoing", -1),
+    *_add_rollups("incoming", 1),
+    f"""
+    INSERT INTO students SELECT * FROM incoming WHERE true ORDER BY studentId
+    ON CONFLICT (studentId) DO UPDATE SET
+        {", ".join(f'"{c}" = excluded."{c}"' for c in STUDENT_COLUMNS[1:])}
+    """,
+    "DELETE FROM risk_rollup WHERE students = 0",
+    "DELETE FROM risk_histogram WHERE students = 0",
+    "DELETE FROM incoming",
+    "DELETE FROM outgoing",
+]
+
+
+class RiskStore:
+    """
+    SQLite store of scored students and their dashboard rollups
+
+    One connection is shared by the threads of the prediction service;
+    queries read a few rollup rows, so they are serialized with a lock.
+
+    Args:
+        path: SQLite file (created with its tables when missing)
+    """
+
+    def __init__(self, path=RISK_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        # Readers (the service) are not blocked by a batch job writing
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # Re-scored students are spread over every index; the default 2 MB
+        # page cache makes each refresh re-read index pages from disk
+        self._db.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+        self._db.executescript(_SCHEMA)
+        # Sampled ANALYZE: milliseconds on a million students
+        self._db.execute("PRAGMA analysis_limit=1000")
+        self._lock = threading.Lock()
+        self._analyzed_rows = self._statistics_rows()
+
+    def _statistics_rows(self):
+        """Students counted by the last ANALYZE (0 without statistics)"""
+        try:
+            row = self._db.execute(
+                "SELECT stat FROM sqlite_stat1 WHERE idx = 'students_score'"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return 0
+        return int(row[0].split()[0]) if row else 0
+
+    def close(self):
+        self._db.close()
+
+    def upsert(self, scored, model=None):
+        """
+        Insert or replace scored students and update the rollups
+
+        Args:
+            scored: DataFrame with studentId, dropoutProbability, riskScore
+                and riskLevel; the other Student columns may be missing
+            model: Model name recorded with the rows
+
+        Returns:
+            Number of rows written
+        """
+        scored = scored.drop_duplicates("studentId", keep="last")
+        columns = scored.reindex(columns=STUDENT_COLUMNS)
+        columns["studentId"] = columns["studentId"].astype(str)
+        columns["model"] = model
+        columns["scoredAt"] = datetime.datetime.now().isoformat(timespec="seconds")
+        # NaN (missing Student fields) is stored as NULL by SQLite
+        rows = zip(*(columns[c].tolist() for c in STUDENT_COLUMNS))
+
+        with self._lock, self._db:
+            for table in ("incoming", "outgoing"):
+                self._db.execute(
+                    f"CREATE TEMP TABLE IF NOT EXISTS {table} AS SELECT * FROM students WHERE false"
+                )
+            self._db.executemany(
+                f"INSERT INTO incoming VALUES ({', '.join('?' * len(STUDENT_COLUMNS))})", rows
+            )
+            for statement in _UPSERT:
+                self._db.execute(statement)
+            # The planner picks the filter index from the statistics: without
+            # them a class + riskLevel page scans the whole class
+            ((students,),) = self._db.execute(
+                "SELECT TOTAL(students) FROM risk_rollup WHERE dimension = 'all'"
+            ).fetchall()
+            if students > 2 * self._analyzed_rows:
+                self._db.execute("ANALYZE")
+                self._analyzed_rows = students
+        return len(scored)
+
+    def rebuild(self):
+        """Recompute every rollup from the students table"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM risk_rollup")
+            self._db.execute("DELETE FROM risk_histogram")
+            for statement in _add_rollups("students", 1):
+                self._db.execute(statement)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def rollup(self, dimension="all"):
+        """
+        Student counts per value and riskLevel of a dimension
+
+        Returns:
+            {value: {"low": n, "medium": n, "high": n, "averageRiskScore": x}}
+        """
+        rows = self._query(
+            "SELECT value, riskLevel, students, riskScoreSum FROM risk_rollup "
+            "WHERE dimension = ? ORDER BY value",
+            (dimension,),
+        )
+        groups = {}
+        for value, level, students, score_sum in rows:
+            group = groups.setdefault(value, dict.fromkeys(RISK_LEVELS, 0) | {"_sum": 0})
+            group[level] = students
+            group["_sum"] += score_sum
+        for group in groups.values():
+            total = sum(group[level] for level in RISK_LEVELS)
+            group["averageRiskScore"] = round(group.pop("_sum") / total, 1) if total else None
+        return groups
+
+    def histogram(self, dimension="all", value=""):
+        """Students per riskScore decile (0-9, ..., 90-100)"""
+        counts = [0] * HISTOGRAM_BUCKETS
+        for bucket, students in self._query(
+            "SELECT bucket, students FROM risk_histogram WHERE dimension = ? AND value = ?",
+            (dimension, value),
+        ):
+            counts[bucket] = students
+        return counts
+
+    def stats(self):
+        """The DashboardStats numbers (src/pages/Dashboard.tsx)"""
+        ((students, at_risk, attendance_sum, attendance_rows),) = self._query(
+            "SELECT TOTAL(students), TOTAL(CASE WHEN riskLevel != 'low' THEN students END), "
+            "TOTAL(attendanceSum), TOTAL(attendanceRows) "
+            "FROM risk_rollup WHERE dimension = 'all'"
+        )
+        ((pending,),) = self._query(
+            "SELECT TOTAL(students) FROM risk_rollup "
+            "WHERE dimension = 'feeStatus' AND value IN ('pending', 'overdue')"
+        )
+        attendance = round(attendance_sum / attendance_rows) if attendance_rows else None
+        return {
+            "totalStudents": int(students),
+            "atRiskStudents": int(at_risk),
+            "averageAttendance": attendance,
+            "pendingFees": int(pending),
+        }
+
+    def query(
+        self,
+        where=None,
+        sort="-riskScore",
+        limit=DEFAULT_LIMIT,
+        cursor=None,
+        fields=None,
+        search=None,
+    ):
+        """
+        One page of students, as returned by GET /students
+
+        Args:
+            where: {column: value or list of values} for the FILTERS columns,
+                plus "minRiskScore" / "maxRiskScore"
+            sort: A SORT_KEYS name; a leading "-" sorts descending. Ties are
+                ordered by studentId.
+            limit: Students per page (at most MAX_LIMIT)
+            cursor: nextCursor of the previous page
+            fields: Columns returned per student (default: all)
+            search: Case-insensitive substring of name or studentId
+
+        Returns:
+            {"students": [...], "nextCursor": cursor or None at the end}
+
+        Raises:
+            QueryError: For unknown columns, sorts, limits or cursors
+        """
+        descending = sort.startswith("-")
+        key = SORT_KEYS.get(sort.lstrip("-"))
+        if key is None:
+            raise QueryError(f"cannot sort on {sort!r} (one of {', '.join(SORT_KEYS)})")
+        if not 1 <= limit <= MAX_LIMIT:
+            raise QueryError(f"limit must be between 1 and {MAX_LIMIT}")
+        fields = list(fields or STUDENT_COLUMNS)
+        unknown = [f for f in fields if f not in STUDENT_COLUMNS]
+        if unknown:
+            raise QueryError(f"unknown fields {unknown}")
+
+        conditions, params = [], []
+        for column, value in (where or {}).items():
+            if column in ("minRiskScore", "maxRiskScore"):
+                conditions.append(f"riskScore {'>=' if column == 'minRiskScore' else '<='} ?")
+                params.append(int(value))
+            elif column in FILTERS:
+                values = [value] if isinstance(value, str) else list(value)
+                conditions.append(f'"{column}" IN ({", ".join("?" * len(values))})')
+                params += values
+            else:
+                raise QueryError(f"cannot filter on {column!r}")
+        if search:
+            conditions.append("(name LIKE ? OR studentId LIKE ?)")
+            params += [f"%{search}%"] * 2
+        if cursor:
+            after, student_id = _decode_cursor(cursor, sort)
+            op = "<" if descending else ">"
+            if key.isidentifier():
+                conditions.append(f"({key}, studentId) {op} (?, ?)")
+                params += [after, student_id]
+            else:
+                # SQLite does not range-scan an expression index on a row value
+                conditions.append(f"{key} {op}= ? AND ({key} {op} ? OR studentId {op} ?)")
+                params += [after, after, student_id]
+
+        order = "DESC" if descending else "ASC"
+        columns = ", ".join(f'"{field}"' for field in fields)
+        sql = (
+            f"SELECT {columns}, {key}, studentId FROM students"
+            f"{' WHERE ' + ' AND '.join(conditions) if conditions else ''}"
+            f" ORDER BY {key} {order}, studentId {order} LIMIT ?"
+        )
+        rows = self._query(sql, params + [limit])
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = _encode_cursor(sort, rows[-1][-2], rows[-1][-1])
+        return {
+            "students": [dict(zip(fields, row)) for row in rows],
+            "nextCursor": next_cursor,
+        }
+
+    def dashboard(self):
+        """DashboardStats plus the ChartsSection series, as returned by GET /dashboard"""
+        levels = self.rollup("all").get("", dict.fromkeys(RISK_LEVELS, 0))
+        return {
+            "stats": self.stats(),
+            "riskDistribution": {level: levels[level] for level in RISK_LEVELS},
+            "departments": [
+                {"department": value, **{level: group[level] for level in RISK_LEVELS}}
+                for value, group in self.rollup("department").items()
+            ],
+            "scoreHistogram": self.histogram(),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard statistics from the risk store")
+    parser.add_argument("--db", type=Path, default=RISK_DB)
+    parser.add_argument("--json", action="store_true", help="print GET /dashboard as JSON")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="recompute the rollups from the students table"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"❌ No risk store at {args.db} (run `mentoraid batch-predict ROSTER --store`)")
+        return 1
+    store = RiskStore(args.db)
+    if args.rebuild:
+        store.rebuild()
+        print("✓ Rollups rebuilt")
+    if args.json:
+        json.dump(store.dashboard(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    stats = store.stats()
+    print(f"📊 Risk store {args.db}")
+    print(f"   students        {stats['totalStudents']:,}")
+    print(f"   at risk         {stats['atRiskStudents']:,}")
+    print(f"   attendance      {stats['averageAttendance']}%")
+    print(f"   pending fees    {stats['pendingFees']:,}")
+    for dimension in DIMENSIONS:
+        print(f"\n{dimension:>16} {'low':>9} {'medium':>9} {'high':>9} {'avg score':>10}")
+        for value, group in store.rollup(dimension).items():
+            print(
+                f"{value or '(none)':>16} {group['low']:9,} {group['medium']:9,} "
+                f"{group['high']:9,} {group['averageRiskScore']:10}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+MentorAid - Feature Schema Registry
+Derives the exact column layout each trained model expects from its
+feature_names_in_ and compiles it once into a fast record -> array mapping.
+"""
+
+from operator import itemgetter
+
+import numpy as np
+
+from .config import PRODUCTION_MODEL
+
+
+class SchemaError(ValueError):
+    """Raised when a record or an artifact does not match a model's features"""
+
+
+class FeatureSchema:
+    """
+    Ordered feature layout of a single model
+
+    The layout is compiled into an itemgetter, so turning a student record
+    (dict or parsed JSON object) into a feature row is a single C-level call
+    writing straight into a preallocated float array.
+    """
+
+    def __init__(self, feature_names, name="model"):
+        self.name = name
+        self.feature_names = tuple(str(feature) for feature in feature_names)
+        if not self.feature_names:
+            raise SchemaError(f"{name}: empty feature list")
+        if len(set(self.feature_names)) != len(self.feature_names):
+            raise SchemaError(f"{name}: duplicate feature names")
+
+        self.index = {feature: i for i, feature in enumerate(self.feature_names)}
+        self._getter = itemgetter(*self.feature_names)
+
+    @classmethod
+    def from_model(cls, model, name="model"):
+        """Build the schema from a fitted scikit-learn estimator"""
+        feature_names = getattr(model, "feature_names_in_", None)
+        if feature_names is None:
+            raise SchemaError(
+                f"{name}: model was not fitted on named columns, "
+                "pass feature_names explicitly"
+            )
+
+        n_features = getattr(model, "n_features_in_", len(feature_names))
+        if n_features != len(feature_names):
+            raise SchemaError(
+                f"{name}: n_features_in_={n_features} but "
+                f"feature_names_in_ lists {len(feature_names)} features"
+            )
+        return cls(feature_names, name)
+
+    def __len__(self):
+        return len(self.feature_names)
+
+    def __eq__(self, other):
+        if not isinstance(other, FeatureSchema):
+            return NotImplemented
+        return self.feature_names == other.feature_names
+
+    def __hash__(self):
+        return hash(self.feature_names)
+
+    def __repr__(self):
+        return f"FeatureSchema({self.name!r}, {len(self)} features)"
+
+    def diff(self, feature_names):
+        """
+        Compare this schema with another feature list
+
+        Returns:
+            (missing, extra): features this schema needs that the list lacks,
+            and features the list has that this schema does not use
+        """
+        other = set(feature_names)
+        missing = [f for f in self.feature_names if f not in other]
+        extra = [f for f in feature_names if f not in self.index]
+        return missing, extra
+
+    def validate(self, feature_names, source="feature list"):
+        """Raise SchemaError unless feature_names matches this schema exactly"""
+        feature_names = tuple(feature_names)
+        if feature_names == self.feature_names:
+            return
+
+        missing, extra = self.diff(feature_names)
+        if missing or extra:
+            raise SchemaError(
+                f"{self.name} does not match {source}: "
+                f"missing={missing}, unexpected={extra}"
+            )
+        raise SchemaError(f"{self.name} does not match {source}: feature order differs")
+
+    def column_map(self, source):
+        """
+        Compile the column indices that reorder a matrix laid out as `source`
+        into this schema's order (X_model = X_source[:, mapping])
+        """
+        missing = [f for f in self.feature_names if f not in source.index]
+        if missing:
+            raise SchemaError(
+                f"{self.name} needs features absent from {source.name}: {missing}"
+            )
+        return np.fromiter(
+            (source.index[f] for f in self.feature_names),
+            dtype=np.intp,
+            count=len(self),
+        )
+
+    def _missing_error(self, record):
+        missing = [f for f in self.feature_names if f not in record]
+        return SchemaError(f"{self.name}: record is missing features {missing}")
+
+    def vectorize(self, record, out=None, dtype=np.float64):
+        """
+        Convert one student record into a feature row
+
+        Args:
+            record: Mapping of feature name -> value (extra keys are ignored)
+            out: Optional preallocated 1-D array of length len(self)
+            dtype: dtype of the array allocated when out is not given
+
+        Returns:
+            1-D numpy array in this schema's column order
+        """
+        if out is None:
+            out = np.empty(len(self), dtype=dtype)
+        try:
+            out[:] = self._getter(record)
+        except KeyError:
+            raise self._missing_error(record) from None
+        return out
+
+    def vectorize_many(self, records, out=None, dtype=np.float64):
+        """
+        Convert a batch of student records into a feature matrix
+
+        Args:
+            records: Sequence of mappings of feature name -> value
+            out: Optional preallocated 2-D array of shape (len(records), len(self))
+            dtype: dtype of the array allocated when out is not given
+
+        Returns:
+            2-D numpy array, one row per record
+        """
+        if out is None:
+            out = np.empty((len(records), len(self)), dtype=dtype)
+        getter = self._getter
+        for i, record in enumerate(records):
+            try:
+                out[i] = getter(record)
+            except KeyError:
+                raise self._missing_error(record) from None
+        return out
+
+
+def _input_width(model):
+    """Number of input columns a fitted model accepts (sklearn or Keras)"""
+    if hasattr(model, "n_features_in_"):
+        return model.n_features_in_
+    input_shape = getattr(model, "input_shape", None)
+    if input_shape is not None:
+        return input_shape[-1]
+    return None
+
+
+class SchemaRegistry:
+    """
+    Feature schemas for every loaded model, validated once at load time
+
+    All models are checked against a reference schema (the production model's
+    layout by default). Any model asking for a feature the reference does not
+    provide, or whose declared input width disagrees with its feature list,
+    is rejected when it is registered instead of failing on the first request.
+    """
+
+    def __init__(self, reference=None):
+        self.reference = reference
+        self._schemas = {}
+        self._column_maps = {}
+
+    def register(self, name, model=None, feature_names=None):
+        """
+        Validate a model and compile its schema
+
+        Args:
+            name: Model name (e.g. "svm")
+            model: Fitted estimator; its feature_names_in_ defines the schema
+            feature_names: Explicit feature list for models without
+                feature_names_in_ (e.g. Keras). Defaults to the reference.
+
+        Returns:
+            The compiled FeatureSchema
+        """
+        if feature_names is not None:
+            schema = FeatureSchema(feature_names, name)
+        elif model is not None and hasattr(model, "feature_names_in_"):
+            schema = FeatureSchema.from_model(model, name)
+        elif self.reference is not None:
+            schema = FeatureSchema(self.reference.feature_names, name)
+        else:
+            raise SchemaError(f"{name}: no feature names available")
+
+        width = _input_width(model) if model is not None else None
+        if width is not None and width != len(schema):
+            raise SchemaError(
+                f"{name}: model expects {width} inputs but its schema "
+                f"has {len(schema)} features"
+            )
+
+        if self.reference is None:
+            self.reference = schema
+        self._column_maps[name] = schema.column_map(self.reference)
+        self._schemas[name] = schema
+        return schema
+
+    def __getitem__(self, name):
+        return self._schemas[name]
+
+    def __contains__(self, name):
+        return name in self._schemas
+
+    def __iter__(self):
+        return iter(self._schemas)
+
+    def __len__(self):
+        return len(self._schemas)
+
+    def column_map(self, name):
+        """Column indices taking a reference-ordered matrix to `name`'s order"""
+        return self._column_maps[name]
+
+    def to_model_order(self, name, X):
+        """Reorder a reference-ordered matrix for `name` (no copy if identical)"""
+        if self._schemas[name] == self.reference:
+            return X
+        return X[:, self._column_maps[name]]
+
+    def vectorize(self, name, record, out=None):
+        """Turn one record into a row laid out for model `name`"""
+        return self._schemas[name].vectorize(record, out)
+
+    def vectorize_many(self, name, records, out=None):
+        """Turn a batch of records into a matrix laid out for model `name`"""
+        return self._schemas[name].vectorize_many(records, out)
+
+
+def build_registry(models, reference=PRODUCTION_MODEL):
+    """
+    Register every loaded model, starting with the reference model
+
+    Args:
+        models: Dictionary of model name -> fitted estimator
+        reference: Name of the model whose layout all others are checked against
+
+    Returns:
+        A populated SchemaRegistry
+    """
+    registry = SchemaRegistry()
+    order = sorted(models, key=lambda name: name != reference)
+    for name in order:
+        registry.register(name, models[name])
+    return registry
@@ -0,0 +1,473 @@
+"""
+MentorAid - Prediction Service
+A small HTTP service over the NumPy prediction path, for the dashboard's
+uploads (FileUpload.tsx) and student views. Standard library only.
+
+Endpoints:
+    POST /predict   one student record or a list -> predictions (same JSON
+                    as `mentoraid predict`)
+    GET  /metrics   Prometheus text format: request counters, the span
+                    histograms of mentoraid.instrumentation (per route
+                    and per pipeline step) and the drift gauges of
+                    mentoraid.drift
+    GET  /drift     drift report of the scored traffic as JSON
+    GET  /healthz   model name, model file hash and model version
+    GET  /dashboard DashboardStats and ChartsSection data from the risk
+                    store of mentoraid.riskstore (--risk-store)
+    GET  /students  one page of scored students for StudentTable:
+                    ?riskLevel=high&department=Arts&sort=-riskScore
+                    &limit=50&fields=studentId,name,riskScore&cursor=...
+                    (filters repeat or take comma-separated values; also
+                    class, feeStatus, minRiskScore, maxRiskScore, search)
+    GET  /history   a student's scores from mentoraid.history (--history):
+                    ?studentId=STU0000123&start=2025-01-01&end=2025-07-01
+                    every score with its model version and top factors, or
+                    with &points=26 the series downsampled for ProgressChart
+
+Concurrent requests are coalesced into batches by mentoraid.batching
+(--max-batch 0 scores every request on its own thread). Every scored batch
+is added to the DriftMonitor; a feature whose drift status worsens is
+reported once on stderr.
+
+mentoraid.prefork runs the same service in several worker processes that
+share the loaded models (--workers). With published model versions
+(mentoraid.versions), the service serves the current one and switches to a
+newly activated version without a restart. /predict answers carry the
+version in an X-Model-Version header.
+
+With --shadow, every scored batch is also handed to the candidate models
+of mentoraid.shadow, scored on a background thread after the response
+has been sent.
+
+Usage:
+    mentoraid serve [--host 127.0.0.1 --port 8000 --drift-window 10000]
+                    [--max-batch 64 --max-wait-ms 0 --batch-workers 1]
+                    [--workers 4] [--shadow knn 3f9c2a1b7d4e:svm] [--risk-store]
+                    [--history]
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .batching import DEFAULT_MAX_BATCH, DEFAULT_MAX_WAIT_MS, DEFAULT_WORKERS, MicroBatcher
+from .config import PRODUCTION_MODEL
+from .drift import DriftMonitor
+from .instrumentation import REGISTRY, span
+from .schema import SchemaError
+from .versions import WATCH_INTERVAL, VersionWatcher
+
+DEFAULT_PORT = 8000
+ROUTES = {
+    "/predict": "predict",
+    "/metrics": "metrics",
+    "/drift": "drift",
+    "/healthz": "healthz",
+    "/dashboard": "dashboard",
+    "/students": "students",
+    "/history": "history",
+}
+
+REQUESTS = REGISTRY.counter("mentoraid_requests_total", "HTTP requests handled")
+ERRORS = REGISTRY.counter("mentoraid_request_errors_total", "Requests answered with an error")
+PREDICTIONS = REGISTRY.counter("mentoraid_predictions_total", "Students scored")
+
+
+class _Deployment:
+    """
+    One model version being served: its registry, predictor, batcher, drift
+    monitor (the version's own reference) and shadow candidates
+    """
+
+    def __init__(self, version, registry, model, score, batching, drift_window, shadow):
+        self.version = version
+        self.registry = registry
+        self.predictor = registry.predictor(model)
+        self.monitor = DriftMonitor.load(registry.models_dir, window_rows=drift_window)
+        # Last reported drift status per feature
+        self.drift_status = {}
+        # ShadowTarget handed to the ShadowScorer with every batch
+        self.shadow = None
+        if shadow:
+            self.shadow = _shadow_target(shadow, registry, self.predictor)
+        self.batcher = None
+        if batching["max_batch"]:
+            self.batcher = MicroBatcher(
+                lambda X: score(self, X),
+                batching["max_batch"],
+                batching["max_wait_ms"],
+                batching["workers"],
+            ).start()
+        # Requests scoring on this deployment; it is closed once retired and idle
+        self.in_flight = 0
+        self.retired = False
+
+    def close(self):
+        if self.batcher is not None:
+            self.batcher.close()
+
+
+class PredictionService:
+    """
+    Scores records with a registry predictor and tracks the scored traffic
+
+    Args:
+        registry: ModelRegistry the predictor comes from
+        model: Model name to serve
+        drift_window: Rows the drift monitor follows (None: all traffic)
+        max_batch: Most rows per coalesced model call (0: no batching)
+        max_wait_ms: Longest a request waits to be batched with others
+        batch_workers: Batches scored concurrently
+        version: Id of the model version in the registry (mentoraid.versions)
+        versions: VersionStore to follow; newly activated versions are
+            swapped in by a VersionWatcher
+        reload_interval: Seconds between two checks of the store
+        shadow: Candidate specs ("knn", "3f9c2a1b7d4e:svm") scored next to
+            the served model by a mentoraid.shadow.ShadowScorer
+        shadow_rate: Fraction of scored batches shadowed
+        shadow_db: SQLite store of the shadow comparisons
+        risk_store: Path of the mentoraid.riskstore file served on
+            /dashboard ("" for the default path, None: no /dashboard)
+        history: Directory of the mentoraid.history store served on
+            /history ("" for the default one, None: no /history)
+    """
+
+    def __init__(
+        self,
+        registry,
+        model=PRODUCTION_MODEL,
+        drift_window=None,
+        max_batch=DEFAULT_MAX_BATCH,
+        max_wait_ms=DEFAULT_MAX_WAIT_MS,
+        batch_workers=DEFAULT_WORKERS,
+        version=None,
+        versions=None,
+        reload_interval=WATCH_INTERVAL,
+        shadow=(),
+        shadow_rate=1.0,
+        shadow_db=None,
+        risk_store=None,
+        history=None,
+    ):
+        self.model = model
+        self._batching = dict(max_batch=max_batch, max_wait_ms=max_wait_ms, workers=batch_workers)
+        self._drift_window = drift_window
+        self._shadow_specs = tuple(shadow)
+        self._deployment = self._deploy(version, registry)
+        self._lock = threading.Lock()
+        self.shadow = None
+        if shadow:
+            from .shadow import SHADOW_DB, ShadowScorer, ShadowStore
+
+            store = ShadowStore(shadow_db or SHADOW_DB)
+            self.shadow = ShadowScorer(self._deployment.shadow, store, shadow_rate).start()
+        self.risk_store = None
+        if risk_store is not None:
+            from .riskstore import RISK_DB, RiskStore
+
+            self.risk_store = RiskStore(risk_store or RISK_DB)
+        self.history = None
+        if history is not None:
+            from .history import HISTORY_DIR, HistoryStore
+
+            self.history = HistoryStore(history or HISTORY_DIR)
+        self.watcher = None
+        if versions is not None:
+            self.watcher = VersionWatcher(versions, self, reload_interval).start()
+
+    @property
+    def version(self):
+        return self._deployment.version
+
+    @property
+    def registry(self):
+        return self._deployment.registry
+
+    @property
+    def predictor(self):
+        return self._deployment.predictor
+
+    @property
+    def monitor(self):
+        """DriftMonitor of the served version (None without a reference)"""
+        return self._deployment.monitor
+
+    def _deploy(self, version, registry):
+        return _Deployment(
+            version,
+            registry,
+            self.model,
+            self._score,
+            self._batching,
+            self._drift_window,
+            self._shadow_specs,
+        )
+
+    def swap(self, version, registry):
+        """
+        Serve another model version from now on
+
+        New requests go to the new version at once. Requests already scoring
+        on the old version finish there; its batcher is closed when the last
+        one is done. Drift is followed from scratch against the new
+        version's reference, and shadow candidates are reloaded from it.
+
+        Returns:
+            The previous version id
+        """
+        deployment = self._deploy(version, registry)
+        with self._lock:
+            old, self._deployment = self._deployment, deployment
+            old.retired = True
+            idle = old.in_flight == 0
+        if idle:
+            old.close()
+        return old.version
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+        self._deployment.close()
+        if self.shadow is not None:
+            self.shadow.close()
+        if self.risk_store is not None:
+            self.risk_store.close()
+
+    def predict(self, records):
+        """Predictions for a list of records, recorded by the drift monitor"""
+        return self.predict_versioned(records)[1]
+
+    def predict_versioned(self, records):
+        """(model version, predictions) for a list of records"""
+        with self._lock:
+            deployment = self._deployment
+            deployment.in_flight += 1
+        try:
+            # Validation errors stay with the request that caused them
+            X = deployment.predictor.schema.vectorize_many(records)
+            if deployment.batcher is not None:
+                return deployment.version, deployment.batcher.predict(X)
+            return deployment.version, self._score(deployment, X)
+        finally:
+            with self._lock:
+                deployment.in_flight -= 1
+                drained = deployment.retired and deployment.in_flight == 0
+            if drained:
+                deployment.close()
+
+    def _score(self, deployment, X):
+        predictor = deployment.predictor
+        start = time.perf_counter()
+        predictions = predictor.predict_matrix(X)
+        if self.shadow is not None:
+            self.shadow.submit(
+                X, predictions, time.perf_counter() - start, deployment.version, deployment.shadow
+            )
+        PREDICTIONS.inc(len(X))
+        if deployment.monitor is not None:
+            with span("drift.observe", rows=len(X)):
+                deployment.monitor.observe(X, predictor.schema.feature_names)
+            with self._lock:
+                self._report_alerts(deployment)
+        return predictions
+
+    def _report_alerts(self, deployment):
+        order = {"insufficient": 0, "ok": 0, "warn": 1, "alert": 2}
+        status = deployment.drift_status
+        for drift in deployment.monitor.report():
+            previous = status.get(drift.feature, "ok")
+            status[drift.feature] = drift.status
+            if order[drift.status] > order[previous]:
+                print(
+                    f"⚠️  Drift {drift.status}: {drift.feature} "
+                    f"(PSI {drift.psi:.3f}, KS {drift.ks:.3f})",
+                    file=sys.stderr,
+                )
+
+    def drift(self):
+        monitor = self.monitor
+        if monitor is None:
+            return {"reference": None, "features": []}
+        return {
+            "reference": monitor.reference.rows,
+            "rows": monitor.rows,
+            "features": [d._asdict() for d in monitor.report()],
+        }
+
+    def metrics(self):
+        """Prometheus text exposition of the metrics registry and drift gauges"""
+        text = REGISTRY.render()
+        monitor = self.monitor
+        if monitor is not None:
+            text += "\n".join(monitor.metrics()) + "\n"
+        return text
+
+
+def _shadow_target(specs, registry, predictor):
+    """ShadowTarget of one deployment: its candidates, scaler and primary"""
+    from .shadow import ShadowTarget, load_candidates
+
+    candidates = load_candidates(specs, registry, predictor.schema)
+    return ShadowTarget(candidates, predictor.runtime.scale_rows, predictor.dropout_probability)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "MentorAid"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def _send(self, status, body, content_type="application/json", headers=()):
+        if content_type == "application/json":
+            body = json.dumps(body)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, message):
+        ERRORS.inc()
+        self._send(status, {"error": message})
+
+    def _span(self):
+        REQUESTS.inc()
+        # Unknown paths share one series, so scanners cannot grow the registry
+        return span(f"http.{ROUTES.get(urlsplit(self.path).path, 'unknown')}")
+
+    def do_GET(self):
+        with self._span():
+            self._get()
+
+    def do_POST(self):
+        with self._span():
+            self._post()
+
+    def _get(self):
+        url = urlsplit(self.path)
+        if url.path == "/students":
+            self._students(parse_qs(url.query))
+        elif url.path == "/history":
+            self._history(parse_qs(url.query))
+        elif url.path == "/metrics":
+            self._send(200, self.service.metrics(), "text/plain; version=0.0.4")
+        elif url.path == "/drift":
+            self._send(200, self.service.drift())
+        elif url.path == "/dashboard":
+            if self.service.risk_store is None:
+                return self._error(404, "no risk store (serve --risk-store)")
+            self._send(200, self.service.risk_store.dashboard())
+        elif url.path == "/healthz":
+            runtime = self.service.predictor.runtime
+            self._send(
+                200,
+                {
+                    "model": self.service.model,
+                    "modelHash": runtime.model_hash,
+                    "version": self.service.version,
+                },
+            )
+        else:
+            self._error(404, f"no route {self.path}")
+
+    def _students(self, params):
+        from .riskstore import FILTERS
+
+        if self.service.risk_store is None:
+            return self._error(404, "no risk store (serve --risk-store)")
+
+        def values(name):
+            return [v for value in params.pop(name, []) for v in value.split(",") if v]
+
+        def single(name, default=None):
+            given = params.pop(name, [])
+            return given[-1] if given else default
+
+        try:
+            where = {name: values(name) for name in FILTERS if name in params}
+            for name in ("minRiskScore", "maxRiskScore"):
+                if name in params:
+                    where[name] = single(name)
+            query = dict(
+                where=where,
+                sort=single("sort", "-riskScore"),
+                limit=int(single("limit", 50)),
+                cursor=single("cursor"),
+                fields=values("fields") or None,
+                search=single("search"),
+            )
+            if params:
+                return self._error(400, f"unknown parameters {sorted(params)}")
+            self._send(200, self.service.risk_store.query(**query))
+        except ValueError as e:
+            self._error(400, str(e))
+
+    def _history(self, params):
+        if self.service.history is None:
+            return self._error(404, "no prediction history (serve --history)")
+        query = {name: values[-1] for name, values in params.items()}
+        student = query.pop("studentId", None)
+        if student is None:
+            return self._error(400, "studentId is required")
+        try:
+            start, end, points = (query.pop(name, None) for name in ("start", "end", "points"))
+            if query:
+                return self._error(400, f"unknown parameters {sorted(query)}")
+            if points is not None:
+                rows = self.service.history.series(student, start, end, int(points))
+                self._send(200, {"studentId": student, "series": rows})
+            else:
+                rows = self.service.history.history(student, start, end)
+                self._send(200, {"studentId": student, "history": rows})
+        except ValueError as e:
+            self._error(400, str(e))
+
+    def _post(self):
+        if self.path != "/predict":
+            return self._error(404, f"no route {self.path}")
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            records = json.loads(self.rfile.read(length))
+        except ValueError as e:
+            return self._error(400, f"invalid JSON: {e}")
+
+        single = isinstance(records, dict)
+        try:
+            version, predictions = self.service.predict_versioned([records] if single else records)
+        except (SchemaError, TypeError, ValueError) as e:
+            return self._error(400, str(e))
+        headers = [("X-Model-Version", version)] if version else []
+        self._send(200, predictions[0] if single else predictions, headers=headers)
+
+    def log_message(self, format, *args):
+        # Request lines are counted in /metrics instead
+        pass
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under concurrent load
+    request_queue_size = 128
+
+    def __init__(self, address, service, bind_and_activate=True):
+        super().__init__(address, _Handler, bind_and_activate)
+        self.service = service
+
+
+def serve(service, host="127.0.0.1", port=DEFAULT_PORT):
+    server = PredictionServer((host, port), service)
+    print(f"🚀 Serving {service.model} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
@@ -0,0 +1,432 @@
+"""
+MentorAid - Shadow Scoring
+Scores live traffic with candidate models next to the production SVM and
+records how they compare, so a newly tuned model can be judged on real
+students before it is activated. tuning_results.csv only compares offline
+CV accuracy.
+
+The primary response never waits for a candidate. The service hands each
+scored batch (raw rows, primary predictions and primary latency) to a
+ShadowScorer, which queues it and returns at once. If the queue is full,
+the batch is dropped and counted. A background thread takes everything
+queued for the same model version, merges it (single-student requests
+would otherwise pay the per-call overhead of every candidate) and scores
+it with every candidate. It records one row per merged batch and
+candidate in a SQLite store with:
+
+- agreement on the predicted class (P(dropout) >= 0.5) and on riskLevel
+- primary and candidate latency for the batch (a merged batch is scored
+  by the primary again, on the shadow thread, so both times are for the
+  same rows in one call)
+- histograms of both P(dropout) distributions (10 bins over 0-1)
+
+The thread runs at the lowest CPU priority (Linux). When the service is
+saturated, shadow batches are dropped rather than requests slowed down.
+
+`python -m mentoraid.shadow` summarises the store per candidate:
+agreement rates, latency delta, mean |P difference| and the PSI between the
+two score distributions.
+
+A candidate is a model name from the served version ("knn") or from a
+published version ("3f9c2a1b7d4e:svm", see mentoraid.versions). Models with
+a runtime artifact (the SVM) are scored through their calibrated Predictor.
+Other sklearn models are scored through predict_proba, and the Keras model
+through its sigmoid output, on the scaled rows.
+
+Usage:
+    mentoraid serve --shadow knn 3f9c2a1b7d4e:svm [--shadow-rate 0.25]
+    python -m mentoraid.shadow [--db monitoring/shadow.sqlite]
+"""
+
+import argparse
+import json
+import os
+import queue
+import random
+import sqlite3
+import sys
+import threading
+import time
+import warnings
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from .calibration import DROPOUT_CLASS, risk_level
+from .config import ML_MODELS_DIR
+from .instrumentation import REGISTRY
+
+SHADOW_DB = ML_MODELS_DIR / "monitoring" / "shadow.sqlite"
+N_BINS = 10
+# Batches waiting for the shadow thread; more are dropped
+MAX_PENDING = 256
+# Queued batches are merged into one candidate call of up to this many rows
+MAX_MERGED_ROWS = 1024
+# Nice value of the shadow thread: under CPU contention the primary scoring
+# runs first and the shadow queue overflows instead
+SHADOW_NICE = 19
+_STOP = object()
+
+SHADOW_ROWS = REGISTRY.counter(
+    "mentoraid_shadow_rows_total", "Rows scored by a shadow candidate", ("candidate",)
+)
+SHADOW_AGREE = REGISTRY.counter(
+    "mentoraid_shadow_agree_total",
+    "Shadow rows whose predicted class matches the primary",
+    ("candidate",),
+)
+SHADOW_SECONDS = REGISTRY.histogram(
+    "mentoraid_shadow_seconds", "Shadow candidate latency per batch", ("candidate",)
+)
+SHADOW_DROPPED = REGISTRY.counter(
+    "mentoraid_shadow_dropped_total", "Batches not shadowed because the queue was full"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shadow_batches (
+    ts REAL NOT NULL,
+    version TEXT,
+    candidate TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    agree INTEGER NOT NULL,
+    level_agree INTEGER NOT NULL,
+    abs_diff REAL NOT NULL,
+    primary_ms REAL NOT NULL,
+    candidate_ms REAL NOT NULL,
+    primary_hist TEXT NOT NULL,
+    candidate_hist TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS shadow_batches_candidate ON shadow_batches (candidate, ts);
+"""
+
+
+ShadowTarget = namedtuple("ShadowTarget", "candidates scaler primary")
+ShadowTarget.__doc__ = """
+What the batches of one served version are compared with
+
+candidates is a list of Candidate, scaler scales raw rows for the sklearn
+candidates (the primary runtime's scale_rows) and primary returns the
+primary's P(dropout) for raw rows; merged batches are re-timed with it.
+"""
+
+
+def _histogram(probabilities):
+    return np.histogram(probabilities, bins=N_BINS, range=(0.0, 1.0))[0]
+
+
+class Candidate:
+    """
+    A model scored on the primary's rows
+
+    Args:
+        name: Label used in the store ("knn", "3f9c2a1b7d4e:svm")
+        model: Fitted estimator or Keras model; None with a predictor
+        reference: FeatureSchema of the primary's raw rows
+        predictor: Calibrated Predictor, used instead of `model` when given
+    """
+
+    def __init__(self, name, model=None, reference=None, predictor=None):
+        self.name = name
+        self.model = model
+        self.predictor = predictor
+        self._columns = None
+        if predictor is not None:
+            self._columns = predictor.schema.column_map(reference)
+        elif hasattr(model, "feature_names_in_"):
+            from .schema import FeatureSchema
+
+            self._columns = FeatureSchema.from_model(model, name).column_map(reference)
+
+    def dropout_probability(self, X, X_scaled):
+        """P(dropout) for raw rows X (primary order) and the same rows scaled"""
+        if self.predictor is not None:
+            return self.predictor.dropout_probability(X[:, self._columns])
+        X_model = X_scaled if self._columns is None else X_scaled[:, self._columns]
+        with warnings.catch_warnings():
+            # Models were fitted on DataFrames; the rows are a plain array
+            warnings.simplefilter("ignore", UserWarning)
+            if hasattr(self.model, "predict_proba"):
+                column = list(self.model.classes_).index(DROPOUT_CLASS)
+                return self.model.predict_proba(X_model)[:, column]
+            # Keras: single sigmoid unit -> P(Graduate)
+            return 1.0 - np.asarray(self.model.predict(X_model, verbose=0)).ravel()
+
+
+def load_candidates(specs, registry, reference):
+    """
+    Candidates for "name" / "version:name" specs
+
+    Args:
+        specs: Candidate specs
+        registry: ModelRegistry of the served version
+        reference: FeatureSchema of the primary's raw rows
+    """
+    from .artifacts import ModelRegistry
+    from .predict import runtime_path
+    from .versions import VersionStore
+
+    candidates = []
+    for spec in specs:
+        version, _, name = spec.rpartition(":")
+        source = registry
+        if version:
+            source = ModelRegistry(VersionStore(registry.models_dir).path(version))
+        if runtime_path(name, source.models_dir).exists():
+            predictor = source.predictor(name)
+            candidates.append(Candidate(spec, reference=reference, predictor=predictor))
+        else:
+            candidates.append(Candidate(spec, source[name], reference))
+    return candidates
+
+
+class ShadowStore:
+    """SQLite table of per-batch shadow comparisons"""
+
+    def __init__(self, path=SHADOW_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Pre-forked workers write to the same file
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def record(self, rows):
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO shadow_batches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def summary(self, since=None):
+        """
+        Comparison of every candidate with the primary
+
+        Args:
+            since: Only batches recorded after this UNIX time
+
+        Returns:
+            List of dictionaries, one per candidate
+        """
+        from .drift import psi
+
+        query = (
+            "SELECT candidate, rows, agree, level_agree, abs_diff, primary_ms, candidate_ms,"
+            " primary_hist, candidate_hist FROM shadow_batches WHERE ts >= ?"
+        )
+        totals = {}
+        for row in self._db.execute(query, (since or 0,)):
+            name, rows, agree, level_agree, abs_diff, primary_ms, candidate_ms, ph, ch = row
+            t = totals.setdefault(
+                name,
+                dict(batches=0, rows=0, agree=0, level_agree=0, abs_diff=0.0, delta_ms=[])
+                | dict(primary=np.zeros(N_BINS), candidate=np.zeros(N_BINS)),
+            )
+            t["batches"] += 1
+            t["rows"] += rows
+            t["agree"] += agree
+            t["level_agree"] += level_agree
+            t["abs_diff"] += abs_diff * rows
+            t["delta_ms"].append(candidate_ms - primary_ms)
+            t["primary"] += json.loads(ph)
+            t["candidate"] += json.loads(ch)
+
+        summary = []
+        for name, t in sorted(totals.items()):
+            shares = np.vstack([t["primary"], t["candidate"]]) / t["rows"]
+            summary.append(
+                {
+                    "candidate": name,
+                    "batches": t["batches"],
+                    "rows": t["rows"],
+                    "agreement": t["agree"] / t["rows"],
+                    "riskLevelAgreement": t["level_agree"] / t["rows"],
+                    "meanAbsDifference": t["abs_diff"] / t["rows"],
+                    "latencyDeltaMs": float(np.median(t["delta_ms"])),
+                    "latencyDeltaP95Ms": float(np.percentile(t["delta_ms"], 95)),
+                    "psi": float(psi(shares[:1], shares[1:])[0]),
+                    "primaryHistogram": t["primary"].astype(int).tolist(),
+                    "candidateHistogram": t["candidate"].astype(int).tolist(),
+                }
+            )
+        return summary
+
+    def close(self):
+        self._db.close()
+
+
+class ShadowScorer:
+    """
+    Scores submitted batches with candidate models on a background thread
+
+    Args:
+        target: ShadowTarget of the submitted batches
+        store: ShadowStore the comparisons are written to
+        sample_rate: Fraction of batches shadowed
+        max_pending: Batches queued before new ones are dropped
+
+    A batch can bring its own ShadowTarget (see submit), so a service that
+    swaps model versions compares each batch with the candidates loaded for
+    the version that scored it.
+    """
+
+    def __init__(self, target, store, sample_rate=1.0, max_pending=MAX_PENDING):
+        self.target = target
+        self.store = store
+        self.sample_rate = sample_rate
+        self._queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, name="mentoraid-shadow", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, X, predictions, seconds, version=None, target=None):
+        """
+        Queue a scored batch; never blocks
+
+        Args:
+            X: Raw rows scored by the primary
+            predictions: The primary's prediction dictionaries
+            seconds: Primary scoring time of the batch
+            version: Primary model version
+            target: ShadowTarget of the batch (default: the scorer's)
+        """
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        item = (time.time(), version, X, predictions, seconds, target or self.target)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            SHADOW_DROPPED.inc()
+
+    def close(self):
+        """Score what is queued, then stop the thread"""
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.store.close()
+
+    def _run(self):
+        _lower_priority()
+        item = self._queue.get()
+        while item is not _STOP:
+            batch, rows = [item], len(item[2])
+            item = None
+            # Merge what else is queued for the same version and target
+            while item is None and rows < MAX_MERGED_ROWS:
+                try:
+                    queued = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if queued is _STOP or queued[1] != batch[0][1] or queued[5] is not batch[0][5]:
+                    item = queued
+                else:
+                    batch.append(queued)
+                    rows += len(queued[2])
+            try:
+                self.store.record(self.compare(*_merge(batch)))
+            except Exception as e:
+                print(f"⚠️  Shadow scoring failed: {e}", file=sys.stderr)
+            if item is None:
+                item = self._queue.get()
+
+    def compare(self, ts, version, X, predictions, seconds, target=None):
+        """Store rows comparing every candidate with one primary batch"""
+        target = target or self.target
+        primary = np.array([p["dropoutProbability"] for p in predictions])
+        primary_class = primary >= 0.5
+        primary_level = risk_level(primary)
+        primary_hist = json.dumps(_histogram(primary).tolist())
+        X_scaled = target.scaler(X)
+
+        rows = []
+        for candidate in target.candidates:
+            start = time.perf_counter()
+            scores = candidate.dropout_probability(X, X_scaled)
+            elapsed = time.perf_counter() - start
+            agree = int(((scores >= 0.5) == primary_class).sum())
+            SHADOW_ROWS.inc(len(X), candidate.name)
+            SHADOW_AGREE.inc(agree, candidate.name)
+            SHADOW_SECONDS.observe(elapsed, candidate.name)
+            rows.append(
+                (
+                    ts,
+                    version,
+                    candidate.name,
+                    len(X),
+                    agree,
+                    int((risk_level(scores) == primary_level).sum()),
+                    float(np.abs(scores - primary).mean()),
+                    seconds * 1000,
+                    elapsed * 1000,
+                    primary_hist,
+                    json.dumps(_histogram(scores).tolist()),
+                )
+            )
+        return rows
+
+
+def _lower_priority():
+    """Give the calling thread the lowest CPU priority (Linux)"""
+    # Linux schedules threads individually: PRIO_PROCESS with a thread id
+    # renices only that thread. Elsewhere the id would name a process.
+    if sys.platform.startswith("linux"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), SHADOW_NICE)
+        except OSError:
+            pass
+
+
+def _merge(batch):
+    """
+    One (ts, version, X, predictions, seconds, target) item from several
+
+    The candidates score the merged rows in one call, so the primary is
+    timed on them in one call too: the sum of the requests' times would
+    charge the primary a per-call overhead the candidates do not pay.
+    """
+    if len(batch) == 1:
+        return batch[0]
+    ts, version, target = batch[0][0], batch[0][1], batch[0][5]
+    X = np.concatenate([item[2] for item in batch])
+    predictions = [p for item in batch for p in item[3]]
+    start = time.perf_counter()
+    target.primary(X)
+    return ts, version, X, predictions, time.perf_counter() - start, target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shadow comparison of candidate models")
+    parser.add_argument("--db", type=Path, default=SHADOW_DB)
+    parser.add_argument("--hours", type=float, help="only the last N hours")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"❌ No shadow store at {args.db} (run `mentoraid serve --shadow ...`)")
+        return 1
+    store = ShadowStore(args.db)
+    since = time.time() - args.hours * 3600 if args.hours else None
+    summary = store.summary(since)
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    print(f"📊 Shadow comparison with the production model ({args.db})")
+    print(
+        f"{'candidate':>22} {'rows':>9} {'class agr':>9} {'level agr':>9} "
+        f"{'|ΔP|':>6} {'PSI':>6} {'Δ ms p50':>9} {'Δ ms p95':>9}"
+    )
+    for s in summary:
+        print(
+            f"{s['candidate']:>22} {s['rows']:>9,} {s['agreement']:9.2%} "
+            f"{s['riskLevelAgreement']:9.2%} {s['meanAbsDifference']:6.3f} {s['psi']:6.3f} "
+            f"{s['latencyDeltaMs']:9.2f} {s['latencyDeltaP95Ms']:9.2f}"
+        )
+    if not summary:
+        print("   no shadowed batches yet")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
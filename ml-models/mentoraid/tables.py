@@ -0,0 +1,124 @@
+"""
+MentorAid - Bulk DOCX Table Writer
+Builds a complete <w:tbl> element from row data in a single pass and appends
+it to the document body once. python-docx's table.add_row() re-reads the
+table grid for every new row, so building large tables row by row is
+quadratic; this writer is linear and produces the same XML.
+"""
+
+from xml.sax.saxutils import escape
+
+_XML_SPACE = ' xml:space="preserve"'
+# nsdecls("w"), spelled out so building the XML does not import python-docx
+_W_NSDECL = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _text_xml(text):
+    """Run content for one cell, matching python-docx's run.text setter"""
+    if "\t" not in text and "\n" not in text and "\r" not in text:
+        if not text:
+            return ""
+        space = _XML_SPACE if text.strip() != text else ""
+        return f"<w:t{space}>{escape(text)}</w:t>"
+
+    parts = []
+    buffer = []
+    for char in text:
+        if char == "\t" or char in "\r\n":
+            if buffer:
+                parts.append(_text_xml("".join(buffer)))
+                buffer.clear()
+            parts.append("<w:tab/>" if char == "\t" else "<w:br/>")
+        else:
+            buffer.append(char)
+    if buffer:
+        parts.append(_text_xml("".join(buffer)))
+    return "".join(parts)
+
+
+def table_xml(rows, headers, style_id=None, col_width=None, header_size=None):
+    """
+    Serialize a header row plus data rows as a <w:tbl> XML string
+
+    Args:
+        rows: Iterable of row sequences; values are converted with str()
+        headers: Header cell texts (also fixes the column count)
+        style_id: Table style id (e.g. "LightGrid-Accent1"), or None
+        col_width: Column width in twips (None omits the widths)
+        header_size: Header font size in half-points (None keeps the style's)
+
+    Returns:
+        XML string of the table element
+    """
+    n_cols = len(headers)
+    width = f'<w:tcW w:type="dxa" w:w="{col_width}"/>' if col_width is not None else ""
+    cell_open = f"<w:tc><w:tcPr>{width}</w:tcPr><w:p><w:r>"
+    cell_close = "</w:r></w:p></w:tc>"
+
+    header_rpr = "<w:b/>"
+    if header_size is not None:
+        header_rpr += f'<w:sz w:val="{header_size}"/>'
+    header_cell_open = f"{cell_open}<w:rPr>{header_rpr}</w:rPr>"
+
+    parts = [f"<w:tbl {_W_NSDECL}><w:tblPr>"]
+    if style_id:
+        parts.append(f'<w:tblStyle w:val="{escape(style_id)}"/>')
+    parts.append(
+        '<w:tblW w:type="auto" w:w="0"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+        'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+        "</w:tblPr><w:tblGrid>"
+    )
+    grid_col = f'<w:gridCol w:w="{col_width}"/>' if col_width is not None else "<w:gridCol/>"
+    parts.append(grid_col * n_cols)
+    parts.append("</w:tblGrid><w:tr>")
+    for header in headers:
+        parts.append(header_cell_open + _text_xml(str(header)) + cell_close)
+    parts.append("</w:tr>")
+
+    empty_cell = cell_open + cell_close
+    for row in rows:
+        parts.append("<w:tr>")
+        cells = 0
+        for value in row:
+            parts.append(cell_open + _text_xml(str(value)) + cell_close)
+            cells += 1
+        if cells != n_cols:
+            if cells > n_cols:
+                raise ValueError(f"row has {cells} cells but the table has {n_cols} columns")
+            # add_row() leaves missing trailing cells empty
+            parts.append(empty_cell * (n_cols - cells))
+        parts.append("</w:tr>")
+    parts.append("</w:tbl>")
+    return "".join(parts)
+
+
+def add_table(doc, rows, headers, style=None, header_size=None):
+    """
+    Append a table with a bold header row to the end of the document body
+
+    Produces the same XML as doc.add_table() followed by add_row() and
+    cell.text assignments, but builds it in one pass.
+
+    Args:
+        doc: python-docx Document
+        rows: Iterable of row sequences
+        headers: Header cell texts
+        style: Table style name (e.g. "Light Grid Accent 1") or None
+        header_size: docx.shared.Length for the header font, or None
+
+    Returns:
+        docx.table.Table wrapping the new element
+    """
+    from docx.oxml import parse_xml
+    from docx.table import Table
+
+    section = doc.sections[-1]
+    block_width = section.page_width - section.left_margin - section.right_margin
+    col_width = (block_width // len(headers)) // 635  # EMU -> twips
+    style_id = doc.styles[style].style_id if style else None
+    half_points = int(header_size.pt * 2) if header_size is not None else None
+
+    tbl = parse_xml(table_xml(rows, headers, style_id, col_width, half_points))
+    doc.element.body._insert_tbl(tbl)
+    return Table(tbl, doc._body)
@@ -0,0 +1,493 @@
+"""
+MentorAid - Early-Warning Triggers
+Re-scores students when something that matters to the model changes, and
+schedules an intervention when the new score crosses a rule. Risk is
+otherwise only refreshed by a batch re-score of the whole roster.
+
+Events are feature changes from the school systems, one JSON object each:
+
+    {"studentId": "STU0000123", "type": "grade_posted",
+     "values": {"Curricular units 2nd sem (grade)": 11.5}}
+    {"studentId": "STU0000123", "type": "fee_status_changed",
+     "values": {"feeStatus": "overdue"}}
+    {"studentId": "STU0000123", "type": "debtor_flag_set"}
+
+EVENT_FEATURES lists the model features each event type may change. An
+event is applied to the student's current feature row. Only a student whose
+row actually changes is re-scored. Events of unknown types, unknown
+students, features the production model does not use and values equal to
+the current ones are counted and skipped. So are invalid events (not an
+object, or a value that is not a finite number); the rest of their batch is
+still applied.
+
+TriggerEngine reads events from an in-process queue (a stand-in for the
+message broker). A worker thread takes up to max_batch queued events and
+applies them in order to copies of the students' rows. It re-scores the
+changed students in one call of the production model, so a student with
+several events is scored once, and only then stores the new rows and
+scores: a batch that fails to score leaves every student as it was. The
+rules are then evaluated on each student's previous and new score. The
+first matching rule queues an intervention, shaped like
+InterventionHistory's Intervention:
+
+    low-to-high    riskLevel low -> high              meeting
+    became-high    riskLevel medium -> high           call
+    sharp-rise     riskScore up 20 points or more     call
+    became-medium  riskLevel low -> medium            email
+
+A rule fires on a transition, not on a level: a student who stays high is
+not flagged again by every grade. With a HistoryStore (mentoraid.history),
+every re-score is also appended to the prediction history.
+
+Usage:
+    mentoraid triggers roster.csv events.jsonl [--rules rules.json]
+                       [--interventions interventions.jsonl] [--history]
+    mentoraid bench triggers
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import math
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .calibration import risk_level, risk_score
+from .instrumentation import REGISTRY, span
+
+# Event type -> model features it may change
+EVENT_FEATURES = {
+    "grade_posted": (
+        "Curricular units 2nd sem (grade)",
+        "Curricular units 2nd sem (evaluations)",
+        "Curricular units 2nd sem (without evaluations)",
+        "Curricular units 2nd sem (credited)",
+    ),
+    "enrollment_changed": ("Curricular units 2nd sem (enrolled)",),
+    "fee_status_changed": ("Tuition fees up to date", "Debtor"),
+    "debtor_flag_set": ("Debtor",),
+    "debtor_flag_cleared": ("Debtor",),
+    "scholarship_changed": ("Scholarship holder",),
+}
+# Values implied by the event type when the event carries none
+EVENT_DEFAULTS = {
+    "debtor_flag_set": {"Debtor": 1},
+    "debtor_flag_cleared": {"Debtor": 0},
+}
+# Dashboard feeStatus -> the flags it stands for (as in mentoraid.synthetic)
+FEE_STATUS_FEATURES = {
+    "paid": {"Tuition fees up to date": 1, "Debtor": 0},
+    "pending": {"Tuition fees up to date": 0, "Debtor": 0},
+    "overdue": {"Tuition fees up to date": 0, "Debtor": 1},
+}
+# Events queued before submit() blocks
+MAX_PENDING = 10_000
+# Events applied per model call
+MAX_BATCH = 256
+_STOP = object()
+
+EVENTS = REGISTRY.counter(
+    "mentoraid_trigger_events_total", "Feature-change events by outcome", ("type", "outcome")
+)
+RESCORED = REGISTRY.counter("mentoraid_trigger_rescored_total", "Students re-scored on events")
+INTERVENTIONS = REGISTRY.counter(
+    "mentoraid_interventions_total", "Interventions queued by early-warning rules", ("rule",)
+)
+EVENT_SECONDS = REGISTRY.histogram(
+    "mentoraid_trigger_event_seconds", "Time from submit() until the event's rules are evaluated"
+)
+
+
+class Rule:
+    """
+    Condition on a student's previous and new score that raises an intervention
+
+    Every given condition must hold.
+
+    Args:
+        name: Rule name, recorded with the intervention
+        to_levels: riskLevels the student enters (and was not in before)
+        from_levels: riskLevels the student leaves
+        threshold: riskScore crossed upwards (previous < threshold <= new)
+        min_rise: Least riskScore increase
+        action: Intervention type (meeting, call, email, resource, plan)
+        title: Intervention title
+    """
+
+    def __init__(
+        self,
+        name,
+        to_levels=(),
+        from_levels=(),
+        threshold=None,
+        min_rise=None,
+        action="meeting",
+        title=None,
+    ):
+        if not (to_levels or from_levels or threshold is not None or min_rise is not None):
+            raise ValueError(f"rule {name!r} has no condition")
+        self.name = name
+        self.to_levels = tuple(to_levels)
+        self.from_levels = tuple(from_levels)
+        self.threshold = threshold
+        self.min_rise = min_rise
+        self.action = action
+        self.title = title or name.replace("-", " ").capitalize()
+
+    def matches(self, old_score, new_score, old_level, new_level):
+        """Boolean mask of the students (arrays of riskScores and riskLevels) matching"""
+        mask = np.ones(len(new_score), dtype=bool)
+        if self.to_levels:
+            mask &= np.isin(new_level, self.to_levels) & ~np.isin(old_level, self.to_levels)
+        if self.from_levels:
+            mask &= np.isin(old_level, self.from_levels)
+        if self.threshold is not None:
+            mask &= (old_score < self.threshold) & (new_score >= self.threshold)
+        if self.min_rise is not None:
+            mask &= new_score - old_score >= self.min_rise
+        return mask
+
+
+DEFAULT_RULES = (
+    Rule("low-to-high", from_levels=("low",), to_levels=("high",), action="meeting"),
+    Rule("became-high", to_levels=("high",), action="call"),
+    Rule("sharp-rise", min_rise=20, action="call"),
+    Rule("became-medium", from_levels=("low",), to_levels=("medium",), action="email"),
+)
+
+
+def load_rules(path):
+    """Rules from a JSON list of Rule keyword arguments"""
+    with open(path) as f:
+        specs = json.load(f)
+    try:
+        return [Rule(**spec) for spec in specs]
+    except TypeError as e:
+        raise ValueError(f"{path}: {e}") from None
+
+
+class TriggerEngine:
+    """
+    Applies feature-change events, re-scores the changed students and
+    queues the interventions their rules raise
+
+    Args:
+        predictor: Production Predictor (mentoraid.predict)
+        student_ids: studentId of every row of X
+        X: Current raw feature rows in the predictor's schema order
+        probabilities: Current P(dropout) of the rows (default: scored now)
+        rules: Rules, first match wins (default: DEFAULT_RULES)
+        history: Optional HistoryStore every re-score is appended to
+        max_batch: Most events applied per model call
+        max_pending: Events queued before submit() blocks
+    """
+
+    def __init__(
+        self,
+        predictor,
+        student_ids,
+        X,
+        probabilities=None,
+        rules=DEFAULT_RULES,
+        history=None,
+        max_batch=MAX_BATCH,
+        max_pending=MAX_PENDING,
+    ):
+        self.predictor = predictor
+        self.student_ids = np.asarray(student_ids, dtype=str)
+        self._rows = {student: row for row, student in enumerate(self.student_ids)}
+        if len(self._rows) != len(self.student_ids):
+            raise ValueError("studentIds are not unique")
+        self.X = np.array(X, dtype=np.float64)
+        if probabilities is None:
+            probabilities = predictor.dropout_probability(self.X)
+        self.probabilities = np.array(probabilities, dtype=np.float64)
+        self.rules = list(rules)
+        self.history = history
+        self.max_batch = max_batch
+        self.interventions = queue.Queue()
+        # Event type -> [(feature, column)] of the features the model uses
+        columns = {name: i for i, name in enumerate(predictor.schema.feature_names)}
+        self._features = {
+            kind: [(name, columns[name]) for name in names if name in columns]
+            for kind, names in EVENT_FEATURES.items()
+        }
+        self._ids = itertools.count(1)
+        self._queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, name="mentoraid-triggers", daemon=True)
+
+    @classmethod
+    def from_roster(cls, path, predictor, **kwargs):
+        """Engine over a roster file with studentId and the model features"""
+        from .cohorts import load_roster
+
+        roster = load_roster(path)
+        missing, _ = predictor.schema.diff(list(roster.columns))
+        if missing or "studentId" not in roster:
+            raise ValueError(f"{Path(path).name} needs studentId and the features {missing}")
+        X = roster[list(predictor.schema.feature_names)].to_numpy(dtype=np.float64)
+        return cls(predictor, roster["studentId"].astype(str), X, **kwargs)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def submit(self, event):
+        """Queue an event for the worker thread; blocks while the queue is full"""
+        self._queue.put((time.perf_counter(), event))
+
+    def close(self):
+        """Process what is queued, then stop the thread"""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        item = self._queue.get()
+        while item is not _STOP:
+            batch, item = [item], None
+            while len(batch) < self.max_batch:
+                try:
+                    queued = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if queued is _STOP:
+                    item = queued
+                    break
+                batch.append(queued)
+            try:
+                self.process([event for _, event in batch])
+            except Exception as e:
+                print(f"⚠️  Trigger batch failed: {e}", file=sys.stderr)
+            done = time.perf_counter()
+            for submitted, _ in batch:
+                EVENT_SECONDS.observe(done - submitted)
+            if item is None:
+                item = self._queue.get()
+
+    def apply(self, event, staged):
+        """
+        Apply one event to a copy of the student's feature row
+
+        Args:
+            event: Event dictionary
+            staged: Row index -> changed feature row of the current batch;
+                the event's row is copied from X into it on its first change
+
+        Returns:
+            (outcome, row): outcome is "changed", "unchanged", "irrelevant",
+            "invalid", "unknown_type" or "unknown_student"; row is None
+            unless changed
+        """
+        if not isinstance(event, dict) or not isinstance(event.get("type"), str):
+            return "invalid", None
+        kind = event["type"]
+        features = self._features.get(kind)
+        if features is None:
+            return "unknown_type", None
+        row = self._rows.get(str(event.get("studentId")))
+        if row is None:
+            return "unknown_student", None
+        given = event.get("values") or {}
+        if not isinstance(given, dict):
+            return "invalid", None
+        values = dict(EVENT_DEFAULTS.get(kind, {}))
+        values.update(given)
+        if "feeStatus" in values:
+            fee_status = values.pop("feeStatus")
+            if not isinstance(fee_status, str):
+                return "invalid", None
+            if fee_status not in FEE_STATUS_FEATURES:
+                return "irrelevant", None
+            values.update(FEE_STATUS_FEATURES[fee_status])
+
+        current = staged.get(row)
+        if current is None:
+            current = self.X[row]
+        relevant, changes = False, []
+        for name, column in features:
+            if name not in values:
+                continue
+            try:
+                value = float(values[name])
+            except (TypeError, ValueError):
+                return "invalid", None
+            if not math.isfinite(value):
+                return "invalid", None
+            relevant = True
+            if current[column] != value:
+                changes.append((column, value))
+        if not relevant:
+            return "irrelevant", None
+        if not changes:
+            return "unchanged", None
+        if row not in staged:
+            staged[row] = current = current.copy()
+        for column, value in changes:
+            current[column] = value
+        return "changed", row
+
+    def process(self, events):
+        """
+        Apply events in order, re-score the changed students once and
+        evaluate the rules
+
+        The changed rows are stored in X together with their new scores
+        only once the re-score has succeeded.
+
+        Returns:
+            List of the interventions queued
+        """
+        staged, changed = {}, {}
+        for event in events:
+            outcome, row = self.apply(event, staged)
+            kind = event.get("type") if isinstance(event, dict) else None
+            if not isinstance(kind, str) or kind not in EVENT_FEATURES:
+                kind = "other"
+            EVENTS.inc(1, kind, outcome)
+            if row is not None:
+                changed[row] = event
+        if not changed:
+            return []
+
+        rows = np.fromiter(changed, dtype=np.int64, count=len(changed))
+        X = np.vstack([staged[row] for row in rows])
+        with span("triggers.rescore", rows=len(rows)):
+            probabilities = self.predictor.dropout_probability(X)
+        self.X[rows] = X
+        previous = self.probabilities[rows]
+        self.probabilities[rows] = probabilities
+        RESCORED.inc(len(rows))
+        if self.history is not None:
+            self.history.append(
+                self.student_ids[rows], probabilities, version=self.predictor.version
+            )
+        return self._evaluate(rows, previous, probabilities, [changed[row] for row in rows])
+
+    def _evaluate(self, rows, previous, probabilities, events):
+        old_score, new_score = risk_score(previous), risk_score(probabilities)
+        old_level, new_level = risk_level(previous), risk_level(probabilities)
+        pending = np.ones(len(rows), dtype=bool)
+        interventions = []
+        date = datetime.date.today().isoformat()
+        for rule in self.rules:
+            matches = rule.matches(old_score, new_score, old_level, new_level)
+            hits = np.flatnonzero(pending & matches)
+            pending[hits] = False
+            for i in hits:
+                intervention = {
+                    "id": f"ew-{next(self._ids)}",
+                    "studentId": str(self.student_ids[rows[i]]),
+                    "date": date,
+                    "type": rule.action,
+                    "title": rule.title,
+                    "description": (
+                        f"Risk score {old_score[i]} -> {new_score[i]} "
+                        f"({old_level[i]} -> {new_level[i]}) after {events[i]['type']}"
+                    ),
+                    "outcome": "scheduled",
+                    "rule": rule.name,
+                    "event": events[i]["type"],
+                    "riskScore": int(new_score[i]),
+                    "previousRiskScore": int(old_score[i]),
+                    "riskLevel": str(new_level[i]),
+                    "previousRiskLevel": str(old_level[i]),
+                    "dropoutProbability": round(float(probabilities[i]), 4),
+                }
+                INTERVENTIONS.inc(1, rule.name)
+                self.interventions.put(intervention)
+                interventions.append(intervention)
+        return interventions
+
+    def drain(self):
+        """Every queued intervention, removed from the queue"""
+        interventions = []
+        while True:
+            try:
+                interventions.append(self.interventions.get_nowait())
+            except queue.Empty:
+                return interventions
+
+
+def main(argv=None):
+    from .artifacts import ModelRegistry
+    from .config import PRODUCTION_MODEL, RUNTIME_MODELS, TRAINED_MODELS_DIR
+
+    parser = argparse.ArgumentParser(description="Re-score students on feature-change events")
+    parser.add_argument("roster", type=Path, help="roster with studentId and the model features")
+    parser.add_argument("events", help="JSON lines of events ('-' for stdin)")
+    parser.add_argument("--rules", type=Path, help="JSON list of rules (default: built-in)")
+    parser.add_argument("--interventions", help="write the interventions here as JSON lines")
+    parser.add_argument(
+        "--history",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="append every re-score to the prediction history (store/history)",
+    )
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--models-dir", type=Path, default=TRAINED_MODELS_DIR)
+    parser.add_argument("--model", default=PRODUCTION_MODEL, choices=RUNTIME_MODELS)
+    args = parser.parse_args(argv)
+
+    history = None
+    if args.history is not None:
+        from .history import HISTORY_DIR, HistoryStore
+
+        history = HistoryStore(args.history or HISTORY_DIR)
+    predictor = ModelRegistry(args.models_dir).predictor(args.model)
+    engine = TriggerEngine.from_roster(
+        args.roster,
+        predictor,
+        rules=load_rules(args.rules) if args.rules else DEFAULT_RULES,
+        history=history,
+        max_batch=args.max_batch,
+    )
+
+    rescored = RESCORED.value()
+    stream = sys.stdin if args.events == "-" else open(args.events)
+    start = time.perf_counter()
+    events = 0
+    engine.start()
+    try:
+        for line in stream:
+            if line.strip():
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # Counted as an invalid event by the engine
+                    event = None
+                engine.submit(event)
+                events += 1
+    finally:
+        engine.close()
+        if stream is not sys.stdin:
+            stream.close()
+    elapsed = time.perf_counter() - start
+
+    interventions = engine.drain()
+    if args.interventions:
+        with open(args.interventions, "w") as f:
+            f.writelines(json.dumps(intervention) + "\n" for intervention in interventions)
+        log = sys.stdout
+    else:
+        sys.stdout.writelines(json.dumps(intervention) + "\n" for intervention in interventions)
+        log = sys.stderr
+    print(
+        f"✓ {events:,} events in {elapsed:.2f}s ({events / max(elapsed, 1e-9):,.0f}/s), "
+        f"{RESCORED.value() - rescored:,.0f} students re-scored, "
+        f"{len(interventions):,} interventions",
+        file=log,
+    )
+    for rule in engine.rules:
+        print(f"   {rule.name:<16} {INTERVENTIONS.value(rule.name):8,.0f}", file=log)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
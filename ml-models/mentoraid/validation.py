@@ -0,0 +1,411 @@
+"""
+MentorAid - Artifact Consistency Validator
+Scans every file in trained-models/ and checks that the models, the label
+encoder and feature_names.pkl agree with each other and with dataset.csv.
+Designed to run as a deploy gate: a few seconds end to end, a JSON report,
+and a non-zero exit status on any drift.
+
+Usage:
+    python -m mentoraid.validation --json report.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from .artifacts import load_keras, load_pickle
+from .calibration import (
+    CalibrationError,
+    calibration_path,
+    load_calibrator,
+    risk_level,
+    risk_score,
+)
+from .config import (
+    DATASET_PATH,
+    MODEL_FILES,
+    PRODUCTION_MODEL,
+    TARGET_MAPPING,
+    TRAINED_MODELS_DIR,
+)
+from .predict import RuntimeArtifactError, load_runtime, runtime_path
+from .preprocessing import prepare_training_data
+from .schema import FeatureSchema, SchemaError, SchemaRegistry
+
+GOLDEN_FILE = "golden_predictions.json"
+GOLDEN_BATCH_SIZE = 256
+GOLDEN_SEED = 42
+
+FEATURE_NAMES_FILE = "feature_names.pkl"
+LABEL_ENCODER_FILE = "label_encoder.pkl"
+
+# (P(dropout), riskLevel) at the RISK_LEVELS boundaries: the dashboard
+# (src/data/mockData.ts) treats riskScore >= 70 as high and >= 40 as medium
+RISK_LEVEL_BOUNDARIES = (
+    (0.394, "low"),
+    (0.40, "medium"),
+    (0.401, "medium"),
+    (0.694, "medium"),
+    (0.70, "high"),
+    (0.701, "high"),
+)
+
+# Fitted attributes that reveal the dtype a model was trained on
+_FITTED_ARRAYS = ("support_vectors_", "_fit_X", "coef_", "estimators_", "tree_")
+
+
+def _check(report, name, ok, detail=""):
+    """Record a single check result on an artifact report"""
+    report["checks"].append({"name": name, "ok": bool(ok), "detail": detail})
+    if not ok:
+        report["status"] = "failed"
+
+
+def _new_report(kind):
+    return {"kind": kind, "status": "ok", "checks": []}
+
+
+def _fitted_dtype(model):
+    """dtype of the training data as stored in the fitted estimator"""
+    for attr in _FITTED_ARRAYS:
+        value = getattr(model, attr, None)
+        if value is None:
+            continue
+        if attr == "tree_":
+            return value.threshold.dtype
+        if attr == "estimators_":
+            return value[0].tree_.threshold.dtype
+        return np.asarray(value).dtype
+    return None
+
+
+def build_golden_batch(feature_names, dataset_path=DATASET_PATH):
+    """
+    Deterministic golden batch drawn from the cleaned, scaled dataset
+
+    Returns:
+        (row indices into dataset.csv, scaled feature matrix, true labels)
+    """
+    students_df, X, labels, _ = prepare_training_data(feature_names, dataset_path)
+
+    rng = np.random.default_rng(GOLDEN_SEED)
+    size = min(GOLDEN_BATCH_SIZE, len(students_df))
+    rows = np.sort(rng.choice(len(students_df), size=size, replace=False))
+
+    return students_df.index.to_numpy()[rows], X[rows], labels[rows]
+
+
+def _predict_labels(model, X):
+    """Class predictions for sklearn estimators and the sigmoid Keras model"""
+    if hasattr(model, "predict_proba") or hasattr(model, "decision_function"):
+        with warnings.catch_warnings():
+            # Models were fitted on DataFrames; the golden batch is a plain array
+            warnings.simplefilter("ignore", UserWarning)
+            return np.asarray(model.predict(X))
+    # Keras: single sigmoid unit -> P(Graduate)
+    return (np.asarray(model.predict(X, verbose=0)).ravel() >= 0.5).astype(np.int64)
+
+
+def _validate_model(name, model, registry, label_classes, golden, expected):
+    """Schema, dtype, label and golden-batch checks for one model"""
+    report = _new_report("model")
+    report["model"] = type(model).__name__
+
+    try:
+        schema = registry.register(name, model)
+        report["n_features"] = len(schema)
+        _check(
+            report,
+            "feature_schema",
+            schema == registry.reference,
+            f"{len(schema)} features, order matches {registry.reference.name}",
+        )
+    except SchemaError as e:
+        _check(report, "feature_schema", False, str(e))
+        return report
+
+    dtype = _fitted_dtype(model)
+    if dtype is not None:
+        _check(
+            report,
+            "input_dtype",
+            np.issubdtype(dtype, np.floating),
+            f"fitted on {dtype}",
+        )
+
+    classes = getattr(model, "classes_", None)
+    if classes is not None:
+        _check(
+            report,
+            "label_mapping",
+            np.array_equal(np.asarray(classes), label_classes),
+            f"classes_={np.asarray(classes).tolist()}",
+        )
+    else:
+        outputs = model.output_shape[-1]
+        _check(report, "label_mapping", outputs == 1, f"{outputs} sigmoid output(s)")
+
+    rows, X, y = golden
+    X = registry.to_model_order(name, X)
+    start = time.perf_counter()
+    predictions = _predict_labels(model, X)
+    elapsed = time.perf_counter() - start
+
+    report["golden"] = {
+        "rows": len(rows),
+        "latency_ms": round(elapsed * 1000, 3),
+        "accuracy": round(float((predictions == y).mean()), 4),
+    }
+    _check(
+        report,
+        "golden_labels",
+        np.isin(predictions, label_classes).all(),
+        "predictions are valid labels",
+    )
+    if expected is not None:
+        mismatches = int((predictions != np.asarray(expected)).sum())
+        _check(
+            report,
+            "golden_predictions",
+            mismatches == 0,
+            f"{mismatches} of {len(rows)} predictions drifted",
+        )
+
+    report["predictions"] = predictions.tolist()
+    return report
+
+
+def validate_artifacts(models_dir=TRAINED_MODELS_DIR, dataset_path=DATASET_PATH):
+    """
+    Validate every artifact in models_dir
+
+    Args:
+        models_dir: Directory holding the trained artifacts
+        dataset_path: dataset.csv used to build the golden batch
+
+    Returns:
+        JSON-serialisable report dictionary; report["passed"] is the gate result
+    """
+    started = time.perf_counter()
+    models_dir = Path(models_dir)
+    artifacts = {}
+    model_files = {filename: name for name, filename in MODEL_FILES.items()}
+
+    # Label encoder defines the label mapping every model must share
+    encoder_report = _new_report("label_encoder")
+    artifacts[LABEL_ENCODER_FILE] = encoder_report
+    expected_classes = np.array(
+        sorted(v for k, v in TARGET_MAPPING.items() if k != "Enrolled")
+    )
+    label_classes = expected_classes
+    if (models_dir / LABEL_ENCODER_FILE).exists():
+        label_classes = np.asarray(load_pickle(models_dir / LABEL_ENCODER_FILE).classes_)
+        _check(
+            encoder_report,
+            "label_mapping",
+            np.array_equal(label_classes, expected_classes),
+            f"classes_={label_classes.tolist()}, expected {expected_classes.tolist()}",
+        )
+    else:
+        _check(encoder_report, "present", False, "label_encoder.pkl not found")
+
+    # The production model is registered first and becomes the reference schema
+    registry = SchemaRegistry()
+    production_path = models_dir / MODEL_FILES[PRODUCTION_MODEL]
+    production = load_pickle(production_path)
+    reference = FeatureSchema.from_model(production, PRODUCTION_MODEL)
+    golden = build_golden_batch(reference.feature_names, dataset_path)
+
+    golden_path = models_dir / GOLDEN_FILE
+    expected = {}
+    if golden_path.exists():
+        with open(golden_path) as f:
+            stored = json.load(f)
+        if stored["rows"] == golden[0].tolist():
+            expected = stored["predictions"]
+        else:
+            golden_report = _new_report("golden")
+            _check(golden_report, "rows", False, "golden batch rows changed")
+            artifacts[GOLDEN_FILE] = golden_report
+
+    models = [(PRODUCTION_MODEL, production_path)]
+    for path in sorted(models_dir.iterdir()):
+        if path == production_path or path.name in (LABEL_ENCODER_FILE, FEATURE_NAMES_FILE):
+            continue
+        if path.suffix in (".pkl", ".keras"):
+            models.append((model_files.get(path.name, path.stem), path))
+        elif path.name != GOLDEN_FILE and not path.name.endswith(
+            ("_calibration.json", "_runtime.npz")
+        ):
+            artifacts[path.name] = {"kind": "other", "status": "ignored", "checks": []}
+
+    for name, path in models:
+        try:
+            if path.suffix == ".keras":
+                model = load_keras(path)
+            else:
+                model = production if path == production_path else load_pickle(path)
+        except ImportError as e:
+            artifacts[path.name] = {
+                "kind": "model",
+                "status": "skipped",
+                "checks": [],
+                "reason": str(e),
+            }
+            continue
+
+        report = _validate_model(
+            name, model, registry, label_classes, golden, expected.get(name)
+        )
+        report["name"] = name
+        artifacts[path.name] = report
+
+        # A stored calibrator must belong to this exact model file
+        if name in MODEL_FILES and calibration_path(name, models_dir).exists():
+            try:
+                load_calibrator(name, models_dir)
+                _check(report, "calibration", True, "calibrator matches model hash")
+            except CalibrationError as e:
+                _check(report, "calibration", False, str(e))
+
+        # The compiled prediction path must reproduce the model's decisions
+        if name in MODEL_FILES and runtime_path(name, models_dir).exists():
+            try:
+                runtime = load_runtime(name, models_dir, rebuild=False)
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", UserWarning)
+                    gap = np.abs(
+                        runtime.decision_function(golden[1])
+                        - model.decision_function(golden[1])
+                    ).max()
+                _check(report, "runtime", gap < 1e-8, f"max decision gap {gap:.1e}")
+            except RuntimeArtifactError as e:
+                _check(report, "runtime", False, str(e))
+
+    # feature_names.pkl must describe the same layout as the models
+    names_report = _new_report("feature_names")
+    artifacts[FEATURE_NAMES_FILE] = names_report
+    if (models_dir / FEATURE_NAMES_FILE).exists():
+        feature_names = load_pickle(models_dir / FEATURE_NAMES_FILE)
+        try:
+            reference.validate(feature_names, FEATURE_NAMES_FILE)
+            _check(names_report, "feature_schema", True, f"{len(feature_names)} features")
+        except SchemaError as e:
+            _check(names_report, "feature_schema", False, str(e))
+    else:
+        _check(names_report, "present", False, "feature_names.pkl not found")
+
+    # Every riskScore must map to one riskLevel, thresholds included
+    levels_report = _new_report("risk_levels")
+    artifacts["RISK_LEVELS"] = levels_report
+    probabilities = [probability for probability, _ in RISK_LEVEL_BOUNDARIES]
+    for probability, score, level, (_, expected) in zip(
+        probabilities,
+        risk_score(probabilities),
+        risk_level(probabilities),
+        RISK_LEVEL_BOUNDARIES,
+    ):
+        _check(
+            levels_report,
+            "risk_level",
+            level == expected,
+            f"P={probability} (riskScore {score}) is {level}, expected {expected}",
+        )
+
+    passed = all(a["status"] != "failed" for a in artifacts.values())
+    return {
+        "models_dir": str(models_dir),
+        "passed": passed,
+        "golden_rows": len(golden[0]),
+        "duration_s": round(time.perf_counter() - started, 3),
+        "artifacts": artifacts,
+        "_golden_rows": golden[0].tolist(),
+    }
+
+
+def write_golden(report, models_dir=TRAINED_MODELS_DIR):
+    """Store the current golden-batch predictions as the expected baseline"""
+    predictions = {
+        a["name"]: a["predictions"]
+        for a in report["artifacts"].values()
+        if a.get("kind") == "model" and "predictions" in a
+    }
+    with open(Path(models_dir) / GOLDEN_FILE, "w") as f:
+        json.dump({"rows": report["_golden_rows"], "predictions": predictions}, f)
+        f.write("\n")
+
+
+def public_report(report):
+    """Report without the bulky per-row prediction lists"""
+    artifacts = {
+        filename: {k: v for k, v in a.items() if k != "predictions"}
+        for filename, a in report["artifacts"].items()
+    }
+    public = {k: v for k, v in report.items() if not k.startswith("_")}
+    public["artifacts"] = artifacts
+    return public
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the trained artifacts")
+    parser.add_argument("--models-dir", type=Path, default=TRAINED_MODELS_DIR)
+    parser.add_argument("--json", metavar="PATH", help="write the JSON report here ('-' for stdout)")
+    parser.add_argument(
+        "--write-golden",
+        action="store_true",
+        help="store the current golden-batch predictions as the baseline",
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="treat skipped artifacts as failures"
+    )
+    args = parser.parse_args(argv)
+
+    report = validate_artifacts(args.models_dir)
+    if args.write_golden:
+        write_golden(report, args.models_dir)
+        print(f"✓ Golden predictions written to {args.models_dir}")
+        report = validate_artifacts(args.models_dir)
+
+    if args.strict:
+        skipped = [a for a in report["artifacts"].values() if a["status"] == "skipped"]
+        report["passed"] = report["passed"] and not skipped
+    public = public_report(report)
+
+    if args.json == "-":
+        print(json.dumps(public, indent=2))
+    else:
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(public, f, indent=2)
+        for filename, artifact in public["artifacts"].items():
+            icon = {"ok": "✓", "failed": "❌", "skipped": "⚠️ ", "ignored": "·"}[
+                artifact["status"]
+            ]
+            line = f"{icon} {filename} [{artifact['status']}]"
+            if "golden" in artifact:
+                golden = artifact["golden"]
+                line += (
+                    f"  golden acc={golden['accuracy']:.4f}"
+                    f"  {golden['latency_ms']:.1f} ms/{golden['rows']} rows"
+                )
+            print(line)
+            for check in artifact["checks"]:
+                if not check["ok"]:
+                    print(f"     ✗ {check['name']}: {check['detail']}")
+            if "reason" in artifact:
+                print(f"     {artifact['reason']}")
+        print(
+            f"\n{'✅ PASSED' if public['passed'] else '❌ FAILED'}"
+            f" in {public['duration_s']:.2f}s"
+        )
+
+    return 0 if public["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+MentorAid - Versioned Model Store
+Keeps every published set of trained artifacts so that a re-run of the
+tuning script never overwrites what a running service is using.
+
+    trained-models/
+        svm_tuned_model.pkl ...       working copy written by the tuning script
+        versions/
+            manifest.json             versions, "current" and "previous"
+            3f9c2a1b7d4e/             one directory per version
+                svm_tuned_model.pkl ...
+
+A version is a copy of every artifact file in trained-models/. Its id is
+derived from the SHA-256 of each file, so publishing unchanged artifacts
+returns the existing version. Version directories are never modified after
+they are written. manifest.json is replaced atomically (write, then
+rename), so a reader always sees either the old manifest or the new one.
+
+A running service follows "current" with a VersionWatcher. When the pointer
+moves, the watcher loads the new version in the background and warms its
+predictor. It then runs the artifact validator (mentoraid.validation,
+including the golden-batch check) on the version directory. Only a version
+that passes is handed to PredictionService.swap(). Requests already being
+scored finish on the old version.
+
+Usage:
+    python -m mentoraid.versions list
+    python -m mentoraid.versions publish [--activate]
+    python -m mentoraid.versions activate 3f9c2a1b7d4e
+    python -m mentoraid.versions rollback
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from .artifacts import file_hash
+from .config import PRODUCTION_MODEL, TRAINED_MODELS_DIR
+
+VERSIONS_DIR = "versions"
+MANIFEST_FILE = "manifest.json"
+VERSION_ID_LENGTH = 12
+# Seconds between two reads of the manifest by a VersionWatcher
+WATCH_INTERVAL = 5.0
+
+
+class VersionError(Exception):
+    """Raised for unknown versions and invalid version operations"""
+
+
+def artifact_files(models_dir):
+    """The files of models_dir that make up a version (scripts excluded)"""
+    return sorted(
+        path for path in Path(models_dir).iterdir() if path.is_file() and path.suffix != ".py"
+    )
+
+
+def version_id(hashes):
+    """Id of a version from {file name: SHA-256}"""
+    digest = hashlib.sha256()
+    for name in sorted(hashes):
+        digest.update(f"{name}\0{hashes[name]}\n".encode())
+    return digest.hexdigest()[:VERSION_ID_LENGTH]
+
+
+class VersionStore:
+    """
+    The versions/ directory of a trained-models directory
+
+    Args:
+        models_dir: Directory whose artifacts are published
+    """
+
+    def __init__(self, models_dir=TRAINED_MODELS_DIR):
+        self.models_dir = Path(models_dir)
+        self.root = self.models_dir / VERSIONS_DIR
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self):
+        return self.root / MANIFEST_FILE
+
+    def manifest(self):
+        """The manifest; an empty one before the first publish"""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"current": None, "previous": None, "versions": {}}
+
+    def _write_manifest(self, manifest):
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".manifest-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+        os.replace(tmp, self.manifest_path)
+
+    def current(self):
+        """Id of the active version, or None"""
+        return self.manifest()["current"]
+
+    def path(self, version):
+        """Directory of a version"""
+        if version not in self.manifest()["versions"]:
+            raise VersionError(f"unknown model version {version}")
+        return self.root / version
+
+    def publish(self, source_dir=None):
+        """
+        Copy the artifacts of source_dir (default: models_dir) into a new version
+
+        Returns:
+            The version id (an existing id when nothing changed)
+        """
+        source_dir = Path(source_dir or self.models_dir)
+        files = artifact_files(source_dir)
+        hashes = {path.name: file_hash(path) for path in files}
+        version = version_id(hashes)
+
+        with self._lock:
+            manifest = self.manifest()
+            if version in manifest["versions"]:
+                return version
+            # Copy into a temporary directory first: a version directory that
+            # exists is always complete
+            self.root.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(dir=self.root, prefix=f".{version}-"))
+            for path in files:
+                shutil.copy2(path, staging / path.name)
+            os.replace(staging, self.root / version)
+
+            manifest["versions"][version] = {
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "files": hashes,
+            }
+            self._write_manifest(manifest)
+        return version
+
+    def activate(self, version):
+        """Point "current" at a published version"""
+        with self._lock:
+            manifest = self.manifest()
+            if version not in manifest["versions"]:
+                raise VersionError(f"unknown model version {version}")
+            if manifest["current"] != version:
+                manifest["previous"] = manifest["current"]
+                manifest["current"] = version
+                self._write_manifest(manifest)
+
+    def rollback(self):
+        """Re-activate the previous version; returns its id"""
+        previous = self.manifest()["previous"]
+        if previous is None:
+            raise VersionError("no previous model version")
+        self.activate(previous)
+        return previous
+
+
+def check_version(path, model=PRODUCTION_MODEL):
+    """
+    Warm a version and run the artifact validator on it
+
+    Returns:
+        (ModelRegistry with the predictor loaded, list of failed checks)
+    """
+    from .artifacts import ModelRegistry
+    from .validation import validate_artifacts
+
+    registry = ModelRegistry(path)
+    predictor = registry.predictor(model)
+    # Score one row so the first live request does not pay for loading pages
+    predictor.dropout_probability(predictor.runtime.mean[None, :])
+
+    report = validate_artifacts(path)
+    failures = [
+        f"{name}: {check['name']} ({check['detail']})"
+        for name, artifact in report["artifacts"].items()
+        for check in artifact["checks"]
+        if not check["ok"]
+    ]
+    return registry, failures
+
+
+class VersionWatcher:
+    """
+    Background thread that deploys the store's current version to a service
+
+    Args:
+        store: VersionStore to follow
+        service: PredictionService (swap(), version)
+        interval: Seconds between manifest reads
+    """
+
+    def __init__(self, store, service, interval=WATCH_INTERVAL):
+        self.store = store
+        self.service = service
+        self.interval = interval
+        # Versions that failed their check are not retried
+        self.rejected = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="mentoraid-versions", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"⚠️  Model version check failed: {e}", file=sys.stderr)
+
+    def check(self):
+        """
+        Deploy the current version if it is new and passes its checks
+
+        Returns:
+            True when the service was switched to another version
+        """
+        version = self.store.current()
+        if version is None or version == self.service.version or version in self.rejected:
+            return False
+
+        registry, failures = check_version(self.store.path(version), self.service.model)
+        if failures:
+            self.rejected[version] = failures
+            print(
+                f"❌ Model version {version} rejected: {'; '.join(failures[:3])}",
+                file=sys.stderr,
+            )
+            return False
+        previous = self.service.swap(version, registry)
+        print(f"✓ Now serving model version {version} (was {previous})", file=sys.stderr)
+        return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Versioned trained-model store")
+    parser.add_argument("--models-dir", type=Path, default=TRAINED_MODELS_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="published versions")
+    publish = commands.add_parser("publish", help="snapshot the current artifacts")
+    publish.add_argument("--activate", action="store_true", help="make it the current version")
+    activate = commands.add_parser("activate", help="switch the current version")
+    activate.add_argument("version")
+    commands.add_parser("rollback", help="switch back to the previous version")
+    args = parser.parse_args(argv)
+
+    store = VersionStore(args.models_dir)
+    try:
+        if args.command == "publish":
+            version = store.publish()
+            print(f"✓ Published model version {version}")
+            if args.activate:
+                store.activate(version)
+                print(f"✓ Activated {version}")
+        elif args.command == "activate":
+            store.activate(args.version)
+            print(f"✓ Activated {args.version}")
+        elif args.command == "rollback":
+            print(f"✓ Rolled back to {store.rollback()}")
+    except VersionError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    manifest = store.manifest()
+    if args.command == "list":
+        for version, info in sorted(manifest["versions"].items(), key=lambda v: v[1]["created"]):
+            marker = "*" if version == manifest["current"] else " "
+            print(f" {marker} {version}  {info['created']}  {len(info['files'])} files")
+        if not manifest["versions"]:
+            print("No published versions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
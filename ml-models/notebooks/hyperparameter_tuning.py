@@ -2,12 +2,26 @@
 Hyperparameter Tuning for All Models - MentorAid Student Dropout Prediction
 This script performs comprehensive hyperparameter optimization for all models
 and compares performance with default configurations.
+
+Run with --out-of-core (plus mentoraid.outofcore's options, e.g. --dataset)
+to train incremental models on a dataset streamed from disk in chunks.
 """
 
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+if "--out-of-core" in sys.argv[1:]:
+    # Chunked, streaming training for histories larger than memory; dispatched
+    # before the sklearn/imblearn imports below, which this path never uses
+    from mentoraid.outofcore import main
+
+    sys.exit(main([arg for arg in sys.argv[1:] if arg != "--out-of-core"]))
+
 import pandas as pd
 import numpy as np
 import pickle
-import time
 from sklearn.model_selection import (
     GridSearchCV,
     RandomizedSearchCV,
@@ -30,6 +44,17 @@ from sklearn.metrics import (
 from imblearn.over_sampling import RandomOverSampler
 import warnings
 
+from mentoraid.calibration import fit_calibrator, save_calibrator
+from mentoraid.config import DATASET_PATH, TRAINED_MODELS_DIR
+from mentoraid.drift import DriftReference
+from mentoraid.instrumentation import flush_metrics, span, span_summary
+from mentoraid.outliers import OutlierFilter
+from mentoraid.predict import export_runtime
+from mentoraid.preprocessing import load_dataset
+from mentoraid.report import summarize_dataset, write_tuning_journal
+from mentoraid.validation import validate_artifacts, write_golden
+from mentoraid.versions import VersionStore
+
 warnings.filterwarnings("ignore")
 
 print("=" * 80)
@@ -39,34 +64,24 @@ print("\n🔄 Loading preprocessed data...")
 
 # Load the preprocessed data
 print("⚠️  Loading from CSV and preprocessing...")
-students_df = pd.read_csv("../../ml-models/datasets/dataset.csv")
+students_df = load_dataset(DATASET_PATH)
 
 # Basic preprocessing (matching notebook)
-from scipy.stats import mode
 from sklearn.preprocessing import StandardScaler
 
-# Remove outliers using IQR method
-Q1 = students_df.select_dtypes(include=[np.number]).quantile(0.25)
-Q3 = students_df.select_dtypes(include=[np.number]).quantile(0.75)
-IQR = Q3 - Q1
-
-# Define bounds
-lower_bound = Q1 - 1.5 * IQR
-upper_bound = Q3 + 1.5 * IQR
-
-# Filter outliers
-outliers = (
-    (students_df.select_dtypes(include=[np.number]) < lower_bound)
-    | (students_df.select_dtypes(include=[np.number]) > upper_bound)
-).any(axis=1)
-students_df_cleaned = students_df[~outliers].copy()
+# Remove outliers using IQR method (quartiles from a mergeable quantile sketch;
+# the bounds are saved with the models for inference-time checks)
+with span("preprocess.outliers", rows=len(students_df)):
+    outlier_filter = OutlierFilter.from_frame(students_df)
+    students_df_cleaned = outlier_filter.apply(students_df)
 
 # Normalize numerical features
 scaler = StandardScaler()
 numerical_cols = students_df_cleaned.select_dtypes(include=[np.number]).columns.tolist()
-students_df_cleaned[numerical_cols] = scaler.fit_transform(
-    students_df_cleaned[numerical_cols]
-)
+with span("preprocess.scaling", rows=len(students_df_cleaned)):
+    students_df_cleaned[numerical_cols] = scaler.fit_transform(
+        students_df_cleaned[numerical_cols]
+    )
 
 students_df_normalised_no_outliers = students_df_cleaned.copy()
 
@@ -111,7 +126,8 @@ print(f"✓ Class distribution: {dict(y.value_counts())}")
 # Apply oversampling (best method from analysis)
 print("\n🔄 Applying Random Oversampling...")
 ros = RandomOverSampler(random_state=42)
-X_resampled, y_resampled = ros.fit_resample(X, y)
+with span("preprocess.oversample", rows=len(y)):
+    X_resampled, y_resampled = ros.fit_resample(X, y)
 print(f"✓ Resampled: {X_resampled.shape[0]} samples")
 print(f"✓ Balanced classes: {dict(pd.Series(y_resampled).value_counts())}")
 
@@ -134,11 +150,11 @@ print("🌲" * 40)
 
 print("\n📌 Default Parameters Performance:")
 rf_default = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
-rf_default_start = time.time()
-rf_default_scores = cross_val_score(
-    rf_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
-)
-rf_default_time = time.time() - rf_default_start
+with span("tune.rf.default_cv") as rf_default_span:
+    rf_default_scores = cross_val_score(
+        rf_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
+    )
+rf_default_time = rf_default_span.elapsed
 rf_default_mean = rf_default_scores.mean()
 
 print(f"   Accuracy: {rf_default_mean:.4f} (+/- {rf_default_scores.std():.4f})")
@@ -166,9 +182,9 @@ rf_grid = GridSearchCV(
     verbose=1,
 )
 
-rf_tuning_start = time.time()
-rf_grid.fit(X_resampled, y_resampled)
-rf_tuning_time = time.time() - rf_tuning_start
+with span("tune.rf.search") as rf_tuning_span:
+    rf_grid.fit(X_resampled, y_resampled)
+rf_tuning_time = rf_tuning_span.elapsed
 
 print(f"\n✓ Tuning completed in {rf_tuning_time:.2f}s")
 print(f"✓ Best Parameters: {rf_grid.best_params_}")
@@ -198,11 +214,11 @@ print("🌳" * 40)
 
 print("\n📌 Default Parameters Performance:")
 dt_default = DecisionTreeClassifier(random_state=42)
-dt_default_start = time.time()
-dt_default_scores = cross_val_score(
-    dt_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
-)
-dt_default_time = time.time() - dt_default_start
+with span("tune.dt.default_cv") as dt_default_span:
+    dt_default_scores = cross_val_score(
+        dt_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
+    )
+dt_default_time = dt_default_span.elapsed
 dt_default_mean = dt_default_scores.mean()
 
 print(f"   Accuracy: {dt_default_mean:.4f} (+/- {dt_default_scores.std():.4f})")
@@ -229,9 +245,9 @@ dt_grid = GridSearchCV(
     verbose=1,
 )
 
-dt_tuning_start = time.time()
-dt_grid.fit(X_resampled, y_resampled)
-dt_tuning_time = time.time() - dt_tuning_start
+with span("tune.dt.search") as dt_tuning_span:
+    dt_grid.fit(X_resampled, y_resampled)
+dt_tuning_time = dt_tuning_span.elapsed
 
 print(f"\n✓ Tuning completed in {dt_tuning_time:.2f}s")
 print(f"✓ Best Parameters: {dt_grid.best_params_}")
@@ -261,11 +277,11 @@ print("📊" * 40)
 
 print("\n📌 Default Parameters Performance:")
 lr_default = LogisticRegression(max_iter=1000, random_state=42)
-lr_default_start = time.time()
-lr_default_scores = cross_val_score(
-    lr_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
-)
-lr_default_time = time.time() - lr_default_start
+with span("tune.lr.default_cv") as lr_default_span:
+    lr_default_scores = cross_val_score(
+        lr_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
+    )
+lr_default_time = lr_default_span.elapsed
 lr_default_mean = lr_default_scores.mean()
 
 print(f"   Accuracy: {lr_default_mean:.4f} (+/- {lr_default_scores.std():.4f})")
@@ -298,9 +314,9 @@ lr_random = RandomizedSearchCV(
     random_state=42,
 )
 
-lr_tuning_start = time.time()
-lr_random.fit(X_resampled, y_resampled)
-lr_tuning_time = time.time() - lr_tuning_start
+with span("tune.lr.search") as lr_tuning_span:
+    lr_random.fit(X_resampled, y_resampled)
+lr_tuning_time = lr_tuning_span.elapsed
 
 print(f"\n✓ Tuning completed in {lr_tuning_time:.2f}s")
 print(f"✓ Best Parameters: {lr_random.best_params_}")
@@ -330,11 +346,11 @@ print("⚡" * 40)
 
 print("\n📌 Default Parameters Performance:")
 svm_default = SVC(random_state=42)
-svm_default_start = time.time()
-svm_default_scores = cross_val_score(
-    svm_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
-)
-svm_default_time = time.time() - svm_default_start
+with span("tune.svm.default_cv") as svm_default_span:
+    svm_default_scores = cross_val_score(
+        svm_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
+    )
+svm_default_time = svm_default_span.elapsed
 svm_default_mean = svm_default_scores.mean()
 
 print(f"   Accuracy: {svm_default_mean:.4f} (+/- {svm_default_scores.std():.4f})")
@@ -364,9 +380,9 @@ svm_random = RandomizedSearchCV(
     random_state=42,
 )
 
-svm_tuning_start = time.time()
-svm_random.fit(X_resampled, y_resampled)
-svm_tuning_time = time.time() - svm_tuning_start
+with span("tune.svm.search") as svm_tuning_span:
+    svm_random.fit(X_resampled, y_resampled)
+svm_tuning_time = svm_tuning_span.elapsed
 
 print(f"\n✓ Tuning completed in {svm_tuning_time:.2f}s")
 print(f"✓ Best Parameters: {svm_random.best_params_}")
@@ -387,6 +403,19 @@ results_comparison.append(
 
 print(f"\n📈 Improvement: {svm_improvement:+.2f}%")
 
+# Calibrate the decision function on held-out folds of the original
+# (non-oversampled) data instead of using SVC(probability=True)
+print("\n🎯 Calibrating SVM dropout probabilities (Platt, 5 held-out folds)...")
+with span("tune.svm.calibration") as svm_calibration_span:
+    svm_calibrator = fit_calibrator(
+        svm_random.best_estimator_,
+        X.to_numpy(dtype=np.float64),
+        y.to_numpy(dtype=np.int64),
+        method="platt",
+        cv=cv,
+    )
+print(f"✓ Calibration fitted in {svm_calibration_span.elapsed:.2f}s")
+
 # =============================================================================
 # 5. KNN TUNING
 # =============================================================================
@@ -396,11 +425,11 @@ print("🎯" * 40)
 
 print("\n📌 Default Parameters Performance:")
 knn_default = KNeighborsClassifier(n_neighbors=5)
-knn_default_start = time.time()
-knn_default_scores = cross_val_score(
-    knn_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
-)
-knn_default_time = time.time() - knn_default_start
+with span("tune.knn.default_cv") as knn_default_span:
+    knn_default_scores = cross_val_score(
+        knn_default, X_resampled, y_resampled, cv=cv, scoring="accuracy"
+    )
+knn_default_time = knn_default_span.elapsed
 knn_default_mean = knn_default_scores.mean()
 
 print(f"   Accuracy: {knn_default_mean:.4f} (+/- {knn_default_scores.std():.4f})")
@@ -431,9 +460,9 @@ knn_random = RandomizedSearchCV(
     random_state=42,
 )
 
-knn_tuning_start = time.time()
-knn_random.fit(X_resampled, y_resampled)
-knn_tuning_time = time.time() - knn_tuning_start
+with span("tune.knn.search") as knn_tuning_span:
+    knn_random.fit(X_resampled, y_resampled)
+knn_tuning_time = knn_tuning_span.elapsed
 
 print(f"\n✓ Tuning completed in {knn_tuning_time:.2f}s")
 print(f"✓ Best Parameters: {knn_random.best_params_}")
@@ -661,32 +690,70 @@ results_df = pd.DataFrame(results_comparison)
 print("\n" + results_df.to_string(index=False))
 
 # Save results
-results_df.to_csv("../../ml-models/trained-models/tuning_results.csv", index=False)
-print(f"\n✓ Results saved to: ../../ml-models/trained-models/tuning_results.csv")
+results_df.to_csv(TRAINED_MODELS_DIR / "tuning_results.csv", index=False)
+print(f"\n✓ Results saved to: {TRAINED_MODELS_DIR / 'tuning_results.csv'}")
+
+# Tuning journal: the dataset figures and search spaces behind tuning_results.csv,
+# read by generate_documentation.py
+write_tuning_journal(
+    TRAINED_MODELS_DIR / "tuning_journal.json",
+    summarize_dataset(
+        students_df, students_df_cleaned, y, X.shape[1], len(X_resampled)
+    ),
+    search_spaces={
+        "rf": rf_param_grid,
+        "dt": dt_param_grid,
+        "lr": lr_param_grid,
+        "svm": svm_param_grid,
+        "knn": knn_param_grid,
+    },
+    tuning_seconds={
+        "rf": rf_tuning_time,
+        "dt": dt_tuning_time,
+        "lr": lr_tuning_time,
+        "svm": svm_tuning_time,
+        "knn": knn_tuning_time,
+    },
+)
+print(f"✓ Tuning journal saved to: {TRAINED_MODELS_DIR / 'tuning_journal.json'}")
 
 # Save best models
 print("\n💾 Saving best tuned models...")
 
-with open("../../ml-models/trained-models/rf_tuned_model.pkl", "wb") as f:
+with open(TRAINED_MODELS_DIR / "rf_tuned_model.pkl", "wb") as f:
     pickle.dump(rf_grid.best_estimator_, f)
 print("   ✓ Random Forest (tuned)")
 
-with open("../../ml-models/trained-models/dt_tuned_model.pkl", "wb") as f:
+with open(TRAINED_MODELS_DIR / "dt_tuned_model.pkl", "wb") as f:
     pickle.dump(dt_grid.best_estimator_, f)
 print("   ✓ Decision Tree (tuned)")
 
-with open("../../ml-models/trained-models/lr_tuned_model.pkl", "wb") as f:
+with open(TRAINED_MODELS_DIR / "lr_tuned_model.pkl", "wb") as f:
     pickle.dump(lr_random.best_estimator_, f)
 print("   ✓ Logistic Regression (tuned)")
 
-with open("../../ml-models/trained-models/svm_tuned_model.pkl", "wb") as f:
+with open(TRAINED_MODELS_DIR / "svm_tuned_model.pkl", "wb") as f:
     pickle.dump(svm_random.best_estimator_, f)
-print("   ✓ SVM (tuned)")
+save_calibrator(svm_calibrator, "svm", TRAINED_MODELS_DIR)
+export_runtime("svm", TRAINED_MODELS_DIR)
+print("   ✓ SVM (tuned) + probability calibration + runtime arrays")
 
-with open("../../ml-models/trained-models/knn_tuned_model.pkl", "wb") as f:
+with open(TRAINED_MODELS_DIR / "knn_tuned_model.pkl", "wb") as f:
     pickle.dump(knn_random.best_estimator_, f)
 print("   ✓ KNN (tuned)")
 
+outlier_filter.save(TRAINED_MODELS_DIR)
+print("   ✓ IQR outlier bounds + quantile sketch")
+
+DriftReference.from_frame(students_df).save(TRAINED_MODELS_DIR)
+print("   ✓ Drift reference histograms")
+
+# The new models define the new golden baseline; the snapshot is what a
+# running service can switch to (`mentoraid models activate <version>`)
+write_golden(validate_artifacts(TRAINED_MODELS_DIR), TRAINED_MODELS_DIR)
+model_version = VersionStore(TRAINED_MODELS_DIR).publish()
+print(f"   ✓ Golden predictions + model version {model_version}")
+
 print("\n" + "=" * 80)
 print("TUNING COMPLETE!")
 print("=" * 80)
@@ -704,3 +771,10 @@ for idx, row in results_df.iterrows():
 print(
     "\n🏆 Overall Winner: Random Forest (Still the best even after tuning all models)"
 )
+
+print("\n⏱️  Time per step:")
+for name, (count, seconds) in span_summary().items():
+    print(f"   {name:32} {seconds:10.2f}s" + (f"  ({count} calls)" if count > 1 else ""))
+metrics_file = flush_metrics()
+if metrics_file:
+    print(f"✓ Metrics written to {metrics_file}")